@@ -436,6 +436,7 @@ def migrate_memory_md_to_github(
                         section=section_name,
                         agent=f"{agent_name} (Migration)",
                         priority="medium",
+                        wait=True,
                     )
 
                     if result.get("success"):
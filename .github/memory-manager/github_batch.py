@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+"""
+GitHub GraphQL Batch Transport - Apply many issue changes per API request
+
+This module packs issue creates, updates and closes into aliased GraphQL
+mutations sent through ``gh api graphql``, so a sync costs one process and
+one HTTP round trip per batch instead of per issue. Errors are attributed
+back to the task that caused them and GitHub's rate limit headers are
+honoured between batches. Transport failures say whether batching is
+unusable here, whether the rate limit was hit, and which operations GitHub
+may already have applied, so callers never replay a batch blindly.
+"""
+
+import json
+import subprocess
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+# Fields requested for every issue a mutation returns
+ISSUE_FIELDS = """
+fragment IssueFields on Issue {
+  id
+  number
+  title
+  body
+  state
+  createdAt
+  updatedAt
+  url
+  labels(first: 20) { nodes { name } }
+  assignees(first: 10) { nodes { login } }
+}
+"""
+
+REPOSITORY_QUERY = """
+query($owner: String!, $name: String!) {
+  repository(owner: $owner, name: $name) {
+    id
+    labels(first: 100) { nodes { id name } }
+  }
+}
+"""
+
+MUTATIONS = {
+    "create": ("createIssue", "CreateIssueInput"),
+    "update": ("updateIssue", "UpdateIssueInput"),
+    "close": ("closeIssue", "CloseIssueInput"),
+}
+
+
+class GitHubTransportError(RuntimeError):
+    """The GraphQL transport itself failed, as opposed to one operation"""
+
+    def __init__(
+        self,
+        message: str,
+        completed: Optional[List[Any]] = None,
+        status: Optional[int] = None,
+    ):
+        super().__init__(message)
+        # Results of the operations applied before the failure, in order
+        self.completed = completed or []
+        # Operations of the failed request, which GitHub may have applied
+        self.in_flight: List["IssueOperation"] = []
+        # HTTP status of the failed response, if there was one
+        self.status = status
+
+
+class GitHubTransportUnavailableError(GitHubTransportError):
+    """GraphQL batching cannot be used here: gh is missing or GraphQL refused"""
+
+
+class GitHubRateLimitError(GitHubTransportError):
+    """GitHub's rate limit was hit; the request was not applied"""
+
+
+@dataclass
+class IssueOperation:
+    """One issue change requested on behalf of a Memory.md task"""
+
+    task_id: str
+    kind: str  # create, update, close
+    title: Optional[str] = None
+    body: Optional[str] = None
+    labels: List[str] = field(default_factory=list)
+    issue_number: Optional[int] = None
+    state: Optional[str] = None  # open, closed; None leaves it unchanged
+
+
+@dataclass
+class OperationResult:
+    """Outcome of an issue operation"""
+
+    operation: IssueOperation
+    issue_data: Optional[Dict[str, Any]] = None  # gh --json style
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+def issue_node_to_gh_json(node: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a GraphQL issue node to the shape ``gh --json`` returns"""
+    return {
+        "id": node.get("id"),
+        "number": node["number"],
+        "title": node["title"],
+        "body": node.get("body", ""),
+        "state": node["state"],
+        "labels": node.get("labels", {}).get("nodes", []),
+        "assignees": node.get("assignees", {}).get("nodes", []),
+        "createdAt": node["createdAt"],
+        "updatedAt": node["updatedAt"],
+        "htmlUrl": node.get("url", ""),
+    }
+
+
+class GraphQLBatchTransport:
+    """Sends batches of issue operations as aliased GraphQL mutations"""
+
+    def __init__(
+        self,
+        repo_path: str,
+        batch_size: int = 20,
+        min_interval: float = 1.0,
+        max_retries: int = 3,
+        max_rate_limit_wait: float = 60.0,
+    ):
+        """Initialize transport
+
+        Args:
+            repo_path: Repository checkout used to resolve the GitHub repo
+            batch_size: Operations per mutation request
+            min_interval: Minimum seconds between mutation requests, keeping
+                content creation under GitHub's secondary rate limits
+            max_retries: Retries of a rate-limited request
+            max_rate_limit_wait: Longest wait for a rate limit to reset
+        """
+        self.repo_path = repo_path
+        self.batch_size = max(1, batch_size)
+        self.min_interval = min_interval
+        self.max_retries = max_retries
+        self.max_rate_limit_wait = max_rate_limit_wait
+
+        self.owner: Optional[str] = None
+        self.name: Optional[str] = None
+        self.repository_id: Optional[str] = None
+        self.label_ids: Dict[str, str] = {}
+        self._last_mutation = 0.0
+
+        # Rate limit state from the latest response
+        self.rate_limit_remaining: Optional[int] = None
+        self.rate_limit_reset: Optional[float] = None
+
+        # Transport statistics
+        self.requests_sent = 0
+        self.operations_sent = 0
+        self.rate_limit_waits = 0
+
+    def _run_gh(self, payload: Dict[str, Any]) -> Tuple[int, Dict[str, str], str]:
+        """Post a GraphQL payload; returns HTTP status, headers and body"""
+        try:
+            result = subprocess.run(
+                ["gh", "api", "graphql", "--include", "--input", "-"],
+                input=json.dumps(payload),
+                capture_output=True,
+                text=True,
+                cwd=self.repo_path,
+            )
+        except FileNotFoundError as e:
+            raise GitHubTransportUnavailableError(f"GitHub CLI not found: {e}")
+
+        # --include prints the status line and headers before the body,
+        # also when gh exits non-zero for an HTTP error
+        head, _, body = result.stdout.replace("\r\n", "\n").partition("\n\n")
+        lines = head.split("\n")
+        if not lines[0].startswith("HTTP/"):
+            raise GitHubTransportError(
+                f"Unexpected response from gh api: {result.stderr.strip()}"
+            )
+
+        status = int(lines[0].split()[1])
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        return status, headers, body
+
+    def _track_rate_limit(self, headers: Dict[str, str]) -> None:
+        if "x-ratelimit-remaining" in headers:
+            self.rate_limit_remaining = int(headers["x-ratelimit-remaining"])
+        if "x-ratelimit-reset" in headers:
+            self.rate_limit_reset = float(headers["x-ratelimit-reset"])
+
+    def _wait(self, seconds: float) -> None:
+        if seconds > self.max_rate_limit_wait:
+            raise GitHubRateLimitError(
+                f"GitHub rate limit resets in {seconds:.0f}s, "
+                f"longer than the {self.max_rate_limit_wait:.0f}s allowed wait"
+            )
+        self.rate_limit_waits += 1
+        time.sleep(max(0.0, seconds))
+
+    def _seconds_until_reset(self) -> float:
+        if self.rate_limit_reset is None:
+            return self.max_rate_limit_wait
+        return self.rate_limit_reset - time.time() + 1
+
+    def graphql(
+        self, query: str, variables: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Execute a GraphQL request, waiting out rate limits
+
+        Returns:
+            The response, with ``data`` and possibly ``errors``
+
+        Raises:
+            GitHubTransportError: If the request fails as a whole
+        """
+        if self.rate_limit_remaining == 0:
+            self._wait(self._seconds_until_reset())
+
+        payload = {"query": query, "variables": variables or {}}
+        for attempt in range(self.max_retries + 1):
+            status, headers, body = self._run_gh(payload)
+            self.requests_sent += 1
+            self._track_rate_limit(headers)
+
+            limited = status in (403, 429) and (
+                "retry-after" in headers
+                or self.rate_limit_remaining == 0
+                or "rate limit" in body.lower()
+            )
+            if limited and attempt < self.max_retries:
+                retry_after = headers.get("retry-after")
+                self._wait(
+                    float(retry_after)
+                    if retry_after
+                    else min(self._seconds_until_reset(), 2.0**attempt * 10)
+                )
+                continue
+
+            if limited:
+                raise GitHubRateLimitError(
+                    "GitHub rate limit retries exhausted", status=status
+                )
+            if status != 200:
+                raise GitHubTransportError(
+                    f"GitHub GraphQL request failed with HTTP {status}: {body[:200]}",
+                    status=status,
+                )
+            try:
+                return json.loads(body)
+            except json.JSONDecodeError as e:
+                raise GitHubTransportError(
+                    f"Invalid GraphQL response: {e}", status=status
+                )
+
+        raise GitHubRateLimitError("GitHub rate limit retries exhausted")
+
+    def _ensure_repository(self) -> None:
+        """Look up the repository and label node IDs once"""
+        if self.repository_id is not None:
+            return
+
+        try:
+            result = subprocess.run(
+                ["gh", "repo", "view", "--json", "owner,name"],
+                capture_output=True,
+                text=True,
+                cwd=self.repo_path,
+            )
+        except FileNotFoundError as e:
+            raise GitHubTransportUnavailableError(f"GitHub CLI not found: {e}")
+        if result.returncode != 0:
+            raise GitHubTransportError(
+                f"Failed to resolve repository: {result.stderr.strip()}"
+            )
+        repo = json.loads(result.stdout)
+        self.owner, self.name = repo["owner"]["login"], repo["name"]
+
+        response = self.graphql(
+            REPOSITORY_QUERY, {"owner": self.owner, "name": self.name}
+        )
+        repository = (response.get("data") or {}).get("repository")
+        if not repository:
+            raise GitHubTransportError(
+                f"Repository lookup failed: {response.get('errors')}"
+            )
+        self.repository_id = repository["id"]
+        self.label_ids = {
+            label["name"]: label["id"] for label in repository["labels"]["nodes"]
+        }
+
+    def resolve_issue_ids(self, numbers: List[int]) -> Dict[int, str]:
+        """Node IDs for issue numbers, fetched in one aliased query"""
+        if not numbers:
+            return {}
+        self._ensure_repository()
+
+        fields = "\n".join(
+            f"    i{number}: issue(number: {int(number)}) {{ id }}"
+            for number in sorted(set(numbers))
+        )
+        query = (
+            "query($owner: String!, $name: String!) {\n"
+            f"  repository(owner: $owner, name: $name) {{\n{fields}\n  }}\n}}"
+        )
+        response = self.graphql(query, {"owner": self.owner, "name": self.name})
+        repository = (response.get("data") or {}).get("repository") or {}
+        return {
+            int(alias[1:]): issue["id"]
+            for alias, issue in repository.items()
+            if issue is not None
+        }
+
+    def _operation_input(
+        self, operation: IssueOperation, node_ids: Dict[int, str]
+    ) -> Dict[str, Any]:
+        """GraphQL input object for an operation"""
+        if operation.kind == "create":
+            missing = [name for name in operation.labels if name not in self.label_ids]
+            if missing:
+                raise ValueError(f"Labels do not exist: {', '.join(missing)}")
+            return {
+                "repositoryId": self.repository_id,
+                "title": operation.title,
+                "body": operation.body,
+                "labelIds": [self.label_ids[name] for name in operation.labels],
+            }
+
+        if operation.issue_number not in node_ids:
+            raise ValueError(f"Issue #{operation.issue_number} not found")
+        if operation.kind == "close":
+            return {"issueId": node_ids[operation.issue_number]}
+
+        update: Dict[str, Any] = {"id": node_ids[operation.issue_number]}
+        if operation.title is not None:
+            update["title"] = operation.title
+        if operation.body is not None:
+            update["body"] = operation.body
+        if operation.state is not None:
+            update["state"] = operation.state.upper()
+        return update
+
+    def execute(
+        self,
+        operations: List[IssueOperation],
+        node_ids: Optional[Dict[int, str]] = None,
+    ) -> List[OperationResult]:
+        """Apply operations in batches of aliased mutations
+
+        Args:
+            operations: Operations to apply, in order
+            node_ids: Known issue node IDs by number; others are looked up
+
+        Returns:
+            One result per operation, in order
+
+        Raises:
+            GitHubTransportUnavailableError: If the repository cannot be used
+                through GraphQL; nothing was applied
+            GitHubRateLimitError: If the rate limit stopped a request; its
+                ``completed`` holds the results of earlier batches
+            GitHubTransportError: If a request fails as a whole; its
+                ``completed`` holds the results of earlier batches and
+                ``in_flight`` the operations GitHub may have applied
+        """
+        try:
+            self._ensure_repository()
+        except GitHubRateLimitError:
+            raise
+        except GitHubTransportError as e:
+            # Server errors are transient; anything else rules out GraphQL
+            if isinstance(e, GitHubTransportUnavailableError) or (e.status or 0) >= 500:
+                raise
+            raise GitHubTransportUnavailableError(str(e), status=e.status) from e
+        node_ids = dict(node_ids or {})
+        unknown = [
+            op.issue_number
+            for op in operations
+            if op.kind != "create"
+            and op.issue_number is not None
+            and op.issue_number not in node_ids
+        ]
+        node_ids.update(self.resolve_issue_ids(unknown))
+
+        results: List[OperationResult] = []
+        for start in range(0, len(operations), self.batch_size):
+            try:
+                results.extend(
+                    self._execute_batch(
+                        operations[start : start + self.batch_size], node_ids
+                    )
+                )
+            except GitHubTransportError as e:
+                e.completed = results
+                raise
+        return results
+
+    def _execute_batch(
+        self, operations: List[IssueOperation], node_ids: Dict[int, str]
+    ) -> List[OperationResult]:
+        results = [OperationResult(operation) for operation in operations]
+        declarations = []
+        selections = []
+        variables: Dict[str, Any] = {}
+
+        for index, operation in enumerate(operations):
+            try:
+                mutation, input_type = MUTATIONS[operation.kind]
+                variables[f"in{index}"] = self._operation_input(operation, node_ids)
+            except (KeyError, ValueError) as e:
+                results[index].error = str(e) or f"Unknown operation {operation.kind}"
+                continue
+            declarations.append(f"$in{index}: {input_type}!")
+            selections.append(
+                f"  op{index}: {mutation}(input: $in{index}) "
+                "{ issue { ...IssueFields } }"
+            )
+
+        if not selections:
+            return results
+
+        query = (
+            f"mutation({', '.join(declarations)}) {{\n"
+            + "\n".join(selections)
+            + "\n}\n"
+            + ISSUE_FIELDS
+        )
+
+        # Space out content-creating requests for the secondary rate limit
+        delay = self._last_mutation + self.min_interval - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        try:
+            response = self.graphql(query, variables)
+        except GitHubRateLimitError:
+            raise
+        except GitHubTransportError as e:
+            # The request may have reached GitHub before failing
+            e.in_flight = [
+                operation
+                for operation, result in zip(operations, results)
+                if result.error is None
+            ]
+            raise
+        finally:
+            self._last_mutation = time.monotonic()
+        self.operations_sent += len(selections)
+
+        # Errors carry the alias of the mutation that failed in their path
+        errors: Dict[str, List[str]] = {}
+        for error in response.get("errors") or []:
+            path = error.get("path") or []
+            alias = path[0] if path else None
+            errors.setdefault(alias, []).append(error.get("message", "Unknown error"))
+
+        data = response.get("data") or {}
+        for index, result in enumerate(results):
+            if result.error is not None:
+                continue
+            alias = f"op{index}"
+            payload = data.get(alias)
+            if payload and payload.get("issue"):
+                result.issue_data = issue_node_to_gh_json(payload["issue"])
+            else:
+                messages = errors.get(alias) or errors.get(None) or ["No result"]
+                result.error = "; ".join(messages)
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get transport statistics"""
+        return {
+            "requests_sent": self.requests_sent,
+            "operations_sent": self.operations_sent,
+            "rate_limit_waits": self.rate_limit_waits,
+            "rate_limit_remaining": self.rate_limit_remaining,
+        }
@@ -13,10 +13,21 @@ import tempfile
 import time
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional
-
+from typing import Any, Dict, List, Optional, Tuple
+
+from github_batch import (
+    GitHubTransportError,
+    GitHubTransportUnavailableError,
+    GraphQLBatchTransport,
+    IssueOperation,
+    OperationResult,
+)
 from memory_parser import MemoryDocument, Task, TaskPriority, TaskStatus
 
+ISSUE_JSON_FIELDS = (
+    "id,number,title,body,state,labels,assignees,createdAt,updatedAt,htmlUrl"
+)
+
 
 @dataclass
 class GitHubIssue:
@@ -32,6 +43,7 @@ class GitHubIssue:
     updated_at: datetime
     html_url: str
     memory_task_id: Optional[str] = None
+    node_id: Optional[str] = None  # GraphQL ID, used by batched mutations
 
     @classmethod
     def from_gh_json(cls, issue_data: Dict[str, Any]) -> "GitHubIssue":
@@ -40,7 +52,7 @@ class GitHubIssue:
             number=issue_data["number"],
             title=issue_data["title"],
             body=issue_data.get("body", ""),
-            state=issue_data["state"],
+            state=issue_data["state"].lower(),
             labels=[label["name"] for label in issue_data.get("labels", [])],
             assignees=[
                 assignee["login"] for assignee in issue_data.get("assignees", [])
@@ -53,6 +65,7 @@ class GitHubIssue:
             ),
             html_url=issue_data["htmlUrl"],
             memory_task_id=cls._extract_memory_task_id(issue_data.get("body", "")),
+            node_id=issue_data.get("id"),
         )
 
     @staticmethod
@@ -70,6 +83,9 @@ class GitHubIntegration:
     # Default labels for memory-sync issues
     DEFAULT_LABELS = ["memory-sync", "ai-assistant"]
 
+    # Seconds between gh commands when GraphQL batching is unavailable
+    GH_FALLBACK_INTERVAL = 0.1
+
     # Issue templates
     TASK_ISSUE_TEMPLATE = """# Memory.md Task
 
@@ -91,10 +107,27 @@ This issue was automatically created from a Memory.md task to enable better proj
 <!-- memory-sync-metadata: {metadata} -->
 """
 
-    def __init__(self, repo_path: Optional[str] = None):
-        """Initialize GitHub integration"""
+    def __init__(
+        self,
+        repo_path: Optional[str] = None,
+        use_graphql: bool = True,
+        batch_size: int = 20,
+    ):
+        """Initialize GitHub integration
+
+        Args:
+            repo_path: Repository checkout to operate on
+            use_graphql: Apply batched operations as GraphQL mutations,
+                falling back to one ``gh issue`` command per operation
+            batch_size: Operations per GraphQL request
+        """
         self.repo_path = repo_path or os.getcwd()
         self._validate_gh_cli()
+        self.batch_transport: Optional[GraphQLBatchTransport] = (
+            GraphQLBatchTransport(self.repo_path, batch_size=batch_size)
+            if use_graphql
+            else None
+        )
 
     def _validate_gh_cli(self):
         """Validate GitHub CLI is available and authenticated"""
@@ -116,10 +149,42 @@ This issue was automatically created from a Memory.md task to enable better proj
         self, task: Task, additional_context: str = ""
     ) -> GitHubIssue:
         """Create GitHub issue from Memory.md task"""
-        # Generate issue title (truncate if too long)
-        title = self._generate_issue_title(task)
+        operation = self.plan_create(task, additional_context)
+
+        # Create issue using GitHub CLI
+        issue_data = self._create_gh_issue(
+            operation.title or "", operation.body or "", operation.labels
+        )
+
+        # Update task with issue number
+        task.issue_number = issue_data["number"]
+
+        return GitHubIssue.from_gh_json(issue_data)
+
+    def update_issue_from_task(
+        self, issue_number: int, task: Task, current_state: Optional[str] = None
+    ) -> GitHubIssue:
+        """Update existing GitHub issue from Memory.md task
 
-        # Generate issue body using template
+        When ``current_state`` is given the issue is only closed or reopened
+        if it is not already in the state the task calls for.
+        """
+        title, body = self._render_task(task)
+
+        # Update issue state based on task status
+        if task.status == TaskStatus.COMPLETED:
+            if current_state != "closed":
+                self._close_issue(issue_number)
+        elif current_state != "open":
+            self._reopen_issue(issue_number)
+
+        # Update issue content
+        issue_data = self._update_gh_issue(issue_number, title, body)
+
+        return GitHubIssue.from_gh_json(issue_data)
+
+    def _render_task(self, task: Task) -> Tuple[str, str]:
+        """Issue title and body for a task"""
         body = self.TASK_ISSUE_TEMPLATE.format(
             content=task.content,
             section=task.section,
@@ -129,48 +194,174 @@ This issue was automatically created from a Memory.md task to enable better proj
             task_id=task.id,
             metadata=json.dumps(task.metadata or {}),
         )
+        return self._generate_issue_title(task), body
 
+    def plan_create(self, task: Task, additional_context: str = "") -> IssueOperation:
+        """Operation creating the issue for a task"""
+        title, body = self._render_task(task)
         if additional_context:
             body += f"\n\n## Additional Context\n{additional_context}"
 
-        # Determine labels
         labels = self.DEFAULT_LABELS.copy()
         labels.append(f"priority:{task.priority.value}")
         if task.status == TaskStatus.COMPLETED:
             labels.append("completed")
 
-        # Create issue using GitHub CLI
-        issue_data = self._create_gh_issue(title, body, labels)
+        return IssueOperation(
+            task_id=task.id, kind="create", title=title, body=body, labels=labels
+        )
 
-        # Update task with issue number
-        task.issue_number = issue_data["number"]
+    def plan_update(
+        self, issue_number: int, task: Task, current_state: Optional[str] = None
+    ) -> IssueOperation:
+        """Operation rewriting an issue from its task, matching its state"""
+        title, body = self._render_task(task)
+        state = "closed" if task.status == TaskStatus.COMPLETED else "open"
+        return IssueOperation(
+            task_id=task.id,
+            kind="update",
+            title=title,
+            body=body,
+            issue_number=issue_number,
+            state=None if state == current_state else state,
+        )
 
-        return GitHubIssue.from_gh_json(issue_data)
+    def apply_operations(
+        self,
+        operations: List[IssueOperation],
+        node_ids: Optional[Dict[int, str]] = None,
+    ) -> List[OperationResult]:
+        """Apply issue operations, batched through GraphQL when possible
 
-    def update_issue_from_task(self, issue_number: int, task: Task) -> GitHubIssue:
-        """Update existing GitHub issue from Memory.md task"""
-        title = self._generate_issue_title(task)
+        Args:
+            operations: Operations to apply, in order
+            node_ids: Known GraphQL IDs of the issues involved, by number
 
-        body = self.TASK_ISSUE_TEMPLATE.format(
-            content=task.content,
-            section=task.section,
-            priority=task.priority.value.title(),
-            status=task.status.value.replace("_", " ").title(),
-            line_number=task.line_number,
-            task_id=task.id,
-            metadata=json.dumps(task.metadata or {}),
+        Returns:
+            One result per operation, in order, each carrying its error
+        """
+        results: List[OperationResult] = []
+        pending = operations
+
+        if self.batch_transport is not None and operations:
+            try:
+                results = self.batch_transport.execute(operations, node_ids)
+                pending = []
+            except GitHubTransportUnavailableError as e:
+                # Stay on gh for the rest of this process
+                print(f"GraphQL batching unavailable, falling back to gh: {e}")
+                self.batch_transport = None
+                results = list(e.completed)
+                pending = operations[len(results) :]
+            except GitHubTransportError as e:
+                # Rate limits and failed requests stop the sync: replaying
+                # through gh would burst past the limit or duplicate issues
+                print(f"GitHub sync stopped: {e}")
+                return self._results_after_failure(operations, e)
+
+        for index, operation in enumerate(pending):
+            if index:
+                # Small delay to avoid rate limiting
+                time.sleep(self.GH_FALLBACK_INTERVAL)
+            results.append(self._apply_with_gh(operation))
+        return results
+
+    def _results_after_failure(
+        self, operations: List[IssueOperation], error: GitHubTransportError
+    ) -> List[OperationResult]:
+        """Results of a batch sync stopped by ``error``
+
+        Creates GitHub may have applied are looked up by their task ID, so
+        they are reported instead of being created again by the next sync.
+        Everything else not completed is reported as failed.
+        """
+        results = list(error.completed)
+        in_flight = {id(operation) for operation in error.in_flight}
+        creates = [op for op in error.in_flight if op.kind == "create"]
+        created: Optional[Dict[str, Dict[str, Any]]] = None
+        if creates:
+            try:
+                created = self._find_recent_memory_issues(max(100, 2 * len(creates)))
+            except Exception as e:
+                print(f"Could not check for issues created before the failure: {e}")
+
+        for operation in operations[len(results) :]:
+            if id(operation) not in in_flight:
+                results.append(
+                    OperationResult(operation, error=f"Not applied: {error}")
+                )
+            elif operation.kind == "create" and created is not None:
+                issue_data = created.get(operation.task_id)
+                results.append(
+                    OperationResult(operation, issue_data=issue_data)
+                    if issue_data is not None
+                    else OperationResult(operation, error=f"Not applied: {error}")
+                )
+            else:
+                results.append(
+                    OperationResult(
+                        operation, error=f"Outcome unknown, not retried: {error}"
+                    )
+                )
+        return results
+
+    def _find_recent_memory_issues(self, limit: int = 100) -> Dict[str, Dict[str, Any]]:
+        """Most recently created memory issues in gh JSON, by task ID"""
+        result = subprocess.run(
+            [
+                "gh",
+                "issue",
+                "list",
+                "--label",
+                "memory-sync",
+                "--state",
+                "all",
+                "--search",
+                "sort:created-desc",
+                "--limit",
+                str(limit),
+                "--json",
+                ISSUE_JSON_FIELDS,
+            ],
+            capture_output=True,
+            text=True,
+            cwd=self.repo_path,
         )
+        if result.returncode != 0:
+            raise RuntimeError(f"Failed to list issues: {result.stderr}")
 
-        # Update issue state based on task status
-        if task.status == TaskStatus.COMPLETED:
-            self._close_issue(issue_number)
-        else:
-            self._reopen_issue(issue_number)
+        issues = {}
+        for issue_data in json.loads(result.stdout):
+            task_id = GitHubIssue._extract_memory_task_id(issue_data.get("body", ""))
+            if task_id and task_id not in issues:
+                issues[task_id] = issue_data
+        return issues
 
-        # Update issue content
-        issue_data = self._update_gh_issue(issue_number, title, body)
+    def _apply_with_gh(self, operation: IssueOperation) -> OperationResult:
+        """Apply one operation with gh issue commands"""
+        try:
+            if operation.kind == "create":
+                issue_data = self._create_gh_issue(
+                    operation.title or "", operation.body or "", operation.labels
+                )
+                return OperationResult(operation, issue_data=issue_data)
+
+            if operation.issue_number is None:
+                raise ValueError("Operation has no issue number")
+            if operation.kind == "close" or operation.state == "closed":
+                self._close_issue(operation.issue_number)
+            elif operation.state == "open":
+                self._reopen_issue(operation.issue_number)
+            if operation.kind == "close":
+                return OperationResult(operation)
+
+            issue_data = self._update_gh_issue(
+                operation.issue_number, operation.title or "", operation.body or ""
+            )
+            return OperationResult(operation, issue_data=issue_data)
 
-        return GitHubIssue.from_gh_json(issue_data)
+        except Exception as e:
+            return OperationResult(operation, error=str(e))
 
     def get_all_memory_issues(self) -> List[GitHubIssue]:
         """Get all GitHub issues with memory-sync label"""
@@ -182,7 +373,7 @@ This issue was automatically created from a Memory.md task to enable better proj
                 "--label",
                 "memory-sync",
                 "--json",
-                "number,title,body,state,labels,assignees,createdAt,updatedAt,htmlUrl",
+                ISSUE_JSON_FIELDS,
             ]
 
             result = subprocess.run(
@@ -208,7 +399,7 @@ This issue was automatically created from a Memory.md task to enable better proj
                 "view",
                 str(issue_number),
                 "--json",
-                "number,title,body,state,labels,assignees,createdAt,updatedAt,htmlUrl",
+                ISSUE_JSON_FIELDS,
             ]
 
             result = subprocess.run(
@@ -226,15 +417,21 @@ This issue was automatically created from a Memory.md task to enable better proj
 
     def close_completed_tasks(self, tasks: List[Task]) -> List[int]:
         """Close GitHub issues for completed tasks"""
-        closed_issues = []
+        operations = [
+            IssueOperation(
+                task_id=task.id, kind="close", issue_number=task.issue_number
+            )
+            for task in tasks
+            if task.status == TaskStatus.COMPLETED and task.issue_number
+        ]
 
-        for task in tasks:
-            if task.status == TaskStatus.COMPLETED and task.issue_number:
-                try:
-                    self._close_issue(task.issue_number)
-                    closed_issues.append(task.issue_number)
-                except Exception as e:
-                    print(f"Failed to close issue #{task.issue_number}: {e}")
+        closed_issues = []
+        for result in self.apply_operations(operations):
+            number = result.operation.issue_number
+            if result.success and number is not None:
+                closed_issues.append(number)
+            else:
+                print(f"Failed to close issue #{number}: {result.error}")
 
         return closed_issues
 
@@ -254,25 +451,32 @@ This issue was automatically created from a Memory.md task to enable better proj
             if issue.memory_task_id
         }
 
-        for task in memory_doc.tasks:
-            try:
-                if task.id in existing_issues:
-                    # Update existing issue
-                    issue = existing_issues[task.id]
-                    self.update_issue_from_task(issue.number, task)
-                    sync_stats["updated_issues"] += 1
-                else:
-                    # Create new issue
-                    self.create_issue_from_task(task)
-                    sync_stats["created_issues"] += 1
-
-                # Small delay to avoid rate limiting
-                time.sleep(0.1)
+        operations = [
+            self.plan_update(
+                existing_issues[task.id].number,
+                task,
+                current_state=existing_issues[task.id].state,
+            )
+            if task.id in existing_issues
+            else self.plan_create(task)
+            for task in memory_doc.tasks
+        ]
+        node_ids = {
+            issue.number: issue.node_id
+            for issue in existing_issues.values()
+            if issue.node_id
+        }
 
-            except Exception as e:
-                error_msg = f"Failed to sync task {task.id}: {e}"
+        for result in self.apply_operations(operations, node_ids):
+            operation = result.operation
+            if not result.success:
+                error_msg = f"Failed to sync task {operation.task_id}: {result.error}"
                 sync_stats["errors"].append(error_msg)
                 print(error_msg)
+            elif operation.kind == "create":
+                sync_stats["created_issues"] += 1
+            else:
+                sync_stats["updated_issues"] += 1
 
         return sync_stats
 
@@ -312,7 +516,7 @@ This issue was automatically created from a Memory.md task to enable better proj
                 "--label",
                 ",".join(labels),
                 "--json",
-                "number,title,body,state,labels,assignees,createdAt,updatedAt,htmlUrl",
+                ISSUE_JSON_FIELDS,
             ]
 
             result = subprocess.run(
@@ -346,7 +550,7 @@ This issue was automatically created from a Memory.md task to enable better proj
                 "--body-file",
                 body_file,
                 "--json",
-                "number,title,body,state,labels,assignees,createdAt,updatedAt,htmlUrl",
+                ISSUE_JSON_FIELDS,
             ]
 
             result = subprocess.run(
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Memory Archive - Append-only, indexed store of compacted Memory.md items
+
+Items archived by the MemoryCompactor are appended as JSON lines to segment
+files that are never rewritten, and a small index records each item's
+date, section, keywords, source hash and byte position. Queries read only
+the index and then seek to the matching items, so agents can recall
+relevant history without loading the whole archive.
+
+Layout, next to LongTermMemoryDetails.md:
+    LongTermMemoryDetails/segment-000001.jsonl
+    LongTermMemoryDetails/index.jsonl
+
+Usage:
+    python3 .github/memory-manager/memory_archive.py query "parser" [--section S]
+    python3 .github/memory-manager/memory_archive.py import LongTermMemoryDetails.md
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Words too common in memory items to be useful keywords
+STOPWORDS = frozenset(
+    "the and for with from that this into was were are has have had not but "
+    "all any can our out its via per now new old also been being when then "
+    "than them they will would should could after before over under more "
+    "most some such only each about added fixed done completed item items".split()
+)
+
+KEYWORD_PATTERN = re.compile(r"#\d+|[^\W\d_][\w-]{2,}")
+ITEM_START_PATTERN = re.compile(r"^(?:[-*+•]|\d+\.)\s+")
+ARCHIVE_HEADER_PATTERN = re.compile(r"^## Memory Compaction Archive - (.+)$")
+
+
+def source_hash(text: str) -> str:
+    """Stable ID of an archived item, from its whitespace-normalized text"""
+    normalized = " ".join(text.split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+def extract_keywords(text: str, limit: int = 12) -> List[str]:
+    """Most frequent distinctive words and all issue references in an item"""
+    counts: Counter = Counter()
+    refs = []
+    for match in KEYWORD_PATTERN.finditer(text.lower()):
+        word = match.group().strip("-")
+        if word.startswith("#"):
+            if word not in refs:
+                refs.append(word)
+        elif word not in STOPWORDS:
+            counts[word] += 1
+    words = sorted(counts, key=lambda word: (-counts[word], word))[:limit]
+    return refs + words
+
+
+@dataclass
+class ArchivedItem:
+    """An archived Memory.md item with its index metadata"""
+
+    id: str
+    section: str
+    text: str
+    date: Optional[str] = None
+    archived_at: Optional[str] = None
+    keywords: List[str] = field(default_factory=list)
+    score: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class IndexEntry:
+    """Index record pointing at one item in a segment"""
+
+    id: str
+    segment: str
+    offset: int
+    length: int
+    section: str
+    date: Optional[str]
+    archived_at: Optional[str]
+    keywords: List[str]
+
+
+class MemoryArchive:
+    """Append-only segmented store of archived memory items"""
+
+    INDEX_NAME = "index.jsonl"
+    SEGMENT_PATTERN = "segment-{:06d}.jsonl"
+
+    def __init__(self, archive_dir: str, max_segment_bytes: int = 1024 * 1024):
+        """
+        Open an archive; nothing is created until the first append
+
+        Args:
+            archive_dir: Directory holding the segments and index
+            max_segment_bytes: Size after which a new segment is started
+        """
+        self.archive_dir = Path(archive_dir)
+        self.index_path = self.archive_dir / self.INDEX_NAME
+        self.max_segment_bytes = max_segment_bytes
+
+        # Parsed index, reused while the index file is unchanged
+        self._index: List[IndexEntry] = []
+        self._index_stamp: Optional[Tuple[int, int]] = None
+
+    def append(
+        self,
+        items: Iterable[Tuple[str, str, Optional[str]]],
+        archived_at: Optional[str] = None,
+    ) -> List[str]:
+        """
+        Append items, skipping any already archived
+
+        Items are written to the current segment before their index entries,
+        so the index never points at missing data; a torn trailing line is
+        ignored on read.
+
+        Args:
+            items: (section, text, item date as YYYY-MM-DD or None)
+            archived_at: Archive time (default: now)
+
+        Returns:
+            IDs of the items appended, in order
+        """
+        archived_at = archived_at or datetime.now().isoformat()
+        known = {entry.id for entry in self._load_index()}
+
+        records = []
+        for section, text, date in items:
+            item_id = source_hash(text)
+            if item_id in known:
+                continue
+            known.add(item_id)
+            records.append(
+                {
+                    "id": item_id,
+                    "section": section,
+                    "date": date,
+                    "archived_at": archived_at,
+                    "text": text,
+                }
+            )
+        if not records:
+            return []
+
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        segment = self._current_segment()
+        entries = []
+        with open(segment, "ab") as f:
+            offset = f.seek(0, os.SEEK_END)
+            for record in records:
+                line = json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+                f.write(line)
+                entries.append(
+                    IndexEntry(
+                        id=record["id"],
+                        segment=segment.name,
+                        offset=offset,
+                        length=len(line),
+                        section=record["section"],
+                        date=record["date"],
+                        archived_at=archived_at,
+                        keywords=extract_keywords(record["text"]),
+                    )
+                )
+                offset += len(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+        with open(self.index_path, "ab") as f:
+            # Start on a fresh line if an earlier append was torn
+            if f.seek(0, os.SEEK_END) and not self._ends_with_newline():
+                f.write(b"\n")
+            f.writelines(
+                json.dumps(asdict(entry)).encode("utf-8") + b"\n" for entry in entries
+            )
+            f.flush()
+            os.fsync(f.fileno())
+
+        return [record["id"] for record in records]
+
+    def query(
+        self,
+        text: Optional[str] = None,
+        section: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: int = 10,
+    ) -> List[ArchivedItem]:
+        """
+        Find archived items using the index
+
+        Query words match the start of an item's keywords or section name;
+        items matching more words rank first, then newer items. Only the
+        returned items are read from the segments.
+
+        Args:
+            text: Words to look for (default: every item)
+            section: Only items from this Memory.md section
+            since: Only items dated on or after this YYYY-MM-DD date
+            until: Only items dated on or before this YYYY-MM-DD date
+            limit: Maximum number of items
+
+        Returns:
+            Matching items, best first
+        """
+        terms = KEYWORD_PATTERN.findall((text or "").lower())
+        section_name = section.lower() if section else None
+
+        scored = []
+        for entry in self._load_index():
+            if section_name and entry.section.lower() != section_name:
+                continue
+            date = entry.date or (entry.archived_at or "")[:10]
+            if (since and date < since) or (until and date > until):
+                continue
+
+            score = 0.0
+            if terms:
+                words = entry.keywords + entry.section.lower().split()
+                hits = sum(any(w.startswith(t) for w in words) for t in terms)
+                if not hits:
+                    continue
+                score = hits / len(terms)
+            scored.append((score, date, entry))
+
+        scored.sort(key=lambda item: (item[0], item[1]), reverse=True)
+        return [self._read_item(entry, score) for score, _, entry in scored[:limit]]
+
+    def recall(
+        self,
+        text: Optional[str] = None,
+        section: Optional[str] = None,
+        limit: int = 5,
+        max_chars: int = 4000,
+    ) -> str:
+        """
+        Matching items as a Markdown excerpt sized for an agent prompt
+
+        Args:
+            text: Words to look for
+            section: Only items from this Memory.md section
+            limit: Maximum number of items
+            max_chars: Length at which the excerpt is cut off
+
+        Returns:
+            Markdown list of items with their section and date, or ""
+        """
+        lines = []
+        size = 0
+        for item in self.query(text, section=section, limit=limit):
+            line = f"- [{item.section}, {item.date or item.archived_at[:10]}] "
+            line += item.text.lstrip("-*+• ").strip()
+            if size + len(line) > max_chars:
+                break
+            lines.append(line)
+            size += len(line) + 1
+        return "\n".join(lines)
+
+    def import_markdown(self, details_path: str, section: str = "Archived") -> int:
+        """
+        Import items from a LongTermMemoryDetails.md written before the index
+
+        Items under "Memory Compaction Archive" headers are appended with the
+        header's time; already archived items are skipped, so importing
+        again is harmless.
+
+        Returns:
+            Number of items appended
+        """
+        with open(details_path, "r", encoding="utf-8") as f:
+            lines = f.read().split("\n")
+
+        imported = 0
+        batch: List[Tuple[str, str, Optional[str]]] = []
+        archived_at = None
+        current: List[str] = []
+
+        def finish_item():
+            if current:
+                batch.append((section, "\n".join(current).rstrip(), None))
+                current.clear()
+
+        for line in lines + ["## end"]:
+            header = ARCHIVE_HEADER_PATTERN.match(line)
+            if header or line.startswith("#"):
+                finish_item()
+                if batch and archived_at:
+                    imported += len(self.append(batch, archived_at))
+                batch = []
+                archived_at = header.group(1).strip() if header else None
+            elif not archived_at or not line.strip():
+                continue
+            elif ITEM_START_PATTERN.match(line):
+                finish_item()
+                current.append(line)
+            elif current and line[0].isspace():
+                current.append(line)
+            else:
+                finish_item()
+
+        return imported
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get archive statistics"""
+        index = self._load_index()
+        segments = sorted(self.archive_dir.glob("segment-*.jsonl"))
+        return {
+            "archive_dir": str(self.archive_dir),
+            "items": len(index),
+            "segments": len(segments),
+            "segment_bytes": sum(path.stat().st_size for path in segments),
+            "index_bytes": self.index_path.stat().st_size
+            if self.index_path.exists()
+            else 0,
+            "sections": dict(Counter(entry.section for entry in index)),
+        }
+
+    def _load_index(self) -> List[IndexEntry]:
+        """Parse the index, skipping torn or malformed lines"""
+        try:
+            stat = self.index_path.stat()
+        except FileNotFoundError:
+            return []
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._index_stamp:
+            return self._index
+
+        index = []
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    index.append(IndexEntry(**json.loads(line)))
+                except (ValueError, TypeError):
+                    continue
+        self._index, self._index_stamp = index, stamp
+        return index
+
+    def _read_item(self, entry: IndexEntry, score: float) -> ArchivedItem:
+        with open(self.archive_dir / entry.segment, "rb") as f:
+            f.seek(entry.offset)
+            record = json.loads(f.read(entry.length))
+        return ArchivedItem(
+            id=entry.id,
+            section=entry.section,
+            text=record["text"],
+            date=entry.date,
+            archived_at=entry.archived_at,
+            keywords=entry.keywords,
+            score=score,
+        )
+
+    def _current_segment(self) -> Path:
+        """Last segment, or a new one once it is full"""
+        segments = sorted(self.archive_dir.glob("segment-*.jsonl"))
+        if segments and segments[-1].stat().st_size < self.max_segment_bytes:
+            return segments[-1]
+        number = int(segments[-1].stem.split("-")[1]) + 1 if segments else 1
+        return self.archive_dir / self.SEGMENT_PATTERN.format(number)
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.index_path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+
+def main():
+    """Query or import the memory archive"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--archive-dir",
+        default=".github/LongTermMemoryDetails",
+        help="Archive directory (default: .github/LongTermMemoryDetails)",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    query_parser = subparsers.add_parser("query", help="Find archived items")
+    query_parser.add_argument("text", nargs="?", help="Words to look for")
+    query_parser.add_argument("--section", help="Only items from this section")
+    query_parser.add_argument("--since", help="Only items dated on or after")
+    query_parser.add_argument("--until", help="Only items dated on or before")
+    query_parser.add_argument("--limit", type=int, default=10, help="Maximum items")
+    query_parser.add_argument("--json", action="store_true", help="Output JSON")
+
+    import_parser = subparsers.add_parser(
+        "import", help="Index items from an existing LongTermMemoryDetails.md"
+    )
+    import_parser.add_argument("details_file", help="LongTermMemoryDetails.md path")
+
+    subparsers.add_parser("stats", help="Show archive statistics")
+
+    args = parser.parse_args()
+    archive = MemoryArchive(args.archive_dir)
+
+    if args.command == "query":
+        items = archive.query(
+            args.text,
+            section=args.section,
+            since=args.since,
+            until=args.until,
+            limit=args.limit,
+        )
+        if args.json:
+            print(json.dumps([item.to_dict() for item in items], indent=2))
+        else:
+            for item in items:
+                print(f"[{item.section}] {item.date or item.archived_at} ({item.id})")
+                print(item.text)
+                print()
+            print(f"{len(items)} archived items")
+    elif args.command == "import":
+        imported = archive.import_markdown(args.details_file)
+        print(f"Imported {imported} archived items into {archive.archive_dir}")
+    else:
+        print(json.dumps(archive.get_stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,575 @@
+#!/usr/bin/env python3
+"""
+Memory Comment Cache - Local SQLite copy of the Project Memory issue
+
+This module keeps parsed Project Memory comments in an on-disk SQLite
+database keyed by comment ID, so SimpleMemoryManager reads are served
+locally and only comments created or edited since the last refresh are
+downloaded and parsed again. A full-text index over the parsed comments,
+maintained with the same incremental updates, serves memory searches.
+Comments archived off the memory issue stay in a manifest table, so they
+remain searchable and can be resolved to the digest that holds them.
+"""
+
+import json
+import re
+import sqlite3
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS comments (
+    issue_number INTEGER NOT NULL,
+    comment_id TEXT NOT NULL,
+    created_at TEXT,
+    updated_at TEXT,
+    author TEXT,
+    section TEXT,
+    parsed TEXT,
+    PRIMARY KEY (issue_number, comment_id)
+);
+CREATE INDEX IF NOT EXISTS comments_by_section
+    ON comments (issue_number, section, created_at);
+CREATE INDEX IF NOT EXISTS comments_by_time
+    ON comments (issue_number, created_at);
+CREATE TABLE IF NOT EXISTS archived_comments (
+    issue_number INTEGER NOT NULL,
+    comment_id TEXT NOT NULL,
+    created_at TEXT,
+    author TEXT,
+    section TEXT,
+    parsed TEXT,
+    period TEXT,
+    archive_issue INTEGER,
+    digest_url TEXT,
+    archived_at TEXT,
+    deleted INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (issue_number, comment_id)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    issue_number INTEGER NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT,
+    PRIMARY KEY (issue_number, key)
+);
+"""
+
+# Full-text index of memory updates; prefix indexes speed up prefix queries
+SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS comment_search USING fts5(
+    content,
+    related,
+    issue_number UNINDEXED,
+    comment_id UNINDEXED,
+    section UNINDEXED,
+    agent UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+"""
+
+# Parses a comment body; None for comments that are not memory updates
+CommentParser = Callable[[str], Optional[Dict[str, Any]]]
+
+
+class MemoryCommentCache:
+    """SQLite cache of parsed memory comments for one issue"""
+
+    def __init__(self, db_path: str, issue_number: int):
+        """Open or create the cache
+
+        Args:
+            db_path: SQLite database file, created with its directory
+            issue_number: Memory issue whose comments are cached
+        """
+        self.db_path = Path(db_path)
+        self.issue_number = issue_number
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.executescript(SCHEMA)
+
+        # SQLite builds without FTS5 fall back to scanning cached comments
+        try:
+            self.conn.executescript(SEARCH_SCHEMA)
+            self.search_enabled = True
+        except sqlite3.OperationalError:
+            self.search_enabled = False
+        self.conn.commit()
+
+        # Cache statistics
+        self.comments_parsed = 0
+        self.comments_unchanged = 0
+        self.full_refreshes = 0
+
+        if self.search_enabled:
+            self._sync_search_index()
+
+    def close(self):
+        """Close the database"""
+        self.conn.close()
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute(
+            "SELECT value FROM meta WHERE issue_number = ? AND key = ?",
+            (self.issue_number, key),
+        ).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: Optional[str]):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (issue_number, key, value) "
+                "VALUES (?, ?, ?)",
+                (self.issue_number, key, value),
+            )
+
+    def watermark(self) -> Optional[str]:
+        """Latest comment ``updatedAt`` in the cache, for ``since`` queries"""
+        row = self.conn.execute(
+            "SELECT MAX(updated_at) FROM comments WHERE issue_number = ?",
+            (self.issue_number,),
+        ).fetchone()
+        return row[0]
+
+    def count(self) -> int:
+        """Number of comments on the issue, memory updates or not
+
+        Archived comments whose deletion is still pending are counted.
+        """
+        row = self.conn.execute(
+            "SELECT (SELECT COUNT(*) FROM comments WHERE issue_number = ?) + "
+            "(SELECT COUNT(*) FROM archived_comments "
+            "WHERE issue_number = ? AND deleted = 0)",
+            (self.issue_number, self.issue_number),
+        ).fetchone()
+        return row[0]
+
+    def upsert(self, comments: Iterable[Dict[str, Any]], parse: CommentParser) -> int:
+        """Store comments in ``gh --json comments`` shape
+
+        Comments whose ``updatedAt`` matches the cached copy, and archived
+        comments not yet deleted from the issue, are not parsed again.
+
+        Returns:
+            Number of comments parsed
+        """
+        known = dict(
+            self.conn.execute(
+                "SELECT comment_id, updated_at FROM comments WHERE issue_number = ?",
+                (self.issue_number,),
+            ).fetchall()
+        )
+        archived = self._archived_ids()
+
+        rows = []
+        for comment in comments:
+            comment_id = str(comment["id"])
+            updated_at = comment.get("updatedAt") or comment.get("createdAt")
+            if comment_id in archived or (
+                comment_id in known and known[comment_id] == updated_at
+            ):
+                self.comments_unchanged += 1
+                continue
+
+            parsed = parse(comment.get("body", ""))
+            rows.append(
+                (
+                    self.issue_number,
+                    comment_id,
+                    comment.get("createdAt"),
+                    updated_at,
+                    (comment.get("author") or {}).get("login", "unknown"),
+                    parsed.get("section", "uncategorized") if parsed else None,
+                    json.dumps(parsed) if parsed else None,
+                )
+            )
+
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO comments (issue_number, comment_id, "
+                "created_at, updated_at, author, section, parsed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._index(
+                [(row[1], row[6]) for row in rows],
+                stale=[row[1] for row in rows if row[1] in known],
+            )
+        self.comments_parsed += len(rows)
+        return len(rows)
+
+    def replace_all(
+        self, comments: Iterable[Dict[str, Any]], parse: CommentParser
+    ) -> int:
+        """Store the complete comment list, dropping deleted comments
+
+        Returns:
+            Number of comments parsed
+        """
+        comments = list(comments)
+        parsed = self.upsert(comments, parse)
+
+        current = {str(comment["id"]) for comment in comments}
+        cached = [
+            row[0]
+            for row in self.conn.execute(
+                "SELECT comment_id FROM comments WHERE issue_number = ?",
+                (self.issue_number,),
+            )
+        ]
+        deleted = [c for c in cached if c not in current]
+        with self.conn:
+            self.conn.executemany(
+                "DELETE FROM comments WHERE issue_number = ? AND comment_id = ?",
+                [(self.issue_number, c) for c in deleted],
+            )
+            self._index([], stale=deleted)
+        self.mark_deleted(c for c in self.pending_deletions() if c not in current)
+        self.full_refreshes += 1
+        return parsed
+
+    def archive(
+        self,
+        entries: Iterable[Tuple[Dict[str, Any], Dict[str, Any]]],
+        period: str,
+        archive_issue: int,
+        digest_url: Optional[str],
+        archived_at: Optional[str] = None,
+    ) -> int:
+        """Record comments copied into an archive digest
+
+        The comments leave the cached memory issue but stay searchable.
+        They count as still on the issue until ``mark_deleted``.
+
+        Args:
+            entries: (comment in ``gh --json comments`` shape, parsed comment)
+            period: Archive period, e.g. ``2025-01``
+            archive_issue: Issue holding the digest
+            digest_url: Digest comment URL
+            archived_at: Archive time (default: None)
+
+        Returns:
+            Number of comments recorded
+        """
+        rows = [
+            (
+                self.issue_number,
+                str(comment["id"]),
+                comment.get("createdAt"),
+                (comment.get("author") or {}).get("login", "unknown"),
+                parsed.get("section", "uncategorized"),
+                json.dumps(parsed),
+                period,
+                archive_issue,
+                digest_url,
+                archived_at,
+            )
+            for comment, parsed in entries
+        ]
+        ids = [row[1] for row in rows]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO archived_comments (issue_number, "
+                "comment_id, created_at, author, section, parsed, period, "
+                "archive_issue, digest_url, archived_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self.conn.executemany(
+                "DELETE FROM comments WHERE issue_number = ? AND comment_id = ?",
+                [(self.issue_number, comment_id) for comment_id in ids],
+            )
+            self._index([(row[1], row[5]) for row in rows], stale=ids)
+        return len(rows)
+
+    def pending_deletions(self) -> List[str]:
+        """Archived comments not yet deleted from the memory issue"""
+        return [
+            row[0]
+            for row in self.conn.execute(
+                "SELECT comment_id FROM archived_comments "
+                "WHERE issue_number = ? AND deleted = 0",
+                (self.issue_number,),
+            )
+        ]
+
+    def mark_deleted(self, comment_ids: Iterable[str]):
+        """Record archived comments as deleted from the memory issue"""
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE archived_comments SET deleted = 1 "
+                "WHERE issue_number = ? AND comment_id = ?",
+                [(self.issue_number, comment_id) for comment_id in comment_ids],
+            )
+
+    def resolve(self, comment_id: str) -> Optional[Dict[str, Any]]:
+        """Where an archived comment went, None if it was not archived"""
+        row = self.conn.execute(
+            "SELECT parsed, created_at, author, period, archive_issue, "
+            "digest_url, archived_at, deleted FROM archived_comments "
+            "WHERE issue_number = ? AND comment_id = ?",
+            (self.issue_number, comment_id),
+        ).fetchone()
+        if row is None:
+            return None
+        parsed, created_at, author, period, issue, url, archived_at, deleted = row
+        return {
+            "comment_id": comment_id,
+            "created_at": created_at,
+            "author": author,
+            "period": period,
+            "archive_issue": issue,
+            "digest_url": url,
+            "archived_at": archived_at,
+            "deleted": bool(deleted),
+            "update": json.loads(parsed),
+        }
+
+    def _archived_ids(self) -> Set[str]:
+        return {
+            row[0]
+            for row in self.conn.execute(
+                "SELECT comment_id FROM archived_comments WHERE issue_number = ?",
+                (self.issue_number,),
+            )
+        }
+
+    def updates(
+        self, section: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """Parsed memory updates in comment order
+
+        Args:
+            section: Only updates from this section
+            limit: Only the most recent updates
+
+        Returns:
+            (parsed comment, comment details) pairs, oldest first
+        """
+        query = (
+            "SELECT parsed, comment_id, created_at, author FROM comments "
+            "WHERE issue_number = ? AND parsed IS NOT NULL"
+        )
+        params: List[Any] = [self.issue_number]
+        if section is not None:
+            query += " AND section = ?"
+            params.append(section)
+        query += " ORDER BY created_at DESC, rowid DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        rows = self.conn.execute(query, params).fetchall()
+        return [
+            (
+                json.loads(parsed),
+                {"comment_id": comment_id, "created_at": created_at, "author": author},
+            )
+            for parsed, comment_id, created_at, author in reversed(rows)
+        ]
+
+    def _index(
+        self, entries: List[Tuple[str, Optional[str]]], stale: Iterable[str] = ()
+    ):
+        """Add comments to the search index after removing stale ones
+
+        Args:
+            entries: (comment ID, parsed JSON) to index; None is skipped
+            stale: Comment IDs whose index rows are removed first
+        """
+        if not self.search_enabled:
+            return
+        self.conn.executemany(
+            "DELETE FROM comment_search WHERE issue_number = ? AND comment_id = ?",
+            [(self.issue_number, comment_id) for comment_id in stale],
+        )
+        rows = []
+        for comment_id, parsed_json in entries:
+            if parsed_json is None:
+                continue
+            parsed = json.loads(parsed_json)
+            related = parsed.get("related_issues", []) + parsed.get("related_prs", [])
+            rows.append(
+                (
+                    parsed.get("content", ""),
+                    " ".join(f"#{number}" for number in related),
+                    self.issue_number,
+                    comment_id,
+                    parsed.get("section", "uncategorized"),
+                    parsed.get("agent", "unknown"),
+                )
+            )
+        self.conn.executemany(
+            "INSERT INTO comment_search (content, related, issue_number, "
+            "comment_id, section, agent) VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    def _sync_search_index(self):
+        """Index comments cached before the search index existed"""
+        indexed = self.conn.execute(
+            "SELECT COUNT(*) FROM comment_search WHERE issue_number = ?",
+            (self.issue_number,),
+        ).fetchone()[0]
+        cached = self.conn.execute(
+            "SELECT comment_id, parsed FROM comments "
+            "WHERE issue_number = ? AND parsed IS NOT NULL "
+            "UNION ALL SELECT comment_id, parsed FROM archived_comments "
+            "WHERE issue_number = ?",
+            (self.issue_number, self.issue_number),
+        ).fetchall()
+        if indexed != len(cached):
+            with self.conn:
+                self.conn.execute(
+                    "DELETE FROM comment_search WHERE issue_number = ?",
+                    (self.issue_number,),
+                )
+                self._index(cached)
+
+    def search(
+        self,
+        query: str,
+        section: Optional[str] = None,
+        agent: Optional[str] = None,
+        limit: int = 20,
+    ) -> List[Tuple[Dict[str, Any], Dict[str, Any], float]]:
+        """Full-text search of cached memory updates
+
+        Every word of the query must match the start of a word in the
+        update's content or related references, in any order. Archived
+        updates are included, with an ``archived`` entry in their details.
+
+        Args:
+            query: Words to look for
+            section: Only updates from this section
+            agent: Only updates added by this agent
+            limit: Maximum number of results
+
+        Returns:
+            (parsed comment, comment details, score) triples, best first
+        """
+        terms = [term.lower() for term in re.findall(r"\w+", query)]
+        if not terms:
+            return []
+        if not self.search_enabled:
+            return self._scan(terms, section, agent, limit)
+
+        sql = (
+            "SELECT COALESCE(c.parsed, a.parsed), s.comment_id, "
+            "COALESCE(c.created_at, a.created_at), COALESCE(c.author, a.author), "
+            "a.period, a.archive_issue, a.digest_url, "
+            "bm25(comment_search) AS rank FROM comment_search s "
+            "LEFT JOIN comments c ON c.issue_number = s.issue_number "
+            "AND c.comment_id = s.comment_id "
+            "LEFT JOIN archived_comments a ON a.issue_number = s.issue_number "
+            "AND a.comment_id = s.comment_id "
+            "WHERE comment_search MATCH ? AND s.issue_number = ? "
+            "AND COALESCE(c.parsed, a.parsed) IS NOT NULL"
+        )
+        params: List[Any] = [
+            " ".join(f'"{term}"*' for term in terms),
+            self.issue_number,
+        ]
+        if section is not None:
+            sql += " AND s.section = ?"
+            params.append(section)
+        if agent is not None:
+            sql += " AND s.agent = ?"
+            params.append(agent)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+
+        results = []
+        for row in self.conn.execute(sql, params):
+            parsed, comment_id, created_at, author, period, issue, url, rank = row
+            details = {
+                "comment_id": comment_id,
+                "created_at": created_at,
+                "author": author,
+            }
+            if issue is not None:
+                details["archived"] = _archive_location(period, issue, url)
+            results.append((json.loads(parsed), details, -rank))
+        return results
+
+    def _archived_updates(
+        self, section: Optional[str] = None
+    ) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """Archived memory updates with their archive location"""
+        query = (
+            "SELECT parsed, comment_id, created_at, author, period, "
+            "archive_issue, digest_url FROM archived_comments WHERE issue_number = ?"
+        )
+        params: List[Any] = [self.issue_number]
+        if section is not None:
+            query += " AND section = ?"
+            params.append(section)
+
+        return [
+            (
+                json.loads(parsed),
+                {
+                    "comment_id": comment_id,
+                    "created_at": created_at,
+                    "author": author,
+                    "archived": _archive_location(period, issue, url),
+                },
+            )
+            for parsed, comment_id, created_at, author, period, issue, url in (
+                self.conn.execute(query + " ORDER BY created_at", params)
+            )
+        ]
+
+    def _scan(
+        self,
+        terms: List[str],
+        section: Optional[str],
+        agent: Optional[str],
+        limit: int,
+    ) -> List[Tuple[Dict[str, Any], Dict[str, Any], float]]:
+        """Search without FTS5, scoring updates by matching word count"""
+        results = []
+        candidates = self._archived_updates(section) + self.updates(section=section)
+        for parsed, details in candidates:
+            if agent is not None and parsed.get("agent") != agent:
+                continue
+            related = parsed.get("related_issues", []) + parsed.get("related_prs", [])
+            words = re.findall(r"\w+", f"{parsed.get('content', '')} {related}".lower())
+            hits = [sum(w.startswith(t) for w in words) for t in terms]
+            if all(hits):
+                results.append((parsed, details, float(sum(hits))))
+        results.sort(key=lambda result: result[2], reverse=True)
+        return results[:limit]
+
+    def section_counts(self) -> Dict[str, int]:
+        """Number of memory updates per section"""
+        return dict(
+            self.conn.execute(
+                "SELECT section, COUNT(*) FROM comments "
+                "WHERE issue_number = ? AND parsed IS NOT NULL GROUP BY section",
+                (self.issue_number,),
+            ).fetchall()
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        return {
+            "db_path": str(self.db_path),
+            "cached_comments": self.count(),
+            "comments_parsed": self.comments_parsed,
+            "comments_unchanged": self.comments_unchanged,
+            "full_refreshes": self.full_refreshes,
+            "archived_comments": self.conn.execute(
+                "SELECT COUNT(*) FROM archived_comments WHERE issue_number = ?",
+                (self.issue_number,),
+            ).fetchone()[0],
+            "search_index": "fts5" if self.search_enabled else "scan",
+            "last_refresh": self.get_meta("refreshed_at"),
+        }
+
+
+def _archive_location(
+    period: Optional[str], archive_issue: int, digest_url: Optional[str]
+) -> Dict[str, Any]:
+    return {"period": period, "archive_issue": archive_issue, "digest_url": digest_url}
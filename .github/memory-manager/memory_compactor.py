@@ -9,6 +9,7 @@ while preserving essential current information.
 
 import os
 import re
+import tempfile
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
@@ -34,6 +35,9 @@ if os.environ.get("GADUGI_TEST_ENV") == "1":
                 content = f.read()
             return self._parse_basic(content)
 
+        def parse_content(self, content, file_path=""):
+            return self._parse_basic(content)
+
         def _parse_basic(self, content):
             sections = []
             current_section = None
@@ -64,6 +68,30 @@ else:
             f"Original error: {e}"
         )
 
+from memory_archive import MemoryArchive, source_hash
+
+# "Last Updated" line in the LongTermMemoryDetails.md header
+LAST_UPDATED_PATTERN = re.compile(rb"^Last Updated: ([^\r\n]*)", re.MULTILINE)
+
+# Top-level bullet or numbered list item
+ITEM_START_PATTERN = re.compile(r"^(?:[-*+•]|\d+\.)\s+")
+
+# Dates and relative age markers, found in one scan of an item
+AGE_PATTERN = re.compile(
+    r"(?P<iso>\d{4}-\d{2}-\d{2})"  # YYYY-MM-DD
+    r"|(?P<us>\d{2}/\d{2}/\d{4})"  # MM/DD/YYYY
+    r"|(?P<short>\d{1,2}/\d{1,2}/\d{2})"  # M/D/YY
+    r"|(?P<relative>months ago|weeks ago|days ago|\bold\b)",
+    re.IGNORECASE,
+)
+DATE_FORMATS = {"iso": "%Y-%m-%d", "us": "%m/%d/%Y", "short": "%m/%d/%y"}
+
+# Assumed ages of relative markers, the first found in this order wins
+RELATIVE_AGES = {"months ago": 90, "weeks ago": 21, "days ago": 7, "old": 60}
+RELATIVE_ORDER = list(RELATIVE_AGES)
+
+PRIORITY_MARKER_PATTERN = re.compile("CRITICAL|HIGH|URGENT|IMPORTANT", re.IGNORECASE)
+
 
 class CompactionRule:
     """Defines rules for compacting specific content types"""
@@ -81,6 +109,14 @@ class CompactionRule:
         self.max_items = max_items
         self.preserve_patterns = preserve_patterns or []
         self.priority_preserve = priority_preserve
+        self._preserve_pattern = (
+            re.compile(
+                "|".join(f"(?:{pattern})" for pattern in self.preserve_patterns),
+                re.IGNORECASE,
+            )
+            if self.preserve_patterns
+            else None
+        )
 
     def should_preserve(self, content: str, age_days: int = 0) -> bool:
         """Determine if content should be preserved during compaction"""
@@ -89,15 +125,11 @@ class CompactionRule:
             return True
 
         # Check preserve patterns
-        for pattern in self.preserve_patterns:
-            if re.search(pattern, content, re.IGNORECASE):
-                return True
+        if self._preserve_pattern and self._preserve_pattern.search(content):
+            return True
 
         # Check for priority markers
-        if self.priority_preserve and any(
-            marker in content.upper()
-            for marker in ["CRITICAL", "HIGH", "URGENT", "IMPORTANT"]
-        ):
+        if self.priority_preserve and PRIORITY_MARKER_PATTERN.search(content):
             return True
 
         return False
@@ -140,6 +172,7 @@ class MemoryCompactor:
         details_file_path: Optional[str] = None,
         rules: Optional[Dict[str, CompactionRule]] = None,
         size_thresholds: Optional[Dict[str, Any]] = None,
+        parser: Optional["MemoryParser"] = None,
     ):
         """
         Initialize Memory Compactor
@@ -149,6 +182,8 @@ class MemoryCompactor:
             details_file_path: Path to LongTermMemoryDetails.md (defaults to same dir)
             rules: Custom compaction rules
             size_thresholds: Custom size thresholds
+            parser: Parser to share with other components, so its parse
+                cache is reused
         """
         # Validate and sanitize paths
         self.memory_path = self._validate_path(memory_file_path)
@@ -161,6 +196,8 @@ class MemoryCompactor:
             raise ValueError(
                 "details_file_path must be in the same directory as memory_file_path"
             )
+        # Indexed, append-only copy of archived items (LongTermMemoryDetails/)
+        self.archive = MemoryArchive(str(self.details_path.with_suffix("")))
 
         self.rules = rules or self.DEFAULT_RULES.copy()
         self.size_thresholds = {
@@ -178,6 +215,9 @@ class MemoryCompactor:
         if not (0 < self.size_thresholds["min_compaction_benefit"] < 1):
             raise ValueError("min_compaction_benefit must be between 0 and 1")
 
+        if parser is not None:
+            self.parser = parser
+            return
         try:
             self.parser = MemoryParser()
         except NameError:
@@ -191,15 +231,24 @@ class MemoryCompactor:
         Returns:
             Tuple of (needs_compaction, analysis_info)
         """
+        _, needs_compaction, analysis = self._load_memory()
+        return needs_compaction, analysis
+
+    def _load_memory(self) -> Tuple[Optional[str], bool, Dict[str, Any]]:
+        """
+        Read Memory.md once and analyze its size
+
+        Returns:
+            Tuple of (content or None on error, needs_compaction, analysis_info)
+        """
         if not self.memory_path.exists():
-            return False, {"error": "Memory.md file not found"}
+            return None, False, {"error": "Memory.md file not found"}
 
         try:
             with open(self.memory_path, "r", encoding="utf-8") as f:
                 content = f.read()
 
-            lines = content.split("\n")
-            line_count = len(lines)
+            line_count = content.count("\n") + 1
             char_count = len(content)
 
             analysis = {
@@ -220,21 +269,24 @@ class MemoryCompactor:
                 analysis["exceeds_line_threshold"] or analysis["exceeds_char_threshold"]
             )
 
-            return needs_compaction, analysis
+            return content, needs_compaction, analysis
 
         except FileNotFoundError:
-            return False, {"error": "Memory.md file not found"}
+            return None, False, {"error": "Memory.md file not found"}
         except PermissionError:
-            return False, {"error": "Permission denied accessing Memory.md"}
+            return None, False, {"error": "Permission denied accessing Memory.md"}
         except UnicodeDecodeError:
-            return False, {"error": "Unable to read Memory.md - invalid encoding"}
+            return None, False, {"error": "Unable to read Memory.md - invalid encoding"}
         except Exception as e:
-            return False, {"error": f"Error analyzing Memory.md: {str(e)[:200]}"}
+            return None, False, {"error": f"Error analyzing Memory.md: {str(e)[:200]}"}
 
     def compact_memory(self, dry_run: bool = False) -> Dict[str, Any]:
         """
         Perform automatic compaction of Memory.md
 
+        The file is read once; its size analysis, the parsed document, the
+        backup and the compacted output all come from that one read.
+
         Args:
             dry_run: If True, only analyze what would be compacted
 
@@ -242,9 +294,9 @@ class MemoryCompactor:
             Compaction results and statistics
         """
         try:
-            needs_compaction, analysis = self.needs_compaction()
+            content, needs_compaction, analysis = self._load_memory()
 
-            if not needs_compaction:
+            if not needs_compaction or content is None:
                 return {
                     "success": True,
                     "compaction_needed": False,
@@ -252,8 +304,8 @@ class MemoryCompactor:
                     "message": "No compaction needed",
                 }
 
-            # Parse current Memory.md
-            memory_doc = self.parser.parse_file(str(self.memory_path))
+            # Parse the content already read
+            memory_doc = self.parser.parse_content(content, str(self.memory_path))
 
             # Determine what to compact
             compaction_plan = self._create_compaction_plan(memory_doc)
@@ -268,7 +320,7 @@ class MemoryCompactor:
                 }
 
             # Execute compaction
-            result = self._execute_compaction(memory_doc, compaction_plan)
+            result = self._execute_compaction(memory_doc, compaction_plan, content)
 
             return {
                 "success": True,
@@ -297,6 +349,8 @@ class MemoryCompactor:
             "sections_to_compact": [],
             "items_to_archive": [],
             "items_to_preserve": [],
+            "section_items_to_preserve": {},
+            "section_items_to_archive": {},
             "estimated_size_reduction": 0,
         }
 
@@ -324,6 +378,12 @@ class MemoryCompactor:
 
                 plan["items_to_archive"].extend(section_analysis["items_to_archive"])
                 plan["items_to_preserve"].extend(section_analysis["items_to_preserve"])
+                plan["section_items_to_preserve"][section.name] = section_analysis[
+                    "items_to_preserve"
+                ]
+                plan["section_items_to_archive"][section.name] = section_analysis[
+                    "items_to_archive"
+                ]
                 plan["estimated_size_reduction"] += section_analysis["chars_to_archive"]
 
         return plan
@@ -375,19 +435,13 @@ class MemoryCompactor:
         items = []
         current_item = []
 
-        bullet_pattern = re.compile(r"^([-*+•])\s+")
-        number_pattern = re.compile(r"^(\d+)\.\s+")
-
         for line in content.split("\n"):
             stripped_line = line.strip()
             if not stripped_line:
                 continue
 
             # Only treat as new item if no leading indentation (top-level)
-            if (
-                bullet_pattern.match(stripped_line)
-                or number_pattern.match(stripped_line)
-            ) and not line.startswith(" "):
+            if ITEM_START_PATTERN.match(stripped_line) and not line.startswith(" "):
                 if current_item:
                     items.append("\n".join(current_item))
                 current_item = [line]
@@ -405,85 +459,84 @@ class MemoryCompactor:
         return items
 
     def _estimate_item_age(self, item: str, current_date: datetime) -> int:
-        """Estimate the age of an item in days (simplified heuristic)"""
-        # Look for date patterns in the item
-        date_patterns = [
-            r"(\d{4}-\d{2}-\d{2})",  # YYYY-MM-DD
-            r"(\d{2}/\d{2}/\d{4})",  # MM/DD/YYYY
-            r"(\d{1,2}/\d{1,2}/\d{2})",  # M/D/YY
-        ]
-
-        for pattern in date_patterns:
-            match = re.search(pattern, item)
-            if match:
+        """Estimate the age of an item in days (simplified heuristic)
+
+        The first valid date in the item wins. Without one, relative markers
+        such as "weeks ago" give an assumed age.
+        """
+        item_date, relative = self._scan_item_dates(item)
+        if item_date:
+            return (current_date - item_date).days
+        return RELATIVE_AGES[relative] if relative else 0  # Recent if no indicators
+
+    def _scan_item_dates(self, item: str) -> Tuple[Optional[datetime], Optional[str]]:
+        """Find the first valid date in an item, or its strongest age marker"""
+        relative = None
+        for match in AGE_PATTERN.finditer(item):
+            kind = match.lastgroup
+            if kind in DATE_FORMATS:
                 try:
-                    date_str = match.group(1)
-                    if "-" in date_str:
-                        item_date = datetime.strptime(date_str, "%Y-%m-%d")
-                    elif "/" in date_str and len(date_str) > 8:
-                        item_date = datetime.strptime(date_str, "%m/%d/%Y")
-                    else:
-                        item_date = datetime.strptime(date_str, "%m/%d/%y")
-                        # Handle 2-digit years properly
-                        if item_date.year < 1950:
-                            item_date = item_date.replace(year=item_date.year + 100)
-
-                    return (current_date - item_date).days
+                    item_date = datetime.strptime(match.group(kind), DATE_FORMATS[kind])
                 except ValueError:
-                    # Log error but continue
-                    pass
+                    continue
+                # Handle 2-digit years properly
+                if kind == "short" and item_date.year < 1950:
+                    item_date = item_date.replace(year=item_date.year + 100)
+                return item_date, None
 
-        # Look for relative age indicators
-        if "months ago" in item.lower():
-            return 90  # Assume 3 months for "months ago"
-        if "weeks ago" in item.lower():
-            return 21  # Assume 3 weeks
-        if "days ago" in item.lower():
-            return 7  # Assume a week
+            marker = match.group(kind).lower()
+            if relative is None or RELATIVE_ORDER.index(marker) < RELATIVE_ORDER.index(
+                relative
+            ):
+                relative = marker
 
-        # Default: assume old if no date found and contains "Old" or similar
-        if re.search(r"\b(old|months ago|weeks ago)\b", item.lower()):
-            return 60  # Assume 2 months old
-
-        return 0  # Recent if no indicators
+        return None, relative
 
     def _execute_compaction(
-        self, memory_doc: MemoryDocument, compaction_plan: Dict[str, Any]
+        self,
+        memory_doc: MemoryDocument,
+        compaction_plan: Dict[str, Any],
+        original_content: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Execute the compaction plan"""
-        # Create backup with error handling
-        backup_path = self.memory_path.with_suffix(".md.backup")
-        try:
+        """Execute the compaction plan
+
+        The backup and compacted Memory.md are each written to a temporary
+        file and renamed into place, so a failure never leaves a partially
+        written file. The compacted file is staged before items are appended
+        to the archive and renamed last; archiving again after a failure
+        skips items that were already archived.
+        """
+        if original_content is None:
             with open(self.memory_path, "r", encoding="utf-8") as f:
                 original_content = f.read()
 
-            with open(backup_path, "w", encoding="utf-8") as f:
-                f.write(original_content)
-            # Set restrictive permissions on backup file
-            os.chmod(backup_path, 0o600)
-        except (IOError, OSError) as e:
+        # Create backup with restrictive permissions
+        backup_path = self.memory_path.with_suffix(".md.backup")
+        try:
+            self._atomic_write(backup_path, original_content, mode=0o600)
+        except OSError as e:
             raise RuntimeError(f"Failed to create backup: {e}") from e
 
-        # Archive items to LongTermMemoryDetails.md
-        archived_count = self._archive_items(compaction_plan["items_to_archive"])
-
-        # Create compacted Memory.md
+        # Stage compacted Memory.md
         compacted_content = self._create_compacted_memory(memory_doc, compaction_plan)
+        try:
+            staged_path = self._write_temp(self.memory_path, compacted_content)
+        except OSError as e:
+            raise RuntimeError(f"Failed to write compacted file: {e}") from e
 
-        # Write compacted version with error handling
         try:
-            with open(self.memory_path, "w", encoding="utf-8") as f:
-                f.write(compacted_content)
-        except (IOError, OSError) as e:
-            # Restore from backup if write fails
-            try:
-                with open(backup_path, "r", encoding="utf-8") as f:
-                    backup_content = f.read()
-                with open(self.memory_path, "w", encoding="utf-8") as f:
-                    f.write(backup_content)
-            except Exception:
-                pass  # Don't mask the original error
+            # Archive items to LongTermMemoryDetails.md and its index
+            archived_count = self._archive_items(
+                compaction_plan["items_to_archive"],
+                compaction_plan.get("section_items_to_archive"),
+            )
+            os.replace(staged_path, self.memory_path)
+        except OSError as e:
+            os.unlink(staged_path)
             raise RuntimeError(f"Failed to write compacted file: {e}") from e
+        except BaseException:
+            os.unlink(staged_path)
+            raise
 
         # Calculate actual size reduction
         original_size = len(original_content)
@@ -500,21 +553,96 @@ class MemoryCompactor:
             "reduction_percentage": reduction_percentage,
             "compacted_file": str(self.memory_path),
             "archive_file": str(self.details_path),
+            "archive_index": str(self.archive.index_path),
         }
 
-    def _archive_items(self, items_to_archive: List[str]) -> int:
-        """Archive items to LongTermMemoryDetails.md"""
+    def _write_temp(self, path: Path, content: str, mode: Optional[int] = None) -> str:
+        """Write content to a temporary file next to path
+
+        Args:
+            path: File the temporary file will replace
+            content: Text to write
+            mode: Permissions (default: those of path, or 0o644)
+
+        Returns:
+            Temporary file path, to be renamed over path
+        """
+        if mode is None:
+            mode = path.stat().st_mode & 0o777 if path.exists() else 0o644
+
+        fd, tmp_path = tempfile.mkstemp(
+            dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_path, mode)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return tmp_path
+
+    def _atomic_write(self, path: Path, content: str, mode: Optional[int] = None):
+        """Replace path with content through a temporary file rename"""
+        tmp_path = self._write_temp(path, content, mode)
+        try:
+            os.replace(tmp_path, path)
+        except OSError:
+            os.unlink(tmp_path)
+            raise
+
+    def _archive_items(
+        self,
+        items_to_archive: List[str],
+        section_items: Optional[Dict[str, List[str]]] = None,
+    ) -> int:
+        """Archive items to the indexed archive and LongTermMemoryDetails.md
+
+        Both are only appended to. Items go into the indexed archive with
+        their section and date so they can be queried later, and
+        LongTermMemoryDetails.md keeps a readable log of each compaction.
+        Items the index already holds, e.g. from a retried compaction, are
+        left out of both.
+
+        Args:
+            items_to_archive: Items to archive
+            section_items: The same items by Memory.md section, when known
+        """
         if not items_to_archive:
             return 0
 
-        # Prepare archive content
         timestamp = datetime.now().isoformat()
+        if section_items is None:
+            section_items = {"Archived": items_to_archive}
+        entries = []
+        for section_name, items in section_items.items():
+            for item in items:
+                item_date, _ = self._scan_item_dates(item)
+                date = item_date.strftime("%Y-%m-%d") if item_date else None
+                entries.append((section_name, item, date))
+        try:
+            appended = set(self.archive.append(entries, archived_at=timestamp))
+        except (IOError, OSError) as e:
+            raise RuntimeError(f"Failed to write archive index: {e}") from e
+
+        new_items = []
+        for item in items_to_archive:
+            item_id = source_hash(item)
+            if item_id in appended:
+                appended.discard(item_id)
+                new_items.append(item)
+        if not new_items:
+            return len(items_to_archive)
+
+        # Prepare archive content
         archive_section = f"\n\n## Memory Compaction Archive - {timestamp}\n\n"
         archive_section += (
             "The following items were archived during automatic compaction:\n\n"
         )
 
-        for item in items_to_archive:
+        for item in new_items:
             archive_section += f"{item}\n\n"
 
         # Append to existing details file or create new one
@@ -522,6 +650,7 @@ class MemoryCompactor:
             if self.details_path.exists():
                 with open(self.details_path, "a", encoding="utf-8") as f:
                     f.write(archive_section)
+                self._update_details_timestamp(timestamp)
             else:
                 # Create new details file with header
                 header = f"""# AI Assistant Long-Term Memory Details
@@ -537,13 +666,42 @@ size thresholds, older and less critical information is automatically moved here
 the main memory file concise and focused on current activities.
 
 """
-                with open(self.details_path, "w", encoding="utf-8") as f:
-                    f.write(header + archive_section)
+                self._atomic_write(self.details_path, header + archive_section)
         except (IOError, OSError) as e:
             raise RuntimeError(f"Failed to write archive file: {e}") from e
 
         return len(items_to_archive)
 
+    def _update_details_timestamp(self, timestamp: str):
+        """Set the "Last Updated" line of LongTermMemoryDetails.md
+
+        The line is overwritten in place, padded to its old length; only a
+        longer value makes the file be rewritten.
+        """
+        with open(self.details_path, "r+b") as f:
+            head = f.read(4096)
+            header_end = head.find(b"\n## ")
+            match = LAST_UPDATED_PATTERN.search(
+                head, 0, header_end if header_end >= 0 else len(head)
+            )
+            if not match:
+                return
+            value = timestamp.encode("utf-8")
+            old_length = match.end(1) - match.start(1)
+            if len(value) <= old_length:
+                f.seek(match.start(1))
+                f.write(value.ljust(old_length))
+                f.flush()
+                os.fsync(f.fileno())
+                return
+            content = (head + f.read()).decode("utf-8")
+
+        start = len(head[: match.start(1)].decode("utf-8"))
+        end = len(head[: match.end(1)].decode("utf-8"))
+        self._atomic_write(
+            self.details_path, content[:start] + timestamp + content[end:]
+        )
+
     def _create_compacted_memory(
         self, memory_doc: MemoryDocument, compaction_plan: Dict[str, Any]
     ) -> str:
@@ -562,26 +720,16 @@ Last Updated: {timestamp}
             for section in compaction_plan["sections_to_compact"]
         }
 
-        # Use the preserved items directly from the compaction plan
-        # Group preserved items by section
-        section_preserved_items = {}
-
-        # Build mapping from the compaction plan results
-        for section_info in compaction_plan["sections_to_compact"]:
-            section_name = section_info["section_name"]
-            # Get preserved items for this section from the plan
-            section_preserved_items[section_name] = []
-
-        # Re-analyze each section to get current preserved items
-        # (This ensures we get the exact same logic that was used in planning)
-        for section in memory_doc.sections:
-            if section.name in sections_to_compact:
-                section_analysis = self._analyze_section_for_compaction(
+        # Preserved items come from the plan; plans without them are re-analyzed
+        section_preserved_items = compaction_plan.get("section_items_to_preserve")
+        if section_preserved_items is None:
+            section_preserved_items = {
+                section.name: self._analyze_section_for_compaction(
                     section, self.rules.get(section.name), datetime.now()
-                )
-                section_preserved_items[section.name] = section_analysis[
-                    "items_to_preserve"
-                ]
+                )["items_to_preserve"]
+                for section in memory_doc.sections
+                if section.name in sections_to_compact
+            }
 
         # Rebuild each section
         for section in memory_doc.sections:
@@ -17,7 +17,7 @@ from .config import ConfigManager, create_default_config
 from github_integration import GitHubIntegration
 
 # Import our components
-from memory_parser import MemoryParser, TaskStatus
+from memory_parser import TaskStatus
 from enums import SyncDirection
 from sync_engine import SyncEngine
 from memory_compactor import MemoryCompactor
@@ -36,11 +36,13 @@ class MemoryManager:
 
         # Initialize components
         memory_path = self.repo_path / self.config.memory_file_path
-        self.parser = MemoryParser()
         self.github = GitHubIntegration(str(self.repo_path))
         self.sync_engine = SyncEngine(
             str(memory_path), str(self.repo_path), self.config.sync
         )
+        # One parser for status, sync and compaction: task IDs stay stable
+        # and unchanged files or sections are not parsed again
+        self.parser = self.sync_engine.parser
         # Initialize memory compactor with config-based thresholds
         details_path = (
             self.repo_path / ".github" / self.config.compaction.details_file_name
@@ -54,6 +56,7 @@ class MemoryManager:
                 "target_lines": self.config.compaction.target_lines,
                 "min_compaction_benefit": self.config.compaction.min_benefit,
             },
+            parser=self.parser,
         )
 
     def status(self) -> Dict[str, Any]:
@@ -203,6 +206,25 @@ class MemoryManager:
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    def query_archive(
+        self,
+        text: Optional[str] = None,
+        section: Optional[str] = None,
+        since: Optional[str] = None,
+        limit: int = 10,
+    ) -> Dict[str, Any]:
+        """Find items archived by compaction, without loading the whole archive"""
+        try:
+            archive = self.compactor.archive
+            items = archive.query(text, section=section, since=since, limit=limit)
+            return {
+                "success": True,
+                "items": [item.to_dict() for item in items],
+                "archive": archive.get_stats(),
+            }
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
     def list_conflicts(self) -> List[Dict[str, Any]]:
         """List all pending synchronization conflicts"""
         return self.sync_engine.list_conflicts()
@@ -327,6 +349,19 @@ def main():
         help="Check and automatically compact if thresholds are exceeded",
     )
 
+    # Archive query command
+    archive_parser = subparsers.add_parser(
+        "archive-query", help="Find items archived to LongTermMemoryDetails"
+    )
+    archive_parser.add_argument("text", nargs="?", help="Words to look for")
+    archive_parser.add_argument("--section", help="Only items from this section")
+    archive_parser.add_argument(
+        "--since", help="Only items dated on or after YYYY-MM-DD"
+    )
+    archive_parser.add_argument(
+        "--limit", type=int, default=10, help="Maximum items to return"
+    )
+
     # Create issues command
     create_parser = subparsers.add_parser(
         "create-issues", help="Create GitHub issues for Memory.md tasks"
@@ -440,6 +475,15 @@ def main():
                 print("❌ Automatic compaction failed")
                 sys.exit(1)
 
+        elif args.command == "archive-query":
+            result = manager.query_archive(
+                args.text, args.section, args.since, args.limit
+            )
+            print(json.dumps(result, indent=2))
+
+            if not result.get("success"):
+                sys.exit(1)
+
         elif args.command == "create-issues":
             result = manager.create_issues(args.section, args.dry_run)
             print(json.dumps(result, indent=2))
@@ -7,12 +7,29 @@ information including tasks, goals, accomplishments, and context for integration
 with GitHub Issues and project management systems.
 """
 
+import hashlib
+import json
+import os
 import re
+import tempfile
+import time
 from dataclasses import asdict, dataclass
 from datetime import datetime
+from difflib import SequenceMatcher
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Status markers that may lead a task without being part of its text
+STATUS_MARKERS = "✅🔄⏳❌⚠️🚧📋"
+
+EMPHASIS_PATTERN = re.compile(r"[*_`~]")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+ISSUE_REF_PATTERN = re.compile(r"#\d+")
+
+# Coarsest file timestamp granularity to allow for (FAT uses 2 seconds)
+MTIME_GRANULARITY_NS = 2_000_000_000
 
 
 class TaskStatus(Enum):
@@ -98,22 +115,182 @@ class MemoryDocument:
         ]
 
 
+@lru_cache(maxsize=16384)
+def normalize_task_text(content: str) -> str:
+    """Task text reduced to what identifies it across formatting edits"""
+    text = EMPHASIS_PATTERN.sub("", content).lstrip(STATUS_MARKERS + " ")
+    text = WHITESPACE_PATTERN.sub(" ", text).strip().lower()
+    return text.rstrip(".!;:, ")
+
+
+def task_key(section: str, content: str) -> str:
+    """Content-derived task ID from a task's section and normalized text"""
+    source = f"{section.strip().lower()}\n{normalize_task_text(content)}"
+    return "task-" + hashlib.sha256(source.encode("utf-8")).hexdigest()[:10]
+
+
+class TaskIdentityMap:
+    """Keeps task IDs stable when a task's text is edited
+
+    Parsing gives every task a content-derived key. A task whose key was
+    not seen before is matched against tasks that disappeared since the
+    previous parse, but only on strong evidence: the same normalized text
+    in another section (a moved task), or an edit in place - same section,
+    same position in it, same issue references, and text that extends or
+    shortens the old text or is at least ``match_threshold`` similar. A
+    match inherits the old ID and the key is recorded in a rename map,
+    persisted to ``path`` when given. Anything else is a new task with a new
+    ID, so an unrelated task never takes over a deleted task's issue.
+    """
+
+    def __init__(self, path: Optional[str] = None, match_threshold: float = 0.85):
+        self.path = Path(path) if path else None
+        self.match_threshold = match_threshold
+
+        # Content key -> stable ID, for tasks edited since first seen
+        self.renames: Dict[str, str] = {}
+        # Stable ID -> section, position in it and normalized text when
+        # last parsed
+        self.known: Dict[str, Dict[str, Any]] = {}
+        # Stable ID -> content key, from the latest assignment
+        self.assigned: Dict[str, str] = {}
+
+        self._load()
+
+    def _load(self):
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            self.renames = state.get("renames", {})
+            self.known = state.get("tasks", {})
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not load task identities: {e}")
+
+    def save(self):
+        """Write the rename map atomically"""
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"renames": self.renames, "tasks": self.known}, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            os.unlink(tmp_path)
+            print(f"Warning: Could not save task identities: {e}")
+
+    def assign(self, tasks: List["Task"]):
+        """Replace content keys in ``task.id`` with stable IDs"""
+        keys = [task.id for task in tasks]
+        ids: List[Optional[str]] = [None] * len(tasks)
+        claimed: Set[str] = set()
+
+        # Unedited tasks keep their key, then edited ones their old ID
+        for i, key in enumerate(keys):
+            if key in self.known and key not in claimed:
+                ids[i] = key
+                claimed.add(key)
+        for i, key in enumerate(keys):
+            target = self.renames.get(key)
+            if ids[i] is None and target in self.known and target not in claimed:
+                ids[i] = target
+                claimed.add(target)
+
+        positions = []
+        counts: Dict[str, int] = {}
+        for task in tasks:
+            positions.append(counts.get(task.section, 0))
+            counts[task.section] = positions[-1] + 1
+
+        # New keys may be tasks moved or edited since the previous parse;
+        # moves are matched first so an edit cannot take a moved task's ID
+        vanished = [task_id for task_id in self.known if task_id not in claimed]
+        for exact in (True, False):
+            for i, task in enumerate(tasks):
+                if ids[i] is not None:
+                    continue
+                match = self._best_match(task, positions[i], vanished, exact)
+                if match is not None:
+                    vanished.remove(match)
+                    ids[i] = match
+        ids = [task_id or key for task_id, key in zip(ids, keys)]
+
+        known = {}
+        for task, position, task_id in zip(tasks, positions, ids):
+            task.id = task_id
+            known[task_id] = {
+                "section": task.section,
+                "position": position,
+                "text": normalize_task_text(task.content),
+            }
+        renames = {key: task_id for key, task_id in zip(keys, ids) if key != task_id}
+
+        self.assigned = dict(zip(ids, keys))
+        if known != self.known or renames != self.renames:
+            self.known, self.renames = known, renames
+            self.save()
+
+    def _best_match(
+        self, task: "Task", position: int, candidates: List[str], exact: bool
+    ) -> Optional[str]:
+        """Vanished task this one was moved (exact) or edited in place from"""
+        text = normalize_task_text(task.content)
+        if exact:
+            for task_id in candidates:
+                if self.known[task_id].get("text") == text:
+                    return task_id
+            return None
+
+        refs = sorted(ISSUE_REF_PATTERN.findall(text))
+        best, best_score = None, self.match_threshold
+        for task_id in candidates:
+            previous = self.known[task_id]
+            if (
+                previous.get("section") != task.section
+                or previous.get("position") != position
+                or sorted(ISSUE_REF_PATTERN.findall(previous.get("text", ""))) != refs
+            ):
+                continue
+            if previous["text"] in text or text in previous["text"]:
+                score = 1.0  # Text added to or cut from the same task
+            else:
+                score = SequenceMatcher(None, previous["text"], text).ratio()
+            if score >= best_score:
+                best, best_score = task_id, score
+        return best
+
+    def adopt(self, task: "Task", task_id: str):
+        """Give a task an existing ID, e.g. one an issue was created with"""
+        key = self.assigned.pop(task.id, task.id)
+        self.known[task_id] = self.known.pop(task.id, {})
+        self.assigned[task_id] = key
+        if key != task_id:
+            self.renames[key] = task_id
+        task.id = task_id
+        self.save()
+
+
 class MemoryParser:
-    """Parser for Memory.md files"""
-
-    # Task patterns for different formats
-    TASK_PATTERNS = [
-        # Completed tasks with checkmark emoji
-        (r"^- ✅ (.+)", TaskStatus.COMPLETED),
-        # Completed tasks with [x] format
-        (r"^- \[x\] (.+)", TaskStatus.COMPLETED),
-        # Pending tasks with [ ] format
-        (r"^- \[ \] (.+)", TaskStatus.PENDING),
-        # Bold priority markers
-        (r"^- \*\*([A-Z]+)\*\*: (.+)", TaskStatus.PENDING),
-        # General bullet points (default to pending)
-        (r"^- (.+)", TaskStatus.PENDING),
-    ]
+    """Parser for Memory.md files
+
+    Parsing is incremental: each section's extracted tasks are cached by a
+    hash of its lines, so re-parsing a document only re-scans the sections
+    that changed, and ``parse_file`` skips reading a file whose modification
+    time and size are unchanged.
+    """
+
+    # Task formats as alternatives of one pattern, tried in order:
+    # completed with checkmark emoji or [x], pending with [ ], bold
+    # priority markers, and general bullet points (default to pending)
+    TASK_PATTERN = (
+        r"^- (?:(?:✅|\[x\]) (?P<completed>.+)"
+        r"|\[ \] (?P<pending>.+)"
+        r"|\*\*(?P<level>[A-Z]+)\*\*: (?P<prioritized>.+)"
+        r"|(?P<bullet>.+))"
+    )
 
     # Section headers pattern
     SECTION_PATTERN = r"^(#{1,6})\s+(.+)"
@@ -128,11 +305,9 @@ class MemoryParser:
     # Issue reference pattern
     ISSUE_PATTERN = r"#(\d+)"
 
-    def __init__(self):
-        self.compiled_patterns = [
-            (re.compile(pattern, re.IGNORECASE), status)
-            for pattern, status in self.TASK_PATTERNS
-        ]
+    def __init__(self, identity_map: Optional[TaskIdentityMap] = None):
+        self.identity_map = identity_map
+        self.task_pattern = re.compile(self.TASK_PATTERN, re.IGNORECASE)
         self.section_pattern = re.compile(self.SECTION_PATTERN)
         self.priority_patterns = [
             (re.compile(pattern, re.IGNORECASE), priority)
@@ -140,14 +315,44 @@ class MemoryParser:
         ]
         self.issue_pattern = re.compile(self.ISSUE_PATTERN)
 
+        # Section hash -> tasks found in it, as (offset, content, status,
+        # priority, issue number, content key); holds the sections of the
+        # latest parse
+        self._section_cache: Dict[str, List[Tuple[Any, ...]]] = {}
+        # File path -> ((inode, mtime_ns, size), read time in ns, content)
+        # of the latest read
+        self._file_cache: Dict[str, Tuple[Tuple[int, int, int], int, str]] = {}
+
+        # Parse statistics
+        self.sections_parsed = 0
+        self.sections_reused = 0
+        self.file_reads_skipped = 0
+
     def parse_file(self, file_path: str) -> MemoryDocument:
         """Parse Memory.md file and return structured document"""
         path = Path(file_path)
-        if not path.exists():
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
             raise FileNotFoundError(f"Memory.md file not found: {file_path}")
 
-        with open(path, "r", encoding="utf-8") as f:
-            content = f.read()
+        # A rewrite within one mtime tick of the last read keeps mtime and
+        # size, so a cached read is only trusted once the file's mtime is
+        # older than the read by more than the timestamp granularity
+        signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        cached = self._file_cache.get(str(path))
+        if (
+            cached
+            and cached[0] == signature
+            and stat.st_mtime_ns < cached[1] - MTIME_GRANULARITY_NS
+        ):
+            content = cached[2]
+            self.file_reads_skipped += 1
+        else:
+            read_at = time.time_ns()
+            with open(path, "r", encoding="utf-8") as f:
+                content = f.read()
+            self._file_cache[str(path)] = (signature, read_at, content)
 
         return self.parse_content(content, str(path))
 
@@ -176,6 +381,15 @@ class MemoryParser:
             file_path=file_path,
         )
 
+    def get_stats(self) -> Dict[str, Any]:
+        """Get incremental parsing statistics"""
+        return {
+            "sections_parsed": self.sections_parsed,
+            "sections_reused": self.sections_reused,
+            "file_reads_skipped": self.file_reads_skipped,
+            "cached_sections": len(self._section_cache),
+        }
+
     def _extract_last_updated(self, lines: List[str]) -> Optional[datetime]:
         """Extract last updated timestamp from Memory.md"""
         for line in lines[:10]:  # Check first 10 lines
@@ -193,93 +407,125 @@ class MemoryParser:
 
     def _parse_sections(self, lines: List[str]) -> List[MemorySection]:
         """Parse sections from Memory.md"""
-        sections = []
-        current_section = None
-
+        headers = []
         for i, line in enumerate(lines):
-            match = self.section_pattern.match(line)
-            if match:
-                # Save previous section
-                if current_section:
-                    current_section.line_end = i - 1
-                    sections.append(current_section)
-
-                # Start new section
-                level = len(match.group(1))
-                name = match.group(2).strip()
-                current_section = MemorySection(
+            if line.startswith("#"):
+                match = self.section_pattern.match(line)
+                if match:
+                    headers.append((i, len(match.group(1)), match.group(2).strip()))
+
+        sections = []
+        for index, (start, level, name) in enumerate(headers):
+            end = headers[index + 1][0] - 1 if index + 1 < len(headers) else None
+            body = lines[start + 1 : end + 1 if end is not None else len(lines)]
+            sections.append(
+                MemorySection(
                     name=name,
-                    content="",
+                    content="\n".join(body) + "\n" if body else "",
                     level=level,
-                    line_start=i,
-                    line_end=len(lines) - 1,
+                    line_start=start,
+                    line_end=end if end is not None else len(lines) - 1,
                 )
-            elif current_section:
-                current_section.content += line + "\n"
-
-        # Add final section
-        if current_section:
-            sections.append(current_section)
+            )
 
         return sections
 
     def _extract_tasks(
         self, lines: List[str], sections: List[MemorySection]
     ) -> List[Task]:
-        """Extract tasks from all sections"""
-        tasks = []
-        task_id_counter = 1
+        """Extract tasks from all sections
 
-        # Find which section each line belongs to
-        section_map = {}
-        for section in sections:
-            for i in range(section.line_start, min(section.line_end + 1, len(lines))):
-                section_map[i] = section.name
+        Task IDs are derived from section and text, so inserting a task does
+        not renumber the others. Repeated text within a section gets a
+        ``-2``, ``-3``... suffix in document order.
+        """
+        # Lines before the first header belong to no section
+        first = sections[0].line_start if sections else len(lines)
+        blocks = [("Unknown", 0, first - 1)]
+        blocks += [(s.name, s.line_start, s.line_end) for s in sections]
 
-        for i, line in enumerate(lines):
-            stripped = line.strip()
-            if not stripped:
+        tasks = []
+        key_counts: Dict[str, int] = {}
+        section_cache: Dict[str, List[Tuple[Any, ...]]] = {}
+
+        for section_name, start, end in blocks:
+            block = lines[start : end + 1]
+            if not block:
                 continue
 
-            # Try to match task patterns
-            for pattern, default_status in self.compiled_patterns:
-                match = pattern.match(stripped)
-                if match:
-                    # Extract task content
-                    if len(match.groups()) == 2:  # Priority pattern
-                        priority_text = match.group(1)
-                        content = match.group(2).strip()
-                        priority = self._extract_priority_from_text(priority_text)
-                    else:
-                        content = match.group(1).strip()
-                        priority = self._extract_priority(content)
-
-                    # Determine section
-                    section_name = section_map.get(i, "Unknown")
-
-                    # Extract issue references
-                    issue_number = self._extract_issue_number(content)
-
-                    # Create task
-                    task = Task(
-                        id=f"task-{task_id_counter:03d}",
+            digest = hashlib.sha1(
+                "\n".join([section_name, *block]).encode("utf-8")
+            ).hexdigest()
+            found = self._section_cache.get(digest)
+            if found is None:
+                found = self._scan_block(section_name, block)
+                self.sections_parsed += 1
+            else:
+                self.sections_reused += 1
+            section_cache[digest] = found
+
+            for offset, content, status, priority, issue_number, key in found:
+                key_counts[key] = key_counts.get(key, 0) + 1
+                if key_counts[key] > 1:
+                    key = f"{key}-{key_counts[key]}"
+
+                tasks.append(
+                    Task(
+                        id=key,
                         content=content,
-                        status=default_status,
+                        status=status,
                         priority=priority,
                         section=section_name,
-                        line_number=i + 1,
+                        line_number=start + offset + 1,
                         issue_number=issue_number,
                         metadata={},
                     )
+                )
+
+        self._section_cache = section_cache
 
-                    tasks.append(task)
-                    task_id_counter += 1
-                    break
+        if self.identity_map is not None:
+            self.identity_map.assign(tasks)
 
         return tasks
 
+    def _scan_block(self, section_name: str, block: List[str]) -> List[Tuple[Any, ...]]:
+        """Match the lines of one section against the task pattern"""
+        found = []
+        for offset, line in enumerate(block):
+            stripped = line.strip()
+            if not stripped.startswith("- "):
+                continue
+
+            match = self.task_pattern.match(stripped)
+            if not match:
+                continue
+
+            kind = match.lastgroup
+            content = match.group(kind).strip()
+            if kind == "prioritized":
+                priority = self._extract_priority_from_text(match.group("level"))
+            else:
+                priority = self._extract_priority(content)
+            status = TaskStatus.COMPLETED if kind == "completed" else TaskStatus.PENDING
+
+            found.append(
+                (
+                    offset,
+                    content,
+                    status,
+                    priority,
+                    self._extract_issue_number(content),
+                    # Derive the task ID from its content
+                    task_key(section_name, content),
+                )
+            )
+        return found
+
     def _extract_priority(self, content: str) -> TaskPriority:
         """Extract priority from task content"""
+        if "**" not in content:
+            return TaskPriority.MEDIUM
         for pattern, priority in self.priority_patterns:
             if pattern.search(content):
                 return priority
@@ -307,6 +553,7 @@ class MemoryParser:
         self, content: str, sections: List[MemorySection], tasks: List[Task]
     ) -> Dict[str, Any]:
         """Build document metadata"""
+        task_sections = {t.section for t in tasks}
         return {
             "total_lines": len(content.split("\n")),
             "total_sections": len(sections),
@@ -316,7 +563,7 @@ class MemoryParser:
             ),
             "pending_tasks": len([t for t in tasks if t.status == TaskStatus.PENDING]),
             "sections_with_tasks": len(
-                [s for s in sections if any(t.section == s.name for t in tasks)]
+                [s for s in sections if s.name in task_sections]
             ),
             "avg_tasks_per_section": len(tasks) / max(len(sections), 1),
             "issue_references": len([t for t in tasks if t.issue_number is not None]),
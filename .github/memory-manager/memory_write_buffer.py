@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""
+Memory Write Buffer - Write-behind queue for Project Memory updates
+
+Memory updates are stored in an on-disk SQLite queue and posted by a
+background thread, so agents do not wait on GitHub. Updates queued within
+``flush_interval`` seconds are coalesced into one comment per section and
+agent. The queue is flushed when it reaches ``max_pending`` updates, when
+the oldest update has waited ``flush_interval`` seconds, and at interpreter
+exit. Updates left behind by a crashed process are posted by the next one.
+Content too long for one comment is split when queued, and updates that
+keep failing are moved to a dead-letter table so they cannot block the
+queue.
+"""
+
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import weakref
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pending_updates (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    issue_number INTEGER NOT NULL,
+    fields TEXT NOT NULL,
+    queued_at REAL NOT NULL,
+    claimed_by TEXT,
+    claimed_at REAL,
+    attempts INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS pending_by_issue
+    ON pending_updates (issue_number, id);
+CREATE TABLE IF NOT EXISTS dead_updates (
+    id INTEGER PRIMARY KEY,
+    issue_number INTEGER NOT NULL,
+    fields TEXT NOT NULL,
+    queued_at REAL NOT NULL,
+    failed_at REAL NOT NULL,
+    attempts INTEGER NOT NULL
+);
+"""
+
+PRIORITY_ORDER = {"high": 0, "medium": 1, "low": 2}
+
+# GitHub rejects comments over 65536 characters; leave room for formatting
+MAX_COMMENT_CONTENT = 60000
+
+# Posts one coalesced update (``MemoryUpdate.to_dict`` shape); True on success
+UpdatePoster = Callable[[Dict[str, Any]], bool]
+
+# Buffers flushed at interpreter exit so queued updates are posted
+_live_buffers: "weakref.WeakSet[MemoryWriteBuffer]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_live_buffers() -> None:
+    for buffer in list(_live_buffers):
+        try:
+            buffer.close()
+        except Exception as e:
+            logger.error(f"Error flushing memory write buffer at exit: {e}")
+
+
+def split_content(content: str, max_content: int = MAX_COMMENT_CONTENT) -> List[str]:
+    """
+    Split content into parts of at most ``max_content`` characters
+
+    Parts end at a line break where there is one.
+    """
+    parts = []
+    while len(content) > max_content:
+        cut = content.rfind("\n", 0, max_content + 1)
+        if cut <= 0:
+            cut = max_content
+        parts.append(content[:cut])
+        content = content[cut:].lstrip("\n")
+    parts.append(content)
+    return parts
+
+
+def coalesce_updates(
+    entries: List[Tuple[int, Dict[str, Any]]],
+    max_content: int = MAX_COMMENT_CONTENT,
+) -> List[Tuple[List[int], Dict[str, Any]]]:
+    """
+    Merge queued updates into one update per section and agent.
+
+    Contents are joined in queue order under the first update's timestamp,
+    the highest priority wins and related references are combined. A group
+    whose content would exceed ``max_content`` characters is split.
+
+    Args:
+        entries: (queue ID, update fields) in queue order
+        max_content: Content length at which a new comment is started
+
+    Returns:
+        (queue IDs, merged update fields) in order of first appearance
+    """
+    groups: Dict[Tuple[str, str], List[Tuple[List[int], Dict[str, Any]]]] = {}
+    order: List[Tuple[List[int], Dict[str, Any]]] = []
+
+    for entry_id, fields in entries:
+        key = (fields["section"], fields["agent"])
+        chunks = groups.setdefault(key, [])
+        if chunks:
+            ids, merged = chunks[-1]
+            if len(merged["content"]) + len(fields["content"]) + 2 <= max_content:
+                ids.append(entry_id)
+                _merge_into(merged, fields)
+                continue
+
+        chunk = ([entry_id], dict(fields))
+        chunks.append(chunk)
+        order.append(chunk)
+
+    return order
+
+
+def _merge_into(merged: Dict[str, Any], fields: Dict[str, Any]):
+    """Append one update's content and references to a merged update"""
+    merged["content"] = f"{merged['content']}\n\n{fields['content']}"
+    if PRIORITY_ORDER.get(fields["priority"], 1) < PRIORITY_ORDER.get(
+        merged["priority"], 1
+    ):
+        merged["priority"] = fields["priority"]
+    for name in ("related_issues", "related_prs", "related_commits", "related_files"):
+        combined = list(merged.get(name) or [])
+        combined += [ref for ref in fields.get(name) or [] if ref not in combined]
+        merged[name] = combined
+
+
+class MemoryWriteBuffer:
+    """Durable write-behind queue of memory updates for one issue"""
+
+    def __init__(
+        self,
+        db_path: str,
+        issue_number: int,
+        post: UpdatePoster,
+        flush_interval: float = 2.0,
+        max_pending: int = 10,
+        claim_timeout: float = 300.0,
+        max_retry_delay: float = 60.0,
+        max_attempts: int = 10,
+    ):
+        """
+        Open the queue and start the flush thread
+
+        Args:
+            db_path: SQLite database file, created with its directory
+            issue_number: Memory issue the updates are posted to
+            post: Posts one coalesced update
+            flush_interval: Seconds an update may wait to be coalesced
+            max_pending: Queued updates that trigger an immediate flush
+            claim_timeout: Seconds after which updates claimed by a process
+                that never posted them are posted by another
+            max_retry_delay: Longest wait between attempts after a failure
+            max_attempts: Failed posts after which an update is moved to
+                the dead-letter table
+        """
+        self.db_path = Path(db_path)
+        self.issue_number = issue_number
+        self.post = post
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.claim_timeout = claim_timeout
+        self.max_retry_delay = max_retry_delay
+        self.max_attempts = max(1, max_attempts)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Shared by callers and the flush thread, serialized by _db_lock
+        self.conn = sqlite3.connect(
+            str(self.db_path), timeout=30.0, check_same_thread=False
+        )
+        self.conn.executescript(SCHEMA)
+        columns = {
+            row[1] for row in self.conn.execute("PRAGMA table_info(pending_updates)")
+        }
+        if "attempts" not in columns:  # Queue created by an older version
+            self.conn.execute(
+                "ALTER TABLE pending_updates "
+                "ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0"
+            )
+        self._db_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._claimer = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+        self._condition = threading.Condition()
+        self._closing = False
+        self._closed = False
+        self._flush_requested = False
+        self._retry_delay = 0.0
+        self._retry_at = 0.0
+
+        # Updates left by an earlier process are posted after one interval
+        self._pending_since: Optional[float] = (
+            time.monotonic() if self.pending_count() else None
+        )
+
+        # Buffer statistics
+        self.updates_queued = 0
+        self.updates_posted = 0
+        self.comments_posted = 0
+        self.flush_failures = 0
+        self.updates_dead_lettered = 0
+
+        self._thread = threading.Thread(
+            target=self._flush_loop, name="gadugi-memory-writer", daemon=True
+        )
+        self._thread.start()
+        _live_buffers.add(self)
+
+    def enqueue(self, fields: Dict[str, Any]) -> int:
+        """
+        Queue an update for posting
+
+        Content longer than one comment allows is queued as several
+        updates, posted in order.
+
+        Args:
+            fields: Update in ``MemoryUpdate.to_dict`` shape
+
+        Returns:
+            Number of updates waiting to be posted
+        """
+        parts = split_content(fields["content"])
+        now = time.time()
+        with self._db_lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO pending_updates (issue_number, fields, queued_at) "
+                "VALUES (?, ?, ?)",
+                [
+                    (self.issue_number, json.dumps({**fields, "content": part}), now)
+                    for part in parts
+                ],
+            )
+        pending = self.pending_count()
+        self.updates_queued += len(parts)
+
+        with self._condition:
+            if self._pending_since is None:
+                self._pending_since = time.monotonic()
+            if pending >= self.max_pending:
+                self._flush_requested = True
+            self._condition.notify()
+        return pending
+
+    def pending_count(self) -> int:
+        """Number of updates not yet posted, by any process"""
+        with self._db_lock:
+            row = self.conn.execute(
+                "SELECT COUNT(*) FROM pending_updates WHERE issue_number = ?",
+                (self.issue_number,),
+            ).fetchone()
+        return row[0]
+
+    def flush(self) -> Dict[str, int]:
+        """
+        Post queued updates now, coalesced
+
+        Posting stops at the first failure; the remaining updates stay
+        queued and are retried with backoff by the flush thread. Updates
+        that failed ``max_attempts`` times are dead-lettered instead, and
+        posting continues with the next comment.
+
+        Returns:
+            Counts of updates and comments posted and updates still queued
+        """
+        with self._flush_lock:
+            if self._closed:
+                return {"updates_posted": 0, "comments_posted": 0, "pending": 0}
+            entries = self._claim()
+            posted_updates = posted_comments = 0
+            failed = False
+
+            for ids, fields in coalesce_updates(entries):
+                try:
+                    posted = self.post(fields)
+                except Exception as e:
+                    logger.warning(f"Failed to post memory update: {e}")
+                    posted = False
+                if not posted:
+                    failed = True
+                    if self._record_failure(ids):
+                        continue
+                    break
+                self._delete(ids)
+                posted_updates += len(ids)
+                posted_comments += 1
+
+            self._release()
+            self.updates_posted += posted_updates
+            self.comments_posted += posted_comments
+            remaining = self.pending_count()
+
+            with self._condition:
+                if failed:
+                    self.flush_failures += 1
+                    self._retry_delay = min(
+                        max(self._retry_delay * 2, self.flush_interval, 1.0),
+                        self.max_retry_delay,
+                    )
+                    self._retry_at = time.monotonic() + self._retry_delay
+                else:
+                    self._retry_delay = 0.0
+                    self._retry_at = 0.0
+                # Updates claimed by another process are checked again later
+                self._pending_since = time.monotonic() if remaining else None
+
+        return {
+            "updates_posted": posted_updates,
+            "comments_posted": posted_comments,
+            "pending": remaining,
+        }
+
+    def _claim(self) -> List[Tuple[int, Dict[str, Any]]]:
+        """Claim queued updates so other processes do not post them too"""
+        now = time.time()
+        with self._db_lock, self.conn:
+            self.conn.execute(
+                "UPDATE pending_updates SET claimed_by = ?, claimed_at = ? "
+                "WHERE issue_number = ? AND (claimed_by IS NULL OR claimed_at < ?)",
+                (self._claimer, now, self.issue_number, now - self.claim_timeout),
+            )
+            rows = self.conn.execute(
+                "SELECT id, fields FROM pending_updates "
+                "WHERE issue_number = ? AND claimed_by = ? ORDER BY id",
+                (self.issue_number, self._claimer),
+            ).fetchall()
+        return [(entry_id, json.loads(fields)) for entry_id, fields in rows]
+
+    def _delete(self, ids: List[int]):
+        with self._db_lock, self.conn:
+            self.conn.executemany(
+                "DELETE FROM pending_updates WHERE id = ?",
+                [(entry_id,) for entry_id in ids],
+            )
+
+    def _record_failure(self, ids: List[int]) -> int:
+        """
+        Count a failed post of updates, dead-lettering exhausted ones
+
+        Returns:
+            Number of updates moved to the dead-letter table
+        """
+        placeholders = ",".join("?" * len(ids))
+        with self._db_lock, self.conn:
+            self.conn.execute(
+                "UPDATE pending_updates SET attempts = attempts + 1 "
+                f"WHERE id IN ({placeholders})",
+                ids,
+            )
+            rows = self.conn.execute(
+                "SELECT id, issue_number, fields, queued_at, attempts "
+                f"FROM pending_updates WHERE id IN ({placeholders}) "
+                "AND attempts >= ?",
+                (*ids, self.max_attempts),
+            ).fetchall()
+            now = time.time()
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO dead_updates "
+                "(id, issue_number, fields, queued_at, failed_at, attempts) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(*row[:4], now, row[4]) for row in rows],
+            )
+            self.conn.executemany(
+                "DELETE FROM pending_updates WHERE id = ?",
+                [(row[0],) for row in rows],
+            )
+
+        if rows:
+            self.updates_dead_lettered += len(rows)
+            logger.error(
+                f"Gave up posting {len(rows)} memory updates after "
+                f"{self.max_attempts} attempts; kept in dead_updates of {self.db_path}"
+            )
+        return len(rows)
+
+    def _release(self):
+        """Unclaim updates that were not posted"""
+        with self._db_lock, self.conn:
+            self.conn.execute(
+                "UPDATE pending_updates SET claimed_by = NULL, claimed_at = NULL "
+                "WHERE claimed_by = ?",
+                (self._claimer,),
+            )
+
+    def _due_in(self) -> Optional[float]:
+        """Seconds until the next flush, None when nothing is queued"""
+        if self._pending_since is None:
+            return None
+        now = time.monotonic()
+        if self._flush_requested:
+            due = now
+        else:
+            due = self._pending_since + self.flush_interval
+        return max(due, self._retry_at) - now
+
+    def _flush_loop(self):
+        while True:
+            with self._condition:
+                while not self._closing:
+                    wait = self._due_in()
+                    if wait is not None and wait <= 0:
+                        break
+                    self._condition.wait(wait)
+                if self._closing:
+                    return
+                self._flush_requested = False
+
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Memory write buffer flush failed: {e}")
+                with self._condition:
+                    self._retry_at = time.monotonic() + self.max_retry_delay
+
+    def close(self) -> Dict[str, int]:
+        """
+        Stop the flush thread and post what is still queued
+
+        Updates that cannot be posted stay on disk for the next process.
+        """
+        if self._closed:
+            return {"updates_posted": 0, "comments_posted": 0, "pending": 0}
+        with self._condition:
+            self._closing = True
+            self._condition.notify()
+        self._thread.join()
+
+        try:
+            result = self.flush()
+        finally:
+            self._closed = True
+            _live_buffers.discard(self)
+            self.conn.close()
+        if result["pending"]:
+            logger.warning(
+                f"{result['pending']} memory updates remain queued in {self.db_path}"
+            )
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get write buffer statistics"""
+        return {
+            "db_path": str(self.db_path),
+            "pending": 0 if self._closed else self.pending_count(),
+            "updates_queued": self.updates_queued,
+            "updates_posted": self.updates_posted,
+            "comments_posted": self.comments_posted,
+            "flush_failures": self.flush_failures,
+            "updates_dead_lettered": self.updates_dead_lettered,
+            "flush_interval": self.flush_interval,
+            "max_pending": self.max_pending,
+        }
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Memory.md Parser Benchmark - Cost of cold, cached and incremental parses
+
+Generates a synthetic Memory.md and times a cold parse, a re-parse of the
+unchanged file, and a re-parse after one section was edited.
+
+Usage:
+    python3 .github/memory-manager/parser_benchmark.py [--lines N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import timeit
+from typing import Dict
+
+from memory_parser import MemoryParser, normalize_task_text
+
+LINE_TEMPLATES = [
+    "- [ ] Implement feature {n} for the workflow manager",
+    "- [x] Fix regression {n} reported in #{n}",
+    "- ✅ Completed milestone {n}",
+    "- **HIGH**: Investigate flaky test {n}",
+    "- Note {n} about the **MEDIUM** priority backlog",
+    "Free-form context paragraph {n} describing earlier decisions.",
+    "",
+]
+
+
+def generate_memory(lines: int = 10000, section_lines: int = 100) -> str:
+    """Synthetic Memory.md with a mix of task formats and prose"""
+    out = ["# AI Assistant Memory", "Last Updated: 2025-08-05T22:38:00-08:00", ""]
+    n = 0
+    while len(out) < lines:
+        out.append(f"## Section {len(out) // section_lines}")
+        for _ in range(section_lines - 1):
+            out.append(LINE_TEMPLATES[n % len(LINE_TEMPLATES)].format(n=n))
+            n += 1
+    return "\n".join(out[:lines]) + "\n"
+
+
+def benchmark_parser(lines: int = 10000, repeat: int = 5) -> Dict[str, float]:
+    """Time parses of a synthetic Memory.md
+
+    Args:
+        lines: Length of the generated document
+        repeat: Timing runs per case; the fastest is reported
+
+    Returns:
+        Milliseconds per parse for each case, and the task count
+    """
+    content = generate_memory(lines)
+    edited = content.replace("Implement feature 7 ", "Implement feature seven ", 1)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "Memory.md")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        # Old enough for the parser to trust its cached read
+        stale = time.time() - 60
+        os.utime(path, (stale, stale))
+
+        def cold():
+            normalize_task_text.cache_clear()
+            MemoryParser().parse_file(path)
+
+        parser = MemoryParser()
+        tasks = len(parser.parse_file(path).tasks)
+
+        def cached():
+            parser.parse_file(path)
+
+        def one_section_changed():
+            # Alternate so every run re-scans exactly one section
+            parser.parse_content(edited)
+            parser.parse_content(content)
+
+        timings = {
+            "cold_parse_ms": min(timeit.repeat(cold, number=1, repeat=repeat)),
+            "cached_parse_ms": min(timeit.repeat(cached, number=1, repeat=repeat)),
+            "one_section_changed_ms": min(
+                timeit.repeat(one_section_changed, number=1, repeat=repeat)
+            )
+            / 2,
+        }
+
+    result = {name: seconds * 1000 for name, seconds in timings.items()}
+    result["tasks"] = tasks
+    return result
+
+
+def main():
+    """Run the parser benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, default=10000, help="Document length")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs")
+    args = parser.parse_args()
+
+    result = benchmark_parser(args.lines, args.repeat)
+    print(f"Memory.md with {args.lines} lines, {result['tasks']} tasks")
+    print(f"  Cold parse:          {result['cold_parse_ms']:8.2f} ms")
+    print(f"  Unchanged re-parse:  {result['cached_parse_ms']:8.2f} ms")
+    print(f"  One section changed: {result['one_section_changed_ms']:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
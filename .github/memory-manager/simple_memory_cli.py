@@ -138,18 +138,24 @@ def handle_update(manager: SimpleMemoryManager, args) -> int:
         related_issues=related_issues or None,
         related_prs=related_prs or None,
         related_files=related_files,
+        wait=args.wait,
     )
 
     if args.json:
         print(json.dumps(result, indent=2))
     else:
         if result["success"]:
-            print("✅ Memory updated successfully")
+            if result.get("queued"):
+                print("✅ Memory update queued (posted on exit)")
+            else:
+                print("✅ Memory updated successfully")
             print(f"Section: {result['section']}")
             print(f"Agent: {result['agent']}")
             print(f"Timestamp: {result['timestamp']}")
             if result.get("comment_url"):
                 print(f"Comment URL: {result['comment_url']}")
+            elif result.get("queued"):
+                print("Comment URL: not known until posted (use --wait)")
         else:
             print(f"❌ Failed to update memory: {result.get('error', 'Unknown error')}")
             return 1
@@ -157,9 +163,30 @@ def handle_update(manager: SimpleMemoryManager, args) -> int:
     return 0
 
 
+def handle_flush(manager: SimpleMemoryManager, args) -> int:
+    """Handle flush command"""
+    result = manager.flush_memory()
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        if result["success"]:
+            print("📤 Memory Updates Flushed")
+            print(f"Updates Posted: {result['updates_posted']}")
+            print(f"Comments Posted: {result['comments_posted']}")
+            print(f"Still Queued: {result['pending']}")
+        else:
+            print(f"❌ Flush failed: {result.get('error', 'Unknown error')}")
+            return 1
+
+    return 0
+
+
 def handle_search(manager: SimpleMemoryManager, args) -> int:
     """Handle search command"""
-    results = manager.search_memory(args.query, section=args.section)
+    results = manager.search_memory(
+        args.query, section=args.section, agent=args.agent, limit=args.limit
+    )
 
     if args.json:
         print(json.dumps(results, indent=2))
@@ -168,6 +195,8 @@ def handle_search(manager: SimpleMemoryManager, args) -> int:
             print(f"🔍 Search Results for '{args.query}'")
             if args.section:
                 print(f"Section Filter: {args.section}")
+            if args.agent:
+                print(f"Agent Filter: {args.agent}")
             print("=" * 50)
 
             if results["total_results"] == 0:
@@ -206,10 +235,17 @@ def handle_cleanup(manager: SimpleMemoryManager, args) -> int:
             print(f"Mode: {'Dry Run' if result['dry_run'] else 'Live Run'}")
             print(f"Total Comments: {result['total_comments']}")
             print(f"Comments to Archive: {result['comments_to_archive']}")
-            if result.get("note"):
-                print(f"Note: {result['note']}")
+            for period, count in result.get("periods", {}).items():
+                print(f"  {period}: {count} entries")
+            if result.get("archive_issue"):
+                print(f"Archive Issue: #{result['archive_issue']}")
+                print(f"Digests Posted: {result['digests_posted']}")
+                print(f"Comments Deleted: {result['comments_deleted']}")
+            if result.get("pending_deletions"):
+                print(f"Pending Deletions: {result['pending_deletions']}")
         else:
-            print(f"❌ Cleanup failed: {result.get('error', 'Unknown error')}")
+            error = result.get("error") or "; ".join(result.get("errors", []))
+            print(f"❌ Cleanup failed: {error or 'Unknown error'}")
             return 1
 
     return 0
@@ -291,6 +327,9 @@ Examples:
   # Add memory from stdin
   echo "Long memory content..." | python simple_memory_cli.py update - --section important-context --agent OrchestratorAgent
 
+  # Post queued memory updates now
+  python simple_memory_cli.py flush
+
   # Search memory
   python simple_memory_cli.py search "performance improvement"
 
@@ -354,11 +393,23 @@ Examples:
         help='Comma-separated list of related issues/PRs (e.g., "#123,#456")',
     )
     update_parser.add_argument("--files", help="Comma-separated list of related files")
+    update_parser.add_argument(
+        "--wait",
+        action="store_true",
+        help="Post the update before exiting and show its comment URL",
+    )
+
+    # Flush command
+    subparsers.add_parser("flush", help="Post queued memory updates now")
 
     # Search command
     search_parser = subparsers.add_parser("search", help="Search memory content")
     search_parser.add_argument("query", help="Search query")
     search_parser.add_argument("--section", help="Search within specific section only")
+    search_parser.add_argument("--agent", help="Only updates added by this agent")
+    search_parser.add_argument(
+        "--limit", type=int, default=20, help="Maximum number of results"
+    )
 
     # Cleanup command
     cleanup_parser = subparsers.add_parser("cleanup", help="Archive old memory entries")
@@ -402,6 +453,8 @@ Examples:
             return handle_read(manager, args)
         elif args.command == "update":
             return handle_update(manager, args)
+        elif args.command == "flush":
+            return handle_flush(manager, args)
         elif args.command == "search":
             return handle_search(manager, args)
         elif args.command == "cleanup":
@@ -7,9 +7,11 @@ exclusively for project memory storage, eliminating the complexity of Memory.md
 synchronization and providing native GitHub integration.
 """
 
+import json
 import logging
-from typing import Dict, List, Optional, Any
-from datetime import datetime
+import time
+from typing import Dict, List, Optional, Any, Tuple
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 import sys
 import os
@@ -19,6 +21,14 @@ shared_path = Path(__file__).parent.parent.parent / ".claude" / "shared"
 sys.path.insert(0, str(shared_path))
 
 from github_operations import GitHubOperations, GitHubError
+from memory_cache import MemoryCommentCache
+from memory_write_buffer import MemoryWriteBuffer
+
+# Comment fields as gh --json comments returns them, from the REST API
+COMMENT_JQ = (
+    ".[] | {id: .node_id, body: .body, createdAt: .created_at, "
+    "updatedAt: .updated_at, author: {login: .user.login}}"
+)
 
 
 class MemorySection:
@@ -68,6 +78,27 @@ class MemoryUpdate:
         self.related_files = related_files or []
         self.timestamp = datetime.now().isoformat()
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "content": self.content,
+            "section": self.section,
+            "agent": self.agent,
+            "priority": self.priority,
+            "related_issues": self.related_issues,
+            "related_prs": self.related_prs,
+            "related_commits": self.related_commits,
+            "related_files": self.related_files,
+            "timestamp": self.timestamp,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MemoryUpdate":
+        """Rebuild an update, keeping its original timestamp"""
+        fields = {key: value for key, value in data.items() if key != "timestamp"}
+        update = cls(**fields)
+        update.timestamp = data.get("timestamp", update.timestamp)
+        return update
+
     def format_comment(self) -> str:
         """Format memory update as structured GitHub issue comment"""
 
@@ -112,6 +143,9 @@ class SimpleMemoryManager:
     MEMORY_ISSUE_TITLE = "🧠 Project Memory - AI Assistant Context"
     MEMORY_LABELS = ["enhancement"]  # Using standard GitHub labels
     DEFAULT_LOCK_REASON = "off-topic"  # Prevents non-collaborator comments
+    ARCHIVE_ISSUE_TITLE = "🗄️ Project Memory Archive"
+    DIGEST_MAX_LENGTH = 60000  # GitHub rejects comments over 65536 characters
+    DELETE_BATCH_SIZE = 20  # Comment deletions per GraphQL request
 
     def __init__(
         self,
@@ -119,6 +153,13 @@ class SimpleMemoryManager:
         auto_lock: bool = True,
         lock_reason: Optional[str] = None,
         strict_security: bool = False,
+        use_cache: bool = True,
+        cache_path: Optional[str] = None,
+        cache_ttl: float = 30.0,
+        write_behind: bool = True,
+        buffer_path: Optional[str] = None,
+        flush_interval: float = 2.0,
+        max_pending: int = 10,
     ):
         """
         Initialize Simple Memory Manager
@@ -128,6 +169,13 @@ class SimpleMemoryManager:
             auto_lock: Whether to automatically lock memory issue for security (default: True)
             lock_reason: GitHub lock reason - one of: off-topic, too heated, resolved, spam (default: off-topic)
             strict_security: Enable strict security mode - fails initialization if auto-lock fails (default: False)
+            use_cache: Serve reads from a local SQLite copy of the memory comments (default: True)
+            cache_path: Cache database (default: .github/memory-sync-state/memory_comments.db)
+            cache_ttl: Seconds a refreshed cache is trusted without asking GitHub (default: 30)
+            write_behind: Queue updates on disk and post them in the background (default: True)
+            buffer_path: Update queue database (default: .github/memory-sync-state/memory_pending.db)
+            flush_interval: Seconds queued updates wait to be coalesced per section (default: 2)
+            max_pending: Queued updates that are posted without waiting (default: 10)
         """
         self.repo_path = Path(repo_path or os.getcwd())
         self.logger = logging.getLogger(__name__)
@@ -149,6 +197,33 @@ class SimpleMemoryManager:
         # Get or create the main memory issue
         self.memory_issue_number = self._get_or_create_memory_issue()
 
+        # Local cache of parsed memory comments, refreshed incrementally
+        self.cache_ttl = cache_ttl
+        self._cache_refreshed_at: Optional[float] = None
+        self.cache_path = cache_path or str(
+            self.repo_path / ".github" / "memory-sync-state" / "memory_comments.db"
+        )
+        self.cache: Optional[MemoryCommentCache] = None
+        if use_cache:
+            self.cache = MemoryCommentCache(self.cache_path, self.memory_issue_number)
+
+        # Write-behind queue of updates, posted coalesced by a background thread
+        self.write_buffer: Optional[MemoryWriteBuffer] = None
+        if write_behind:
+            self.write_buffer = MemoryWriteBuffer(
+                buffer_path
+                or str(
+                    self.repo_path
+                    / ".github"
+                    / "memory-sync-state"
+                    / "memory_pending.db"
+                ),
+                self.memory_issue_number,
+                self._post_buffered_update,
+                flush_interval=flush_interval,
+                max_pending=max_pending,
+            )
+
     def _get_or_create_memory_issue(self) -> int:
         """Get existing Project Memory issue or create new one"""
         try:
@@ -268,53 +343,64 @@ enhanced integration with GitHub's collaboration features."""
             Dictionary containing parsed memory data
         """
         try:
-            # Get all comments from memory issue
-            result = self.github._execute_gh_command(
-                [
-                    "issue",
-                    "view",
-                    str(self.memory_issue_number),
-                    "--json",
-                    "comments,createdAt,updatedAt",
-                ]
-            )
-
-            if not result["success"]:
-                raise GitHubError(
-                    "Failed to read memory issue", "read_memory", result, None
+            self._flush_before_read()
+            if self.cache is not None:
+                self._refresh_cache()
+                updates = self.cache.updates()
+                last_updated = self.cache.get_meta("issue_updated_at")
+                total_comments = self.cache.count()
+            else:
+                # Get all comments from memory issue
+                result = self.github._execute_gh_command(
+                    [
+                        "issue",
+                        "view",
+                        str(self.memory_issue_number),
+                        "--json",
+                        "comments,createdAt,updatedAt",
+                    ]
                 )
 
-            issue_data = result["data"]
-            comments = issue_data.get("comments", [])
+                if not result["success"]:
+                    raise GitHubError(
+                        "Failed to read memory issue", "read_memory", result, None
+                    )
+
+                issue_data = result["data"]
+                comments = issue_data.get("comments", [])
+                last_updated = issue_data.get("updatedAt")
+                total_comments = len(comments)
+
+                updates = []
+                for comment in comments:
+                    parsed_comment = self._parse_memory_comment(comment["body"])
+                    if parsed_comment:
+                        details = {
+                            "comment_id": comment.get("id"),
+                            "created_at": comment.get("createdAt"),
+                            "author": comment.get("author", {}).get("login", "unknown"),
+                        }
+                        updates.append((parsed_comment, details))
 
             # Parse memory comments
             memory_data = {
                 "issue_number": self.memory_issue_number,
-                "last_updated": issue_data.get("updatedAt"),
-                "total_comments": len(comments),
+                "last_updated": last_updated,
+                "total_comments": total_comments,
                 "sections": {},
                 "all_updates": [],
             }
 
-            for comment in comments:
-                parsed_comment = self._parse_memory_comment(comment["body"])
-                if parsed_comment:
-                    # Add to all updates
-                    memory_data["all_updates"].append(
-                        {
-                            **parsed_comment,
-                            "comment_id": comment.get("id"),
-                            "created_at": comment.get("createdAt"),
-                            "author": comment.get("author", {}).get("login", "unknown"),
-                        }
-                    )
+            for parsed_comment, details in updates:
+                # Add to all updates
+                memory_data["all_updates"].append({**parsed_comment, **details})
 
-                    # Group by section
-                    comment_section = parsed_comment.get("section", "uncategorized")
-                    if comment_section not in memory_data["sections"]:
-                        memory_data["sections"][comment_section] = []
+                # Group by section
+                comment_section = parsed_comment.get("section", "uncategorized")
+                if comment_section not in memory_data["sections"]:
+                    memory_data["sections"][comment_section] = []
 
-                    memory_data["sections"][comment_section].append(parsed_comment)
+                memory_data["sections"][comment_section].append(parsed_comment)
 
             # Filter by section if requested
             if section:
@@ -336,6 +422,75 @@ enhanced integration with GitHub's collaboration features."""
             self.logger.error(f"Failed to read memory: {e}")
             raise
 
+    def _refresh_cache(self, force: bool = False):
+        """
+        Bring the comment cache up to date with the memory issue.
+
+        Only comments updated since the newest cached one are downloaded.
+        When the issue's comment count then differs from the cache, comments
+        were deleted and the full list is fetched once.
+
+        Args:
+            force: Refresh even if the cache was refreshed within cache_ttl
+        """
+        if self.cache is None:
+            return
+        if (
+            not force
+            and self._cache_refreshed_at is not None
+            and time.monotonic() - self._cache_refreshed_at < self.cache_ttl
+        ):
+            return
+
+        watermark = self.cache.watermark()
+        if watermark:
+            self.cache.upsert(
+                self._fetch_comments(since=watermark), self._parse_memory_comment
+            )
+
+        result = self.github._execute_gh_command(
+            [
+                "api",
+                f"repos/:owner/:repo/issues/{self.memory_issue_number}",
+                "--jq",
+                "{comments: .comments, updatedAt: .updated_at}",
+            ]
+        )
+        if not result["success"]:
+            raise GitHubError(
+                "Failed to read memory issue", "read_memory", result, None
+            )
+        issue_data = result["data"]
+
+        if not watermark or issue_data.get("comments") != self.cache.count():
+            self.cache.replace_all(self._fetch_comments(), self._parse_memory_comment)
+
+        self.cache.set_meta("issue_updated_at", issue_data.get("updatedAt"))
+        self.cache.set_meta("refreshed_at", datetime.now(timezone.utc).isoformat())
+        self._cache_refreshed_at = time.monotonic()
+
+    def _fetch_comments(self, since: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Fetch memory issue comments, optionally only those updated since a time"""
+        endpoint = f"repos/:owner/:repo/issues/{self.memory_issue_number}/comments"
+        endpoint += "?per_page=100"
+        if since:
+            endpoint += f"&since={since}"
+
+        result = self.github._execute_gh_command(
+            ["api", endpoint, "--paginate", "--jq", COMMENT_JQ]
+        )
+        if not result["success"]:
+            raise GitHubError(
+                "Failed to fetch memory comments", "read_memory", result, None
+            )
+
+        # --jq prints one comment per line
+        return [
+            json.loads(line)
+            for line in result.get("raw_output", "").splitlines()
+            if line.strip()
+        ]
+
     def _parse_memory_comment(self, comment_body: str) -> Optional[Dict[str, Any]]:
         """Parse a structured memory comment"""
         try:
@@ -420,6 +575,7 @@ enhanced integration with GitHub's collaboration features."""
         related_prs: Optional[List[int]] = None,
         related_commits: Optional[List[str]] = None,
         related_files: Optional[List[str]] = None,
+        wait: bool = False,
     ) -> Dict[str, Any]:
         """
         Add memory update as GitHub issue comment.
@@ -433,9 +589,15 @@ enhanced integration with GitHub's collaboration features."""
             related_prs: List of related PR numbers
             related_commits: List of related commit hashes
             related_files: List of related file paths
+            wait: Post the comment before returning even with write-behind
+                enabled, after any queued updates (default: False)
 
         Returns:
-            Result dictionary with success status and comment details
+            Result dictionary with success, section, agent and timestamp.
+            A posted update adds comment_id and comment_url. A queued update
+            (write-behind without wait) instead has queued: True and
+            pending_updates, the number of updates waiting to be posted;
+            no comment exists yet
         """
         try:
             # Create memory update object
@@ -450,6 +612,24 @@ enhanced integration with GitHub's collaboration features."""
                 related_files=related_files,
             )
 
+            if self.write_buffer is not None and not wait:
+                pending = self.write_buffer.enqueue(update.to_dict())
+                self.logger.info(
+                    f"Queued memory update to section '{section}' by {agent}"
+                )
+                return {
+                    "success": True,
+                    "queued": True,
+                    "pending_updates": pending,
+                    "section": section,
+                    "agent": agent,
+                    "timestamp": update.timestamp,
+                }
+
+            # Keep the section's updates in order
+            if self.write_buffer is not None:
+                self.write_buffer.flush()
+
             # Format as comment
             comment_body = update.format_comment()
 
@@ -460,6 +640,8 @@ enhanced integration with GitHub's collaboration features."""
                 self.logger.info(
                     f"Added memory update to section '{section}' by {agent}"
                 )
+                # The next read picks the new comment up
+                self._cache_refreshed_at = None
                 return {
                     "success": True,
                     "comment_id": result["data"].get("id"),
@@ -482,20 +664,89 @@ enhanced integration with GitHub's collaboration features."""
                 "agent": agent,
             }
 
+    def _post_buffered_update(self, fields: Dict[str, Any]) -> bool:
+        """Post one coalesced update from the write buffer"""
+        update = MemoryUpdate.from_dict(fields)
+        result = self.github.add_comment(
+            self.memory_issue_number, update.format_comment()
+        )
+        if not result["success"]:
+            self.logger.warning(
+                f"Failed to post queued memory update: {result.get('error')}"
+            )
+            return False
+
+        # The next read picks the new comment up
+        self._cache_refreshed_at = None
+        return True
+
+    def flush_memory(self) -> Dict[str, Any]:
+        """
+        Post queued memory updates without waiting for the flush interval.
+
+        Returns:
+            Counts of updates and comments posted and updates still queued
+        """
+        if self.write_buffer is None:
+            return {
+                "success": True,
+                "updates_posted": 0,
+                "comments_posted": 0,
+                "pending": 0,
+            }
+        try:
+            return {"success": True, **self.write_buffer.flush()}
+        except Exception as e:
+            self.logger.error(f"Failed to flush memory updates: {e}")
+            return {"success": False, "error": str(e)}
+
+    def _flush_before_read(self):
+        """Post this process's queued updates so reads include them"""
+        if self.write_buffer is not None and self.write_buffer.pending_count():
+            self.write_buffer.flush()
+
     def search_memory(
-        self, query: str, section: Optional[str] = None
+        self,
+        query: str,
+        section: Optional[str] = None,
+        agent: Optional[str] = None,
+        limit: int = 20,
     ) -> Dict[str, Any]:
         """
-        Search memory using GitHub Issues search.
+        Search memory, locally when the comment cache is enabled.
+
+        With the cache, every word of the query must start a word of an
+        update's content or related references, and results are ranked by
+        relevance. Without it, GitHub Issues search is used.
 
         Args:
             query: Search query
             section: Optional section filter
+            agent: Optional filter on the agent that added the update
+            limit: Maximum number of results from the local index
 
         Returns:
             Search results with matching memory updates
         """
         try:
+            self._flush_before_read()
+            if self.cache is not None:
+                self._refresh_cache()
+                search_results = [
+                    {**parsed_comment, **details, "score": score}
+                    for parsed_comment, details, score in self.cache.search(
+                        query, section=section, agent=agent, limit=limit
+                    )
+                ]
+                return {
+                    "success": True,
+                    "query": query,
+                    "section_filter": section,
+                    "agent_filter": agent,
+                    "total_results": len(search_results),
+                    "results": search_results,
+                }
+
             # Use GitHub's search API through the memory issue
             search_query = f"{query} in:comments"
 
@@ -588,6 +839,9 @@ enhanced integration with GitHub's collaboration features."""
                     "memory_issue_title": self.MEMORY_ISSUE_TITLE,
                     "memory_labels": self.MEMORY_LABELS,
                 },
+                "write_buffer": (
+                    self.write_buffer.get_stats() if self.write_buffer else None
+                ),
             }
 
         except Exception as e:
@@ -604,6 +858,13 @@ enhanced integration with GitHub's collaboration features."""
         """
         Archive old memory comments by moving them to a separate issue.
 
+        Memory updates older than the threshold are copied, grouped by month,
+        into digest comments on the Project Memory Archive issue and then
+        deleted from the memory issue, which keeps it bounded in size. Each
+        archived update is recorded in the local manifest, so searches still
+        find it and ``resolve_archived`` points at its digest. Comments that
+        are not memory updates are left alone.
+
         Args:
             days_old: Age threshold in days for archiving
             dry_run: If True, only report what would be archived
@@ -611,24 +872,241 @@ enhanced integration with GitHub's collaboration features."""
         Returns:
             Results of cleanup operation
         """
+        manifest = self.cache or MemoryCommentCache(
+            self.cache_path, self.memory_issue_number
+        )
         try:
-            # This is a placeholder for future archival functionality
-            # For now, we rely on GitHub's natural issue history
-
-            memory_data = self.read_memory()
-            total_comments = memory_data.get("total_comments", 0)
+            self._flush_before_read()
+            comments = self._fetch_comments()
+            cutoff = datetime.now(timezone.utc) - timedelta(days=days_old)
+            on_issue = {str(comment["id"]) for comment in comments}
+            pending_deletions = [
+                c for c in manifest.pending_deletions() if c in on_issue
+            ]
+
+            # Group old memory updates by the month they were written
+            periods: Dict[str, List[Any]] = {}
+            for comment in comments:
+                created_at = comment.get("createdAt")
+                if str(comment["id"]) in pending_deletions or not created_at:
+                    continue
+                if _parse_github_time(created_at) >= cutoff:
+                    continue
+                parsed = self._parse_memory_comment(comment.get("body", ""))
+                if parsed:
+                    periods.setdefault(created_at[:7], []).append((comment, parsed))
 
-            return {
+            result: Dict[str, Any] = {
                 "success": True,
                 "dry_run": dry_run,
-                "total_comments": total_comments,
-                "comments_to_archive": 0,  # Would calculate based on age
-                "note": "GitHub Issues provide natural archival through issue history. Manual archival not implemented yet.",
+                "total_comments": len(comments),
+                "comments_to_archive": sum(len(e) for e in periods.values()),
+                "periods": {period: len(e) for period, e in sorted(periods.items())},
+                "pending_deletions": len(pending_deletions),
             }
+            if dry_run or not (periods or pending_deletions):
+                return result
+
+            archive_issue = self._get_or_create_archive_issue(manifest)
+            archived_at = datetime.now(timezone.utc).isoformat()
+            errors = []
+            digests_posted = 0
+            for period, entries in sorted(periods.items()):
+                for body, digest_entries in self._format_digests(period, entries):
+                    posted = self.github.add_comment(archive_issue, body)
+                    if not posted["success"]:
+                        errors.append(
+                            f"Failed to post {period} digest: {posted.get('error')}"
+                        )
+                        # Later digests may continue a comment split here
+                        break
+                    digests_posted += 1
+                    manifest.archive(
+                        digest_entries,
+                        period,
+                        archive_issue,
+                        posted["data"].get("html_url"),
+                        archived_at,
+                    )
+
+            # Originals are deleted only once their digest is posted
+            to_delete = [c for c in manifest.pending_deletions() if c in on_issue]
+            deleted, delete_errors = self._delete_comments(to_delete)
+            manifest.mark_deleted(deleted)
+            manifest.mark_deleted(
+                c for c in manifest.pending_deletions() if c not in on_issue
+            )
+            errors.extend(delete_errors)
+            self._cache_refreshed_at = None
+
+            result.update(
+                {
+                    "success": not errors,
+                    "archive_issue": archive_issue,
+                    "digests_posted": digests_posted,
+                    "comments_deleted": len(deleted),
+                    "pending_deletions": len(to_delete) - len(deleted),
+                    "errors": errors,
+                }
+            )
+            return result
 
         except Exception as e:
             self.logger.error(f"Memory cleanup failed: {e}")
             return {"success": False, "error": str(e)}
+        finally:
+            if manifest is not self.cache:
+                manifest.close()
+
+    def resolve_archived(self, comment_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Find where an archived memory comment went.
+
+        Args:
+            comment_id: Node ID of the original memory issue comment
+
+        Returns:
+            The archived update with its period, archive issue and digest URL,
+            or None if the comment was not archived
+        """
+        manifest = self.cache or MemoryCommentCache(
+            self.cache_path, self.memory_issue_number
+        )
+        try:
+            return manifest.resolve(comment_id)
+        finally:
+            if manifest is not self.cache:
+                manifest.close()
+
+    def _get_or_create_archive_issue(self, manifest: MemoryCommentCache) -> int:
+        """Get the Project Memory Archive issue, creating and locking it once"""
+        known = manifest.get_meta("archive_issue")
+        if known:
+            return int(known)
+
+        search_result = self.github._execute_gh_command(
+            ["issue", "list", "--state", "all", "--json", "number,title"]
+        )
+        issue_number = None
+        if search_result["success"] and search_result["data"]:
+            for issue in search_result["data"]:
+                if issue.get("title") == self.ARCHIVE_ISSUE_TITLE:
+                    issue_number = issue["number"]
+                    break
+
+        if issue_number is None:
+            result = self.github.create_issue(
+                title=self.ARCHIVE_ISSUE_TITLE,
+                body=(
+                    f"Memory updates archived from #{self.memory_issue_number}, "
+                    "one digest comment per month.\n\n"
+                    "Each digest keeps the original comments verbatim, headed by "
+                    "their creation time, author and comment ID."
+                ),
+                labels=self.MEMORY_LABELS,
+            )
+            if not result["success"]:
+                raise GitHubError(
+                    "Failed to create archive issue", "cleanup", result, None
+                )
+            issue_number = result["data"]["number"]
+            self.logger.info(f"Created memory archive issue #{issue_number}")
+            if self.auto_lock and not self._lock_memory_issue(issue_number):
+                self.logger.warning(f"Failed to lock archive issue #{issue_number}")
+
+        manifest.set_meta("archive_issue", str(issue_number))
+        return issue_number
+
+    def _format_digests(
+        self, period: str, entries: List[Any]
+    ) -> List[Tuple[str, List[Any]]]:
+        """
+        Render archived comments as digest bodies within the size limit
+
+        A comment too long for one digest is split into consecutive blocks.
+        Each entry is attached to the digest holding its last block, so it
+        only counts as archived once all of its blocks are posted.
+        """
+        # Leave room for the digest header
+        limit = self.DIGEST_MAX_LENGTH - 500
+        blocks: List[Tuple[str, Optional[Any]]] = []
+        for comment, parsed in entries:
+            heading = (
+                f"#### {comment.get('createdAt')} - "
+                f"@{(comment.get('author') or {}).get('login', 'unknown')} - "
+                f"{comment['id']}"
+            )
+            pieces = _split_text(comment.get("body", "").strip(), limit - 200)
+            for index, piece in enumerate(pieces, 1):
+                suffix = f" (part {index} of {len(pieces)})" if len(pieces) > 1 else ""
+                last = index == len(pieces)
+                blocks.append(
+                    (
+                        f"{heading}{suffix}\n\n{piece}\n",
+                        (comment, parsed) if last else None,
+                    )
+                )
+
+        parts: List[Tuple[List[str], List[Any]]] = []
+        size = 0
+        for block, entry in blocks:
+            if not parts or size + len(block) > limit:
+                parts.append(([], []))
+                size = 0
+            parts[-1][0].append(block)
+            if entry is not None:
+                parts[-1][1].append(entry)
+            size += len(block)
+
+        digests = []
+        for index, (part_blocks, part_entries) in enumerate(parts, 1):
+            header = (
+                f"### MEMORY ARCHIVE {period} - "
+                f"{datetime.now(timezone.utc).isoformat()}\n\n"
+                f"**Source**: #{self.memory_issue_number}\n"
+                f"**Entries**: {len(part_entries)}\n"
+            )
+            if len(parts) > 1:
+                header += f"**Part**: {index} of {len(parts)}\n"
+            digests.append(
+                (header + "\n---\n\n" + "\n".join(part_blocks), part_entries)
+            )
+        return digests
+
+    def _delete_comments(self, comment_ids: List[str]) -> Tuple[List[str], List[str]]:
+        """
+        Delete memory issue comments in batched GraphQL mutations.
+
+        Returns:
+            Deleted comment IDs and error messages for the rest
+        """
+        deleted: List[str] = []
+        errors: List[str] = []
+        for start in range(0, len(comment_ids), self.DELETE_BATCH_SIZE):
+            batch = comment_ids[start : start + self.DELETE_BATCH_SIZE]
+            fields = " ".join(
+                f"d{i}: deleteIssueComment(input: {{id: {json.dumps(comment_id)}}}) "
+                "{ clientMutationId }"
+                for i, comment_id in enumerate(batch)
+            )
+            mutation = f"mutation {{ {fields} }}"
+            result = self.github._execute_gh_command(
+                ["api", "graphql", "-f", f"query={mutation}"]
+            )
+            data = result.get("data") or {}
+            failed = {
+                error.get("path", [None])[0]: error.get("message")
+                for error in data.get("errors", [])
+            }
+            if not result["success"] and not data.get("data"):
+                failed = {f"d{i}": result.get("error") for i in range(len(batch))}
+
+            for i, comment_id in enumerate(batch):
+                if f"d{i}" in failed:
+                    errors.append(f"Failed to delete {comment_id}: {failed[f'd{i}']}")
+                else:
+                    deleted.append(comment_id)
+        return deleted, errors
 
     def _lock_memory_issue(self, issue_number: int) -> bool:
         """
@@ -828,3 +1306,19 @@ enhanced integration with GitHub's collaboration features."""
                 "warnings": [f"Security status check failed: {e}"],
                 "recommendations": ["Fix the underlying error and try again"],
             }
+
+
+def _split_text(text: str, size: int) -> List[str]:
+    """Split text into pieces of at most ``size`` characters, at line ends"""
+    pieces = []
+    while len(text) > size:
+        cut = text.rfind("\n", 0, size) + 1 or size
+        pieces.append(text[:cut])
+        text = text[cut:]
+    pieces.append(text)
+    return pieces
+
+
+def _parse_github_time(value: str) -> datetime:
+    """Parse a GitHub ISO 8601 timestamp, which may end in Z"""
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
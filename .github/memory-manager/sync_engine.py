@@ -6,21 +6,31 @@ This module orchestrates the synchronization between Memory.md tasks and GitHub
 handling conflict resolution, status updates, and maintaining data consistency.
 """
 
+import hashlib
 import json
+import re
 import shutil
-import time
 from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 from github_integration import GitHubIntegration, GitHubIssue
-from memory_parser import MemoryDocument, MemoryParser, Task, TaskStatus
-
+from memory_parser import (
+    MemoryDocument,
+    MemoryParser,
+    Task,
+    TaskIdentityMap,
+    TaskStatus,
+    normalize_task_text,
+)
 
 # Import enums from separate module to avoid circular imports
 from enums import SyncDirection, ConflictResolution
 
+if TYPE_CHECKING:
+    from github_batch import IssueOperation
+
 
 @dataclass
 class SyncConflict:
@@ -57,6 +67,7 @@ class SyncResult:
     conflicts: List[SyncConflict]
     errors: List[str]
     success: bool
+    skipped_unchanged: int = 0
 
     @property
     def duration(self) -> timedelta:
@@ -76,6 +87,25 @@ class SyncResult:
         return result
 
 
+def task_fingerprint(task: Task) -> str:
+    """Hash of the task fields that are rendered into its GitHub issue
+
+    The line number is left out so that moving a task without editing it
+    does not count as a change.
+    """
+    payload = json.dumps(
+        [
+            task.content,
+            task.section,
+            task.status.value,
+            task.priority.value,
+            task.metadata or {},
+        ],
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
 @dataclass
 class SyncConfig:
     """Synchronization configuration"""
@@ -112,17 +142,21 @@ class SyncEngine:
         self.repo_path = repo_path or str(self.memory_path.parent.parent)
         self.config = config or SyncConfig()
 
+        # Create sync state directory
+        self.state_dir = Path(self.repo_path) / ".github" / "memory-sync-state"
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+
         # Initialize components
-        self.parser = MemoryParser()
+        self.identity_map = TaskIdentityMap(str(self.state_dir / "task_ids.json"))
+        self.parser = MemoryParser(self.identity_map)
         self.github = GitHubIntegration(self.repo_path)
 
         # State tracking
         self.last_sync: Optional[datetime] = None
         self.conflicts: List[SyncConflict] = []
 
-        # Create sync state directory
-        self.state_dir = Path(self.repo_path) / ".github" / "memory-sync-state"
-        self.state_dir.mkdir(parents=True, exist_ok=True)
+        # Last-synced fingerprint per task ID, with the issue it was synced to
+        self.task_state: Dict[str, Dict[str, Any]] = {}
 
         self._load_sync_state()
 
@@ -157,6 +191,7 @@ class SyncEngine:
             # Load current state
             memory_doc = self.parser.parse_file(str(self.memory_path))
             github_issues = self.github.get_all_memory_issues()
+            self._adopt_issue_task_ids(memory_doc, github_issues)
 
             result.memory_tasks_processed = len(memory_doc.tasks)
             result.github_issues_processed = len(github_issues)
@@ -183,65 +218,161 @@ class SyncEngine:
             print(f"Sync completed in {result.duration.total_seconds():.1f}s")
             print(
                 f"Created: {result.created_issues}, Updated: {result.updated_issues}, "
-                f"Closed: {result.closed_issues}, Conflicts: {len(result.conflicts)}"
+                f"Closed: {result.closed_issues}, "
+                f"Skipped unchanged: {result.skipped_unchanged}, "
+                f"Conflicts: {len(result.conflicts)}"
             )
 
         return result
 
+    def _adopt_issue_task_ids(
+        self, memory_doc: MemoryDocument, github_issues: List[GitHubIssue]
+    ):
+        """Reattach tasks to issues created under IDs the parser no longer gives
+
+        Issues created before task IDs were content-derived carry sequential
+        IDs such as ``task-001``. A task without an issue takes over the ID
+        of an orphaned issue whose recorded content matches its own.
+        """
+        task_ids = {task.id for task in memory_doc.tasks}
+        orphans: Dict[str, GitHubIssue] = {}
+        for issue in github_issues:
+            if issue.memory_task_id and issue.memory_task_id not in task_ids:
+                match = re.search(
+                    r"# Memory\.md Task\n\n(.+?)\n\n", issue.body, re.DOTALL
+                )
+                if match:
+                    orphans.setdefault(normalize_task_text(match.group(1)), issue)
+
+        if not orphans:
+            return
+        linked = {issue.memory_task_id for issue in github_issues}
+        for task in memory_doc.tasks:
+            if task.id in linked:
+                continue
+            issue = orphans.pop(normalize_task_text(task.content), None)
+            if issue is not None:
+                self.identity_map.adopt(task, issue.memory_task_id)
+
     def _sync_memory_to_github(
         self,
         memory_doc: MemoryDocument,
         github_issues: List[GitHubIssue],
         result: SyncResult,
-    ):
-        """Sync Memory.md tasks to GitHub issues"""
+    ) -> Dict[int, GitHubIssue]:
+        """Sync Memory.md tasks to GitHub issues
+
+        Tasks whose fingerprint and issue ``updatedAt`` both match the last
+        sync are skipped without any API call.
+
+        Returns:
+            Issues as returned by the API after being created or updated,
+            by issue number
+        """
         # Create mapping of existing issues
         issue_map = {
             issue.memory_task_id: issue
             for issue in github_issues
             if issue.memory_task_id
         }
+        synced: Dict[int, GitHubIssue] = {}
+        tasks = self._filter_tasks(memory_doc.tasks)
+        operations: List["IssueOperation"] = []
+        planned: Dict[str, Tuple[Task, str, Optional[GitHubIssue]]] = {}
 
-        for task in self._filter_tasks(memory_doc.tasks):
+        for task in tasks:
             if self.config.dry_run:
                 print(f"[DRY RUN] Would sync task: {task.content[:50]}...")
                 continue
 
-            try:
-                if task.id in issue_map:
-                    # Update existing issue
-                    issue = issue_map[task.id]
-
-                    # Check for conflicts
-                    conflict = self._detect_conflict(task, issue)
-                    if conflict:
-                        result.conflicts.append(conflict)
-                        if self.config.conflict_resolution == ConflictResolution.MANUAL:
-                            continue
-
-                    self.github.update_issue_from_task(issue.number, task)
-                    result.updated_issues += 1
-
-                    # Close issue if task is completed
-                    if (
-                        task.status == TaskStatus.COMPLETED
-                        and issue.state == "open"
-                        and self.config.auto_close_completed
-                    ):
-                        self.github._close_issue(issue.number)
-                        result.closed_issues += 1
-
-                else:
-                    # Create new issue
-                    if self.config.auto_create_issues:
-                        self.github.create_issue_from_task(task)
-                        result.created_issues += 1
-
-                # Rate limiting
-                time.sleep(0.1)
+            fingerprint = task_fingerprint(task)
 
-            except Exception as e:
-                result.errors.append(f"Failed to sync task {task.id}: {str(e)}")
+            if task.id in issue_map:
+                # Update existing issue
+                issue = issue_map[task.id]
+
+                if self._is_unchanged(task.id, fingerprint, issue):
+                    result.skipped_unchanged += 1
+                    continue
+
+                # Check for conflicts
+                conflict = self._detect_conflict(task, issue)
+                if conflict:
+                    result.conflicts.append(conflict)
+                    if self.config.conflict_resolution == ConflictResolution.MANUAL:
+                        continue
+
+                # Closes or reopens the issue to match the task status
+                operations.append(
+                    self.github.plan_update(
+                        issue.number, task, current_state=issue.state
+                    )
+                )
+                planned[task.id] = (task, fingerprint, issue)
+
+            elif self.config.auto_create_issues:
+                operations.append(self.github.plan_create(task))
+                planned[task.id] = (task, fingerprint, None)
+
+        # All writes go out together, batched where the API allows it
+        node_ids = {
+            issue.number: issue.node_id for issue in github_issues if issue.node_id
+        }
+        for outcome in self.github.apply_operations(operations, node_ids):
+            task, fingerprint, issue = planned[outcome.operation.task_id]
+            if outcome.issue_data is None:
+                error = outcome.error or "no issue returned"
+                result.errors.append(f"Failed to sync task {task.id}: {error}")
+                continue
+
+            updated = GitHubIssue.from_gh_json(outcome.issue_data)
+            if issue is None:
+                task.issue_number = updated.number
+                result.created_issues += 1
+            else:
+                result.updated_issues += 1
+                if (
+                    task.status == TaskStatus.COMPLETED
+                    and issue.state == "open"
+                    and self.config.auto_close_completed
+                ):
+                    result.closed_issues += 1
+
+            synced[updated.number] = updated
+            self._record_task_state(task.id, fingerprint, updated)
+
+        if not self.config.dry_run:
+            # Forget tasks that are gone so a reappearing ID is synced afresh
+            task_ids = {task.id for task in tasks}
+            for task_id in list(self.task_state):
+                if task_id not in task_ids:
+                    del self.task_state[task_id]
+
+        return synced
+
+    def _is_unchanged(self, task_id: str, fingerprint: str, issue: GitHubIssue) -> bool:
+        """Whether neither the task nor its issue changed since the last sync"""
+        state = self.task_state.get(task_id)
+        return (
+            state is not None
+            and state.get("fingerprint") == fingerprint
+            and state.get("issue_number") == issue.number
+            and state.get("issue_updated_at") == self._timestamp(issue.updated_at)
+        )
+
+    def _record_task_state(
+        self, task_id: str, fingerprint: str, issue: GitHubIssue
+    ) -> None:
+        """Remember what a task looked like when its issue was last written"""
+        self.task_state[task_id] = {
+            "fingerprint": fingerprint,
+            "issue_number": issue.number,
+            "issue_updated_at": self._timestamp(issue.updated_at),
+        }
+
+    @staticmethod
+    def _timestamp(value: Any) -> str:
+        return value.isoformat() if hasattr(value, "isoformat") else str(value)
 
     def _sync_github_to_memory(
         self,
@@ -278,12 +409,13 @@ class SyncEngine:
     ):
         """Perform bidirectional synchronization"""
         # First sync Memory.md to GitHub
-        self._sync_memory_to_github(memory_doc, github_issues, result)
+        synced = self._sync_memory_to_github(memory_doc, github_issues, result)
 
-        # Then sync GitHub changes back to Memory.md
-        # Re-fetch issues to get latest state
-        updated_issues = self.github.get_all_memory_issues()
-        self._sync_github_to_memory(memory_doc, updated_issues, result)
+        # Then sync GitHub changes back to Memory.md, using the issues the
+        # API returned for whatever was just written instead of re-fetching
+        current_issues = [synced.pop(issue.number, issue) for issue in github_issues]
+        current_issues.extend(synced.values())
+        self._sync_github_to_memory(memory_doc, current_issues, result)
 
     def _filter_tasks(self, tasks: List[Task]) -> List[Task]:
         """Filter tasks based on configuration"""
@@ -389,6 +521,7 @@ class SyncEngine:
                     state = json.load(f)
                     if "last_sync" in state:
                         self.last_sync = datetime.fromisoformat(state["last_sync"])
+                    self.task_state = state.get("task_fingerprints", {})
             except Exception as e:
                 print(f"Warning: Could not load sync state: {e}")
 
@@ -399,6 +532,7 @@ class SyncEngine:
         state = {
             "last_sync": result.end_time.isoformat(),
             "last_result": result.to_dict(),
+            "task_fingerprints": self.task_state,
         }
 
         try:
@@ -425,6 +559,7 @@ class SyncEngine:
             "last_sync": self.last_sync.isoformat() if self.last_sync else None,
             "config": config_dict,
             "pending_conflicts": len(self.conflicts),
+            "tracked_tasks": len(self.task_state),
             "memory_file": str(self.memory_path),
             "state_dir": str(self.state_dir),
         }
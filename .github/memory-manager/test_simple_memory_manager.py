@@ -6,6 +6,7 @@ This test suite validates the GitHub Issues-only memory management system,
 ensuring all operations work correctly without Memory.md file dependencies.
 """
 
+import json
 import unittest
 import tempfile
 import shutil
@@ -182,7 +183,7 @@ class TestSimpleMemoryManager(unittest.TestCase):
 
     def test_update_memory(self):
         """Test memory update operation"""
-        manager = SimpleMemoryManager(str(self.repo_path))
+        manager = SimpleMemoryManager(str(self.repo_path), write_behind=False)
 
         # Mock successful comment creation
         self.github_mock.add_comment.return_value = {
@@ -216,9 +217,57 @@ class TestSimpleMemoryManager(unittest.TestCase):
         self.assertIn("Test memory update", comment_body)
         self.assertIn("TestAgent", comment_body)
 
+    def test_update_memory_write_behind(self):
+        """Test queued updates are posted as one comment per section"""
+        manager = SimpleMemoryManager(
+            str(self.repo_path), use_cache=False, flush_interval=60
+        )
+        self.github_mock.add_comment.return_value = {"success": True, "data": {}}
+
+        for content in ("First goal", "Second goal"):
+            result = manager.update_memory(
+                content=content, section="current-goals", agent="TestAgent"
+            )
+            self.assertTrue(result["queued"])
+        self.github_mock.add_comment.assert_not_called()
+
+        flushed = manager.flush_memory()
+        manager.write_buffer.close()
+
+        self.assertEqual(flushed["updates_posted"], 2)
+        self.github_mock.add_comment.assert_called_once_with(42, ANY)
+        comment_body = self.github_mock.add_comment.call_args[0][1]
+        self.assertIn("First goal\n\nSecond goal", comment_body)
+
+    def test_update_memory_wait(self):
+        """Test wait posts after queued updates and returns the comment"""
+        manager = SimpleMemoryManager(
+            str(self.repo_path), use_cache=False, flush_interval=60
+        )
+        self.github_mock.add_comment.return_value = {
+            "success": True,
+            "data": {
+                "id": 789,
+                "html_url": "https://github.com/test/repo/issues/42#issuecomment-789",
+            },
+        }
+
+        manager.update_memory(content="Queued", section="current-goals", agent="A")
+        result = manager.update_memory(
+            content="Posted", section="current-goals", agent="A", wait=True
+        )
+        manager.write_buffer.close()
+
+        self.assertNotIn("queued", result)
+        self.assertEqual(result["comment_id"], 789)
+        bodies = [c[0][1] for c in self.github_mock.add_comment.call_args_list]
+        self.assertEqual(len(bodies), 2)
+        self.assertIn("Queued", bodies[0])
+        self.assertIn("Posted", bodies[1])
+
     def test_read_memory(self):
         """Test memory reading operation"""
-        manager = SimpleMemoryManager(str(self.repo_path))
+        manager = SimpleMemoryManager(str(self.repo_path), use_cache=False)
 
         # Mock issue with comments
         self.github_mock._execute_gh_command.return_value = {
@@ -254,7 +303,7 @@ class TestSimpleMemoryManager(unittest.TestCase):
 
     def test_read_memory_filtered_section(self):
         """Test reading memory with section filter"""
-        manager = SimpleMemoryManager(str(self.repo_path))
+        manager = SimpleMemoryManager(str(self.repo_path), use_cache=False)
 
         # Mock issue with multiple section comments
         self.github_mock._execute_gh_command.return_value = {
@@ -328,7 +377,7 @@ spanning multiple lines.
 
     def test_search_memory(self):
         """Test memory search operation"""
-        manager = SimpleMemoryManager(str(self.repo_path))
+        manager = SimpleMemoryManager(str(self.repo_path), use_cache=False)
 
         # Mock search results
         self.github_mock._execute_gh_command.return_value = {
@@ -356,7 +405,7 @@ spanning multiple lines.
 
     def test_get_memory_status(self):
         """Test memory status operation"""
-        manager = SimpleMemoryManager(str(self.repo_path))
+        manager = SimpleMemoryManager(str(self.repo_path), use_cache=False)
 
         # Mock issue details
         self.github_mock.get_issue.return_value = {
@@ -392,28 +441,117 @@ spanning multiple lines.
         self.assertEqual(result["memory_content"]["total_comments"], 1)
         self.assertIn("current-goals", result["memory_content"]["sections"])
 
+    def _cleanup_comments(self):
+        """Old and recent comments in the REST --jq line format"""
+        memory_body = (
+            "### CURRENT-GOALS - 2024-01-05T12:00:00\n\n**Content**:\n{}\n\n"
+            "---\n*Added by: TestAgent*"
+        )
+        comments = [
+            ("IC_1", "2024-01-05T12:00:00Z", memory_body.format("Old goal")),
+            ("IC_2", "2024-01-06T12:00:00Z", "Plain discussion comment"),
+            ("IC_3", "2099-01-01T12:00:00Z", memory_body.format("Recent goal")),
+        ]
+        return "\n".join(
+            json.dumps(
+                {
+                    "id": comment_id,
+                    "body": body,
+                    "createdAt": created_at,
+                    "updatedAt": created_at,
+                    "author": {"login": "testuser"},
+                }
+            )
+            for comment_id, created_at, body in comments
+        )
+
     def test_cleanup_old_memory(self):
-        """Test memory cleanup operation"""
-        manager = SimpleMemoryManager(str(self.repo_path))
+        """Test memory cleanup dry run"""
+        manager = SimpleMemoryManager(
+            str(self.repo_path), use_cache=False, write_behind=False
+        )
 
         # Mock memory content for cleanup
         self.github_mock._execute_gh_command.return_value = {
             "success": True,
-            "data": {
-                "comments": [{"body": "test comment 1"}, {"body": "test comment 2"}]
-            },
+            "raw_output": self._cleanup_comments(),
         }
 
         result = manager.cleanup_old_memory(days_old=30, dry_run=True)
 
         self.assertTrue(result["success"])
         self.assertTrue(result["dry_run"])
-        self.assertEqual(result["total_comments"], 2)
-        self.assertIn("GitHub Issues provide natural archival", result["note"])
+        self.assertEqual(result["total_comments"], 3)
+        self.assertEqual(result["comments_to_archive"], 1)
+        self.assertEqual(result["periods"], {"2024-01": 1})
+        self.github_mock.add_comment.assert_not_called()
+
+    def test_cleanup_archives_and_deletes(self):
+        """Test old updates move to a digest and leave the memory issue"""
+        manager = SimpleMemoryManager(str(self.repo_path), write_behind=False)
+        self.github_mock.create_issue.return_value = {
+            "success": True,
+            "data": {"number": 43},
+        }
+        self.github_mock.add_comment.return_value = {
+            "success": True,
+            "data": {"html_url": "https://github.com/test/repo/issues/43#c1"},
+        }
+
+        def gh(args):
+            if args[:2] == ["api", "graphql"]:
+                return {"success": True, "data": {"data": {"d0": {}}}}
+            if args[0] == "api":
+                return {"success": True, "raw_output": self._cleanup_comments()}
+            return {"success": True, "data": []}
+
+        self.github_mock._execute_gh_command.side_effect = gh
+
+        result = manager.cleanup_old_memory(days_old=30, dry_run=False)
+
+        self.assertTrue(result["success"])
+        self.assertEqual(result["archive_issue"], 43)
+        self.assertEqual(result["comments_deleted"], 1)
+        digest = self.github_mock.add_comment.call_args[0][1]
+        self.assertIn("### MEMORY ARCHIVE 2024-01", digest)
+        self.assertIn("Old goal", digest)
+        self.assertNotIn("Recent goal", digest)
+
+        archived = manager.resolve_archived("IC_1")
+        self.assertEqual(archived["archive_issue"], 43)
+        self.assertTrue(archived["deleted"])
+        self.assertEqual(archived["update"]["content"], "Old goal")
+
+    def test_oversized_comment_is_split_across_digests(self):
+        """Test a comment near GitHub's size limit fits in valid digests"""
+        manager = SimpleMemoryManager(str(self.repo_path), write_behind=False)
+        body = "\n".join(f"line {n:05d} " + "x" * 40 for n in range(1400))
+        self.assertGreater(len(body), 65000)
+        comment = {
+            "id": "IC_1",
+            "body": body,
+            "createdAt": "2024-01-05T12:00:00Z",
+            "author": {"login": "testuser"},
+        }
+        small = {"id": "IC_2", "body": "Small", "createdAt": "2024-01-06T12:00:00Z"}
+
+        digests = manager._format_digests("2024-01", [(comment, {}), (small, {})])
+
+        self.assertGreater(len(digests), 1)
+        for digest, _ in digests:
+            self.assertLessEqual(len(digest), manager.DIGEST_MAX_LENGTH)
+        joined = "".join(digest for digest, _ in digests)
+        for line in body.splitlines():
+            self.assertIn(line, joined)
+        self.assertIn("IC_1 (part 1 of", digests[0][0])
+        # Each entry counts as archived once its last block is posted
+        attached = [entry[0]["id"] for _, part in digests for entry in part]
+        self.assertEqual(attached, ["IC_1", "IC_2"])
+        self.assertEqual(digests[-1][1][0][0]["id"], "IC_1")
 
     def test_error_handling_github_failure(self):
         """Test error handling when GitHub operations fail"""
-        manager = SimpleMemoryManager(str(self.repo_path))
+        manager = SimpleMemoryManager(str(self.repo_path), write_behind=False)
 
         # Mock GitHub API failure
         self.github_mock.add_comment.return_value = {
@@ -501,7 +639,9 @@ class TestIntegration(unittest.TestCase):
         ]
 
         # Initialize manager
-        manager = SimpleMemoryManager(str(self.repo_path))
+        manager = SimpleMemoryManager(
+            str(self.repo_path), use_cache=False, write_behind=False
+        )
 
         # Test memory update
         update_result = manager.update_memory(
@@ -6,6 +6,7 @@ with the existing agent-manager system in Gadugi.
 """
 
 import logging
+import os
 from typing import Dict, List, Optional, Any, Union
 from pathlib import Path
 
@@ -14,9 +15,25 @@ from .execution_engine import (
     ExecutionRequest,
     ExecutionResponse,
 )
+from .host_process import HOST_POPEN, current_sandbox_session, set_sandbox_session
+from .sandbox_session import SandboxProcess, SandboxSession
 
 logger = logging.getLogger(__name__)
 
+# Positional parameters of subprocess.Popen after args
+POPEN_POSITIONAL_ARGS = (
+    "bufsize",
+    "executable",
+    "stdin",
+    "stdout",
+    "stderr",
+    "preexec_fn",
+    "close_fds",
+    "shell",
+    "cwd",
+    "env",
+)
+
 
 class AgentContainerExecutor:
     """
@@ -241,6 +258,37 @@ class AgentContainerExecutor:
             "error": response.error_message,
         }
 
+    def open_session(
+        self,
+        runtime: str = "shell",
+        security_policy: Optional[str] = None,
+        environment: Optional[Dict[str, str]] = None,
+        user_id: Optional[str] = None,
+        idle_timeout: Optional[float] = None,
+    ) -> SandboxSession:
+        """
+        Start a sandbox session for running many commands in one container.
+
+        Args:
+            runtime: Runtime image to run commands in
+            security_policy: Security policy to use (defaults to default_policy)
+            environment: Environment variables for every command
+            user_id: User ID for audit logging
+            idle_timeout: Seconds without commands after which the container
+                is stopped until the next command
+
+        Returns:
+            Started sandbox session; close it when the agent session ends
+        """
+        return SandboxSession(
+            self.execution_engine,
+            runtime=runtime,
+            security_policy=security_policy or self.default_policy,
+            environment=environment,
+            user_id=user_id,
+            idle_timeout=idle_timeout,
+        ).start()
+
     def get_system_status(self) -> Dict[str, Any]:
         """Get system status and statistics."""
         return self.execution_engine.get_execution_statistics()
@@ -267,52 +315,81 @@ def create_agent_executor(policy: str = "standard") -> AgentContainerExecutor:
     return AgentContainerExecutor(default_policy=policy)
 
 
-def replace_shell_execution():
+class _SandboxPopenMeta(type):
+    """Keeps ``isinstance`` checks against ``subprocess.Popen`` working."""
+
+    def __instancecheck__(cls, instance: Any) -> bool:
+        return isinstance(instance, (HOST_POPEN, SandboxProcess))
+
+
+class SandboxedPopen(HOST_POPEN, metaclass=_SandboxPopenMeta):  # type: ignore[misc]
     """
-    Replace shell execution with container execution.
+    ``subprocess.Popen`` replacement installed by ``replace_shell_execution``.
 
-    This function can be called to monkey-patch subprocess calls
-    to use container execution instead.
+    While a sandbox session is installed, commands run in it and return a
+    ``SandboxProcess``; otherwise, and inside ``run_on_host``, this is the
+    host ``Popen``.
     """
-    import subprocess
 
-    # Store original subprocess functions
-    original_run = subprocess.run
-    original_popen = subprocess.Popen
+    def __new__(cls, args, *popen_args, **kwargs):  # type: ignore[no-untyped-def]
+        session = current_sandbox_session()
+        if session is None:
+            return HOST_POPEN(args, *popen_args, **kwargs)
+
+        kwargs.update(zip(POPEN_POSITIONAL_ARGS, popen_args))
+        env = kwargs.pop("env", None)
+        if env is not None:
+            # Forward only overrides so host secrets stay out of the sandbox
+            kwargs["env"] = {k: v for k, v in env.items() if os.environ.get(k) != v}
+        if kwargs.pop("cwd", None) is not None:
+            logger.debug("Ignoring host working directory for sandboxed command")
+
+        return session.popen(args, **kwargs)
+
+
+def replace_shell_execution(policy: str = "standard"):
+    """
+    Replace shell execution with container execution.
 
-    # Create global executor
-    global_executor = create_agent_executor()
+    Installs ``SandboxedPopen`` as ``subprocess.Popen`` so subprocess calls
+    (``run``, ``call``, ``check_output`` and ``Popen`` itself) from any
+    thread run inside one sandbox session container. Only the runtime's own
+    commands (see ``host_process.run_on_host``) run on the host. The session is
+    started here and torn down by the returned restore function. Host
+    working directories are ignored and only environment variables that
+    differ from the host environment are forwarded. Code that imported
+    ``Popen`` directly is not affected.
 
-    def containerized_run(*args, **kwargs):
-        """Containerized replacement for subprocess.run."""
-        # Extract command
-        if args:
-            command = args[0]
-        else:
-            command = kwargs.get("args", [])
+    Args:
+        policy: Security policy for the sandbox session
 
-        # Use container execution
-        result = global_executor.execute_command(command)
+    Returns:
+        Function restoring subprocess and closing the session
+    """
+    import subprocess
 
-        # Create subprocess.CompletedProcess-like result
-        class ContainerResult:
-            def __init__(self, result_dict):
-                self.returncode = result_dict["exit_code"]
-                self.stdout = result_dict["stdout"]
-                self.stderr = result_dict["stderr"]
-                self.args = command
+    # Store original subprocess functions
+    original_popen = subprocess.Popen
 
-        return ContainerResult(result)
+    # Create global executor and its session container
+    global_executor = create_agent_executor(policy)
+    try:
+        session = global_executor.open_session()
+    except Exception:
+        global_executor.shutdown()
+        raise
 
-    # Replace subprocess functions
-    subprocess.run = containerized_run
+    # Route every subprocess call into the session
+    set_sandbox_session(session)
+    subprocess.Popen = SandboxedPopen  # type: ignore[misc]
 
     logger.info("Shell execution replaced with container execution")
 
     # Return cleanup function
     def restore_shell_execution():
-        subprocess.run = original_run
-        subprocess.Popen = original_popen
+        subprocess.Popen = original_popen  # type: ignore[misc]
+        set_sandbox_session(None)
+        session.close()
         global_executor.shutdown()
         logger.info("Shell execution restored")
 
@@ -0,0 +1,602 @@
+"""
+Asyncio Docker Engine API Client.
+
+Talks to the Docker daemon over its Unix socket (or TCP) with aiohttp, so
+container lifecycles are driven from an event loop instead of blocking a
+thread per HTTP call. All requests share one pooled connector.
+
+:class:`AsyncContainerManager` mirrors :class:`ContainerManager` on top of
+the client and backs ``ContainerExecutionEngine.execute_async``.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import aiohttp
+
+from .cgroup_reader import CgroupV2Reader
+from .container_manager import (
+    ContainerConfig,
+    ContainerResult,
+    ContainerStatus,
+    usage_from_cgroup,
+    usage_from_docker_stats,
+)
+from .execution_history import DEFAULT_INLINE_LIMIT, ExecutionHistory, OutputStore
+
+# Import Enhanced Separation shared modules
+import sys
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", ".claude", "shared", "utils")
+)
+try:
+    from error_handling import GadugiError  # type: ignore[import-not-found]
+except ImportError:
+
+    class GadugiError(Exception):  # type: ignore[import-not-found]
+        pass
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DOCKER_HOST = "unix:///var/run/docker.sock"
+
+# Oldest Engine API with one-shot stats (Docker 20.10)
+DEFAULT_API_VERSION = "1.41"
+
+# Stream ids in the multiplexed log format of non-TTY containers
+STDOUT_STREAM = 1
+STDERR_STREAM = 2
+
+_MEMORY_UNITS = {"": 1, "b": 1, "k": 1024, "m": 1024**2, "g": 1024**3}
+
+
+class DockerAPIError(Exception):
+    """
+    Error response from (or failure to reach) the Docker daemon.
+
+    Like ``docker.errors.APIError`` this is a plain exception; the
+    container manager wraps it in ``GadugiError`` for its callers.
+    """
+
+    def __init__(self, status: Optional[int], message: str):
+        super().__init__(f"Docker API error {status or 'unreachable'}: {message}")
+        self.status = status
+        self.message = message
+
+
+def parse_memory_limit(limit: str) -> int:
+    """Convert a Docker memory string such as ``512m`` to bytes."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([bkmg]?)b?\s*", str(limit).lower())
+    if not match:
+        raise GadugiError(f"Invalid memory limit '{limit}'")
+    return int(float(match.group(1)) * _MEMORY_UNITS[match.group(2)])
+
+
+def demultiplex_logs(data: bytes) -> Tuple[bytes, bytes]:
+    """
+    Split a multiplexed log stream into stdout and stderr.
+
+    Each frame is an 8-byte header (stream id, three zero bytes, big-endian
+    length) followed by the payload. TTY containers send raw output, which
+    is returned as stdout.
+    """
+    stdout: List[bytes] = []
+    stderr: List[bytes] = []
+    position = 0
+    while position < len(data):
+        header = data[position : position + 8]
+        if (
+            len(header) < 8
+            or header[0] not in (0, STDOUT_STREAM, STDERR_STREAM)
+            or header[1:4] != b"\0\0\0"
+        ):
+            if position == 0:
+                return data, b""  # Not multiplexed
+            break
+        size = int.from_bytes(header[4:8], "big")
+        payload = data[position + 8 : position + 8 + size]
+        (stderr if header[0] == STDERR_STREAM else stdout).append(payload)
+        position += 8 + size
+
+    return b"".join(stdout), b"".join(stderr)
+
+
+def container_config_to_api(config: ContainerConfig) -> Dict[str, Any]:
+    """
+    Build an Engine API create body with the same hardening as
+    ``ContainerManager.create_container``.
+    """
+    binds = [
+        f"{host}:{mount['bind']}:{mount.get('mode', 'ro')}"
+        for host, mount in (config.volumes or {}).items()
+    ]
+    return {
+        "Image": config.image,
+        "Cmd": config.command,
+        "User": config.user,
+        "WorkingDir": config.working_dir,
+        "Env": [f"{key}={value}" for key, value in (config.environment or {}).items()],
+        "HostConfig": {
+            "NetworkMode": config.network_mode,
+            "ReadonlyRootfs": config.read_only,
+            "Memory": parse_memory_limit(config.memory_limit),
+            "NanoCpus": int(float(config.cpu_limit) * 1e9),
+            "SecurityOpt": config.security_opt or ["no-new-privileges:true"],
+            "CapDrop": config.cap_drop or ["ALL"],
+            "Binds": binds,
+            "Tmpfs": {"/tmp": "rw,noexec,nosuid,size=100m"},
+            "Ulimits": [
+                {"Name": "nproc", "Soft": 1024, "Hard": 1024},
+                {"Name": "nofile", "Soft": 1024, "Hard": 1024},
+            ],
+        },
+    }
+
+
+class AsyncDockerClient:
+    """
+    Minimal asyncio client for the Docker Engine API.
+
+    One ``aiohttp`` session and connector pool is shared by every request;
+    ``max_connections`` bounds concurrent connections to the daemon. The
+    session is bound to the event loop that first uses it.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        api_version: str = DEFAULT_API_VERSION,
+        max_connections: int = 100,
+        timeout: float = 60.0,
+    ):
+        """
+        Initialize Docker API client.
+
+        Args:
+            base_url: ``unix://`` socket or ``tcp://``/``http://`` address,
+                ``DOCKER_HOST`` or the default socket if not given
+            api_version: Engine API version prefix
+            max_connections: Pooled connections to the daemon
+            timeout: Default seconds per request
+
+        Raises:
+            GadugiError: If the address scheme is unsupported
+        """
+        base_url = base_url or os.environ.get("DOCKER_HOST") or DEFAULT_DOCKER_HOST
+        self.base_url = base_url
+        self.api_version = api_version
+        self.max_connections = max_connections
+        self.timeout = timeout
+
+        self._socket_path: Optional[str] = None
+        if base_url.startswith("unix://"):
+            self._socket_path = base_url[len("unix://") :]
+            self._origin = "http://docker"
+        elif base_url.startswith(("tcp://", "http://")):
+            self._origin = "http://" + base_url.split("://", 1)[1].rstrip("/")
+        else:
+            raise GadugiError(f"Unsupported Docker host '{base_url}'")
+
+        self._session: Optional[aiohttp.ClientSession] = None
+
+        # Request statistics
+        self.requests_sent = 0
+        self.request_errors = 0
+
+    async def __aenter__(self) -> "AsyncDockerClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector: aiohttp.BaseConnector
+            if self._socket_path is not None:
+                connector = aiohttp.UnixConnector(
+                    path=self._socket_path, limit=self.max_connections
+                )
+            else:
+                connector = aiohttp.TCPConnector(limit=self.max_connections)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the session and its pooled connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        body: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = -1,
+    ) -> bytes:
+        """
+        Send one API request and return the response body.
+
+        Args:
+            timeout: Seconds for this request, None for no limit, negative
+                for the client default
+
+        Raises:
+            DockerAPIError: On error responses or connection failures
+            asyncio.TimeoutError: If the request timed out
+        """
+        session = self._get_session()
+        url = f"{self._origin}/v{self.api_version}{path}"
+        options: Dict[str, Any] = {
+            "params": {k: str(v) for k, v in (params or {}).items()},
+        }
+        if body is not None:
+            options["json"] = body
+        if timeout is None or timeout >= 0:
+            options["timeout"] = aiohttp.ClientTimeout(total=timeout)
+        self.requests_sent += 1
+
+        try:
+            async with session.request(method, url, **options) as response:
+                data = await response.read()
+                if response.status >= 400:
+                    self.request_errors += 1
+                    try:
+                        message = json.loads(data)["message"]
+                    except (ValueError, KeyError, TypeError):
+                        message = data.decode("utf-8", errors="replace")
+                    raise DockerAPIError(response.status, message)
+                return data
+        except asyncio.TimeoutError:
+            self.request_errors += 1
+            raise
+        except aiohttp.ClientError as e:
+            self.request_errors += 1
+            raise DockerAPIError(None, str(e))
+
+    async def _request_json(self, method: str, path: str, **kwargs) -> Any:
+        data = await self._request(method, path, **kwargs)
+        return json.loads(data) if data else {}
+
+    async def ping(self) -> bool:
+        """Check that the daemon responds."""
+        return await self._request("GET", "/_ping") == b"OK"
+
+    async def create_container(
+        self, body: Dict[str, Any], name: Optional[str] = None
+    ) -> str:
+        """Create a container and return its Docker ID."""
+        params = {"name": name} if name else None
+        response = await self._request_json(
+            "POST", "/containers/create", params=params, body=body
+        )
+        return response["Id"]
+
+    async def start_container(self, docker_id: str) -> None:
+        await self._request("POST", f"/containers/{docker_id}/start")
+
+    async def wait_container(
+        self, docker_id: str, timeout: Optional[float] = None
+    ) -> int:
+        """
+        Wait for a container to exit.
+
+        Raises:
+            asyncio.TimeoutError: If it is still running after ``timeout``
+        """
+        response = await self._request_json(
+            "POST", f"/containers/{docker_id}/wait", timeout=timeout
+        )
+        return int(response.get("StatusCode", 1))
+
+    async def kill_container(self, docker_id: str, signal: str = "SIGKILL") -> None:
+        await self._request(
+            "POST", f"/containers/{docker_id}/kill", params={"signal": signal}
+        )
+
+    async def stop_container(self, docker_id: str, timeout: int = 10) -> None:
+        await self._request(
+            "POST",
+            f"/containers/{docker_id}/stop",
+            params={"t": timeout},
+            timeout=timeout + self.timeout,
+        )
+
+    async def remove_container(self, docker_id: str, force: bool = True) -> None:
+        await self._request(
+            "DELETE", f"/containers/{docker_id}", params={"force": int(force)}
+        )
+
+    async def container_logs(self, docker_id: str) -> Tuple[bytes, bytes]:
+        """Fetch a container's complete stdout and stderr."""
+        data = await self._request(
+            "GET",
+            f"/containers/{docker_id}/logs",
+            params={"stdout": 1, "stderr": 1},
+        )
+        return demultiplex_logs(data)
+
+    async def container_stats(self, docker_id: str) -> Dict[str, Any]:
+        """Fetch a single stats snapshot."""
+        return await self._request_json(
+            "GET",
+            f"/containers/{docker_id}/stats",
+            params={"stream": 0, "one-shot": 1},
+        )
+
+    async def inspect_container(self, docker_id: str) -> Dict[str, Any]:
+        return await self._request_json("GET", f"/containers/{docker_id}/json")
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get client status information."""
+        return {
+            "base_url": self.base_url,
+            "api_version": self.api_version,
+            "max_connections": self.max_connections,
+            "session_open": self._session is not None and not self._session.closed,
+            "requests_sent": self.requests_sent,
+            "request_errors": self.request_errors,
+        }
+
+
+class AsyncContainerManager:
+    """
+    Asyncio counterpart of :class:`ContainerManager`.
+
+    Runs container lifecycles as coroutines over one pooled
+    :class:`AsyncDockerClient`, so many executions share one event loop.
+    ``max_concurrent`` bounds how many containers exist at once.
+    """
+
+    def __init__(
+        self,
+        client: Optional[AsyncDockerClient] = None,
+        max_concurrent: int = 256,
+        cgroup_reader: Optional[CgroupV2Reader] = None,
+        history_size: int = 1000,
+        output_store_dir: Optional[Path] = None,
+        inline_output_limit: int = DEFAULT_INLINE_LIMIT,
+        output_store: Optional[OutputStore] = None,
+    ):
+        """
+        Initialize async container manager.
+
+        Args:
+            client: Docker API client, from ``DOCKER_HOST`` by default;
+                its pool should be larger than ``max_concurrent``
+            max_concurrent: Containers alive at the same time
+            cgroup_reader: Reader for final container resource usage
+            history_size: Executions kept in the execution history
+            output_store_dir: Directory for output too large to keep in memory
+            inline_output_limit: Characters of each output kept in memory
+            output_store: Store for large output, instead of one opened on
+                ``output_store_dir``; stores must not share a directory
+        """
+        # Every running container holds a connection for its wait request,
+        # so the pool needs headroom for creates, logs and removals
+        self.client = client or AsyncDockerClient(max_connections=max_concurrent + 32)
+        self.max_concurrent = max_concurrent
+        if self.client.max_connections <= max_concurrent:
+            logger.warning(
+                f"Docker connection pool ({self.client.max_connections}) is not "
+                f"larger than max_concurrent ({max_concurrent}); waits will queue"
+            )
+        self.cgroup_reader = cgroup_reader or CgroupV2Reader()
+        self.active_containers: Dict[str, str] = {}  # container ID -> Docker ID
+        self.execution_history = ExecutionHistory(
+            max_records=history_size,
+            output_store=output_store
+            or (OutputStore(output_store_dir) if output_store_dir else None),
+            inline_limit=inline_output_limit,
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Created on first use so it belongs to the running loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        return self._semaphore
+
+    async def create_container(self, config: ContainerConfig) -> str:
+        """
+        Create a new container with security hardening.
+
+        Returns:
+            Container ID
+
+        Raises:
+            GadugiError: If container creation fails
+        """
+        container_id = str(uuid.uuid4())
+        try:
+            docker_id = await self.client.create_container(
+                container_config_to_api(config), name=f"gadugi-{container_id[:8]}"
+            )
+        except DockerAPIError as e:
+            raise GadugiError(f"Docker API error creating container: {e}")
+
+        self.active_containers[container_id] = docker_id
+        logger.info(f"Container created: {container_id[:8]} ({docker_id[:12]})")
+        return container_id
+
+    async def start_container(self, container_id: str) -> None:
+        """
+        Start a container.
+
+        Raises:
+            GadugiError: If container start fails
+        """
+        if container_id not in self.active_containers:
+            raise GadugiError(f"Container {container_id} not found")
+
+        try:
+            await self.client.start_container(self.active_containers[container_id])
+            logger.info(f"Container started: {container_id[:8]}")
+        except DockerAPIError as e:
+            raise GadugiError(f"Docker API error starting container: {e}")
+
+    async def execute_container(
+        self,
+        config: ContainerConfig,
+        on_started: Optional[Callable[[str, str], None]] = None,
+    ) -> ContainerResult:
+        """
+        Execute a container from creation to completion.
+
+        Args:
+            config: Container configuration
+            on_started: Called with (container_id, docker_id) once the
+                container is running
+
+        Returns:
+            Container execution result
+
+        Raises:
+            GadugiError: If execution fails
+        """
+        async with self._get_semaphore():
+            start_time = time.time()
+            container_id = None
+
+            try:
+                container_id = await self.create_container(config)
+                await self.start_container(container_id)
+                started = time.monotonic()
+                docker_id = self.active_containers[container_id]
+
+                if on_started:
+                    try:
+                        on_started(container_id, docker_id)
+                    except Exception as e:
+                        logger.warning(f"Container start callback failed: {e}")
+
+                # Wait for completion with timeout
+                try:
+                    exit_code = await self.client.wait_container(
+                        docker_id, timeout=config.timeout
+                    )
+                except (asyncio.TimeoutError, DockerAPIError) as e:
+                    logger.warning(f"Container timeout or error: {e!r}")
+                    await self.stop_container(container_id, force=True)
+                    exit_code = 124  # Timeout exit code
+
+                # Get logs, kept apart unlike the combined synchronous stream
+                try:
+                    out, err = await self.client.container_logs(docker_id)
+                    stdout = out.decode("utf-8", errors="replace")
+                    stderr = err.decode("utf-8", errors="replace")
+                except (asyncio.TimeoutError, DockerAPIError) as e:
+                    logger.warning(f"Failed to retrieve container logs: {e!r}")
+                    stdout = ""
+                    stderr = f"Log retrieval failed: {e}"
+
+                resource_usage = await self._get_resource_usage(docker_id, started)
+                execution_time = time.time() - start_time
+
+                result = ContainerResult(
+                    container_id=container_id,
+                    exit_code=exit_code,
+                    stdout=stdout,
+                    stderr=stderr,
+                    execution_time=execution_time,
+                    resource_usage=resource_usage,
+                    status=ContainerStatus.STOPPED
+                    if exit_code == 0
+                    else ContainerStatus.FAILED,
+                )
+                self.execution_history.add(result, image=config.image)
+
+                logger.info(
+                    f"Container execution completed: {container_id[:8]} "
+                    f"(exit_code={exit_code}, time={execution_time:.2f}s)"
+                )
+                return result
+
+            finally:
+                # Always cleanup container, even if the task was cancelled
+                if container_id:
+                    await asyncio.shield(self.cleanup_container(container_id))
+
+    async def stop_container(
+        self, container_id: str, force: bool = False, timeout: int = 10
+    ) -> None:
+        """Stop a running container, killing it if ``force`` is set."""
+        docker_id = self.active_containers.get(container_id)
+        if docker_id is None:
+            logger.warning(f"Container {container_id} not found for stopping")
+            return
+
+        try:
+            if force:
+                await self.client.kill_container(docker_id)
+                logger.info(f"Container killed: {container_id[:8]}")
+            else:
+                await self.client.stop_container(docker_id, timeout=timeout)
+                logger.info(f"Container stopped: {container_id[:8]}")
+        except DockerAPIError as e:
+            if e.status in (404, 409):
+                logger.info(f"Container {container_id[:8]} already stopped")
+            else:
+                logger.error(f"Error stopping container {container_id[:8]}: {e}")
+        except asyncio.TimeoutError:
+            logger.error(f"Timed out stopping container {container_id[:8]}")
+
+    async def cleanup_container(self, container_id: str) -> None:
+        """Remove a container and forget it."""
+        docker_id = self.active_containers.pop(container_id, None)
+        if docker_id is None:
+            return
+
+        try:
+            await self.client.remove_container(docker_id, force=True)
+            logger.info(f"Container cleaned up: {container_id[:8]}")
+        except DockerAPIError as e:
+            if e.status == 404:
+                logger.info(f"Container {container_id[:8]} already removed")
+            else:
+                logger.warning(f"Error during container cleanup: {e}")
+        except asyncio.TimeoutError:
+            logger.warning(f"Timed out removing container {container_id[:8]}")
+        finally:
+            self.cgroup_reader.forget(docker_id)
+
+    async def _get_resource_usage(
+        self, docker_id: str, started: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Get final resource usage, preferring cgroup v2 counters."""
+        cgroup_stats = self.cgroup_reader.read(docker_id)
+        if cgroup_stats is not None:
+            return usage_from_cgroup(cgroup_stats, started)
+
+        try:
+            return usage_from_docker_stats(await self.client.container_stats(docker_id))
+        except (asyncio.TimeoutError, DockerAPIError) as e:
+            logger.warning(f"Failed to get container resource usage: {e!r}")
+            return {}
+
+    async def cleanup_all(self) -> None:
+        """Clean up all active containers concurrently."""
+        container_ids = list(self.active_containers)
+        await asyncio.gather(
+            *(self.cleanup_container(container_id) for container_id in container_ids)
+        )
+        logger.info(f"Cleaned up {len(container_ids)} containers")
+
+    async def close(self) -> None:
+        """Remove remaining containers and close the client."""
+        await self.cleanup_all()
+        self.execution_history.close()
+        await self.client.close()
@@ -0,0 +1,314 @@
+"""
+Compressed Cold Storage for Audit Log Segments.
+
+Rotated segments are rewritten as a series of independent gzip members
+("frames") of roughly ``frame_size`` uncompressed bytes, cut on line
+boundaries. A small sidecar records where each frame starts in both the
+compressed file and the original byte stream, so readers seek to an
+original offset by decompressing a single frame. The whole file remains a
+valid gzip stream for standard tools.
+"""
+
+import bisect
+import gzip
+import json
+import logging
+import os
+from dataclasses import dataclass, asdict, field
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterator, Tuple, BinaryIO
+
+logger = logging.getLogger(__name__)
+
+COMPRESSED_SUFFIX = ".gz"
+FRAME_INDEX_SUFFIX = ".frames"
+
+# Uncompressed bytes per independently decompressible frame
+DEFAULT_FRAME_SIZE = 1024 * 1024
+
+
+@dataclass
+class Frame:
+    """Location of one gzip member."""
+
+    raw_offset: int  # Offset in the original segment
+    raw_length: int
+    offset: int  # Offset in the compressed file
+    length: int
+
+
+@dataclass
+class FrameIndex:
+    """Frame layout of a compressed segment."""
+
+    raw_size: int
+    frames: List[Frame]
+    _starts: List[int] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._starts = [frame.raw_offset for frame in self.frames]
+
+    def find(self, raw_offset: int) -> int:
+        """Index of the frame containing an original byte offset."""
+        return max(0, bisect.bisect_right(self._starts, raw_offset) - 1)
+
+
+def is_compressed(path: Path) -> bool:
+    return path.name.endswith(COMPRESSED_SUFFIX)
+
+
+def logical_name(path: Path) -> str:
+    """Segment name independent of its storage tier."""
+    if is_compressed(path):
+        return path.name[: -len(COMPRESSED_SUFFIX)]
+    return path.name
+
+
+def frame_index_path(path: Path) -> Path:
+    return path.with_name(path.name + FRAME_INDEX_SUFFIX)
+
+
+def segment_files(log_directory: Path) -> List[Path]:
+    """
+    Audit segments in chronological order, whichever tier they are in.
+
+    A plain segment wins over a compressed copy left by an interrupted
+    compression.
+    """
+    segments: Dict[str, Path] = {}
+    for path in log_directory.glob(f"audit_*.jsonl{COMPRESSED_SUFFIX}"):
+        segments[logical_name(path)] = path
+    for path in log_directory.glob("audit_*.jsonl"):
+        segments[path.name] = path
+    return [segments[name] for name in sorted(segments)]
+
+
+def resolve_segment(log_directory: Path, name: str) -> Optional[Path]:
+    """Locate a segment by logical name."""
+    for candidate in (
+        log_directory / name,
+        log_directory / f"{name}{COMPRESSED_SUFFIX}",
+    ):
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def load_frame_index(path: Path) -> Optional[FrameIndex]:
+    """Read the frame sidecar of a compressed segment."""
+    try:
+        data = json.loads(frame_index_path(path).read_text())
+        return FrameIndex(
+            raw_size=data["raw_size"],
+            frames=[Frame(**frame) for frame in data["frames"]],
+        )
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def segment_size(path: Path) -> int:
+    """Uncompressed size of a segment."""
+    if not is_compressed(path):
+        return path.stat().st_size
+
+    frame_index = load_frame_index(path)
+    if frame_index is not None:
+        return frame_index.raw_size
+    with gzip.open(path, "rb") as f:
+        return f.seek(0, os.SEEK_END)
+
+
+def _read_frame(f: BinaryIO, frame: Frame) -> bytes:
+    f.seek(frame.offset)
+    return gzip.decompress(f.read(frame.length))
+
+
+def iter_segment_lines(path: Path, start: int = 0) -> Iterator[Tuple[int, bytes]]:
+    """
+    Yield (original byte offset, line) pairs from ``start`` onwards.
+
+    Compressed segments skip whole frames before ``start``.
+    """
+    if not is_compressed(path):
+        with open(path, "rb") as f:
+            f.seek(start)
+            offset = start
+            for line in f:
+                yield offset, line
+                offset += len(line)
+        return
+
+    frame_index = load_frame_index(path)
+    if frame_index is None:
+        with gzip.open(path, "rb") as gz:
+            gz.seek(start)
+            offset = start
+            for line in gz:
+                yield offset, line
+                offset += len(line)
+        return
+
+    with open(path, "rb") as f:
+        for frame in frame_index.frames[frame_index.find(start) :]:
+            offset = frame.raw_offset
+            for line in _read_frame(f, frame).splitlines(keepends=True):
+                if offset >= start:
+                    yield offset, line
+                offset += len(line)
+
+
+def reverse_segment_lines(path: Path, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Yield lines from the end of a segment backwards."""
+    if is_compressed(path):
+        frame_index = load_frame_index(path)
+        if frame_index is None:
+            lines = [line for _, line in iter_segment_lines(path)]
+            yield from reversed(lines)
+            return
+        with open(path, "rb") as f:
+            for frame in reversed(frame_index.frames):
+                yield from reversed(_read_frame(f, frame).splitlines())
+        return
+
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        remainder = b""
+        while position > 0:
+            step = min(chunk_size, position)
+            position -= step
+            f.seek(position)
+            lines = (f.read(step) + remainder).split(b"\n")
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                if line:
+                    yield line
+        if remainder:
+            yield remainder
+
+
+class SegmentReader:
+    """Random access to records by original offset, in either tier."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.frames_read = 0
+        self._frame_index = load_frame_index(path) if is_compressed(path) else None
+        self._file: BinaryIO = (
+            gzip.open(path, "rb")  # type: ignore[assignment]
+            if is_compressed(path) and self._frame_index is None
+            else open(path, "rb")
+        )
+        self._frame_number: Optional[int] = None
+        self._frame_data = b""
+
+    def read(self, offset: int, length: int) -> bytes:
+        """Read ``length`` original bytes starting at ``offset``."""
+        if self._frame_index is None:
+            self._file.seek(offset)
+            return self._file.read(length)
+
+        chunks = []
+        end = offset + length
+        while offset < end:
+            number = self._frame_index.find(offset)
+            frame = self._frame_index.frames[number]
+            if number != self._frame_number:
+                self._frame_data = _read_frame(self._file, frame)
+                self._frame_number = number
+                self.frames_read += 1
+            start = offset - frame.raw_offset
+            chunk = self._frame_data[start : start + end - offset]
+            if not chunk:
+                break
+            chunks.append(chunk)
+            offset += len(chunk)
+        return b"".join(chunks)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def _write_atomic(path: Path, data_writer) -> None:
+    """Write a file through a synced temporary file and rename."""
+    temp_path = path.with_name(path.name + ".tmp")
+    with open(temp_path, "wb") as f:
+        data_writer(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def compress_segment(
+    path: Path, frame_size: int = DEFAULT_FRAME_SIZE, compresslevel: int = 6
+) -> Dict[str, Any]:
+    """
+    Move a sealed segment to compressed storage.
+
+    The frame sidecar and compressed file are written atomically before the
+    original is removed, so an interruption leaves the plain segment in
+    place. The original modification time is kept for retention.
+
+    Args:
+        path: Plain JSONL segment
+        frame_size: Uncompressed bytes per frame
+        compresslevel: gzip compression level
+
+    Returns:
+        Original and compressed sizes
+    """
+    compressed_path = path.with_name(path.name + COMPRESSED_SUFFIX)
+    stat = path.stat()
+    frames: List[Frame] = []
+
+    def write_frames(out: BinaryIO) -> None:
+        raw_offset = 0
+        pending: List[bytes] = []
+        pending_size = 0
+
+        def emit() -> None:
+            nonlocal raw_offset, pending_size
+            member = gzip.compress(b"".join(pending), compresslevel=compresslevel)
+            frames.append(Frame(raw_offset, pending_size, out.tell(), len(member)))
+            out.write(member)
+            raw_offset += pending_size
+            pending.clear()
+            pending_size = 0
+
+        with open(path, "rb") as f:
+            for line in f:
+                pending.append(line)
+                pending_size += len(line)
+                if pending_size >= frame_size:
+                    emit()
+        if pending:
+            emit()
+
+    _write_atomic(compressed_path, write_frames)
+    raw_size = sum(frame.raw_length for frame in frames)
+    frame_index = {"raw_size": raw_size, "frames": [asdict(f) for f in frames]}
+    _write_atomic(
+        frame_index_path(compressed_path),
+        lambda out: out.write(json.dumps(frame_index).encode("utf-8")),
+    )
+    os.utime(compressed_path, (stat.st_atime, stat.st_mtime))
+    path.unlink()
+
+    compressed_size = compressed_path.stat().st_size
+    logger.info(
+        f"Compressed audit segment {path.name}: {raw_size} -> "
+        f"{compressed_size} bytes in {len(frames)} frames"
+    )
+    return {
+        "segment": path.name,
+        "original_bytes": raw_size,
+        "compressed_bytes": compressed_size,
+        "frames": len(frames),
+    }
+
+
+def remove_segment_files(path: Path) -> None:
+    """Delete a segment and its frame sidecar."""
+    path.unlink(missing_ok=True)
+    if is_compressed(path):
+        frame_index_path(path).unlink(missing_ok=True)
@@ -0,0 +1,450 @@
+"""
+Audit Log Index for Container Execution.
+
+SQLite sidecar index over the JSONL audit segments written by
+:class:`AuditLogger`. Each event is indexed by segment, byte offset,
+timestamp, type, severity and container so queries only read the lines
+they need, and hourly rollup counters back the audit statistics.
+"""
+
+import json
+import logging
+import math
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+
+from .audit_archive import iter_segment_lines, logical_name, segment_size
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS segments (
+    name TEXT PRIMARY KEY,
+    indexed_bytes INTEGER NOT NULL DEFAULT 0,
+    event_count INTEGER NOT NULL DEFAULT 0,
+    min_ts REAL,
+    max_ts REAL
+);
+CREATE TABLE IF NOT EXISTS events (
+    segment TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    event_type TEXT,
+    severity TEXT,
+    container_id TEXT,
+    PRIMARY KEY (segment, offset)
+);
+CREATE INDEX IF NOT EXISTS idx_events_ts ON events (ts);
+CREATE INDEX IF NOT EXISTS idx_events_container ON events (container_id, ts);
+CREATE TABLE IF NOT EXISTS rollups (
+    bucket INTEGER NOT NULL,
+    event_type TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (bucket, event_type, severity)
+);
+"""
+
+# Rollup bucket width in seconds
+ROLLUP_BUCKET_SECONDS = 3600
+
+
+class IndexEntry:
+    """Location and filterable fields of one audit event."""
+
+    __slots__ = (
+        "segment",
+        "offset",
+        "length",
+        "ts",
+        "event_type",
+        "severity",
+        "container_id",
+    )
+
+    def __init__(
+        self,
+        segment: str,
+        offset: int,
+        length: int,
+        ts: float,
+        event_type: Optional[str],
+        severity: Optional[str],
+        container_id: Optional[str],
+    ):
+        self.segment = segment
+        self.offset = offset
+        self.length = length
+        self.ts = ts
+        self.event_type = event_type
+        self.severity = severity
+        self.container_id = container_id
+
+    def as_row(self) -> Tuple[Any, ...]:
+        return (
+            self.segment,
+            self.offset,
+            self.length,
+            self.ts,
+            self.event_type,
+            self.severity,
+            self.container_id,
+        )
+
+
+def entry_from_line(segment: str, offset: int, line: bytes) -> Optional[IndexEntry]:
+    """Build an index entry from a raw JSONL line, skipping headers."""
+    try:
+        event = json.loads(line)
+        if "log_initialized" in event:
+            return None
+        ts = datetime.fromisoformat(event["timestamp"]).timestamp()
+    except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+        return None
+
+    return IndexEntry(
+        segment=segment,
+        offset=offset,
+        length=len(line),
+        ts=ts,
+        event_type=event.get("event_type"),
+        severity=event.get("severity"),
+        container_id=event.get("container_id"),
+    )
+
+
+class AuditIndex:
+    """
+    SQLite sidecar index for audit log segments.
+
+    Entries are buffered and written in batches; segments that grew past
+    their indexed size (crash, older logger versions) are caught up by
+    scanning only the unindexed tail.
+    """
+
+    def __init__(self, index_path: Path, batch_size: int = 256):
+        """
+        Initialize audit index.
+
+        Args:
+            index_path: SQLite database path
+            batch_size: Buffered entries that trigger a flush
+        """
+        self.index_path = index_path
+        self.batch_size = batch_size
+        self._lock = threading.RLock()
+        self._pending: List[IndexEntry] = []
+        self._conn = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database, rebuilding it if unreadable or outdated."""
+        try:
+            conn = self._open()
+            row = conn.execute(
+                "SELECT value FROM meta WHERE key = 'schema_version'"
+            ).fetchone()
+            if row is None:
+                conn.execute(
+                    "INSERT INTO meta (key, value) VALUES ('schema_version', ?)",
+                    (str(SCHEMA_VERSION),),
+                )
+                conn.commit()
+            elif int(row[0]) != SCHEMA_VERSION:
+                raise sqlite3.DatabaseError("schema version mismatch")
+            return conn
+        except sqlite3.DatabaseError as e:
+            logger.warning(f"Rebuilding audit index {self.index_path}: {e}")
+            self.index_path.unlink(missing_ok=True)
+            return self._open()
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.index_path), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        return conn
+
+    def add(self, entry: IndexEntry) -> None:
+        """Buffer an entry for the next batch write."""
+        with self._lock:
+            self._pending.append(entry)
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+
+    def add_many(self, entries: Iterable[IndexEntry]) -> None:
+        """Buffer several entries and flush if the batch is full."""
+        with self._lock:
+            self._pending.extend(entries)
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+
+    def flush(self) -> None:
+        """Write buffered entries, segment bounds and rollups in one transaction."""
+        with self._lock:
+            if not self._pending:
+                return
+            entries, self._pending = self._pending, []
+
+            segments: Dict[str, List[float]] = {}
+            rollups: Dict[Tuple[int, str, str], int] = {}
+            for entry in entries:
+                bounds = segments.setdefault(entry.segment, [entry.ts, entry.ts, 0, 0])
+                bounds[0] = min(bounds[0], entry.ts)
+                bounds[1] = max(bounds[1], entry.ts)
+                bounds[2] += 1
+                bounds[3] = max(bounds[3], entry.offset + entry.length)
+
+                key = (
+                    int(entry.ts // ROLLUP_BUCKET_SECONDS),
+                    entry.event_type or "unknown",
+                    entry.severity or "unknown",
+                )
+                rollups[key] = rollups.get(key, 0) + 1
+
+            with self._conn:
+                cursor = self._conn.executemany(
+                    "INSERT OR IGNORE INTO events VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [entry.as_row() for entry in entries],
+                )
+                # Replayed entries are ignored above and must not be counted
+                if cursor.rowcount == len(entries):
+                    self._conn.executemany(
+                        "INSERT INTO rollups VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT (bucket, event_type, severity) "
+                        "DO UPDATE SET count = count + excluded.count",
+                        [(*key, count) for key, count in rollups.items()],
+                    )
+                else:
+                    self._recount_rollups()
+
+                for name, (min_ts, max_ts, count, end) in segments.items():
+                    self._conn.execute(
+                        "INSERT INTO segments VALUES (?, ?, ?, ?, ?) "
+                        "ON CONFLICT (name) DO UPDATE SET "
+                        "indexed_bytes = MAX(indexed_bytes, excluded.indexed_bytes), "
+                        "event_count = (SELECT COUNT(*) FROM events WHERE segment = ?), "
+                        "min_ts = MIN(COALESCE(min_ts, excluded.min_ts), excluded.min_ts), "
+                        "max_ts = MAX(COALESCE(max_ts, excluded.max_ts), excluded.max_ts)",
+                        (name, end, count, min_ts, max_ts, name),
+                    )
+
+    def _recount_rollups(self) -> None:
+        """Rebuild rollup counters from the events table."""
+        self._conn.execute("DELETE FROM rollups")
+        self._conn.execute(
+            "INSERT INTO rollups "
+            "SELECT CAST(ts / ? AS INTEGER), COALESCE(event_type, 'unknown'), "
+            "COALESCE(severity, 'unknown'), COUNT(*) FROM events GROUP BY 1, 2, 3",
+            (ROLLUP_BUCKET_SECONDS,),
+        )
+
+    def mark_indexed(self, segment: str, indexed_bytes: int) -> None:
+        """Record that a segment has been indexed up to a byte offset."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO segments (name, indexed_bytes) VALUES (?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET "
+                "indexed_bytes = MAX(indexed_bytes, excluded.indexed_bytes)",
+                (segment, indexed_bytes),
+            )
+
+    def indexed_bytes(self, segment: str) -> int:
+        """Byte offset up to which a segment has been indexed."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT indexed_bytes FROM segments WHERE name = ?", (segment,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def catch_up(self, segment_path: Path) -> int:
+        """
+        Index the part of a segment written since it was last indexed.
+
+        Args:
+            segment_path: JSONL segment file, plain or compressed
+
+        Returns:
+            Number of events indexed
+        """
+        name = logical_name(segment_path)
+        with self._lock:
+            self.flush()
+            start = self.indexed_bytes(name)
+            try:
+                size = segment_size(segment_path)
+            except FileNotFoundError:
+                return 0
+            if size <= start:
+                return 0
+
+            entries = []
+            offset = start
+            for line_offset, line in iter_segment_lines(segment_path, start):
+                if not line.endswith(b"\n"):
+                    break  # Partial trailing write, index it later
+                entry = entry_from_line(name, line_offset, line)
+                if entry:
+                    entries.append(entry)
+                offset = line_offset + len(line)
+
+            self._pending.extend(entries)
+            self.flush()
+            self.mark_indexed(name, offset)
+
+        if entries:
+            logger.info(f"Indexed {len(entries)} audit events from {name}")
+        return len(entries)
+
+    def remove_segment(self, segment: str) -> None:
+        """Drop a deleted segment from the index."""
+        with self._lock:
+            self.flush()
+            with self._conn:
+                self._conn.execute("DELETE FROM events WHERE segment = ?", (segment,))
+                self._conn.execute("DELETE FROM segments WHERE name = ?", (segment,))
+                self._recount_rollups()
+
+    def query(
+        self,
+        event_type: Optional[str] = None,
+        severity: Optional[str] = None,
+        container_id: Optional[str] = None,
+        start_ts: Optional[float] = None,
+        end_ts: Optional[float] = None,
+        limit: int = 1000,
+    ) -> List[Tuple[str, int, int]]:
+        """
+        Find matching events.
+
+        Returns:
+            (segment, offset, length) tuples in log order
+        """
+        clauses = []
+        params: List[Any] = []
+        for column, value in (
+            ("event_type", event_type),
+            ("severity", severity),
+            ("container_id", container_id),
+        ):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if start_ts is not None:
+            clauses.append("ts >= ?")
+            params.append(start_ts)
+        if end_ts is not None:
+            clauses.append("ts <= ?")
+            params.append(end_ts)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            self.flush()
+            return self._conn.execute(
+                f"SELECT segment, offset, length FROM events {where} "
+                "ORDER BY segment, offset LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+
+    def statistics(
+        self, start_ts: Optional[float] = None, end_ts: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Count events by type and severity plus affected containers.
+
+        Whole rollup buckets inside the range are served from the rollup
+        counters; only partial buckets at the edges touch the events table.
+        """
+        by_type: Dict[str, int] = {}
+        by_severity: Dict[str, int] = {}
+
+        def add_counts(rows: Iterable[Tuple[str, str, int]]) -> None:
+            for event_type, severity, count in rows:
+                by_type[event_type] = by_type.get(event_type, 0) + count
+                by_severity[severity] = by_severity.get(severity, 0) + count
+
+        # Whole buckets [first, last] lie inside the range; the rest is edges
+        width = ROLLUP_BUCKET_SECONDS
+        first = math.ceil(start_ts / width) if start_ts is not None else None
+        last = math.floor(end_ts / width) - 1 if end_ts is not None else None
+
+        with self._lock:
+            self.flush()
+
+            if first is not None and last is not None and first > last:
+                # Range narrower than a bucket, count it directly
+                edges = [(start_ts, end_ts)]
+            else:
+                bucket_clauses = []
+                bucket_params: List[Any] = []
+                edges = []
+                if first is not None:
+                    bucket_clauses.append("bucket >= ?")
+                    bucket_params.append(first)
+                    edges.append((start_ts, first * width))
+                if last is not None:
+                    bucket_clauses.append("bucket <= ?")
+                    bucket_params.append(last)
+                    edges.append(((last + 1) * width, end_ts))
+
+                where = (
+                    f"WHERE {' AND '.join(bucket_clauses)}" if bucket_clauses else ""
+                )
+                add_counts(
+                    self._conn.execute(
+                        "SELECT event_type, severity, SUM(count) FROM rollups "
+                        f"{where} GROUP BY event_type, severity",
+                        bucket_params,
+                    )
+                )
+
+            for low, high in edges:
+                # Left edge is half-open, the range end itself is inclusive
+                upper = "ts <= ?" if high == end_ts else "ts < ?"
+                add_counts(
+                    self._conn.execute(
+                        "SELECT COALESCE(event_type, 'unknown'), "
+                        "COALESCE(severity, 'unknown'), COUNT(*) FROM events "
+                        f"WHERE ts >= ? AND {upper} GROUP BY 1, 2",
+                        (low, high),
+                    )
+                )
+
+            container_clauses = ["container_id IS NOT NULL", "container_id != ''"]
+            container_params: List[Any] = []
+            if start_ts is not None:
+                container_clauses.append("ts >= ?")
+                container_params.append(start_ts)
+            if end_ts is not None:
+                container_clauses.append("ts <= ?")
+                container_params.append(end_ts)
+            containers = [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT DISTINCT container_id FROM events "
+                    f"WHERE {' AND '.join(container_clauses)}",
+                    container_params,
+                )
+            ]
+
+        return {
+            "total_events": sum(by_type.values()),
+            "events_by_type": by_type,
+            "events_by_severity": by_severity,
+            "containers_affected": containers,
+        }
+
+    def close(self) -> None:
+        """Flush pending entries and close the database."""
+        with self._lock:
+            self.flush()
+            self._conn.close()
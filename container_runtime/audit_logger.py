@@ -2,15 +2,38 @@ from datetime import timedelta
 import json
 import logging
 import hashlib
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from enum import Enum
+import threading
+import time
 import uuid
 import sys
 import os
 
+from .audit_archive import (
+    COMPRESSED_SUFFIX,
+    DEFAULT_FRAME_SIZE,
+    SegmentReader,
+    compress_segment,
+    is_compressed,
+    iter_segment_lines,
+    logical_name,
+    remove_segment_files,
+    resolve_segment,
+    segment_files,
+    segment_size,
+)
+from .audit_index import AuditIndex, IndexEntry
+from .audit_writer import AuditWriter
+from .audit_verifier import (
+    segment_end_hash,
+    verify_segment,
+    verify_segments,
+)
+
 try:
     from error_handling import GadugiError  # type: ignore[import-not-found]
 except ImportError:
@@ -93,6 +116,12 @@ class AuditLogger:
         log_directory: Optional[Path] = None,
         max_log_size: int = 100 * 1024 * 1024,  # 100MB
         retention_days: int = 90,
+        flush_interval: float = 0.05,
+        batch_size: int = 256,
+        fsync_policy: str = "interval",
+        compress_rotated: bool = True,
+        frame_size: int = DEFAULT_FRAME_SIZE,
+        seal_after: float = 24 * 60 * 60,
     ):
         """
         Initialize audit logger.
@@ -101,12 +130,22 @@ class AuditLogger:
             log_directory: Directory for audit logs
             max_log_size: Maximum size per log file
             retention_days: Number of days to retain logs
+            flush_interval: Maximum seconds an event waits before being written
+            batch_size: Events that trigger an immediate group commit
+            fsync_policy: "always", "interval" or "never" (see audit_writer)
+            compress_rotated: Compress rotated segments during cleanup
+            frame_size: Uncompressed bytes per compressed frame
+            seal_after: Seconds without writes after which a segment is
+                treated as sealed even if no newer segment links to it
         """
         self.log_directory = log_directory or Path("logs/audit")
         self.log_directory.mkdir(parents=True, exist_ok=True)
 
         self.max_log_size = max_log_size
         self.retention_days = retention_days
+        self.compress_rotated = compress_rotated
+        self.frame_size = frame_size
+        self.seal_after = seal_after
         self.current_log_file: Optional[Path] = None
         self.current_log_size = 0
 
@@ -114,25 +153,79 @@ class AuditLogger:
         self.log_integrity_enabled = True
         self.previous_event_hash = ""
 
+        # Serialises the hash chain, segment writes and index updates
+        self._lock = threading.RLock()
+
+        # Secondary index so searches and statistics skip unrelated lines
+        self.index = AuditIndex(self.log_directory / "audit_index.sqlite")
+
+        # Events are serialised on the caller's thread and written in batches
+        # by a background writer; index entries are published once on disk
+        self.writer = AuditWriter(
+            flush_interval=flush_interval,
+            batch_size=batch_size,
+            fsync_policy=fsync_policy,
+            on_commit=self.index.add_many,
+        )
+
+        # Continue the hash chain from the newest existing segment
+        self.previous_event_hash = self._recover_chain_head()
+
         # Initialize current log file
         self._initialize_log_file()
 
         logger.info(f"Audit logger initialized with directory: {self.log_directory}")
 
+    def _recover_chain_head(self) -> str:
+        """Read the last chain hash left by a previous logger, if any."""
+        for log_file in reversed(segment_files(self.log_directory)):
+            try:
+                last_hash = segment_end_hash(log_file)
+            except OSError as e:
+                logger.warning(f"Could not read audit segment {log_file}: {e}")
+                continue
+            if last_hash is not None:
+                return last_hash
+        return ""
+
     def _initialize_log_file(self) -> None:
         """Initialize current log file."""
+        previous_segment = self.current_log_file
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.current_log_file = self.log_directory / f"audit_{timestamp}.jsonl"
+        log_file = self.log_directory / f"audit_{timestamp}.jsonl"
+
+        # Never append to an existing segment, index offsets assume a fresh
+        # file. The writer opens segments lazily, so claim the name now.
+        # A compressed segment keeps its name; it is written before the
+        # plain file is removed, so check for it after claiming.
+        sequence = 1
+        while True:
+            try:
+                log_file.touch(exist_ok=False)
+                compressed = log_file.with_name(log_file.name + COMPRESSED_SUFFIX)
+                if not compressed.exists():
+                    break
+                log_file.unlink()
+            except FileExistsError:
+                pass
+            log_file = self.log_directory / f"audit_{timestamp}_{sequence:03d}.jsonl"
+            sequence += 1
+
+        self.current_log_file = log_file
         self.current_log_size = 0
 
         # Write log file header
+        # The checkpoint links this segment to the end of the previous one,
+        # so segments can be verified independently
         header = {
             "log_initialized": datetime.now().isoformat(),
-            "version": "1.0",
+            "version": "1.1",
             "integrity_enabled": self.log_integrity_enabled,
+            "previous_hash": self.previous_event_hash,
+            "previous_segment": previous_segment.name if previous_segment else None,
         }
 
-        self._write_raw_entry(header)
+        self._write_raw_entry((json.dumps(header) + "\n").encode("utf-8"))
         logger.info(f"Initialized audit log file: {self.current_log_file}")
 
     def _rotate_log_file(self) -> None:
@@ -143,12 +236,8 @@ class AuditLogger:
             )
             self._initialize_log_file()
 
-    def _calculate_event_checksum(self, event: AuditEvent) -> str:
-        """Calculate tamper-evident checksum for audit event."""
-        if not self.log_integrity_enabled:
-            return ""
-
-        # Create deterministic string representation
+    def _canonical_event_json(self, event: AuditEvent, previous_hash: str) -> str:
+        """Deterministic JSON of the fields covered by the hash chain."""
         event_data = {
             "event_id": event.event_id,
             "timestamp": event.timestamp.isoformat(),
@@ -157,27 +246,67 @@ class AuditLogger:
             "container_id": event.container_id,
             "message": event.message,
             "details": event.details,
-            "previous_hash": self.previous_event_hash,
+            "previous_hash": previous_hash,
         }
+        return json.dumps(
+            event_data, sort_keys=True, separators=(",", ":"), default=str
+        )
 
-        event_json = json.dumps(event_data, sort_keys=True, separators=(",", ":"))
-        return hashlib.sha256(event_json.encode("utf-8")).hexdigest()
+    def _serialize_event(self, event: AuditEvent) -> bytes:
+        """
+        Serialise an event and set its checksum in a single pass.
 
-    def _write_raw_entry(self, data: Dict[str, Any]) -> None:
-        """Write raw data entry to log file."""
+        The canonical JSON hashed for the chain is reused verbatim as the
+        start of the log line, so details are only encoded once.
+        """
+        canonical = self._canonical_event_json(event, self.previous_event_hash)
+        if self.log_integrity_enabled:
+            event.checksum = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+        else:
+            event.checksum = ""
+
+        remainder = json.dumps(
+            {
+                "user_id": event.user_id,
+                "source_ip": event.source_ip,
+                "resource_usage": event.resource_usage,
+                "security_context": event.security_context,
+                "checksum": event.checksum,
+            },
+            separators=(",", ":"),
+            default=str,
+        )
+        return f"{canonical[:-1]},{remainder[1:]}\n".encode("utf-8")
+
+    def _write_raw_entry(
+        self, data: bytes, entry: Optional[IndexEntry] = None
+    ) -> Tuple[int, int]:
+        """
+        Queue a serialised line for the current log file.
+
+        Returns:
+            Byte offset and length the line will occupy
+        """
         if self.current_log_file is None:
-            return
-        try:
-            with open(self.current_log_file, "a", encoding="utf-8") as f:
-                json_line = json.dumps(data, default=str) + "\n"
-                f.write(json_line)
-                f.flush()  # Ensure immediate write
+            return 0, 0
 
-                self.current_log_size += len(json_line.encode("utf-8"))
+        offset = self.current_log_size
+        if entry is not None:
+            entry.offset = offset
+            entry.length = len(data)
 
-        except Exception as e:
-            logger.error(f"Failed to write audit log entry: {e}")
-            raise GadugiError(f"Audit logging failed: {e}")
+        self.writer.submit(self.current_log_file, data, entry)
+        self.current_log_size += len(data)
+        return offset, len(data)
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait until all logged events have been written.
+
+        Raises:
+            GadugiError: If writing failed
+        """
+        self.writer.flush(timeout)
 
     def log_event(
         self,
@@ -225,26 +354,28 @@ class AuditLogger:
             security_context=security_context,
         )
 
-        # Calculate integrity checksum
-        event.checksum = self._calculate_event_checksum(event)
-
-        # Convert to dictionary for logging
-        event_dict = asdict(event)
-
-        # Convert enum values to strings
-        event_dict["event_type"] = event.event_type.value
-        event_dict["severity"] = event.severity.value
-        event_dict["timestamp"] = event.timestamp.isoformat()
-
-        # Write to log file
-        self._write_raw_entry(event_dict)
+        with self._lock:
+            # Checksum and log line come from the same serialisation
+            line = self._serialize_event(event)
+            self._write_raw_entry(
+                line,
+                IndexEntry(
+                    segment=self.current_log_file.name if self.current_log_file else "",
+                    offset=0,
+                    length=0,
+                    ts=event.timestamp.timestamp(),
+                    event_type=event_type.value,
+                    severity=severity.value,
+                    container_id=container_id,
+                ),
+            )
 
-        # Update hash chain for next event
-        if self.log_integrity_enabled:
-            self.previous_event_hash = event.checksum
+            # Update hash chain for next event
+            if self.log_integrity_enabled:
+                self.previous_event_hash = event.checksum or ""
 
-        # Rotate log file if needed
-        self._rotate_log_file()
+            # Rotate log file if needed
+            self._rotate_log_file()
 
         # Log to standard logger for real-time monitoring
         log_level = {
@@ -376,16 +507,42 @@ class AuditLogger:
         policy_name: str,
         policy_details: Dict[str, Any],
         user_id: Optional[str] = None,
+        policy_version: Optional[int] = None,
+        tenant: Optional[str] = None,
     ) -> str:
         """Log security policy application event."""
+        security_context: Dict[str, Any] = {"policy": policy_name}
+        details = policy_details
+        if policy_version is not None:
+            # Inside the details so the version is covered by the checksum
+            details = {**policy_details, "policy_version": policy_version}
+            security_context["policy_version"] = policy_version
+        if tenant is not None:
+            security_context["tenant"] = tenant
+
         return self.log_event(
             event_type=AuditEventType.POLICY_APPLIED,
             severity=AuditSeverity.INFO,
             message=f"Security policy '{policy_name}' applied to {container_id[:8]}",
             container_id=container_id,
             user_id=user_id,
-            details=policy_details,
-            security_context={"policy": policy_name},
+            details=details,
+            security_context=security_context,
+        )
+
+    def log_policies_reloaded(
+        self, policy_version: int, policies: List[str], tenants: List[str]
+    ) -> str:
+        """Log publication of a new security policy version."""
+        return self.log_event(
+            event_type=AuditEventType.CONFIGURATION_CHANGED,
+            severity=AuditSeverity.INFO,
+            message=f"Security policy version {policy_version} published",
+            details={
+                "policy_version": policy_version,
+                "policies": policies,
+                "tenants": tenants,
+            },
         )
 
     def log_access_denied(
@@ -428,117 +585,114 @@ class AuditLogger:
         Returns:
             List of matching audit events
         """
-        events = []
+        events: List[Dict[str, Any]] = []
 
         try:
-            # Search through all log files
-            log_files = sorted(self.log_directory.glob("audit_*.jsonl"))
-
-            for log_file in log_files:
-                with open(log_file, "r", encoding="utf-8") as f:
-                    for line in f:
-                        try:
-                            event = json.loads(line.strip())
-
-                            # Skip header entries
-                            if "log_initialized" in event:
-                                continue
-
-                            # Apply filters
-                            if (
-                                event_type
-                                and event.get("event_type") != event_type.value
-                            ):
-                                continue
-
-                            if severity and event.get("severity") != severity.value:
-                                continue
-
-                            if (
-                                container_id
-                                and event.get("container_id") != container_id
-                            ):
-                                continue
-
-                            # Time filters
-                            event_time = datetime.fromisoformat(
-                                event.get("timestamp", "")
-                            )
-
-                            if start_time and event_time < start_time:
-                                continue
-
-                            if end_time and event_time > end_time:
-                                continue
-
-                            events.append(event)
-
-                            # Respect limit
-                            if len(events) >= limit:
-                                break
-
-                        except (json.JSONDecodeError, ValueError) as e:
-                            logger.warning(f"Invalid audit log entry: {e}")
-                            continue
-
-                # Break if we've reached the limit
-                if len(events) >= limit:
-                    break
+            with self._lock:
+                self._sync_index()
+                matches = self.index.query(
+                    event_type=event_type.value if event_type else None,
+                    severity=severity.value if severity else None,
+                    container_id=container_id,
+                    start_ts=start_time.timestamp() if start_time else None,
+                    end_ts=end_time.timestamp() if end_time else None,
+                    limit=limit,
+                )
+
+            # Read only the matching lines; compressed segments decompress
+            # just the frames holding them
+            reader: Optional[SegmentReader] = None
+            try:
+                for segment, offset, length in matches:
+                    if reader is None or logical_name(reader.path) != segment:
+                        if reader:
+                            reader.close()
+                        reader = self._open_segment(segment)
+                    try:
+                        events.append(json.loads(reader.read(offset, length)))
+                    except (json.JSONDecodeError, ValueError) as e:
+                        logger.warning(f"Invalid audit log entry: {e}")
+            finally:
+                if reader:
+                    reader.close()
 
         except Exception as e:
             logger.error(f"Error searching audit events: {e}")
             raise GadugiError(f"Audit search failed: {e}")
 
-        return events[-limit:]  # Return most recent events
+        return events
+
+    def _open_segment(self, name: str) -> SegmentReader:
+        """Open a segment by name, following it into compressed storage."""
+        for _ in range(2):
+            path = resolve_segment(self.log_directory, name)
+            if path is None:
+                break
+            try:
+                return SegmentReader(path)
+            except FileNotFoundError:
+                continue  # Compressed between lookup and open
+        raise GadugiError(f"Audit segment not found: {name}")
+
+    def _sync_index(self) -> None:
+        """Index segment data written outside this logger or lost in a crash."""
+        self.writer.flush()
+        for log_file in segment_files(self.log_directory):
+            indexed = self.index.indexed_bytes(logical_name(log_file))
+            if segment_size(log_file) > indexed:
+                self.index.catch_up(log_file)
+
+    def rebuild_index(self) -> int:
+        """
+        Rebuild the audit index from the log segments.
+
+        Returns:
+            Number of events indexed
+        """
+        with self._lock:
+            self.writer.flush()
+            self.index.close()
+            self.index.index_path.unlink(missing_ok=True)
+            self.index = AuditIndex(self.index.index_path)
+            self.writer.on_commit = self.index.add_many
+            return sum(
+                self.index.catch_up(log_file)
+                for log_file in segment_files(self.log_directory)
+            )
 
     def get_statistics(
         self, start_time: Optional[datetime] = None, end_time: Optional[datetime] = None
     ) -> Dict[str, Any]:
         """Get audit statistics for a time period."""
-        events = self.search_events(start_time=start_time, end_time=end_time)
+        with self._lock:
+            self._sync_index()
+            counts = self.index.statistics(
+                start_ts=start_time.timestamp() if start_time else None,
+                end_ts=end_time.timestamp() if end_time else None,
+            )
 
-        stats = {
-            "total_events": len(events),
-            "events_by_type": {},
-            "events_by_severity": {},
-            "containers_affected": set(),
+        return {
+            **counts,
             "time_range": {
                 "start": start_time.isoformat() if start_time else None,
                 "end": end_time.isoformat() if end_time else None,
             },
+            "unique_containers": len(counts["containers_affected"]),
         }
 
-        for event in events:
-            # Count by type
-            event_type = event.get("event_type", "unknown")
-            stats["events_by_type"][event_type] = (
-                stats["events_by_type"].get(event_type, 0) + 1
-            )
-
-            # Count by severity
-            severity = event.get("severity", "unknown")
-            stats["events_by_severity"][severity] = (
-                stats["events_by_severity"].get(severity, 0) + 1
-            )
-
-            # Track affected containers
-            if event.get("container_id"):
-                stats["containers_affected"].add(event["container_id"])
-
-        stats["unique_containers"] = len(stats["containers_affected"])
-        stats["containers_affected"] = list(stats["containers_affected"])
-
-        return stats
-
     def verify_log_integrity(self, log_file: Optional[Path] = None) -> Dict[str, Any]:
         """
         Verify integrity of audit log using checksums.
 
+        The chain is checked from the checkpoint in the segment header, so
+        rotated segments verify on their own.
+
         Args:
             log_file: Specific log file to verify, or current file if None
 
         Returns:
-            Verification results
+            Verification results, including the offset of the first broken
+            record
         """
         if not self.log_integrity_enabled:
             return {"integrity_enabled": False, "status": "skipped"}
@@ -553,84 +707,176 @@ class AuditLogger:
             }
 
         try:
-            events_verified = 0
-            events_failed = 0
-            previous_hash = ""
-
-            with open(file_to_verify, "r", encoding="utf-8") as f:
-                for line_num, line in enumerate(f, 1):
-                    try:
-                        event = json.loads(line.strip())
-
-                        # Skip header entries
-                        if "log_initialized" in event:
-                            continue
-
-                        # Verify checksum if present
-                        if "checksum" in event:
-                            # Recreate the event for verification
-                            temp_event = AuditEvent(
-                                event_id=event["event_id"],
-                                timestamp=datetime.fromisoformat(event["timestamp"]),
-                                event_type=AuditEventType(event["event_type"]),
-                                severity=AuditSeverity(event["severity"]),
-                                container_id=event.get("container_id"),
-                                user_id=event.get("user_id"),
-                                source_ip=event.get("source_ip"),
-                                message=event["message"],
-                                details=event.get("details", {}),
-                                resource_usage=event.get("resource_usage"),
-                                security_context=event.get("security_context"),
-                            )
-
-                            # Calculate expected checksum
-                            old_previous_hash = self.previous_event_hash
-                            self.previous_event_hash = previous_hash
-                            expected_checksum = self._calculate_event_checksum(
-                                temp_event
-                            )
-                            self.previous_event_hash = old_previous_hash
-
-                            if expected_checksum == event["checksum"]:
-                                events_verified += 1
-                            else:
-                                events_failed += 1
-                                logger.warning(
-                                    f"Integrity violation at line {line_num}"
-                                )
-
-                            previous_hash = event["checksum"]
-
-                    except (json.JSONDecodeError, ValueError, KeyError) as e:
-                        logger.warning(f"Invalid entry at line {line_num}: {e}")
-                        events_failed += 1
-
-            return {
-                "integrity_enabled": True,
-                "status": "verified" if events_failed == 0 else "failed",
-                "events_verified": events_verified,
-                "events_failed": events_failed,
-                "file_verified": str(file_to_verify),
-            }
-
+            self.writer.flush()
+            result = verify_segment(str(file_to_verify))
         except Exception as e:
             logger.error(f"Error verifying log integrity: {e}")
             return {"integrity_enabled": True, "status": "error", "error": str(e)}
 
+        if result["first_failure"]:
+            logger.warning(
+                f"Integrity violation in {file_to_verify} at offset "
+                f"{result['first_failure']['offset']}: "
+                f"{result['first_failure']['reason']}"
+            )
+
+        return {
+            "integrity_enabled": True,
+            **result,
+            "file_verified": str(file_to_verify),
+        }
+
+    def verify_all_segments(
+        self, since: Optional[str] = None, workers: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Verify the hash chain across all segments in parallel.
+
+        Args:
+            since: Only verify segments newer than this segment name, or
+                "last" to resume after the previous successful verification
+            workers: Verification processes (None for one per CPU)
+
+        Returns:
+            Verification results with per-segment details and chain links
+        """
+        if not self.log_integrity_enabled:
+            return {"integrity_enabled": False, "status": "skipped"}
+
+        self.writer.flush()
+        return verify_segments(self.log_directory, since=since, workers=workers)
+
     def cleanup_old_logs(self) -> int:
-        """Clean up old audit logs based on retention policy."""
+        """
+        Clean up old audit logs based on retention policy.
+
+        Rotated segments within the retention period are moved to
+        compressed storage when ``compress_rotated`` is enabled.
+        """
         cutoff_date = datetime.now() - timedelta(days=self.retention_days)
         files_removed = 0
 
         try:
-            for log_file in self.log_directory.glob("audit_*.jsonl"):
+            for log_file in segment_files(self.log_directory):
+                # The active segment is still being written
+                if log_file == self.current_log_file:
+                    continue
+
                 # Check if file is older than retention period
                 if log_file.stat().st_mtime < cutoff_date.timestamp():
-                    log_file.unlink()
+                    remove_segment_files(log_file)
+                    self.index.remove_segment(logical_name(log_file))
                     files_removed += 1
                     logger.info(f"Removed old audit log: {log_file}")
 
+            if self.compress_rotated:
+                self.compress_rotated_logs()
+
         except Exception as e:
             logger.error(f"Error during log cleanup: {e}")
 
         return files_removed
+
+    def compress_rotated_logs(self) -> Dict[str, Any]:
+        """
+        Move sealed segments to compressed, frame-indexed storage.
+
+        Segments still being written by another logger sharing the
+        directory are left alone (see ``_sealed_segments``).
+
+        Returns:
+            Segments compressed and the bytes saved
+        """
+        with self._lock:
+            # Index everything first; offsets stay valid after compression
+            self._sync_index()
+            candidates = self._sealed_segments()
+
+        original_bytes = 0
+        compressed_bytes = 0
+        for path in candidates:
+            try:
+                result = compress_segment(path, frame_size=self.frame_size)
+            except OSError as e:
+                logger.error(f"Failed to compress audit segment {path}: {e}")
+                continue
+            original_bytes += result["original_bytes"]
+            compressed_bytes += result["compressed_bytes"]
+
+        if candidates:
+            logger.info(
+                f"Compressed {len(candidates)} audit segments, saved "
+                f"{original_bytes - compressed_bytes} bytes"
+            )
+
+        return {
+            "segments_compressed": len(candidates),
+            "original_bytes": original_bytes,
+            "compressed_bytes": compressed_bytes,
+            "bytes_saved": original_bytes - compressed_bytes,
+        }
+
+    def _sealed_segments(self) -> List[Path]:
+        """
+        Plain segments that no logger will write to again.
+
+        Other loggers may share the directory, so a segment is sealed only
+        when a newer segment's header checkpoint names it as the previous
+        segment, or when it has not been written for ``seal_after`` seconds.
+        """
+        segments = segment_files(self.log_directory)
+        linked = set()
+        for path in segments:
+            try:
+                _, line = next(iter_segment_lines(path))
+                previous = json.loads(line).get("previous_segment")
+            except (OSError, StopIteration, ValueError, AttributeError):
+                continue  # Header not written yet
+            if previous:
+                linked.add(previous)
+
+        quiet_before = time.time() - self.seal_after
+        sealed = []
+        for path in segments:
+            if is_compressed(path) or path == self.current_log_file:
+                continue
+            try:
+                if path.name in linked or path.stat().st_mtime < quiet_before:
+                    sealed.append(path)
+            except OSError:
+                continue  # Removed concurrently
+        return sealed
+
+    def get_storage_stats(self) -> Dict[str, Any]:
+        """Get audit log storage usage, including compression savings."""
+        segments = segment_files(self.log_directory)
+        compressed = [path for path in segments if is_compressed(path)]
+
+        logical_bytes = 0
+        stored_bytes = 0
+        for path in segments:
+            try:
+                logical_bytes += segment_size(path)
+                stored_bytes += path.stat().st_size
+            except OSError:
+                continue  # Removed or compressed concurrently
+
+        saved = logical_bytes - stored_bytes
+        return {
+            "segments": len(segments),
+            "compressed_segments": len(compressed),
+            "logical_bytes": logical_bytes,
+            "stored_bytes": stored_bytes,
+            "bytes_saved": saved,
+            "savings_percent": (saved / logical_bytes * 100) if logical_bytes else 0.0,
+        }
+
+    def close(self) -> None:
+        """Write queued events, then flush and release the index."""
+        with self._lock:
+            self.writer.close()
+            self.index.close()
+
+    def get_writer_status(self) -> Dict[str, Any]:
+        """Get background writer status information."""
+        return self.writer.get_status()
@@ -0,0 +1,320 @@
+"""
+Audit Log Integrity Verifier.
+
+Streams audit log segments (plain or compressed) and checks the tamper-evident hash chain. Each
+segment header records the last hash of the segment before it, so segments
+are verified independently (in parallel across processes) and then linked
+together with a cheap pass over their checkpoints.
+
+Usage:
+    python -m container_runtime.audit_verifier logs/audit
+    python -m container_runtime.audit_verifier logs/audit --since last
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+from .audit_archive import (
+    iter_segment_lines,
+    logical_name,
+    resolve_segment,
+    reverse_segment_lines,
+    segment_files,
+)
+
+logger = logging.getLogger(__name__)
+
+# Records the newest sealed segment checked by a successful verification
+VERIFY_STATE_FILE = "verify_state.json"
+
+# Bytes read per step when scanning a segment backwards for its last hash
+TAIL_CHUNK_SIZE = 64 * 1024
+
+
+def event_checksum(event: Dict[str, Any], previous_hash: str) -> str:
+    """
+    Recompute the chain checksum of a logged event.
+
+    Matches ``AuditLogger._canonical_event_json`` for the stored fields.
+    """
+    event_data = {
+        "event_id": event["event_id"],
+        "timestamp": event["timestamp"],
+        "event_type": event["event_type"],
+        "severity": event["severity"],
+        "container_id": event.get("container_id"),
+        "message": event["message"],
+        "details": event.get("details", {}),
+        "previous_hash": previous_hash,
+    }
+    event_json = json.dumps(
+        event_data, sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(event_json.encode("utf-8")).hexdigest()
+
+
+def list_segments(log_directory: Path) -> List[Path]:
+    """Audit log segments in chronological order, plain or compressed."""
+    return segment_files(log_directory)
+
+
+def segment_end_hash(path: Path) -> Optional[str]:
+    """
+    Read the chain hash a segment ends with.
+
+    Only the tail of the segment is read. Returns the header checkpoint for
+    a segment without events, or None if the segment has no usable records.
+    """
+    for line in reverse_segment_lines(path, TAIL_CHUNK_SIZE):
+        try:
+            record = json.loads(line)
+        except (json.JSONDecodeError, ValueError):
+            continue  # Torn trailing write
+        if "log_initialized" in record:
+            return record.get("previous_hash")
+        if "checksum" in record:
+            return record["checksum"]
+    return None
+
+
+def verify_segment(path: str) -> Dict[str, Any]:
+    """
+    Stream one segment and verify its hash chain.
+
+    The chain starts at the checkpoint in the segment header (an empty hash
+    for segments written before checkpoints existed). Module level so it
+    can run in a worker process.
+
+    Args:
+        path: Segment file path
+
+    Returns:
+        Verification result including the first broken record offset
+    """
+    segment = Path(path)
+    result: Dict[str, Any] = {
+        "segment": logical_name(segment),
+        "status": "verified",
+        "events_verified": 0,
+        "events_failed": 0,
+        "start_hash": None,
+        "end_hash": None,
+        "first_failure": None,
+        "truncated": False,
+    }
+
+    previous_hash = ""
+    line_num = 0
+    try:
+        for line_num, (offset, line) in enumerate(iter_segment_lines(segment), 1):
+            reason = None
+            try:
+                record = json.loads(line)
+            except (json.JSONDecodeError, ValueError) as e:
+                if not line.endswith(b"\n"):
+                    # Crash mid-write: the torn record was never committed
+                    result["truncated"] = True
+                    break
+                record = None
+                reason = f"invalid entry: {e}"
+
+            if record is not None and "log_initialized" in record:
+                if line_num == 1:
+                    previous_hash = record.get("previous_hash", "")
+                    result["start_hash"] = record.get("previous_hash")
+                continue
+
+            if record is not None and "checksum" not in record:
+                continue  # Not part of the chain
+
+            if record is not None:
+                if (
+                    result["start_hash"] is None
+                    and not result["events_verified"]
+                    and not result["events_failed"]
+                ):
+                    # Header without a checkpoint: link through the first
+                    # event's own previous_hash, where recorded
+                    previous_hash = record.get("previous_hash", previous_hash)
+                    result["start_hash"] = record.get("previous_hash")
+                try:
+                    if record.get("previous_hash", previous_hash) != previous_hash:
+                        reason = "previous_hash does not match chain"
+                    elif event_checksum(record, previous_hash) != record["checksum"]:
+                        reason = "checksum mismatch"
+                except KeyError as e:
+                    reason = f"missing field {e}"
+
+                # Continue from the recorded hash so one edit is one failure
+                previous_hash = record["checksum"]
+
+            if reason is None:
+                result["events_verified"] += 1
+                continue
+
+            result["events_failed"] += 1
+            if result["first_failure"] is None:
+                result["first_failure"] = {
+                    "offset": offset,
+                    "line": line_num,
+                    "event_id": record.get("event_id") if record else None,
+                    "reason": reason,
+                }
+
+    except OSError as e:
+        result["status"] = "error"
+        result["error"] = str(e)
+        return result
+
+    result["end_hash"] = previous_hash
+    if result["events_failed"]:
+        result["status"] = "failed"
+    return result
+
+
+def _verify_all(paths: List[Path], workers: Optional[int]) -> List[Dict[str, Any]]:
+    """Verify segments in a process pool, falling back to this process."""
+    if len(paths) > 1 and workers != 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(verify_segment, [str(p) for p in paths]))
+        except (OSError, NotImplementedError, BrokenProcessPool) as e:
+            logger.warning(f"Process pool unavailable, verifying serially: {e}")
+
+    return [verify_segment(str(path)) for path in paths]
+
+
+def verify_segments(
+    log_directory: Path,
+    since: Optional[str] = None,
+    workers: Optional[int] = None,
+    record_state: bool = True,
+) -> Dict[str, Any]:
+    """
+    Verify the hash chain across audit log segments.
+
+    Args:
+        log_directory: Directory containing audit segments
+        since: Only verify segments newer than this segment name, or "last"
+            to resume after the previous successful verification
+        workers: Worker processes (None for one per CPU, 1 for serial)
+        record_state: Save the newest sealed segment for ``since="last"``
+
+    Returns:
+        Verification results with per-segment details and chain links
+    """
+    segments = list_segments(log_directory)
+    state_path = log_directory / VERIFY_STATE_FILE
+
+    anchor: Optional[str] = None
+    anchor_hash: Optional[str] = None
+    if since == "last":
+        try:
+            state = json.loads(state_path.read_text())
+            anchor, anchor_hash = state["last_segment"], state["end_hash"]
+        except (OSError, ValueError, KeyError):
+            anchor = None  # Nothing verified yet, check everything
+    elif since:
+        anchor = since
+        anchor_path = resolve_segment(log_directory, since)
+        anchor_hash = segment_end_hash(anchor_path) if anchor_path else None
+
+    if anchor:
+        segments = [path for path in segments if logical_name(path) > anchor]
+
+    results = _verify_all(segments, workers)
+
+    # Link segments through their header checkpoints
+    broken_links = []
+    expected = anchor_hash
+    for result in results:
+        start = result["start_hash"]
+        if start is not None and expected is not None and start != expected:
+            broken_links.append(
+                {"segment": result["segment"], "expected": expected, "found": start}
+            )
+        expected = result["end_hash"]
+
+    failed = [r for r in results if r["status"] != "verified"]
+    first_failure = next(
+        (
+            {"segment": r["segment"], **r["first_failure"]}
+            for r in results
+            if r["first_failure"]
+        ),
+        None,
+    )
+
+    summary = {
+        "integrity_enabled": True,
+        "status": "verified" if not failed and not broken_links else "failed",
+        "segments_verified": len(results),
+        "events_verified": sum(r["events_verified"] for r in results),
+        "events_failed": sum(r["events_failed"] for r in results),
+        "broken_links": broken_links,
+        "first_failure": first_failure,
+        "since": anchor,
+        "segments": results,
+    }
+
+    # The newest segment may still be written to, so it is never recorded
+    if record_state and summary["status"] == "verified" and len(results) > 1:
+        sealed = results[-2]
+        state_path.write_text(
+            json.dumps(
+                {
+                    "last_segment": sealed["segment"],
+                    "end_hash": sealed["end_hash"],
+                    "verified_at": datetime.now().isoformat(),
+                }
+            )
+        )
+
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Verify audit log integrity")
+    parser.add_argument("log_directory", type=Path, help="Audit log directory")
+    parser.add_argument(
+        "--since",
+        help='Only verify segments newer than this segment name, or "last" '
+        "to resume after the previous successful run",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Verification processes"
+    )
+    args = parser.parse_args(argv)
+
+    summary = verify_segments(
+        args.log_directory, since=args.since, workers=args.workers
+    )
+
+    print(
+        f"{summary['status']}: {summary['segments_verified']} segments, "
+        f"{summary['events_verified']} events verified, "
+        f"{summary['events_failed']} failed"
+    )
+    if summary["first_failure"]:
+        failure = summary["first_failure"]
+        print(
+            f"First broken record: {failure['segment']} offset {failure['offset']} "
+            f"(line {failure['line']}): {failure['reason']}"
+        )
+    for link in summary["broken_links"]:
+        print(f"Broken chain link before {link['segment']}")
+
+    return 0 if summary["status"] == "verified" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,387 @@
+"""
+Group-Commit Writer for Audit Logs.
+
+Moves audit log I/O off the caller's thread. Serialised records are queued
+in hash-chain order and a background thread appends them in batches through
+one long-lived file handle per segment, with a configurable fsync policy.
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, Optional, Any, Tuple, BinaryIO
+
+from .audit_index import IndexEntry
+
+# Import Enhanced Separation shared modules
+import sys
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", ".claude", "shared", "utils")
+)
+try:
+    from error_handling import GadugiError  # type: ignore[import-not-found]
+except ImportError:
+
+    class GadugiError(Exception):  # type: ignore[import-not-found]
+        pass
+
+
+logger = logging.getLogger(__name__)
+
+# "always": fsync every batch, "interval": fsync written records within
+# fsync_interval seconds, even when idle, "never": leave write-back to the OS
+FSYNC_POLICIES = {"always", "interval", "never"}
+
+# Writers flushed at interpreter exit so queued records are not lost
+_live_writers: "weakref.WeakSet[AuditWriter]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_live_writers() -> None:
+    for writer in list(_live_writers):
+        try:
+            writer.close()
+        except Exception as e:
+            logger.error(f"Error closing audit writer at exit: {e}")
+
+
+class AuditWriter:
+    """
+    Background group-commit writer for audit log segments.
+
+    Records are written strictly in submission order, so a crash can only
+    lose a suffix of the log and never leaves a gap in the hash chain.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = 0.05,
+        batch_size: int = 256,
+        fsync_policy: str = "interval",
+        fsync_interval: float = 1.0,
+        max_pending: int = 10000,
+        on_commit: Optional[Callable[[List[IndexEntry]], None]] = None,
+    ):
+        """
+        Initialize audit writer.
+
+        Args:
+            flush_interval: Maximum seconds a record waits before being written
+            batch_size: Records that trigger an immediate group commit
+            fsync_policy: One of ``FSYNC_POLICIES``
+            fsync_interval: Seconds between fsyncs under the "interval" policy
+            max_pending: Queued records before submitters block
+            on_commit: Called with the index entries of each written batch
+
+        Raises:
+            GadugiError: If the fsync policy is unknown
+        """
+        if fsync_policy not in FSYNC_POLICIES:
+            raise GadugiError(
+                f"Invalid fsync policy '{fsync_policy}', "
+                f"expected one of {sorted(FSYNC_POLICIES)}"
+            )
+
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.fsync_policy = fsync_policy
+        self.fsync_interval = fsync_interval
+        self.max_pending = max_pending
+        self.on_commit = on_commit
+
+        self._pending: Deque[Tuple[Path, bytes, Optional[IndexEntry]]] = deque()
+        self._condition = threading.Condition()
+        self._submitted = 0
+        self._written = 0
+        self._oldest_pending = 0.0
+        self._flush_requested = False
+        self._closing = False
+        self._error: Optional[Exception] = None
+
+        self._file: Optional[BinaryIO] = None
+        self._file_path: Optional[Path] = None
+        self._committed_size = 0  # Bytes known to be in the open segment
+        self._retry_delay = 0.0
+        self._last_fsync = time.monotonic()
+        self._unsynced = False  # Written since the last fsync
+
+        # Write statistics
+        self.batches_committed = 0
+        self.bytes_written = 0
+        self.fsyncs = 0
+        self.largest_batch = 0
+
+        self._thread = threading.Thread(
+            target=self._write_loop, name="gadugi-audit-writer", daemon=True
+        )
+        self._thread.start()
+        _live_writers.add(self)
+
+    @property
+    def pending(self) -> int:
+        """Records submitted but not yet written."""
+        return self._submitted - self._written
+
+    def submit(
+        self, path: Path, data: bytes, entry: Optional[IndexEntry] = None
+    ) -> None:
+        """
+        Queue a serialised record for a segment.
+
+        Args:
+            path: Segment file the record belongs to
+            data: Complete JSONL line
+            entry: Index entry published once the record is on disk
+
+        Raises:
+            GadugiError: If the writer is closed or failing
+        """
+        with self._condition:
+            self._raise_if_failed()
+            if self._closing:
+                raise GadugiError("Audit logging failed: writer is closed")
+
+            while len(self._pending) >= self.max_pending and not self._error:
+                self._flush_requested = True
+                self._condition.notify_all()
+                self._condition.wait()
+            self._raise_if_failed()
+
+            if not self._pending:
+                self._oldest_pending = time.monotonic()
+            self._pending.append((path, data, entry))
+            self._submitted += 1
+            if len(self._pending) >= self.batch_size:
+                self._condition.notify_all()
+            elif len(self._pending) == 1:
+                self._condition.notify_all()  # Start the latency timer
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait until every submitted record has been written.
+
+        Raises:
+            GadugiError: If writing failed or the timeout expired
+        """
+        with self._condition:
+            target = self._submitted
+            self._flush_requested = True
+            self._condition.notify_all()
+
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while self._written < target and not self._error:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise GadugiError("Timed out flushing audit log")
+                self._condition.wait(remaining)
+            self._raise_if_failed()
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Write remaining records, sync and close the current segment."""
+        with self._condition:
+            if self._closing:
+                return
+            self._closing = True
+            self._condition.notify_all()
+
+        self._thread.join(timeout=timeout)
+        self._close_file()
+        _live_writers.discard(self)
+
+        if self.pending:
+            logger.error(f"Audit writer closed with {self.pending} unwritten records")
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise GadugiError(f"Audit logging failed: {self._error}")
+
+    def _write_loop(self) -> None:
+        """Collect records into batches and commit them."""
+        while True:
+            with self._condition:
+                sync_due = False
+                while not self._pending and not self._closing:
+                    # An idle writer still syncs its tail within the interval
+                    if self._unsynced and self.fsync_policy == "interval":
+                        remaining = (
+                            self._last_fsync + self.fsync_interval - time.monotonic()
+                        )
+                        if remaining <= 0:
+                            sync_due = True
+                            break
+                        self._condition.wait(remaining)
+                    else:
+                        self._condition.wait()
+                if not self._pending and self._closing:
+                    return
+
+            if sync_due:
+                try:
+                    self._fsync()
+                except OSError as e:
+                    logger.error(f"Failed to sync audit log: {e}")
+                    self._last_fsync = time.monotonic()  # Retry next interval
+                continue
+
+            with self._condition:
+                # Group commit: wait for a full batch or the latency budget
+                while len(self._pending) < self.batch_size and not (
+                    self._flush_requested or self._closing
+                ):
+                    remaining = (
+                        self._oldest_pending + self.flush_interval - time.monotonic()
+                    )
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                batch = [
+                    self._pending.popleft()
+                    for _ in range(min(self.batch_size, len(self._pending)))
+                ]
+                self._flush_requested = bool(self._pending) and self._flush_requested
+
+            written, error = self._commit(batch)
+
+            with self._condition:
+                self._written += written
+                if error is not None:
+                    if self._error is None:
+                        logger.error(f"Failed to write audit log batch: {error}")
+                    # Keep unwritten records, in order, for the next attempt
+                    self._pending.extendleft(reversed(batch[written:]))
+                    self._error = error
+                    self._retry_delay = min(
+                        max(self._retry_delay * 2, self.flush_interval, 0.1), 5.0
+                    )
+                    self._condition.notify_all()
+                    if self._closing:
+                        return
+                    self._condition.wait(self._retry_delay)
+                    continue
+
+                self._error = None
+                self._retry_delay = 0.0
+                if self._pending:
+                    self._oldest_pending = time.monotonic()
+                self._condition.notify_all()
+
+    def _commit(
+        self, batch: List[Tuple[Path, bytes, Optional[IndexEntry]]]
+    ) -> Tuple[int, Optional[Exception]]:
+        """
+        Append a batch with one write per segment run, then publish it.
+
+        Returns:
+            Number of records written and the error that stopped the batch
+        """
+        runs: List[Tuple[Path, List[bytes]]] = []
+        for path, data, _ in batch:
+            if runs and runs[-1][0] == path:
+                runs[-1][1].append(data)
+            else:
+                runs.append((path, [data]))
+
+        written = 0
+        error: Optional[Exception] = None
+        try:
+            for path, chunks in runs:
+                f = self._open(path)
+                payload = b"".join(chunks)
+                f.write(payload)
+                f.flush()
+                self._committed_size += len(payload)
+                self.bytes_written += len(payload)
+                self._unsynced = True
+                written += len(chunks)
+
+            if self.fsync_policy == "always" or (
+                self.fsync_policy == "interval"
+                and time.monotonic() - self._last_fsync >= self.fsync_interval
+            ):
+                self._fsync()
+        except OSError as e:
+            error = e
+            self._discard_file()
+
+        if written:
+            self.batches_committed += 1
+            self.largest_batch = max(self.largest_batch, written)
+
+            entries = [entry for _, _, entry in batch[:written] if entry is not None]
+            if entries and self.on_commit:
+                try:
+                    self.on_commit(entries)
+                except Exception as e:
+                    # The log itself is intact, the index catches up later
+                    logger.warning(f"Failed to publish audit index entries: {e}")
+
+        return written, error
+
+    def _open(self, path: Path) -> BinaryIO:
+        """Return the handle for a segment, closing the previous one on rotation."""
+        if self._file is not None and self._file_path == path:
+            return self._file
+
+        if self._file_path != path:
+            self._close_file()
+            self._file = open(path, "ab")
+            self._committed_size = os.fstat(self._file.fileno()).st_size
+        else:
+            # Reopening after a failed write: drop any torn tail so queued
+            # offsets and the hash chain line up again
+            self._file = open(path, "ab")
+            if os.fstat(self._file.fileno()).st_size > self._committed_size:
+                self._file.truncate(self._committed_size)
+
+        self._file_path = path
+        return self._file
+
+    def _discard_file(self) -> None:
+        """Drop the handle after a failed write, keeping the committed size."""
+        if self._file is None:
+            return
+        try:
+            self._file.close()
+        except OSError:
+            pass
+        self._file = None
+
+    def _fsync(self) -> None:
+        if self._file is not None:
+            os.fsync(self._file.fileno())
+            self.fsyncs += 1
+        self._last_fsync = time.monotonic()
+        self._unsynced = False
+
+    def _close_file(self) -> None:
+        if self._file is None:
+            return
+        try:
+            self._file.flush()
+            if self.fsync_policy != "never":
+                self._fsync()
+        finally:
+            self._file.close()
+            self._file = None
+            self._file_path = None
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get writer status information."""
+        return {
+            "running": self._thread.is_alive(),
+            "pending_records": self.pending,
+            "records_written": self._written,
+            "batches_committed": self.batches_committed,
+            "largest_batch": self.largest_batch,
+            "bytes_written": self.bytes_written,
+            "fsyncs": self.fsyncs,
+            "fsync_policy": self.fsync_policy,
+            "last_error": str(self._error) if self._error else None,
+        }
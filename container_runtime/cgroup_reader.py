@@ -0,0 +1,265 @@
+"""
+cgroup v2 Reader for Container Resource Accounting.
+
+Reads a container's resource counters straight from the unified cgroup
+hierarchy instead of going through the Docker stats API, which exposes
+neither PID counts, I/O bytes nor OOM events and costs an HTTP round trip
+to the daemon per call.
+"""
+
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+# Where Docker places container cgroups under the common cgroup drivers
+CGROUP_PATH_TEMPLATES = [
+    "system.slice/docker-{id}.scope",  # systemd driver
+    "docker/{id}",  # cgroupfs driver
+    "docker.slice/docker-{id}.scope",  # rootless / custom slice
+]
+
+
+@dataclass
+class CgroupStats:
+    """Raw counters read from a container's cgroup."""
+
+    timestamp: float  # time.monotonic() when read
+    cpu_usage_usec: int
+    memory_current: int
+    memory_max: Optional[int]  # None when unlimited ("max")
+    oom_events: int
+    oom_kill_events: int
+    io_read_bytes: int
+    io_write_bytes: int
+    pids_current: int
+    open_files: int
+    network_rx_bytes: int
+    network_tx_bytes: int
+
+    @property
+    def io_bytes(self) -> int:
+        """Total bytes read and written."""
+        return self.io_read_bytes + self.io_write_bytes
+
+
+def _parse_flat_keyed(content: str) -> Dict[str, int]:
+    """Parse a flat-keyed cgroup file (``key value`` per line)."""
+    values: Dict[str, int] = {}
+    for line in content.splitlines():
+        parts = line.split()
+        if len(parts) == 2:
+            try:
+                values[parts[0]] = int(parts[1])
+            except ValueError:
+                continue
+    return values
+
+
+def _parse_io_stat(content: str) -> Dict[str, int]:
+    """Sum nested-keyed ``io.stat`` counters over all devices."""
+    totals: Dict[str, int] = {}
+    for line in content.splitlines():
+        # "8:0 rbytes=1 wbytes=2 rios=3 wios=4 dbytes=0 dios=0"
+        for field in line.split()[1:]:
+            key, _, value = field.partition("=")
+            try:
+                totals[key] = totals.get(key, 0) + int(value)
+            except ValueError:
+                continue
+    return totals
+
+
+class CgroupV2Reader:
+    """
+    Reads container resource counters directly from cgroup v2 files.
+
+    Callers should fall back to the Docker API whenever :meth:`read`
+    returns ``None`` (cgroup v1 host, remote daemon, missing permissions).
+    """
+
+    def __init__(
+        self,
+        cgroup_root: Optional[Path] = None,
+        proc_root: Path = Path("/proc"),
+        miss_retry_after: float = 5.0,
+    ):
+        """
+        Initialize cgroup reader.
+
+        Args:
+            cgroup_root: Mount point of the unified cgroup hierarchy
+            proc_root: Mount point of procfs, used for fd and network counts
+            miss_retry_after: Seconds before a container whose cgroup was
+                not found is looked up again
+        """
+        self.cgroup_root = cgroup_root or DEFAULT_CGROUP_ROOT
+        self.proc_root = proc_root
+        self.miss_retry_after = miss_retry_after
+        self.available = (self.cgroup_root / "cgroup.controllers").exists()
+        self._path_cache: Dict[str, Path] = {}
+        self._missed_at: Dict[str, float] = {}  # docker ID -> failed lookup time
+
+        if self.available:
+            logger.info(f"cgroup v2 hierarchy available at {self.cgroup_root}")
+        else:
+            logger.debug("cgroup v2 hierarchy not available - using Docker API")
+
+    def find_cgroup_path(self, docker_id: str) -> Optional[Path]:
+        """
+        Locate the cgroup directory for a Docker container.
+
+        Args:
+            docker_id: Full Docker container ID
+
+        Returns:
+            cgroup directory, or None if it cannot be found. A miss is only
+            remembered for ``miss_retry_after`` seconds, since a container
+            probed early may not have its cgroup yet.
+        """
+        if not self.available or not docker_id:
+            return None
+
+        cached = self._path_cache.get(docker_id)
+        if cached is not None and cached.exists():
+            return cached
+
+        missed_at = self._missed_at.get(docker_id)
+        if (
+            missed_at is not None
+            and time.monotonic() - missed_at < self.miss_retry_after
+        ):
+            return None
+
+        path = None
+        for template in CGROUP_PATH_TEMPLATES:
+            candidate = self.cgroup_root / template.format(id=docker_id)
+            if (candidate / "cgroup.procs").exists():
+                path = candidate
+                break
+
+        if path is None:
+            self._path_cache.pop(docker_id, None)
+            self._missed_at[docker_id] = time.monotonic()
+        else:
+            self._path_cache[docker_id] = path
+            self._missed_at.pop(docker_id, None)
+        return path
+
+    def forget(self, docker_id: Optional[str]) -> None:
+        """Drop cached path information for a removed container."""
+        if not docker_id:
+            return
+        self._path_cache.pop(docker_id, None)
+        self._missed_at.pop(docker_id, None)
+
+    def read(self, docker_id: str) -> Optional[CgroupStats]:
+        """
+        Read resource counters for a container.
+
+        Args:
+            docker_id: Full Docker container ID
+
+        Returns:
+            Counters, or None if the cgroup is not accessible
+        """
+        path = self.find_cgroup_path(docker_id)
+        if path is None:
+            return None
+
+        try:
+            cpu_stat = _parse_flat_keyed(self._read_file(path / "cpu.stat"))
+            memory_events = _parse_flat_keyed(
+                self._read_file(path / "memory.events", default="")
+            )
+            io_stat = _parse_io_stat(self._read_file(path / "io.stat", default=""))
+
+            memory_max_raw = self._read_file(path / "memory.max", default="max")
+            memory_max = None if memory_max_raw == "max" else int(memory_max_raw)
+
+            pids = self._read_pids(path)
+            network_rx, network_tx = self._read_network(pids)
+
+            return CgroupStats(
+                timestamp=time.monotonic(),
+                cpu_usage_usec=cpu_stat.get("usage_usec", 0),
+                memory_current=int(self._read_file(path / "memory.current")),
+                memory_max=memory_max,
+                oom_events=memory_events.get("oom", 0),
+                oom_kill_events=memory_events.get("oom_kill", 0),
+                io_read_bytes=io_stat.get("rbytes", 0),
+                io_write_bytes=io_stat.get("wbytes", 0),
+                pids_current=int(
+                    self._read_file(path / "pids.current", default=str(len(pids)))
+                ),
+                open_files=self._count_open_files(pids),
+                network_rx_bytes=network_rx,
+                network_tx_bytes=network_tx,
+            )
+
+        except (OSError, ValueError) as e:
+            # Container exited between lookup and read, or permission denied
+            logger.debug(f"cgroup read failed for {docker_id[:12]}: {e}")
+            self.forget(docker_id)
+            return None
+
+    def _read_file(self, path: Path, default: Optional[str] = None) -> str:
+        """Read a small cgroup or procfs file."""
+        try:
+            with open(path, "r") as f:
+                return f.read().strip()
+        except FileNotFoundError:
+            if default is None:
+                raise
+            return default
+
+    def _read_pids(self, path: Path) -> List[int]:
+        """List process IDs in the cgroup."""
+        content = self._read_file(path / "cgroup.procs", default="")
+        return [int(pid) for pid in content.split()]
+
+    def _count_open_files(self, pids: List[int]) -> int:
+        """Count open file descriptors across the cgroup's processes."""
+        open_files = 0
+        for pid in pids:
+            try:
+                open_files += len(os.listdir(self.proc_root / str(pid) / "fd"))
+            except OSError:
+                continue  # Process exited or fds not readable
+        return open_files
+
+    def _read_network(self, pids: List[int]) -> Tuple[int, int]:
+        """Read network byte counters from the container's network namespace."""
+        for pid in pids:
+            try:
+                content = self._read_file(self.proc_root / str(pid) / "net" / "dev")
+            except OSError:
+                continue
+
+            rx_total = 0
+            tx_total = 0
+            for line in content.splitlines()[2:]:
+                interface, _, counters = line.partition(":")
+                if interface.strip() == "lo":
+                    continue
+                fields = counters.split()
+                if len(fields) >= 9:
+                    rx_total += int(fields[0])
+                    tx_total += int(fields[8])
+            return rx_total, tx_total
+
+        return 0, 0
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get reader status information."""
+        return {
+            "available": self.available,
+            "cgroup_root": str(self.cgroup_root),
+            "cached_paths": len(self._path_cache),
+        }
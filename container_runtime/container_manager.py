@@ -5,9 +5,20 @@ Container Manager for secure container lifecycle management.
 import logging
 import time
 import uuid
-from typing import Dict, List, Optional, Any, TYPE_CHECKING
+from typing import Dict, List, Optional, Any, Callable, TYPE_CHECKING
 from dataclasses import dataclass
 from enum import Enum
+from pathlib import Path
+
+import psutil
+
+from .cgroup_reader import CgroupStats, CgroupV2Reader
+from .execution_history import (
+    DEFAULT_INLINE_LIMIT,
+    ExecutionHistory,
+    ExecutionRecord,
+    OutputStore,
+)
 
 if TYPE_CHECKING:
     import docker
@@ -82,6 +93,114 @@ class ContainerResult:
     status: ContainerStatus
 
 
+def usage_from_cgroup(
+    cgroup_stats: CgroupStats, started: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Final resource usage from cgroup v2 counters.
+
+    Returns the same keys as ``usage_from_docker_stats``. CPU usage is the
+    average share of host CPU since ``started`` (``time.monotonic()`` when
+    the container started, with its cgroup counters at zero).
+    """
+    cpu_percent = 0.0
+    if started is not None:
+        elapsed_usec = (cgroup_stats.timestamp - started) * 1_000_000
+        if elapsed_usec > 0:
+            cpu_percent = (
+                cgroup_stats.cpu_usage_usec / elapsed_usec / (os.cpu_count() or 1)
+            ) * 100.0
+
+    # Like Docker, report host memory as the limit of an unlimited container
+    memory_limit = cgroup_stats.memory_max or psutil.virtual_memory().total
+    return {
+        "source": "cgroup",
+        "cpu_percent": cpu_percent,
+        "cpu_usage_usec": cgroup_stats.cpu_usage_usec,
+        "memory_usage_bytes": cgroup_stats.memory_current,
+        "memory_limit_bytes": memory_limit,
+        "memory_percent": cgroup_stats.memory_current / memory_limit * 100,
+        "oom_events": cgroup_stats.oom_events,
+        "oom_kill_events": cgroup_stats.oom_kill_events,
+        "io_read_bytes": cgroup_stats.io_read_bytes,
+        "io_write_bytes": cgroup_stats.io_write_bytes,
+        "processes": cgroup_stats.pids_current,
+        "open_files": cgroup_stats.open_files,
+        "network_rx_bytes": cgroup_stats.network_rx_bytes,
+        "network_tx_bytes": cgroup_stats.network_tx_bytes,
+        "network_stats": {
+            "total": {
+                "rx_bytes": cgroup_stats.network_rx_bytes,
+                "tx_bytes": cgroup_stats.network_tx_bytes,
+            }
+        },
+        "block_io_stats": {
+            "io_service_bytes_recursive": [
+                {"op": "read", "value": cgroup_stats.io_read_bytes},
+                {"op": "write", "value": cgroup_stats.io_write_bytes},
+            ]
+        },
+    }
+
+
+def usage_from_docker_stats(stats: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Final resource usage from a Docker stats snapshot.
+
+    Returns the same keys as ``usage_from_cgroup``; counters Docker does not
+    expose (OOM events, open files) are None.
+    """
+    # Calculate CPU usage percentage
+    cpu_stats = stats.get("cpu_stats", {})
+    precpu_stats = stats.get("precpu_stats", {})
+    cpu_total = cpu_stats.get("cpu_usage", {}).get("total_usage", 0)
+
+    cpu_percent = 0.0
+    if cpu_stats and precpu_stats:
+        cpu_delta = cpu_total - precpu_stats.get("cpu_usage", {}).get("total_usage", 0)
+        system_delta = cpu_stats.get("system_cpu_usage", 0) - precpu_stats.get(
+            "system_cpu_usage", 0
+        )
+
+        if system_delta > 0:
+            cpu_percent = (cpu_delta / system_delta) * 100.0
+
+    # Memory usage
+    memory_stats = stats.get("memory_stats", {})
+    memory_usage = memory_stats.get("usage", 0)
+    memory_limit = memory_stats.get("limit", 0)
+
+    # Network and block I/O totals
+    networks = stats.get("networks", {})
+    blkio_stats = stats.get("blkio_stats", {})
+    io_bytes = {"read": 0, "write": 0}
+    for entry in blkio_stats.get("io_service_bytes_recursive") or []:
+        op = str(entry.get("op", "")).lower()
+        if op in io_bytes:
+            io_bytes[op] += entry.get("value", 0)
+
+    return {
+        "source": "docker",
+        "cpu_percent": cpu_percent,
+        "cpu_usage_usec": cpu_total // 1000,
+        "memory_usage_bytes": memory_usage,
+        "memory_limit_bytes": memory_limit,
+        "memory_percent": (memory_usage / memory_limit * 100)
+        if memory_limit > 0
+        else None,
+        "oom_events": None,
+        "oom_kill_events": None,
+        "io_read_bytes": io_bytes["read"],
+        "io_write_bytes": io_bytes["write"],
+        "processes": stats.get("pids_stats", {}).get("current"),
+        "open_files": None,
+        "network_rx_bytes": sum(net.get("rx_bytes", 0) for net in networks.values()),
+        "network_tx_bytes": sum(net.get("tx_bytes", 0) for net in networks.values()),
+        "network_stats": networks,
+        "block_io_stats": blkio_stats,
+    }
+
+
 class ContainerManager:
     """
     Manages Docker container lifecycle for secure code execution.
@@ -90,14 +209,40 @@ class ContainerManager:
     with comprehensive security controls and resource management.
     """
 
-    def __init__(self, docker_client: Optional[Any] = None):
-        """Initialize container manager."""
+    def __init__(
+        self,
+        docker_client: Optional[Any] = None,
+        cgroup_reader: Optional[CgroupV2Reader] = None,
+        history_size: int = 1000,
+        output_store_dir: Optional[Path] = None,
+        inline_output_limit: int = DEFAULT_INLINE_LIMIT,
+        output_store: Optional[OutputStore] = None,
+    ):
+        """
+        Initialize container manager.
+
+        Args:
+            docker_client: Docker client, from the environment by default
+            cgroup_reader: Reader for final container resource usage
+            history_size: Executions kept in the execution history
+            output_store_dir: Directory for output too large to keep in
+                memory; without one such output is truncated
+            inline_output_limit: Characters of each output kept in memory
+            output_store: Store for large output, instead of one opened on
+                ``output_store_dir``; stores must not share a directory
+        """
         if not docker_available:
             raise GadugiError("Docker is not available. Please install docker package.")
 
         self.client = docker_client or docker.from_env()  # type: ignore[attr-defined]
+        self.cgroup_reader = cgroup_reader or CgroupV2Reader()
         self.active_containers: Dict[str, Any] = {}
-        self.execution_history: List[ContainerResult] = []
+        self.execution_history = ExecutionHistory(
+            max_records=history_size,
+            output_store=output_store
+            or (OutputStore(output_store_dir) if output_store_dir else None),
+            inline_limit=inline_output_limit,
+        )
 
         # Verify Docker daemon is accessible
         try:
@@ -181,12 +326,18 @@ class ContainerManager:
         except Exception as e:
             raise GadugiError(f"Unexpected error starting container: {e}")
 
-    def execute_container(self, config: ContainerConfig) -> ContainerResult:
+    def execute_container(
+        self,
+        config: ContainerConfig,
+        on_started: Optional[Callable[[str, Any], None]] = None,
+    ) -> ContainerResult:
         """
         Execute a container from creation to completion.
 
         Args:
             config: Container configuration
+            on_started: Called with (container_id, container) once the
+                container is running, e.g. to begin resource monitoring
 
         Returns:
             Container execution result
@@ -201,9 +352,16 @@ class ContainerManager:
             # Create and start container
             container_id = self.create_container(config)
             self.start_container(container_id)
+            started = time.monotonic()
 
             container = self.active_containers[container_id]
 
+            if on_started:
+                try:
+                    on_started(container_id, container)
+                except Exception as e:
+                    logger.warning(f"Container start callback failed: {e}")
+
             # Wait for completion with timeout
             try:
                 exit_code = container.wait(timeout=config.timeout)
@@ -227,7 +385,7 @@ class ContainerManager:
                 stderr = f"Log retrieval failed: {e}"
 
             # Get resource usage stats
-            resource_usage = self._get_resource_usage(container)
+            resource_usage = self._get_resource_usage(container, started)
 
             # Calculate execution time
             execution_time = time.time() - start_time
@@ -245,8 +403,8 @@ class ContainerManager:
                 else ContainerStatus.FAILED,
             )
 
-            # Store in history
-            self.execution_history.append(result)
+            # Store a compact record in history
+            self.execution_history.add(result, image=config.image)
 
             logger.info(
                 f"Container execution completed: {container_id[:8]} "
@@ -321,42 +479,19 @@ class ContainerManager:
             # Remove from active containers
             self.active_containers.pop(container_id, None)
 
-    def _get_resource_usage(self, container) -> Dict[str, Any]:
+    def _get_resource_usage(
+        self, container, started: Optional[float] = None
+    ) -> Dict[str, Any]:
         """Get container resource usage statistics."""
-        try:
-            stats = container.stats(stream=False)
-
-            # Calculate CPU usage percentage
-            cpu_stats = stats.get("cpu_stats", {})
-            precpu_stats = stats.get("precpu_stats", {})
-
-            cpu_percent = 0.0
-            if cpu_stats and precpu_stats:
-                cpu_delta = cpu_stats.get("cpu_usage", {}).get(
-                    "total_usage", 0
-                ) - precpu_stats.get("cpu_usage", {}).get("total_usage", 0)
-                system_delta = cpu_stats.get("system_cpu_usage", 0) - precpu_stats.get(
-                    "system_cpu_usage", 0
-                )
+        docker_id = getattr(container, "id", None)
+        cgroup_stats = (
+            self.cgroup_reader.read(docker_id) if isinstance(docker_id, str) else None
+        )
+        if cgroup_stats is not None:
+            return usage_from_cgroup(cgroup_stats, started)
 
-                if system_delta > 0:
-                    cpu_percent = (cpu_delta / system_delta) * 100.0
-
-            # Memory usage
-            memory_stats = stats.get("memory_stats", {})
-            memory_usage = memory_stats.get("usage", 0)
-            memory_limit = memory_stats.get("limit", 0)
-
-            return {
-                "cpu_percent": cpu_percent,
-                "memory_usage_bytes": memory_usage,
-                "memory_limit_bytes": memory_limit,
-                "memory_percent": (memory_usage / memory_limit * 100)
-                if memory_limit > 0
-                else 0,
-                "network_stats": stats.get("networks", {}),
-                "block_io_stats": stats.get("blkio_stats", {}),
-            }
+        try:
+            return usage_from_docker_stats(container.stats(stream=False))
 
         except Exception as e:
             logger.warning(f"Failed to get container resource usage: {e}")
@@ -392,9 +527,57 @@ class ContainerManager:
         logger.info(f"Cleaned up {len(container_ids)} containers")
 
     def get_execution_history(
-        self, limit: Optional[int] = None
-    ) -> List[ContainerResult]:
-        """Get container execution history."""
-        if limit:
-            return self.execution_history[-limit:]
-        return self.execution_history.copy()
+        self,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        container_id: Optional[str] = None,
+        status: Optional[ContainerStatus] = None,
+        exit_code: Optional[int] = None,
+        image: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ) -> List[ExecutionRecord]:
+        """
+        Get container execution history, oldest first.
+
+        Args:
+            limit: Maximum records to return, newest matches first;
+                None or 0 returns all
+            offset: Newest matches to skip, for paging backwards
+            container_id: Filter by container ID or prefix
+            status: Filter by final container status
+            exit_code: Filter by exit code
+            image: Filter by image
+            since: Only executions finished at or after this timestamp
+            until: Only executions finished before this timestamp
+
+        Returns:
+            Execution records; use ``get_execution_output`` for full output
+        """
+        return self.execution_history.query(
+            limit=limit,
+            offset=offset,
+            container_id=container_id,
+            status=status,
+            exit_code=exit_code,
+            image=image,
+            since=since,
+            until=until,
+        )
+
+    def get_execution_output(self, record: ExecutionRecord) -> Dict[str, Any]:
+        """
+        Get the full output of a recorded execution.
+
+        Outputs that are no longer stored come back as their truncated tail
+        with ``complete`` set to False.
+        """
+        output: Dict[str, Any] = {"complete": True}
+        for stream in ("stdout", "stderr"):
+            ref = getattr(record, stream)
+            text = self.execution_history.read_output(ref)
+            if text is None:
+                text = ref.preview
+                output["complete"] = False
+            output[stream] = text
+        return output
@@ -5,17 +5,19 @@ Main interface for secure containerized execution that integrates
 all container runtime components with enhanced separation architecture.
 """
 
-import json
+import asyncio
 import logging
 import threading
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime
 
+from .async_docker import AsyncContainerManager, AsyncDockerClient
 from .container_manager import ContainerManager, ContainerConfig, ContainerResult
-from .security_policy import SecurityPolicyEngine, ExecutionPolicy
-from .resource_manager import ResourceManager, ResourceAlert
+from .execution_history import OutputStore
+from .security_policy import SecurityPolicyEngine, CompiledPolicy, PolicySet
+from .resource_manager import ResourceManager, ResourceAlert, ResourceMonitor
 from .audit_logger import AuditLogger
 from .image_manager import ImageManager
 
@@ -50,6 +52,8 @@ class ExecutionRequest:
     timeout: Optional[int] = None
     user_id: Optional[str] = None
     working_directory: str = "/workspace"
+    packages: Optional[List[str]] = None  # preinstalled via dependency image
+    tenant_id: Optional[str] = None  # selects per-tenant policy overrides
 
 
 @dataclass
@@ -81,6 +85,13 @@ class ContainerExecutionEngine:
         policy_file: Optional[Path] = None,
         audit_log_dir: Optional[Path] = None,
         image_cache_dir: Optional[Path] = None,
+        sample_interval: float = 1.0,
+        prebuild_images: bool = True,
+        tenant_policy_dir: Optional[Path] = None,
+        policy_reload_interval: Optional[float] = 5.0,
+        execution_output_dir: Optional[Path] = None,
+        docker_host: Optional[str] = None,
+        max_async_executions: int = 256,
     ):
         """
         Initialize container execution engine.
@@ -89,23 +100,52 @@ class ContainerExecutionEngine:
             policy_file: Security policy configuration file
             audit_log_dir: Directory for audit logs
             image_cache_dir: Directory for image cache
+            sample_interval: Seconds between resource samples of running containers
+            prebuild_images: Build default runtime images in the background
+            tenant_policy_dir: Directory of per-tenant policy files
+            policy_reload_interval: Seconds between checks of the policy
+                sources for changes, None to disable hot reload
+            execution_output_dir: Directory for large execution output kept
+                by the execution history, truncated if not set
+            docker_host: Docker daemon address for ``execute_async``,
+                ``DOCKER_HOST`` or the default socket if not set
+            max_async_executions: Containers ``execute_async`` runs at once
         """
         self.execution_id_counter = 0
         self.execution_lock = threading.Lock()
 
         # Initialize core components
-        self.container_manager = ContainerManager()
-        self.security_policy = SecurityPolicyEngine(policy_file)
-        self.resource_manager = ResourceManager()
+        # One store for both execution paths, since stores on the same
+        # directory would write over each other's segments
+        self.output_store = (
+            OutputStore(execution_output_dir) if execution_output_dir else None
+        )
+        self.container_manager = ContainerManager(output_store=self.output_store)
+        self.security_policy = SecurityPolicyEngine(policy_file, tenant_policy_dir)
+        self.resource_manager = ResourceManager(sample_interval=sample_interval)
         self.audit_logger = AuditLogger(audit_log_dir)
         self.image_manager = ImageManager(image_cache_dir=image_cache_dir)
 
+        # Warm runtime images off the request path
+        if prebuild_images:
+            self.image_manager.prebuild_runtime_images()
+
         # Track active executions
         self.active_executions: Dict[str, Dict[str, Any]] = {}
 
+        # Async execution path, connected on first execute_async
+        self.docker_host = docker_host
+        self.max_async_executions = max_async_executions
+        self.async_container_manager: Optional[AsyncContainerManager] = None
+
         # Register resource alert handler
         self.resource_manager.add_alert_handler(self._handle_resource_alert)
 
+        # Audit every policy version and watch the sources for edits
+        self.security_policy.add_reload_handler(self._handle_policy_reload)
+        if policy_reload_interval and (policy_file or tenant_policy_dir):
+            self.security_policy.start_watching(policy_reload_interval)
+
         logger.info("Container execution engine initialized")
 
     def _generate_request_id(self) -> str:
@@ -136,6 +176,14 @@ class ContainerExecutionEngine:
                 actual=alert.current_value,
             )
 
+    def _handle_policy_reload(self, policy_set: PolicySet) -> None:
+        """Record a newly published policy version in the audit log."""
+        self.audit_logger.log_policies_reloaded(
+            policy_version=policy_set.version,
+            policies=sorted(policy_set.policies),
+            tenants=sorted(policy_set.tenants),
+        )
+
     def execute(self, request: ExecutionRequest) -> ExecutionResponse:
         """
         Execute code in secure container environment.
@@ -157,100 +205,209 @@ class ContainerExecutionEngine:
                 "System at capacity - cannot execute additional containers"
             )
 
-        audit_events = []
-        security_events = []
+        audit_events: List[str] = []
+        security_events: List[Dict[str, Any]] = []
 
         try:
-            # Get security policy
-            policy = self.security_policy.get_policy(request.security_policy)
-
-            # Validate execution request against policy
-            image_name = self._get_runtime_image(request.runtime)
-            self.security_policy.validate_execution_request(
-                image=image_name,
-                command=request.command,
-                policy_name=request.security_policy,
+            policy_set, compiled = self._resolve_policy(request)
+            image_name = self._admit_image(request, compiled)
+            container_config = self._start_execution(
+                request, request_id, policy_set, compiled, image_name, audit_events
             )
 
-            # Log policy application
-            policy_event_id = self.audit_logger.log_policy_applied(
-                container_id=request_id,
-                policy_name=policy.name,
-                policy_details=self.security_policy.get_policy_summary(policy.name),
-                user_id=request.user_id,
+            # Execute container
+            result = self._execute_container(
+                request_id, container_config, request.user_id
             )
-            audit_events.append(policy_event_id)
+            return self._completed_response(
+                request_id, result, security_events, audit_events
+            )
+
+        except Exception as e:
+            return self._failed_response(
+                request_id, request, e, security_events, audit_events
+            )
+
+        finally:
+            # Clean up active execution tracking
+            self.active_executions.pop(request_id, None)
 
-            # Prepare container configuration
-            container_config = self._build_container_config(request, policy, image_name)
+    async def execute_async(self, request: ExecutionRequest) -> ExecutionResponse:
+        """
+        Execute code in secure container environment from an event loop.
 
-            # Track active execution
-            self.active_executions[request_id] = {
-                "started": datetime.now(),
-                "request": request,
-                "policy": policy.name,
-                "container_id": None,
-            }
+        Policy, image and audit handling match :meth:`execute`. The container
+        lifecycle runs on the shared async Docker client, so many executions
+        can run concurrently on one loop; image preparation and the capacity
+        check run in worker threads. Resource usage is the final snapshot
+        rather than sampled over the run.
 
-            # Execute container
-            result = self._execute_container(
-                request_id, container_config, request.user_id
+        Args:
+            request: Execution request with code and configuration
+
+        Returns:
+            Execution response with results and audit information
+
+        Raises:
+            GadugiError: If the system is at capacity
+        """
+        request_id = self._generate_request_id()
+
+        if not await asyncio.to_thread(self.resource_manager.check_system_capacity):
+            raise GadugiError(
+                "System at capacity - cannot execute additional containers"
             )
 
-            # Build response
-            response = ExecutionResponse(
-                request_id=request_id,
-                success=result.exit_code == 0,
-                exit_code=result.exit_code,
-                stdout=result.stdout,
-                stderr=result.stderr,
-                execution_time=result.execution_time,
-                resource_usage=result.resource_usage,
-                security_events=security_events,
-                audit_events=audit_events,
+        audit_events: List[str] = []
+        security_events: List[Dict[str, Any]] = []
+
+        try:
+            policy_set, compiled = self._resolve_policy(request)
+            image_name = await asyncio.to_thread(self._admit_image, request, compiled)
+            container_config = self._start_execution(
+                request, request_id, policy_set, compiled, image_name, audit_events
             )
 
-            logger.info(
-                f"Execution completed: {request_id} (success={response.success})"
+            result = await self._execute_container_async(
+                request_id, container_config, request.user_id
+            )
+            return self._completed_response(
+                request_id, result, security_events, audit_events
             )
-            return response
 
         except Exception as e:
-            # Log execution failure
-            error_event_id = self.audit_logger.log_container_failed(
-                container_id=request_id, error=str(e), user_id=request.user_id
-            )
-            audit_events.append(error_event_id)
-
-            # Return error response
-            return ExecutionResponse(
-                request_id=request_id,
-                success=False,
-                exit_code=-1,
-                stdout="",
-                stderr=str(e),
-                execution_time=0.0,
-                resource_usage={},
-                security_events=security_events,
-                audit_events=audit_events,
-                error_message=str(e),
+            return self._failed_response(
+                request_id, request, e, security_events, audit_events
             )
 
         finally:
-            # Clean up active execution tracking
             self.active_executions.pop(request_id, None)
 
-    def _get_runtime_image(self, runtime: str) -> str:
+    def _resolve_policy(
+        self, request: ExecutionRequest
+    ) -> Tuple[PolicySet, CompiledPolicy]:
+        """Pin the current policy version for the whole execution."""
+        policy_set = self.security_policy.policy_set
+        compiled = self.security_policy.get_compiled_policy(
+            request.security_policy, request.tenant_id, policy_set
+        )
+        return policy_set, compiled
+
+    def _admit_image(self, request: ExecutionRequest, compiled: CompiledPolicy) -> str:
+        """Get the runtime image and check the request against the policy."""
+        image_name = self._get_runtime_image(request.runtime, request.packages)
+        compiled.validate(image_name, request.command)
+
+        # Quarantined images never run; "block" policies wait for a scan
+        self.image_manager.ensure_image_scanned(
+            image_name, block=compiled.policy.image_scan_mode == "block"
+        )
+        return image_name
+
+    def _start_execution(
+        self,
+        request: ExecutionRequest,
+        request_id: str,
+        policy_set: PolicySet,
+        compiled: CompiledPolicy,
+        image_name: str,
+        audit_events: List[str],
+    ) -> ContainerConfig:
+        """Audit the applied policy, build the container config and track it."""
+        policy = compiled.policy
+
+        # Log policy application
+        policy_event_id = self.audit_logger.log_policy_applied(
+            container_id=request_id,
+            policy_name=policy.name,
+            policy_details=compiled.summary(),
+            user_id=request.user_id,
+            policy_version=policy_set.version,
+            tenant=request.tenant_id,
+        )
+        audit_events.append(policy_event_id)
+
+        # Prepare container configuration
+        container_config = self._build_container_config(request, compiled, image_name)
+
+        # Track active execution
+        self.active_executions[request_id] = {
+            "started": datetime.now(),
+            "request": request,
+            "policy": policy.name,
+            "policy_version": policy_set.version,
+            "container_id": None,
+        }
+        return container_config
+
+    def _completed_response(
+        self,
+        request_id: str,
+        result: ContainerResult,
+        security_events: List[Dict[str, Any]],
+        audit_events: List[str],
+    ) -> ExecutionResponse:
+        """Build the response for a container that ran to completion."""
+        response = ExecutionResponse(
+            request_id=request_id,
+            success=result.exit_code == 0,
+            exit_code=result.exit_code,
+            stdout=result.stdout,
+            stderr=result.stderr,
+            execution_time=result.execution_time,
+            resource_usage=result.resource_usage,
+            security_events=security_events,
+            audit_events=audit_events,
+        )
+
+        logger.info(f"Execution completed: {request_id} (success={response.success})")
+        return response
+
+    def _failed_response(
+        self,
+        request_id: str,
+        request: ExecutionRequest,
+        error: Exception,
+        security_events: List[Dict[str, Any]],
+        audit_events: List[str],
+    ) -> ExecutionResponse:
+        """Audit a failed execution and build its error response."""
+        error_event_id = self.audit_logger.log_container_failed(
+            container_id=request_id, error=str(error), user_id=request.user_id
+        )
+        audit_events.append(error_event_id)
+
+        return ExecutionResponse(
+            request_id=request_id,
+            success=False,
+            exit_code=-1,
+            stdout="",
+            stderr=str(error),
+            execution_time=0.0,
+            resource_usage={},
+            security_events=security_events,
+            audit_events=audit_events,
+            error_message=str(error),
+        )
+
+    def _get_runtime_image(
+        self, runtime: str, packages: Optional[List[str]] = None
+    ) -> str:
         """Get or create runtime image for execution."""
         try:
+            if packages:
+                return self.image_manager.get_or_create_dependency_image(
+                    runtime, packages
+                )
             return self.image_manager.get_or_create_runtime_image(runtime)
         except Exception as e:
             raise GadugiError(f"Failed to get runtime image for {runtime}: {e}")
 
     def _build_container_config(
-        self, request: ExecutionRequest, policy: ExecutionPolicy, image_name: str
+        self, request: ExecutionRequest, compiled: CompiledPolicy, image_name: str
     ) -> ContainerConfig:
         """Build container configuration from request and policy."""
+        policy = compiled.policy
 
         # Base configuration
         base_config = {
@@ -262,9 +419,7 @@ class ContainerExecutionEngine:
         }
 
         # Apply security policy
-        secured_config = self.security_policy.apply_policy_to_container_config(
-            base_config, policy.name
-        )
+        secured_config = compiled.apply(base_config)
 
         # Convert to ContainerConfig
         return ContainerConfig(
@@ -282,12 +437,9 @@ class ContainerExecutionEngine:
             timeout=secured_config.get("timeout", 1800),
         )
 
-    def _execute_container(
+    def _log_container_created(
         self, request_id: str, config: ContainerConfig, user_id: Optional[str]
-    ) -> ContainerResult:
-        """Execute container with monitoring and audit logging."""
-
-        # Log container creation
+    ) -> None:
         self.audit_logger.log_container_created(
             container_id=request_id,
             image=config.image,
@@ -301,19 +453,46 @@ class ContainerExecutionEngine:
             user_id=user_id,
         )
 
+    def _mark_started(
+        self, request_id: str, container_id: str, user_id: Optional[str]
+    ) -> None:
+        if request_id in self.active_executions:
+            self.active_executions[request_id]["container_id"] = container_id
+        self.audit_logger.log_container_started(
+            container_id=request_id, user_id=user_id
+        )
+
+    def _execute_container(
+        self, request_id: str, config: ContainerConfig, user_id: Optional[str]
+    ) -> ContainerResult:
+        """Execute container with monitoring and audit logging."""
+
+        # Log container creation
+        self._log_container_created(request_id, config, user_id)
+
+        monitors: Dict[str, ResourceMonitor] = {}
+
+        def on_started(container_id: str, container: Any) -> None:
+            # Monitor from container start so sampling and threshold
+            # alerts cover the whole run, not just the exited container
+            monitor = self.resource_manager.register_container(container_id, container)
+            monitor.sample()
+            monitors[container_id] = monitor
+
+            self._mark_started(request_id, container_id, user_id)
+
         try:
             # Execute container
-            result = self.container_manager.execute_container(config)
-
-            # Register container for monitoring (if it was created successfully)
-            if (
-                hasattr(result, "container_id")
-                and result.container_id in self.container_manager.active_containers
-            ):
-                container = self.container_manager.active_containers[
-                    result.container_id
-                ]
-                self.resource_manager.register_container(result.container_id, container)
+            result = self.container_manager.execute_container(
+                config, on_started=on_started
+            )
+
+            # Fold lifetime peak/average usage into the final report
+            for monitor in monitors.values():
+                result.resource_usage = {
+                    **result.resource_usage,
+                    **monitor.get_usage_summary(),
+                }
 
             # Log container completion
             self.audit_logger.log_container_stopped(
@@ -335,10 +514,52 @@ class ContainerExecutionEngine:
 
         finally:
             # Ensure container is unregistered from monitoring
-            try:
-                self.resource_manager.unregister_container(request_id)
-            except Exception:
-                pass  # Not critical if unregistration fails
+            for container_id in monitors:
+                try:
+                    self.resource_manager.unregister_container(container_id)
+                except Exception:
+                    pass  # Not critical if unregistration fails
+
+    def get_async_container_manager(self) -> AsyncContainerManager:
+        """The async container manager, created on first use."""
+        if self.async_container_manager is None:
+            self.async_container_manager = AsyncContainerManager(
+                client=AsyncDockerClient(
+                    self.docker_host, max_connections=self.max_async_executions + 32
+                ),
+                max_concurrent=self.max_async_executions,
+                output_store=self.output_store,
+            )
+        return self.async_container_manager
+
+    async def _execute_container_async(
+        self, request_id: str, config: ContainerConfig, user_id: Optional[str]
+    ) -> ContainerResult:
+        """Execute container on the async Docker client with audit logging."""
+        self._log_container_created(request_id, config, user_id)
+
+        def on_started(container_id: str, docker_id: str) -> None:
+            self._mark_started(request_id, container_id, user_id)
+
+        try:
+            result = await self.get_async_container_manager().execute_container(
+                config, on_started=on_started
+            )
+
+            self.audit_logger.log_container_stopped(
+                container_id=request_id,
+                exit_code=result.exit_code,
+                execution_time=result.execution_time,
+                resource_usage=result.resource_usage,
+                user_id=user_id,
+            )
+            return result
+
+        except Exception as e:
+            self.audit_logger.log_container_failed(
+                container_id=request_id, error=str(e), user_id=user_id
+            )
+            raise
 
     def execute_python_code(
         self,
@@ -364,21 +585,16 @@ class ContainerExecutionEngine:
         # Create temporary Python file
         files = {"main.py": code}
 
-        # If packages specified, create requirements.txt
-        if packages:
-            files["requirements.txt"] = "\n".join(packages)
-            command = ["sh", "-c", "pip install -r requirements.txt && python main.py"]
-        else:
-            command = ["python", "main.py"]
-
+        # Packages are preinstalled in a cached dependency image
         request = ExecutionRequest(
             runtime="python",
-            command=command,
+            command=["python", "main.py"],
             code=code,
             files=files,
             security_policy=security_policy,
             timeout=timeout,
             user_id=user_id,
+            packages=packages,
         )
 
         return self.execute(request)
@@ -440,26 +656,16 @@ class ContainerExecutionEngine:
         """
         files = {"main.js": code}
 
-        # If packages specified, create package.json
-        if packages:
-            package_json = {
-                "name": "gadugi-execution",
-                "version": "1.0.0",
-                "dependencies": {pkg: "latest" for pkg in packages},
-            }
-            files["package.json"] = json.dumps(package_json, indent=2)
-            command = ["sh", "-c", "npm install && node main.js"]
-        else:
-            command = ["node", "main.js"]
-
+        # Packages are preinstalled in a cached dependency image
         request = ExecutionRequest(
             runtime="node",
-            command=command,
+            command=["node", "main.js"],
             code=code,
             files=files,
             security_policy=security_policy,
             timeout=timeout,
             user_id=user_id,
+            packages=packages,
         )
 
         return self.execute(request)
@@ -476,6 +682,7 @@ class ContainerExecutionEngine:
                     "request_id": request_id,
                     "runtime": info["request"].runtime,
                     "policy": info["policy"],
+                    "policy_version": info["policy_version"],
                     "duration_seconds": duration,
                     "user_id": info["request"].user_id,
                 }
@@ -490,8 +697,15 @@ class ContainerExecutionEngine:
             "system_usage": self.resource_manager.get_system_usage(),
             "container_usage": self.resource_manager.get_usage_summary(),
             "security_summary": self.image_manager.get_security_summary(),
+            "dependency_cache": self.image_manager.get_dependency_cache_stats(),
             "audit_statistics": self.audit_logger.get_statistics(),
+            "audit_storage": self.audit_logger.get_storage_stats(),
             "available_policies": self.security_policy.list_policies(),
+            "policy_status": self.security_policy.get_status(),
+            "execution_history": self.container_manager.execution_history.get_stats(),
+            "async_docker": self.async_container_manager.client.get_status()
+            if self.async_container_manager
+            else None,
         }
 
     def get_security_alerts(
@@ -533,22 +747,38 @@ class ContainerExecutionEngine:
 
         try:
             # Stop all active executions
-            for request_id in list(self.active_executions.keys()):
+            for request_id, info in list(self.active_executions.items()):
                 try:
                     # Force stop container if still running
-                    if request_id in self.container_manager.active_containers:
-                        self.container_manager.stop_container(request_id, force=True)
+                    container_id = info.get("container_id")
+                    if container_id in self.container_manager.active_containers:
+                        self.container_manager.stop_container(container_id, force=True)
                 except Exception as e:
                     logger.warning(f"Error stopping execution {request_id}: {e}")
 
             # Cleanup all resources
+            self.security_policy.stop_watching()
+            self.image_manager.shutdown()
             self.cleanup_resources()
+            self.container_manager.execution_history.close()
+            self.audit_logger.close()
 
             logger.info("Container execution engine shutdown completed")
 
         except Exception as e:
             logger.error(f"Error during shutdown: {e}")
 
+    async def shutdown_async(self) -> None:
+        """Shut down the async execution path, then the engine."""
+        if self.async_container_manager is not None:
+            try:
+                await self.async_container_manager.close()
+            except Exception as e:
+                logger.error(f"Error closing async container manager: {e}")
+            self.async_container_manager = None
+
+        await asyncio.to_thread(self.shutdown)
+
 
 # Convenience functions for direct usage
 def execute_python(
@@ -558,7 +788,7 @@ def execute_python(
     timeout: int = 300,
 ) -> ExecutionResponse:
     """Convenience function to execute Python code."""
-    engine = ContainerExecutionEngine()
+    engine = ContainerExecutionEngine(prebuild_images=False)
     try:
         return engine.execute_python_code(code, packages, security_policy, timeout)
     finally:
@@ -569,7 +799,7 @@ def execute_shell(
     script: str, security_policy: str = "standard", timeout: int = 300
 ) -> ExecutionResponse:
     """Convenience function to execute shell script."""
-    engine = ContainerExecutionEngine()
+    engine = ContainerExecutionEngine(prebuild_images=False)
     try:
         return engine.execute_shell_script(script, security_policy, timeout)
     finally:
@@ -583,7 +813,7 @@ def execute_node(
     timeout: int = 300,
 ) -> ExecutionResponse:
     """Convenience function to execute Node.js code."""
-    engine = ContainerExecutionEngine()
+    engine = ContainerExecutionEngine(prebuild_images=False)
     try:
         return engine.execute_node_code(code, packages, security_policy, timeout)
     finally:
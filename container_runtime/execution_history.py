@@ -0,0 +1,405 @@
+"""
+Bounded Execution History for Container Results.
+
+Keeps a fixed number of compact execution records in memory. Output bodies
+are kept inline only while small; larger ones are spilled to a rotating
+on-disk store and referenced by location, or, without a store, truncated to
+their tail. Every output keeps its size and SHA-256 so a truncated or
+expired body can still be identified.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import deque
+from enum import Enum
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Any, BinaryIO, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .container_manager import ContainerResult
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_SEGMENT_PATTERN = "output_*.log"
+
+# Characters of each output kept in memory
+DEFAULT_INLINE_LIMIT = 4096
+
+
+class OutputRef:
+    """Compact reference to one stdout or stderr body."""
+
+    __slots__ = ("size", "sha256", "preview", "truncated", "segment", "offset")
+
+    def __init__(
+        self,
+        size: int,
+        sha256: str,
+        preview: str,
+        truncated: bool = False,
+        segment: Optional[int] = None,
+        offset: int = 0,
+    ):
+        self.size = size  # UTF-8 bytes of the full output
+        self.sha256 = sha256
+        self.preview = preview  # Full output, or its tail when truncated
+        self.truncated = truncated
+        self.segment = segment  # Output store segment holding the body
+        self.offset = offset
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "sha256": self.sha256,
+            "preview": self.preview,
+            "truncated": self.truncated,
+            "stored": self.segment is not None,
+        }
+
+
+class ExecutionRecord:
+    """Compact summary of one container execution."""
+
+    __slots__ = (
+        "container_id",
+        "image",
+        "exit_code",
+        "status",
+        "finished_at",
+        "execution_time",
+        "resource_usage",
+        "stdout",
+        "stderr",
+    )
+
+    def __init__(
+        self,
+        container_id: str,
+        image: Optional[str],
+        exit_code: int,
+        status: str,
+        finished_at: float,
+        execution_time: float,
+        resource_usage: Dict[str, Any],
+        stdout: OutputRef,
+        stderr: OutputRef,
+    ):
+        self.container_id = container_id
+        self.image = image
+        self.exit_code = exit_code
+        self.status = status
+        self.finished_at = finished_at
+        self.execution_time = execution_time
+        self.resource_usage = resource_usage
+        self.stdout = stdout
+        self.stderr = stderr
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "container_id": self.container_id,
+            "image": self.image,
+            "exit_code": self.exit_code,
+            "status": self.status,
+            "finished_at": self.finished_at,
+            "execution_time": self.execution_time,
+            "resource_usage": self.resource_usage,
+            "stdout": self.stdout.to_dict(),
+            "stderr": self.stderr.to_dict(),
+        }
+
+
+class OutputStore:
+    """
+    Rotating append-only store for execution output bodies.
+
+    Bodies are appended to numbered segment files. When a segment exceeds
+    ``segment_size`` a new one is started, and segments beyond
+    ``max_segments`` are deleted oldest first, so disk use stays bounded and
+    references into deleted segments simply expire.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        segment_size: int = 16 * 1024 * 1024,
+        max_segments: int = 8,
+    ):
+        """
+        Initialize output store.
+
+        Args:
+            directory: Directory for output segments
+            segment_size: Bytes written to a segment before rotating
+            max_segments: Segments kept on disk
+        """
+        self.directory = directory
+        self.segment_size = segment_size
+        self.max_segments = max(1, max_segments)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._file: Optional[BinaryIO] = None
+        self._segment_size = 0
+        existing = self._segment_ids()
+        self._segment = existing[-1] if existing else 0
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.directory / f"output_{segment:06d}.log"
+
+    def _segment_ids(self) -> List[int]:
+        ids = []
+        for path in self.directory.glob(OUTPUT_SEGMENT_PATTERN):
+            try:
+                ids.append(int(path.stem.split("_", 1)[1]))
+            except (IndexError, ValueError):
+                continue
+        return sorted(ids)
+
+    def _rotate(self) -> None:
+        """Start a new segment and drop the oldest beyond the limit."""
+        if self._file is not None:
+            self._file.close()
+
+        # Never append to segments from an earlier run
+        self._segment += 1
+        self._file = open(self._segment_path(self._segment), "ab")
+        self._segment_size = 0
+
+        for segment in self._segment_ids()[: -self.max_segments]:
+            self._segment_path(segment).unlink(missing_ok=True)
+            logger.debug(f"Expired execution output segment {segment}")
+
+    def append(self, data: bytes) -> Tuple[int, int]:
+        """
+        Append an output body.
+
+        Returns:
+            Segment number and offset of the body
+        """
+        with self._lock:
+            if self._file is None or (
+                self._segment_size
+                and self._segment_size + len(data) > self.segment_size
+            ):
+                self._rotate()
+            assert self._file is not None
+
+            offset = self._segment_size
+            self._file.write(data)
+            self._file.flush()
+            self._segment_size += len(data)
+            return self._segment, offset
+
+    def read(self, segment: int, offset: int, length: int) -> Optional[bytes]:
+        """Read a body back, or None if its segment has expired."""
+        try:
+            with open(self._segment_path(segment), "rb") as f:
+                f.seek(offset)
+                data = f.read(length)
+        except OSError:
+            return None
+        return data if len(data) == length else None
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get output store statistics."""
+        segments = self._segment_ids()
+        total = 0
+        for segment in segments:
+            try:
+                total += self._segment_path(segment).stat().st_size
+            except OSError:
+                continue  # Expired while listing
+        return {
+            "directory": str(self.directory),
+            "segments": len(segments),
+            "bytes": total,
+        }
+
+
+class ExecutionHistory:
+    """
+    Bounded, queryable history of container executions.
+
+    Holds at most ``max_records`` records; the oldest are dropped first.
+    """
+
+    def __init__(
+        self,
+        max_records: int = 1000,
+        output_store: Optional[OutputStore] = None,
+        inline_limit: int = DEFAULT_INLINE_LIMIT,
+    ):
+        """
+        Initialize execution history.
+
+        Args:
+            max_records: Records kept in memory
+            output_store: Store for output larger than ``inline_limit``;
+                without one such output is truncated to its tail
+            inline_limit: Characters of each output kept in memory
+        """
+        self.max_records = max_records
+        self.output_store = output_store
+        self.inline_limit = inline_limit
+        self._records: Deque[ExecutionRecord] = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+
+        # History statistics
+        self.records_added = 0
+        self.outputs_spilled = 0
+        self.outputs_truncated = 0
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def _make_ref(self, output: str) -> OutputRef:
+        """Keep small output inline, spill or truncate the rest."""
+        data = output.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        if len(output) <= self.inline_limit:
+            return OutputRef(len(data), digest, output)
+
+        # The tail is where failures are reported
+        preview = output[-self.inline_limit :]
+        if self.output_store is not None:
+            try:
+                segment, offset = self.output_store.append(data)
+                self.outputs_spilled += 1
+                return OutputRef(len(data), digest, preview, True, segment, offset)
+            except OSError as e:
+                logger.warning(f"Failed to store execution output: {e}")
+
+        self.outputs_truncated += 1
+        return OutputRef(len(data), digest, preview, True)
+
+    def add(
+        self, result: "ContainerResult", image: Optional[str] = None
+    ) -> ExecutionRecord:
+        """
+        Record a finished execution.
+
+        Args:
+            result: Container execution result
+            image: Image the container ran
+
+        Returns:
+            The stored record
+        """
+        record = ExecutionRecord(
+            container_id=result.container_id,
+            image=image,
+            exit_code=result.exit_code,
+            status=result.status.value,
+            finished_at=time.time(),
+            execution_time=result.execution_time,
+            resource_usage=result.resource_usage,
+            stdout=self._make_ref(result.stdout),
+            stderr=self._make_ref(result.stderr),
+        )
+        with self._lock:
+            self._records.append(record)
+            self.records_added += 1
+        return record
+
+    def query(
+        self,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        container_id: Optional[str] = None,
+        status: Optional[Any] = None,
+        exit_code: Optional[int] = None,
+        image: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ) -> List[ExecutionRecord]:
+        """
+        Find executions, oldest first.
+
+        Pages run backwards from the newest match: ``limit`` returns the
+        newest matches and ``offset`` skips that many newer ones, so
+        ``offset=limit`` is the previous page.
+
+        Args:
+            limit: Maximum records to return; None or 0 returns all
+            offset: Newest matches to skip
+            container_id: Filter by container ID (prefixes match)
+            status: Filter by ``ContainerStatus`` or its value
+            exit_code: Filter by exit code
+            image: Filter by image
+            since: Only executions finished at or after this timestamp
+            until: Only executions finished before this timestamp
+
+        Returns:
+            Matching execution records
+        """
+        if isinstance(status, Enum):
+            status = status.value
+
+        with self._lock:
+            records = list(self._records)
+
+        matches: List[ExecutionRecord] = []
+        wanted = offset + limit if limit else None
+        for record in reversed(records):
+            if (
+                (container_id and not record.container_id.startswith(container_id))
+                or (status is not None and record.status != status)
+                or (exit_code is not None and record.exit_code != exit_code)
+                or (image is not None and record.image != image)
+                or (since is not None and record.finished_at < since)
+                or (until is not None and record.finished_at >= until)
+            ):
+                continue
+            matches.append(record)
+            if wanted is not None and len(matches) >= wanted:
+                break
+
+        page = matches[offset:]
+        page.reverse()
+        return page
+
+    def read_output(self, ref: OutputRef) -> Optional[str]:
+        """
+        Full text of an output.
+
+        Returns:
+            The output, or None if only a truncated preview is left
+        """
+        if not ref.truncated:
+            return ref.preview
+        if ref.segment is None or self.output_store is None:
+            return None
+
+        data = self.output_store.read(ref.segment, ref.offset, ref.size)
+        if data is None or hashlib.sha256(data).hexdigest() != ref.sha256:
+            return None  # Expired or overwritten
+        return data.decode("utf-8")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+
+    def close(self) -> None:
+        if self.output_store is not None:
+            self.output_store.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get history statistics."""
+        return {
+            "records": len(self._records),
+            "max_records": self.max_records,
+            "records_added": self.records_added,
+            "outputs_spilled": self.outputs_spilled,
+            "outputs_truncated": self.outputs_truncated,
+            "output_store": self.output_store.get_stats()
+            if self.output_store
+            else None,
+        }
@@ -0,0 +1,63 @@
+"""
+Host process execution for the container runtime.
+
+``replace_shell_execution`` routes subprocess calls into a sandbox session
+for the whole process, including threads and thread pools started later.
+The runtime's own tools (such as trivy scans) opt out through
+``run_on_host``, and its Docker SDK calls that may start credential helpers
+(image builds and pulls) through ``host_only``. The opt-out is
+context-local, so it never leaks to agent code running concurrently.
+"""
+
+import contextlib
+import contextvars
+import subprocess
+import threading
+from typing import Any, Iterator, Optional
+
+# Popen saved before any patching
+HOST_POPEN = subprocess.Popen
+
+# Set while the runtime runs its own commands through host_only
+HOST_ONLY: "contextvars.ContextVar[bool]" = contextvars.ContextVar(
+    "gadugi_host_only", default=False
+)
+
+_session_lock = threading.Lock()
+_sandbox_session: Optional[Any] = None
+
+
+def set_sandbox_session(session: Optional[Any]) -> None:
+    """Install the process-wide sandbox session, or remove it with None."""
+    global _sandbox_session
+    with _session_lock:
+        _sandbox_session = session
+
+
+def current_sandbox_session() -> Optional[Any]:
+    """Get the session a subprocess call here should run in, if any."""
+    if HOST_ONLY.get():
+        return None
+    return _sandbox_session
+
+
+@contextlib.contextmanager
+def host_only() -> Iterator[None]:
+    """
+    Run subprocesses started in the block on the host.
+
+    Sandbox routing installed by ``replace_shell_execution`` is suspended
+    for the current thread or task, including subprocesses that libraries
+    start internally, such as Docker credential helpers.
+    """
+    token = HOST_ONLY.set(True)
+    try:
+        yield
+    finally:
+        HOST_ONLY.reset(token)
+
+
+def run_on_host(*args: Any, **kwargs: Any) -> subprocess.CompletedProcess:
+    """Run a command on the host, like ``subprocess.run``."""
+    with host_only():
+        return subprocess.run(*args, **kwargs)
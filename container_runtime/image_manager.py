@@ -7,14 +7,21 @@ and efficient caching for the Gadugi execution environment.
 
 import logging
 import hashlib
+import shlex
+import shutil
 import subprocess
-from typing import Dict, List, Optional, Any, TYPE_CHECKING
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Callable, Set, TYPE_CHECKING
 from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime, timedelta
 import json
 import tempfile
 
+from .host_process import host_only, run_on_host
+
 if TYPE_CHECKING:
     import docker
 else:
@@ -45,6 +52,14 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Default base images for each runtime
+DEFAULT_BASE_IMAGES = {
+    "python": "python:3.11-slim",
+    "node": "node:18-alpine",
+    "shell": "alpine:latest",
+    "multi": "ubuntu:22.04",
+}
+
 
 @dataclass
 class ImageInfo:
@@ -59,6 +74,7 @@ class ImageInfo:
     security_scan_date: Optional[datetime] = None
     vulnerability_count: Optional[int] = None
     security_score: Optional[float] = None
+    scan_status: Optional[str] = None  # pending, clean, quarantined, failed
 
 
 @dataclass
@@ -74,6 +90,21 @@ class BuildContext:
     group_id: int = 1000
 
 
+@dataclass
+class DependencyImageEntry:
+    """Cached derived image holding a runtime's installed packages."""
+
+    image_name: str
+    runtime: str
+    base_image: str
+    packages: List[str]
+    image_id: str
+    layer_size: int  # Bytes added on top of the runtime image
+    created: datetime
+    last_used: datetime
+    use_count: int = 0
+
+
 class ImageManager:
     """
     Manages container images for secure execution environment.
@@ -86,8 +117,28 @@ class ImageManager:
         self,
         docker_client: Optional[Any] = None,
         image_cache_dir: Optional[Path] = None,
+        max_dependency_cache_bytes: int = 5 * 1024 * 1024 * 1024,  # 5GB
+        wheel_cache_dir: Optional[Path] = None,
+        npm_cache_dir: Optional[Path] = None,
+        scan_workers: int = 2,
+        max_critical_vulnerabilities: int = 0,
+        scan_retry_after: float = 300,
     ):
-        """Initialize image manager."""
+        """
+        Initialize image manager.
+
+        Args:
+            docker_client: Docker client to use, defaults to environment
+            image_cache_dir: Directory for image registry and cache metadata
+            max_dependency_cache_bytes: Disk budget for dependency images
+            wheel_cache_dir: Optional offline directory of Python wheels
+            npm_cache_dir: Optional offline npm cache directory
+            scan_workers: Number of background vulnerability scan workers
+            max_critical_vulnerabilities: Critical findings tolerated before
+                an image is quarantined
+            scan_retry_after: Seconds a failed scan is remembered before
+                the image is scanned again
+        """
         if not docker_available:
             raise GadugiError("Docker is not available. Please install docker package.")
 
@@ -98,15 +149,49 @@ class ImageManager:
         self.image_registry: Dict[str, ImageInfo] = {}
         self.security_scanner_available = self._check_security_scanner()
 
+        # Dependency-layer image cache
+        self.max_dependency_cache_bytes = max_dependency_cache_bytes
+        self.offline_caches: Dict[str, Optional[Path]] = {
+            "python": wheel_cache_dir,
+            "node": npm_cache_dir,
+        }
+        self.dependency_cache: Dict[str, DependencyImageEntry] = {}
+        self.dependency_cache_hits = 0
+        self.dependency_cache_misses = 0
+        # Cache hits only touch usage fields, persisted at shutdown
+        self._dependency_cache_dirty = False
+
+        # Build coordination: one in-flight build per tag, shared by callers.
+        # Also guards the dependency cache and its index file.
+        self._build_lock = threading.Lock()
+        self._inflight_builds: Dict[str, Future] = {}
+        self._build_executor: Optional[ThreadPoolExecutor] = None
+
+        # Positive cache of tags known to exist locally
+        self._known_images: Set[str] = set()
+
+        # Background vulnerability scanning, cached by image layer set
+        self.scan_workers = scan_workers
+        self.max_critical_vulnerabilities = max_critical_vulnerabilities
+        self.scan_retry_after = scan_retry_after
+        self._scan_lock = threading.Lock()
+        self._scan_executor: Optional[ThreadPoolExecutor] = None
+        self._inflight_scans: Dict[str, Future] = {}
+        self.scan_results: Dict[str, Dict[str, Any]] = {}  # scan key -> summary
+        self.image_scan_keys: Dict[str, str] = {}  # image name -> scan key
+        self._failed_scans: Dict[str, float] = {}  # scan key -> failure time
+
         # Load existing image information
         self._load_image_registry()
+        self._load_dependency_cache()
+        self._load_scan_cache()
 
         logger.info("Image manager initialized")
 
     def _check_security_scanner(self) -> bool:
         """Check if security scanner (trivy) is available."""
         try:
-            result = subprocess.run(
+            result = run_on_host(
                 ["trivy", "--version"], capture_output=True, text=True, timeout=5
             )
             if result.returncode == 0:
@@ -144,6 +229,7 @@ class ImageManager:
                         else None,
                         vulnerability_count=data.get("vulnerability_count"),
                         security_score=data.get("security_score"),
+                        scan_status=data.get("scan_status"),
                     )
 
                 logger.info(f"Loaded {len(self.image_registry)} images from registry")
@@ -170,6 +256,7 @@ class ImageManager:
                     else None,
                     "vulnerability_count": info.vulnerability_count,
                     "security_score": info.security_score,
+                    "scan_status": info.scan_status,
                 }
 
             with open(registry_file, "w") as f:
@@ -197,7 +284,17 @@ class ImageManager:
 
         # Check if image already exists
         if self._image_exists(full_name):
-            logger.info(f"Image {full_name} already exists")
+            logger.debug(f"Image {full_name} already exists")
+            return full_name
+
+        return self._single_flight(
+            full_name, lambda: self._build_runtime_image(context, full_name)
+        )
+
+    def _build_runtime_image(self, context: BuildContext, full_name: str) -> str:
+        """Build a runtime image; callers must hold the tag's build slot."""
+        # A build for this tag may have finished since the caller checked
+        if self._image_exists(full_name):
             return full_name
 
         try:
@@ -211,9 +308,11 @@ class ImageManager:
                     f.write(dockerfile_content)
 
                 logger.info(f"Building image {full_name}")
-                image, build_logs = self.client.images.build(
-                    path=build_dir, tag=full_name, rm=True, pull=True, nocache=False
-                )
+                # Credential helpers run while pulling the base image
+                with host_only():
+                    image, build_logs = self.client.images.build(
+                        path=build_dir, tag=full_name, rm=True, pull=True, nocache=False
+                    )
 
                 # Log build output
                 for log in build_logs:
@@ -224,10 +323,10 @@ class ImageManager:
 
             # Update registry
             self._register_image(image, context.runtime)
+            self._known_images.add(full_name)
 
-            # Perform security scan
-            if self.security_scanner_available:
-                self._scan_image_security(full_name)
+            # Queue security scan; policies decide whether to wait for it
+            self.request_scan(full_name)
 
             logger.info(f"Successfully created image {full_name}")
             return full_name
@@ -404,10 +503,115 @@ CMD ["/bin/bash"]
 
         return dockerfile.strip()
 
+    def _single_flight(self, tag: str, build: Callable[[], str]) -> str:
+        """
+        Run a build for a tag at most once at a time.
+
+        Concurrent callers for the same tag wait for the in-flight build
+        and share its result or exception instead of building again.
+
+        Args:
+            tag: Image tag being built
+            build: Function performing the build
+
+        Returns:
+            Result of the build
+        """
+        with self._build_lock:
+            future = self._inflight_builds.get(tag)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight_builds[tag] = future
+
+        if not leader:
+            logger.info(f"Waiting for in-flight build of {tag}")
+            return future.result()
+
+        try:
+            result = build()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._build_lock:
+                self._inflight_builds.pop(tag, None)
+
+    def prebuild_runtime_images(
+        self, runtimes: Optional[List[str]] = None
+    ) -> Dict[str, Future]:
+        """
+        Build runtime images in the background.
+
+        Args:
+            runtimes: Runtimes to warm up, defaults to all default runtimes
+
+        Returns:
+            Futures resolving to image names, keyed by runtime
+        """
+        with self._build_lock:
+            if self._build_executor is None:
+                self._build_executor = ThreadPoolExecutor(
+                    max_workers=2, thread_name_prefix="gadugi-image-build"
+                )
+            executor = self._build_executor
+
+        futures = {}
+        for runtime in runtimes or list(DEFAULT_BASE_IMAGES):
+            future = executor.submit(self.get_or_create_runtime_image, runtime)
+            future.add_done_callback(self._log_prebuild_failure)
+            futures[runtime] = future
+
+        logger.info(f"Prebuilding runtime images: {', '.join(futures)}")
+        return futures
+
+    @staticmethod
+    def _log_prebuild_failure(future: Future) -> None:
+        """Log background prebuild failures, which have no caller to raise to."""
+        if not future.cancelled() and future.exception():
+            logger.warning(f"Runtime image prebuild failed: {future.exception()}")
+
+    def forget_image(self, image_name: Optional[str] = None) -> None:
+        """
+        Drop tags from the positive existence cache.
+
+        Args:
+            image_name: Tag to forget, or None to clear the whole cache
+        """
+        if image_name is None:
+            self._known_images.clear()
+        else:
+            self._known_images.discard(image_name)
+
+    def shutdown(self) -> None:
+        """
+        Stop background image builds and scans that have not started yet,
+        and persist dependency cache usage recorded since the last save.
+        """
+        with self._build_lock:
+            build_executor = self._build_executor
+            self._build_executor = None
+            dirty = self._dependency_cache_dirty
+        if dirty:
+            self._save_dependency_cache()
+        with self._scan_lock:
+            scan_executor = self._scan_executor
+            self._scan_executor = None
+
+        for executor in (build_executor, scan_executor):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
     def _image_exists(self, image_name: str) -> bool:
-        """Check if image exists locally."""
+        """Check if image exists locally, consulting the positive cache first."""
+        if image_name in self._known_images:
+            return True
+
         try:
             self.client.images.get(image_name)
+            self._known_images.add(image_name)
             return True
         except Exception as e:
             # Handle ImageNotFound and other exceptions
@@ -446,6 +650,220 @@ CMD ["/bin/bash"]
         except Exception as e:
             logger.warning(f"Failed to register image: {e}")
 
+    def _load_scan_cache(self) -> None:
+        """Load cached vulnerability scan results."""
+        cache_file = self.image_cache_dir / "scan_cache.json"
+
+        if cache_file.exists():
+            try:
+                with open(cache_file, "r") as f:
+                    cache_data = json.load(f)
+
+                self.scan_results = cache_data.get("results", {})
+                self.image_scan_keys = cache_data.get("images", {})
+                logger.info(f"Loaded {len(self.scan_results)} cached scan results")
+
+            except Exception as e:
+                logger.warning(f"Failed to load scan cache: {e}")
+
+    def _save_scan_cache(self) -> None:
+        """Save cached vulnerability scan results."""
+        cache_file = self.image_cache_dir / "scan_cache.json"
+
+        try:
+            with self._scan_lock:
+                cache_data = {
+                    "results": dict(self.scan_results),
+                    "images": dict(self.image_scan_keys),
+                }
+
+            with open(cache_file, "w") as f:
+                json.dump(cache_data, f, indent=2)
+
+        except Exception as e:
+            logger.error(f"Failed to save scan cache: {e}")
+
+    def _scan_key(self, image_name: str) -> str:
+        """
+        Key scan results by the image's layer set.
+
+        Rebuilt or retagged images with identical layers share a key, so
+        they are not rescanned.
+        """
+        image = self.client.images.get(image_name)
+        layers: List[str] = [
+            str(layer)
+            for layer in image.attrs.get("RootFS", {}).get("Layers") or [image.id]
+            if layer
+        ]
+        return hashlib.sha256("\n".join(layers).encode()).hexdigest()
+
+    def request_scan(self, image_name: str) -> Optional[Future]:
+        """
+        Queue a background vulnerability scan for an image.
+
+        Args:
+            image_name: Image to scan
+
+        Returns:
+            Future resolving to the scan summary (None if the scan failed),
+            or None if no scanner is available. A layer set whose scan
+            failed within ``scan_retry_after`` seconds resolves to None
+            at once instead of being scanned again.
+        """
+        if not self.security_scanner_available:
+            return None
+
+        try:
+            key = self._scan_key(image_name)
+        except Exception as e:
+            logger.warning(f"Cannot scan {image_name}: {e}")
+            return None
+
+        with self._scan_lock:
+            self.image_scan_keys[image_name] = key
+            cached = self.scan_results.get(key)
+            inflight = self._inflight_scans.get(key)
+            failed_at = self._failed_scans.get(key)
+            recently_failed = (
+                cached is None
+                and inflight is None
+                and failed_at is not None
+                and time.monotonic() - failed_at < self.scan_retry_after
+            )
+
+            if recently_failed:
+                self._set_scan_status(image_name, "failed")
+            elif cached is None:
+                self._set_scan_status(image_name, "pending")
+
+            if cached is None and inflight is None and not recently_failed:
+                if self._scan_executor is None:
+                    self._scan_executor = ThreadPoolExecutor(
+                        max_workers=self.scan_workers,
+                        thread_name_prefix="gadugi-image-scan",
+                    )
+                inflight = self._scan_executor.submit(self._run_scan, image_name, key)
+                self._inflight_scans[key] = inflight
+
+        if cached is not None or recently_failed:
+            # Unchanged layer set - reuse the earlier result
+            if cached is not None:
+                self._apply_scan_result(image_name, cached)
+            future: Future = Future()
+            future.set_result(cached)
+            return future
+
+        return inflight
+
+    def _run_scan(self, image_name: str, key: str) -> Optional[Dict[str, Any]]:
+        """Scan worker: run the scanner and record the result."""
+        try:
+            summary = self._scan_image_security(image_name)
+            if summary is None:
+                with self._scan_lock:
+                    self._failed_scans[key] = time.monotonic()
+                self._set_scan_status(image_name, "failed")
+                return None
+
+            with self._scan_lock:
+                self._failed_scans.pop(key, None)
+                self.scan_results[key] = summary
+                images = [
+                    name
+                    for name, image_key in self.image_scan_keys.items()
+                    if image_key == key
+                ]
+
+            for name in images or [image_name]:
+                self._apply_scan_result(name, summary)
+            self._save_scan_cache()
+            return summary
+
+        finally:
+            with self._scan_lock:
+                self._inflight_scans.pop(key, None)
+
+    def _apply_scan_result(self, image_name: str, summary: Dict[str, Any]) -> None:
+        """Record a scan summary in the image registry."""
+        info = self.image_registry.get(image_name)
+        if info is not None:
+            info.security_scan_date = datetime.fromisoformat(summary["scan_date"])
+            info.vulnerability_count = summary["total_vulnerabilities"]
+            info.security_score = summary["security_score"]
+            info.scan_status = summary["status"]
+            self._save_image_registry()
+
+        if summary["status"] == "quarantined":
+            logger.warning(
+                f"Image {image_name} quarantined: "
+                f"{summary['critical_count']} critical vulnerabilities"
+            )
+
+    def _set_scan_status(self, image_name: str, status: str) -> None:
+        """Update the scan status of a registered image."""
+        info = self.image_registry.get(image_name)
+        if info is not None and info.scan_status != status:
+            info.scan_status = status
+            self._save_image_registry()
+
+    def get_scan_result(self, image_name: str) -> Optional[Dict[str, Any]]:
+        """Get the cached scan summary for an image, if scanned."""
+        with self._scan_lock:
+            key = self.image_scan_keys.get(image_name)
+            return self.scan_results.get(key) if key else None
+
+    def is_quarantined(self, image_name: str) -> bool:
+        """Check whether an image was quarantined by a scan."""
+        result = self.get_scan_result(image_name)
+        return result is not None and result["status"] == "quarantined"
+
+    def ensure_image_scanned(
+        self, image_name: str, block: bool = False, timeout: float = 300
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Apply the scan gate for an image before it is executed.
+
+        Args:
+            image_name: Image about to be executed
+            block: Wait for a completed clean scan instead of scanning in
+                the background
+            timeout: Maximum seconds to wait when blocking
+
+        Returns:
+            Scan summary if one is available
+
+        Raises:
+            GadugiError: If the image is quarantined, or if blocking and the
+                image cannot be scanned
+        """
+        if self.is_quarantined(image_name):
+            raise GadugiError(f"Image {image_name} is quarantined by security scan")
+
+        summary = self.get_scan_result(image_name)
+        if summary is not None:
+            return summary
+
+        future = self.request_scan(image_name)
+        if not block:
+            return None
+
+        if future is None:
+            raise GadugiError(
+                f"Image {image_name} requires a security scan but no scanner is available"
+            )
+
+        try:
+            summary = future.result(timeout=timeout)
+        except Exception as e:
+            raise GadugiError(f"Security scan of {image_name} did not complete: {e}")
+
+        if summary is None:
+            raise GadugiError(f"Security scan of {image_name} failed")
+        if summary["status"] == "quarantined":
+            raise GadugiError(f"Image {image_name} is quarantined by security scan")
+        return summary
+
     def _scan_image_security(self, image_name: str) -> Optional[Dict[str, Any]]:
         """Scan image for security vulnerabilities using Trivy."""
         if not self.security_scanner_available:
@@ -454,9 +872,18 @@ CMD ["/bin/bash"]
         try:
             logger.info(f"Scanning image {image_name} for vulnerabilities")
 
-            # Run trivy scan
-            result = subprocess.run(
-                ["trivy", "image", "--format", "json", "--quiet", image_name],
+            # Run trivy scan; its cache dir lets it skip already analysed layers
+            result = run_on_host(
+                [
+                    "trivy",
+                    "image",
+                    "--format",
+                    "json",
+                    "--quiet",
+                    "--cache-dir",
+                    str(self.image_cache_dir / "trivy"),
+                    image_name,
+                ],
                 capture_output=True,
                 text=True,
                 timeout=300,
@@ -475,8 +902,8 @@ CMD ["/bin/bash"]
             critical_count = 0
             high_count = 0
 
-            for result_item in scan_data.get("Results", []):
-                vulnerabilities = result_item.get("Vulnerabilities", [])
+            for result_item in scan_data.get("Results") or []:
+                vulnerabilities = result_item.get("Vulnerabilities") or []
                 total_vulnerabilities += len(vulnerabilities)
 
                 for vuln in vulnerabilities:
@@ -489,21 +916,15 @@ CMD ["/bin/bash"]
             # Calculate security score (0-100, higher is better)
             security_score = max(0, 100 - (critical_count * 10 + high_count * 5))
 
-            # Update image registry
-            if image_name in self.image_registry:
-                self.image_registry[image_name].security_scan_date = datetime.now()
-                self.image_registry[
-                    image_name
-                ].vulnerability_count = total_vulnerabilities
-                self.image_registry[image_name].security_score = security_score
-                self._save_image_registry()
-
             scan_summary = {
                 "total_vulnerabilities": total_vulnerabilities,
                 "critical_count": critical_count,
                 "high_count": high_count,
                 "security_score": security_score,
                 "scan_date": datetime.now().isoformat(),
+                "status": "quarantined"
+                if critical_count > self.max_critical_vulnerabilities
+                else "clean",
             }
 
             logger.info(
@@ -537,16 +958,8 @@ CMD ["/bin/bash"]
         Returns:
             Full image name with tag
         """
-        # Default base images for each runtime
-        default_base_images = {
-            "python": "python:3.11-slim",
-            "node": "node:18-alpine",
-            "shell": "alpine:latest",
-            "multi": "ubuntu:22.04",
-        }
-
         context = BuildContext(
-            base_image=base_image or default_base_images.get(runtime, "alpine:latest"),
+            base_image=base_image or DEFAULT_BASE_IMAGES.get(runtime, "alpine:latest"),
             runtime=runtime,
             packages=packages or [],
             security_hardening=True,
@@ -555,6 +968,337 @@ CMD ["/bin/bash"]
 
         return self.create_runtime_image(context)
 
+    def _load_dependency_cache(self) -> None:
+        """Load dependency image cache index."""
+        cache_file = self.image_cache_dir / "dependency_cache.json"
+
+        if cache_file.exists():
+            try:
+                with open(cache_file, "r") as f:
+                    cache_data = json.load(f)
+
+                for key, data in cache_data.items():
+                    self.dependency_cache[key] = DependencyImageEntry(
+                        image_name=data["image_name"],
+                        runtime=data["runtime"],
+                        base_image=data["base_image"],
+                        packages=data["packages"],
+                        image_id=data["image_id"],
+                        layer_size=data["layer_size"],
+                        created=datetime.fromisoformat(data["created"]),
+                        last_used=datetime.fromisoformat(data["last_used"]),
+                        use_count=data.get("use_count", 0),
+                    )
+
+                logger.info(
+                    f"Loaded {len(self.dependency_cache)} dependency images from cache"
+                )
+
+            except Exception as e:
+                logger.warning(f"Failed to load dependency cache: {e}")
+
+    def _save_dependency_cache(self) -> None:
+        """Save dependency image cache index through a temporary file rename."""
+        cache_file = self.image_cache_dir / "dependency_cache.json"
+
+        try:
+            with self._build_lock:
+                self._write_dependency_cache(cache_file)
+        except Exception as e:
+            logger.error(f"Failed to save dependency cache: {e}")
+
+    def _write_dependency_cache(self, cache_file: Path) -> None:
+        """Write the dependency cache index; the caller holds the build lock."""
+        cache_data = {
+            key: {
+                "image_name": entry.image_name,
+                "runtime": entry.runtime,
+                "base_image": entry.base_image,
+                "packages": entry.packages,
+                "image_id": entry.image_id,
+                "layer_size": entry.layer_size,
+                "created": entry.created.isoformat(),
+                "last_used": entry.last_used.isoformat(),
+                "use_count": entry.use_count,
+            }
+            for key, entry in self.dependency_cache.items()
+        }
+
+        fd, temp_path = tempfile.mkstemp(
+            dir=self.image_cache_dir, prefix=".dependency_cache.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(cache_data, f, indent=2)
+            os.replace(temp_path, cache_file)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        self._dependency_cache_dirty = False
+
+    @staticmethod
+    def _normalize_packages(packages: List[str]) -> List[str]:
+        """Normalize a package list so equivalent sets share one image."""
+        normalized: Dict[str, str] = {}
+        for package in packages:
+            spec = package.strip()
+            if spec:
+                normalized.setdefault(spec.lower(), spec)
+        return [normalized[key] for key in sorted(normalized)]
+
+    def _dependency_key(
+        self, runtime: str, base_image: str, packages: List[str]
+    ) -> str:
+        """Hash the runtime image and sorted package set into a cache key."""
+        key_data = json.dumps([runtime, base_image, packages], separators=(",", ":"))
+        return hashlib.sha256(key_data.encode()).hexdigest()[:16]
+
+    def get_or_create_dependency_image(
+        self,
+        runtime: str,
+        packages: List[str],
+        base_image: Optional[str] = None,
+    ) -> str:
+        """
+        Get or build an image with packages preinstalled on a runtime image.
+
+        Images are keyed by a hash of the runtime image and the sorted
+        package set, so executions needing the same packages reuse one
+        image instead of installing them inside every container.
+
+        Args:
+            runtime: Runtime type (python, node)
+            packages: Packages to install
+            base_image: Base image for the underlying runtime image
+
+        Returns:
+            Full image name with tag
+
+        Raises:
+            GadugiError: If the runtime has no package installer or the
+                build fails
+        """
+        normalized = self._normalize_packages(packages)
+        runtime_image = self.get_or_create_runtime_image(runtime, base_image)
+        if not normalized:
+            return runtime_image
+
+        if runtime not in self.offline_caches:
+            raise GadugiError(f"Package installation not supported for {runtime}")
+
+        key = self._dependency_key(runtime, runtime_image, normalized)
+        image_name = f"gadugi/{runtime}-deps:{key}"
+
+        with self._build_lock:
+            cached = key in self.dependency_cache
+        if cached and self._image_exists(image_name):
+            with self._build_lock:
+                entry = self.dependency_cache.get(key)
+                if entry is not None:
+                    self.dependency_cache_hits += 1
+                    entry.last_used = datetime.now()
+                    entry.use_count += 1
+                    self._dependency_cache_dirty = True
+            if entry is not None:
+                logger.debug(f"Dependency image cache hit: {image_name}")
+                return image_name
+
+        with self._build_lock:
+            self.dependency_cache_misses += 1
+        return self._single_flight(
+            image_name,
+            lambda: self._build_dependency_image(
+                key, image_name, runtime, runtime_image, normalized
+            ),
+        )
+
+    def _build_dependency_image(
+        self,
+        key: str,
+        image_name: str,
+        runtime: str,
+        runtime_image: str,
+        packages: List[str],
+    ) -> str:
+        """Build a dependency image and record it in the cache index."""
+        # Another caller may have completed this build meanwhile
+        with self._build_lock:
+            cached = key in self.dependency_cache
+        if cached and self._image_exists(image_name):
+            return image_name
+
+        offline_cache = self.offline_caches.get(runtime)
+        if offline_cache is not None and not offline_cache.is_dir():
+            logger.warning(f"Offline cache {offline_cache} not found - ignoring")
+            offline_cache = None
+
+        try:
+            with tempfile.TemporaryDirectory() as build_dir:
+                context_dir = Path(build_dir)
+                (context_dir / "offline-cache").mkdir()
+                if offline_cache is not None:
+                    # Offline caches are only read; the copy lives in a
+                    # build stage that is discarded from the final image
+                    shutil.copytree(
+                        offline_cache,
+                        context_dir / "offline-cache",
+                        dirs_exist_ok=True,
+                    )
+
+                dockerfile = self._generate_dependency_dockerfile(
+                    runtime, runtime_image, packages, offline=offline_cache is not None
+                )
+                (context_dir / "Dockerfile").write_text(dockerfile)
+
+                logger.info(f"Building dependency image {image_name}")
+                with host_only():
+                    image, build_logs = self.client.images.build(
+                        path=build_dir,
+                        tag=image_name,
+                        rm=True,
+                        pull=False,
+                        nocache=False,
+                    )
+
+                for log in build_logs:
+                    if isinstance(log, dict) and "stream" in log:
+                        stream_content = log["stream"]
+                        if isinstance(stream_content, str):
+                            logger.debug(stream_content.strip())
+
+        except Exception as e:
+            raise GadugiError(f"Failed to build dependency image {image_name}: {e}")
+
+        # Only the layers above the runtime image count against the budget
+        size = image.attrs.get("Size", 0)
+        try:
+            base_size = self.client.images.get(runtime_image).attrs.get("Size", 0)
+        except Exception:
+            base_size = 0
+
+        now = datetime.now()
+        with self._build_lock:
+            self.dependency_cache[key] = DependencyImageEntry(
+                image_name=image_name,
+                runtime=runtime,
+                base_image=runtime_image,
+                packages=packages,
+                image_id=image.id,
+                layer_size=max(0, size - base_size),
+                created=now,
+                last_used=now,
+                use_count=1,
+            )
+        self._known_images.add(image_name)
+        self._save_dependency_cache()
+        logger.info(f"Cached dependency image {image_name} ({len(packages)} packages)")
+
+        self._evict_dependency_images(keep=key)
+        return image_name
+
+    def _generate_dependency_dockerfile(
+        self, runtime: str, runtime_image: str, packages: List[str], offline: bool
+    ) -> str:
+        """Generate a multi-stage Dockerfile installing packages on a runtime image."""
+        packages_str = " ".join(shlex.quote(package) for package in packages)
+
+        if runtime == "python":
+            offline_args = (
+                "--no-index --find-links=/opt/gadugi/offline-cache " if offline else ""
+            )
+            dockerfile = f"""
+FROM {runtime_image} AS deps
+USER root
+COPY offline-cache /opt/gadugi/offline-cache
+RUN pip install --no-cache-dir --prefix=/opt/gadugi/deps {offline_args}{packages_str}
+
+FROM {runtime_image}
+USER root
+COPY --from=deps /opt/gadugi/deps /usr/local
+USER gadugi:gadugi
+"""
+        else:
+            offline_args = (
+                "--offline --cache /opt/gadugi/offline-cache " if offline else ""
+            )
+            dockerfile = f"""
+FROM {runtime_image} AS deps
+USER root
+COPY offline-cache /opt/gadugi/offline-cache
+RUN mkdir -p /opt/gadugi/node && cd /opt/gadugi/node \\
+    && npm install --no-audit --no-fund {offline_args}{packages_str}
+
+FROM {runtime_image}
+USER root
+COPY --from=deps /opt/gadugi/node/node_modules /opt/gadugi/node_modules
+ENV NODE_PATH=/opt/gadugi/node_modules
+USER gadugi:gadugi
+"""
+
+        return dockerfile.strip()
+
+    def _evict_dependency_images(self, keep: Optional[str] = None) -> int:
+        """
+        Evict least recently used dependency images over the disk budget.
+
+        Args:
+            keep: Cache key that must not be evicted (e.g. just built)
+
+        Returns:
+            Number of images evicted
+        """
+        # Docker calls are made without the lock, on a snapshot of the cache
+        with self._build_lock:
+            total_size = sum(e.layer_size for e in self.dependency_cache.values())
+            candidates = sorted(
+                self.dependency_cache.items(), key=lambda item: item[1].last_used
+            )
+        evicted = 0
+
+        for key, entry in candidates:
+            if total_size <= self.max_dependency_cache_bytes:
+                break
+            if key == keep or self._image_in_use(entry.image_id):
+                continue
+
+            try:
+                self.client.images.remove(entry.image_id, force=False)
+            except Exception as e:
+                if not (
+                    "ImageNotFound" in str(type(e)) or "not found" in str(e).lower()
+                ):
+                    logger.warning(f"Failed to evict {entry.image_name}: {e}")
+                    continue
+
+            with self._build_lock:
+                if self.dependency_cache.get(key) is entry:
+                    del self.dependency_cache[key]
+            self.forget_image(entry.image_name)
+            total_size -= entry.layer_size
+            evicted += 1
+            logger.info(f"Evicted dependency image {entry.image_name}")
+
+        if evicted:
+            self._save_dependency_cache()
+        return evicted
+
+    def get_dependency_cache_stats(self) -> Dict[str, Any]:
+        """Get dependency image cache statistics."""
+        with self._build_lock:
+            lookups = self.dependency_cache_hits + self.dependency_cache_misses
+            return {
+                "cached_images": len(self.dependency_cache),
+                "total_bytes": sum(
+                    e.layer_size for e in self.dependency_cache.values()
+                ),
+                "max_bytes": self.max_dependency_cache_bytes,
+                "hits": self.dependency_cache_hits,
+                "misses": self.dependency_cache_misses,
+                "hit_rate": (self.dependency_cache_hits / lookups * 100)
+                if lookups
+                else 0,
+            }
+
     def list_images(self) -> List[ImageInfo]:
         """List all managed images."""
         return list(self.image_registry.values())
@@ -588,6 +1332,8 @@ CMD ["/bin/bash"]
                         try:
                             image_name = image.tags[0] if image.tags else image_id
                             self.client.images.remove(image_id, force=True)
+                            for tag in image.tags:
+                                self.forget_image(tag)
 
                             # Remove from registry
                             if image_name in self.image_registry:
@@ -653,4 +1399,9 @@ CMD ["/bin/bash"]
             if security_scores
             else 0,
             "scanner_available": self.security_scanner_available,
+            "pending_scans": len(self._inflight_scans),
+            "cached_scan_results": len(self.scan_results),
+            "quarantined_images": sorted(
+                name for name in self.image_scan_keys if self.is_quarantined(name)
+            ),
         }
@@ -0,0 +1,94 @@
+"""
+Per-request cost of security policy evaluation.
+
+Times ``validate_execution_request`` and ``apply_policy_to_container_config``
+for each built-in policy against a representative request.
+
+Usage:
+    python -m container_runtime.policy_benchmark [--iterations N]
+"""
+
+import argparse
+import timeit
+from typing import Dict, List, Optional
+
+from .security_policy import SecurityPolicyEngine
+
+# Image each built-in policy allows; paranoid only allows scratch images
+BENCHMARK_IMAGES = {
+    "minimal": "python:3.11-slim",
+    "standard": "python:3.11-slim",
+    "hardened": "gcr.io/distroless/python3",
+    "paranoid": "gcr.io/distroless/static",
+}
+
+# Must pass every policy's substring blocklist ("at", "su", "nc", ...)
+BENCHMARK_COMMAND = ["python", "main.py", "--input", "/workspace/input.json", "-v"]
+
+
+def benchmark_policies(
+    iterations: int = 10000,
+    repeat: int = 5,
+    engine: Optional[SecurityPolicyEngine] = None,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Measure per-request policy evaluation cost.
+
+    Args:
+        iterations: Requests per timing run
+        repeat: Timing runs; the fastest is reported
+        engine: Policy engine to measure, built-in policies by default
+
+    Returns:
+        Microseconds per request for validation and config application,
+        keyed by policy name
+    """
+    engine = engine or SecurityPolicyEngine()
+    base_config = {
+        "image": "",
+        "command": BENCHMARK_COMMAND,
+        "environment": {"PATH": "/usr/bin", "HOME": "/workspace", "TOKEN": "x"},
+        "working_dir": "/workspace",
+    }
+
+    results = {}
+    for name, image in BENCHMARK_IMAGES.items():
+        validate = min(
+            timeit.repeat(
+                lambda: engine.validate_execution_request(
+                    image, BENCHMARK_COMMAND, name
+                ),
+                number=iterations,
+                repeat=repeat,
+            )
+        )
+        apply = min(
+            timeit.repeat(
+                lambda: engine.apply_policy_to_container_config(base_config, name),
+                number=iterations,
+                repeat=repeat,
+            )
+        )
+        results[name] = {
+            "validate_us": validate / iterations * 1e6,
+            "apply_us": apply / iterations * 1e6,
+        }
+
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark policy evaluation")
+    parser.add_argument("--iterations", type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    for name, timings in benchmark_policies(args.iterations).items():
+        print(
+            f"{name:10} validate {timings['validate_us']:6.2f}us  "
+            f"apply {timings['apply_us']:6.2f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -8,11 +8,25 @@ including CPU, memory, disk, and network usage tracking.
 import logging
 import time
 import threading
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Optional, Any, Callable, Tuple, Type
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import psutil
 
+from .cgroup_reader import CgroupStats, CgroupV2Reader
+from .stats_sampler import StatsSampler, UsageRingBuffer
+
+# Raised by daemons/SDKs that predate one-shot stats (API < 1.41)
+_one_shot_docker_errors: Tuple[Type[Exception], ...] = ()
+try:
+    from docker.errors import InvalidArgument, InvalidVersion  # type: ignore[import-untyped]
+
+    _one_shot_docker_errors = (InvalidVersion, InvalidArgument)
+except ImportError:
+    pass
+
+ONE_SHOT_ERRORS: Tuple[Type[Exception], ...] = (TypeError,) + _one_shot_docker_errors
+
 # Import Enhanced Separation shared modules
 import sys
 import os
@@ -37,6 +51,8 @@ class ResourceUsage:
     network_tx_bytes: int
     processes: int
     open_files: int
+    oom_kills: int = 0
+    source: str = "docker"  # docker or cgroup
 
 
 @dataclass
@@ -52,21 +68,92 @@ class ResourceAlert:
     message: str
 
 
+# Metrics tracked for lifetime peak/average summaries
+SUMMARY_METRICS = ("cpu_percent", "memory_bytes", "memory_percent", "processes")
+
+
+def _usage_to_sample(usage: ResourceUsage) -> Dict[str, float]:
+    """Flatten a usage snapshot into ring buffer metric values."""
+    return {
+        "timestamp": usage.timestamp.timestamp(),
+        "cpu_percent": usage.cpu_percent,
+        "memory_bytes": usage.memory_bytes,
+        "memory_percent": usage.memory_percent,
+        "disk_bytes": usage.disk_bytes,
+        "network_rx_bytes": usage.network_rx_bytes,
+        "network_tx_bytes": usage.network_tx_bytes,
+        "processes": usage.processes,
+        "open_files": usage.open_files,
+        "oom_kills": usage.oom_kills,
+    }
+
+
+def _sample_to_usage(sample: Dict[str, float]) -> ResourceUsage:
+    """Rebuild a usage snapshot from ring buffer metric values."""
+    return ResourceUsage(
+        timestamp=datetime.fromtimestamp(sample["timestamp"]),
+        cpu_percent=float(sample["cpu_percent"]),
+        memory_bytes=int(sample["memory_bytes"]),
+        memory_percent=float(sample["memory_percent"]),
+        disk_bytes=int(sample["disk_bytes"]),
+        network_rx_bytes=int(sample["network_rx_bytes"]),
+        network_tx_bytes=int(sample["network_tx_bytes"]),
+        processes=int(sample["processes"]),
+        open_files=int(sample["open_files"]),
+        oom_kills=int(sample.get("oom_kills", 0)),
+        source="history",
+    )
+
+
+def _sum_blkio_bytes(blkio_stats: Dict[str, Any]) -> int:
+    """Sum read/write bytes from Docker blkio stats."""
+    entries = blkio_stats.get("io_service_bytes_recursive") or []
+    return sum(
+        entry.get("value", 0)
+        for entry in entries
+        if str(entry.get("op", "")).lower() in ("read", "write")
+    )
+
+
 class ResourceMonitor:
     """Monitors resource usage for a single container."""
 
     def __init__(
-        self, container_id: str, container, alert_callback: Optional[Callable] = None
+        self,
+        container_id: str,
+        container,
+        alert_callback: Optional[Callable] = None,
+        sampler: Optional[StatsSampler] = None,
+        history_size: int = 1000,
+        cgroup_reader: Optional[CgroupV2Reader] = None,
     ):
         """Initialize resource monitor for a container."""
         self.container_id = container_id
         self.container = container
         self.alert_callback = alert_callback
         self.monitoring = False
-        self.monitor_thread: Optional[threading.Thread] = None
-        self.usage_history: List[ResourceUsage] = []
+        self.sampler = sampler
+        self._owns_sampler = False
+        self.history = UsageRingBuffer(history_size)
         self.alerts: List[ResourceAlert] = []
 
+        # Lifetime aggregates, kept independently of the bounded history
+        self._sample_lock = threading.Lock()
+        self.started_at = datetime.now()
+        self.sample_count = 0
+        self.peaks: Dict[str, float] = dict.fromkeys(SUMMARY_METRICS, 0.0)
+        self._totals: Dict[str, float] = dict.fromkeys(SUMMARY_METRICS, 0.0)
+
+        # Previous CPU counters for one-shot stats (no precpu_stats)
+        self._last_cpu_total: Optional[int] = None
+        self._last_system_cpu: Optional[int] = None
+        self._one_shot_supported = True
+
+        # Direct cgroup accounting, when the container's cgroup is readable
+        self.cgroup_reader = cgroup_reader
+        self._last_cgroup_stats: Optional[CgroupStats] = None
+        self._last_oom_kills = 0
+
         # Alert thresholds (percentages)
         self.thresholds = {
             "cpu_warning": 80.0,
@@ -77,16 +164,23 @@ class ResourceMonitor:
             "disk_critical": 95.0,
         }
 
+    @property
+    def usage_history(self) -> List[ResourceUsage]:
+        """Retained usage samples, oldest first."""
+        return [_sample_to_usage(row) for row in self.history.rows()]
+
     def start_monitoring(self, interval: float = 5.0) -> None:
-        """Start resource monitoring in background thread."""
+        """Start resource monitoring via the shared stats sampler."""
         if self.monitoring:
             return
 
+        # Standalone monitors get a private sampler
+        if self.sampler is None:
+            self.sampler = StatsSampler(interval=interval)
+            self._owns_sampler = True
+
         self.monitoring = True
-        self.monitor_thread = threading.Thread(
-            target=self._monitor_loop, args=(interval,), daemon=True
-        )
-        self.monitor_thread.start()
+        self.sampler.add(self)
         logger.info(
             f"Started resource monitoring for container {self.container_id[:8]}"
         )
@@ -94,53 +188,171 @@ class ResourceMonitor:
     def stop_monitoring(self) -> None:
         """Stop resource monitoring."""
         self.monitoring = False
-        if self.monitor_thread and self.monitor_thread.is_alive():
-            self.monitor_thread.join(timeout=1.0)
+        if self.sampler is not None:
+            self.sampler.remove(self.container_id)
+            if self._owns_sampler:
+                self.sampler.stop()
         logger.info(
             f"Stopped resource monitoring for container {self.container_id[:8]}"
         )
 
-    def _monitor_loop(self, interval: float) -> None:
-        """Main monitoring loop."""
-        while self.monitoring:
-            try:
-                usage = self._collect_usage()
-                if usage:
-                    self.usage_history.append(usage)
-                    self._check_thresholds(usage)
+    def sample(self) -> bool:
+        """
+        Collect one usage sample, record it and check thresholds.
 
-                    # Keep history manageable (last 1000 samples)
-                    if len(self.usage_history) > 1000:
-                        self.usage_history = self.usage_history[-1000:]
+        Returns:
+            True if a sample was recorded
+        """
+        with self._sample_lock:
+            usage = self._collect_usage()
+            if not usage:
+                return False
 
-            except Exception as e:
-                logger.warning(
-                    f"Error collecting usage for {self.container_id[:8]}: {e}"
-                )
+            sample = _usage_to_sample(usage)
+            self.history.append(sample)
+            self._update_aggregates(sample)
+
+        self._check_thresholds(usage)
+        return True
+
+    def _update_aggregates(self, sample: Dict[str, float]) -> None:
+        """Update lifetime peak and running totals."""
+        self.sample_count += 1
+        for metric in SUMMARY_METRICS:
+            value = sample[metric]
+            self._totals[metric] += value
+            if value > self.peaks[metric]:
+                self.peaks[metric] = value
+
+    def get_usage_summary(self, max_points: int = 60) -> Dict[str, Any]:
+        """
+        Summarize usage over the monitored lifetime.
+
+        Args:
+            max_points: Maximum number of points in the returned time series
+
+        Returns:
+            Peak and average values plus a downsampled time series
+        """
+        with self._sample_lock:
+            count = self.sample_count
+            peaks = dict(self.peaks)
+            averages = {
+                metric: (total / count if count else 0.0)
+                for metric, total in self._totals.items()
+            }
+        rows = self.history.rows()
 
-            time.sleep(interval)
+        # Downsample by striding so long runs stay compact
+        stride = max(1, -(-len(rows) // max_points)) if max_points > 0 else 1
+        points = rows[::stride]
+        if rows and points[-1] is not rows[-1]:
+            points.append(rows[-1])
+        origin = self.started_at.timestamp()
+
+        return {
+            "samples": count,
+            "monitored_seconds": round(
+                (datetime.now() - self.started_at).total_seconds(), 3
+            ),
+            "peak": {metric: round(value, 3) for metric, value in peaks.items()},
+            "average": {metric: round(value, 3) for metric, value in averages.items()},
+            "time_series": {
+                "offset_seconds": [round(p["timestamp"] - origin, 3) for p in points],
+                **{
+                    metric: [round(p[metric], 3) for p in points]
+                    for metric in SUMMARY_METRICS
+                },
+            },
+        }
+
+    def _fetch_stats(self) -> Dict[str, Any]:
+        """Fetch a single stats snapshot from the Docker API."""
+        if self._one_shot_supported:
+            try:
+                # one_shot skips the daemon's ~1s wait for a second sample
+                return self.container.stats(stream=False, one_shot=True)
+            except ONE_SHOT_ERRORS as e:
+                logger.debug(f"One-shot stats unavailable, falling back: {e}")
+                self._one_shot_supported = False
+
+        return self.container.stats(stream=False)
 
     def _collect_usage(self) -> Optional[ResourceUsage]:
-        """Collect current resource usage."""
+        """Collect current resource usage, preferring cgroup v2 counters."""
+        if self.cgroup_reader is not None:
+            docker_id = getattr(self.container, "id", None)
+            cgroup_stats = (
+                self.cgroup_reader.read(docker_id)
+                if isinstance(docker_id, str)
+                else None
+            )
+            if cgroup_stats is not None:
+                return self._usage_from_cgroup(cgroup_stats)
+
+        return self._collect_docker_usage()
+
+    def _usage_from_cgroup(self, stats: CgroupStats) -> ResourceUsage:
+        """Convert raw cgroup counters into a usage snapshot."""
+        cpu_percent = 0.0
+        previous = self._last_cgroup_stats
+        if previous is not None:
+            elapsed_usec = (stats.timestamp - previous.timestamp) * 1_000_000
+            cpu_delta = stats.cpu_usage_usec - previous.cpu_usage_usec
+            if elapsed_usec > 0 and cpu_delta >= 0:
+                cpu_percent = cpu_delta / elapsed_usec * 100.0
+        self._last_cgroup_stats = stats
+
+        memory_limit = stats.memory_max or psutil.virtual_memory().total
+        memory_percent = (
+            (stats.memory_current / memory_limit * 100) if memory_limit > 0 else 0
+        )
+
+        return ResourceUsage(
+            timestamp=datetime.now(),
+            cpu_percent=cpu_percent,
+            memory_bytes=stats.memory_current,
+            memory_percent=memory_percent,
+            disk_bytes=stats.io_bytes,
+            network_rx_bytes=stats.network_rx_bytes,
+            network_tx_bytes=stats.network_tx_bytes,
+            processes=stats.pids_current,
+            open_files=stats.open_files,
+            oom_kills=stats.oom_kill_events,
+            source="cgroup",
+        )
+
+    def _collect_docker_usage(self) -> Optional[ResourceUsage]:
+        """Collect current resource usage from the Docker stats API."""
         try:
-            stats = self.container.stats(stream=False)
+            stats = self._fetch_stats()
 
             # Calculate CPU usage
             cpu_stats = stats.get("cpu_stats", {})
             precpu_stats = stats.get("precpu_stats", {})
 
+            cpu_total = cpu_stats.get("cpu_usage", {}).get("total_usage", 0)
+            system_total = cpu_stats.get("system_cpu_usage", 0)
+
+            # One-shot stats carry no precpu_stats; use our previous sample
+            if precpu_stats.get("system_cpu_usage"):
+                prev_cpu_total = precpu_stats.get("cpu_usage", {}).get("total_usage", 0)
+                prev_system_total = precpu_stats.get("system_cpu_usage", 0)
+            else:
+                prev_cpu_total = self._last_cpu_total
+                prev_system_total = self._last_system_cpu
+
+            self._last_cpu_total = cpu_total
+            self._last_system_cpu = system_total
+
             cpu_percent = 0.0
-            if cpu_stats and precpu_stats:
-                cpu_delta = cpu_stats.get("cpu_usage", {}).get(
-                    "total_usage", 0
-                ) - precpu_stats.get("cpu_usage", {}).get("total_usage", 0)
-                system_delta = cpu_stats.get("system_cpu_usage", 0) - precpu_stats.get(
-                    "system_cpu_usage", 0
-                )
+            if prev_cpu_total is not None and prev_system_total is not None:
+                cpu_delta = cpu_total - prev_cpu_total
+                system_delta = system_total - prev_system_total
 
                 if system_delta > 0 and cpu_delta >= 0:
-                    num_cpus = len(
-                        cpu_stats.get("cpu_usage", {}).get("percpu_usage", [])
+                    num_cpus = cpu_stats.get("online_cpus") or len(
+                        cpu_stats.get("cpu_usage", {}).get("percpu_usage") or []
                     )
                     if num_cpus == 0:
                         num_cpus = 1
@@ -159,16 +371,17 @@ class ResourceMonitor:
             network_rx = sum(net.get("rx_bytes", 0) for net in networks.values())
             network_tx = sum(net.get("tx_bytes", 0) for net in networks.values())
 
-            # Process and file descriptor counts (approximation)
-            processes = 1  # Docker doesn't provide this directly
+            # Process count and block I/O
+            processes = stats.get("pids_stats", {}).get("current", 1)
             open_files = 0  # Docker doesn't provide this directly
+            disk_bytes = _sum_blkio_bytes(stats.get("blkio_stats", {}))
 
             return ResourceUsage(
                 timestamp=datetime.now(),
                 cpu_percent=cpu_percent,
                 memory_bytes=memory_usage,
                 memory_percent=memory_percent,
-                disk_bytes=0,  # Docker doesn't provide this directly
+                disk_bytes=disk_bytes,
                 network_rx_bytes=network_rx,
                 network_tx_bytes=network_tx,
                 processes=processes,
@@ -235,6 +448,21 @@ class ResourceMonitor:
                 )
             )
 
+        # OOM kills (cgroup accounting only)
+        if usage.oom_kills > self._last_oom_kills:
+            alerts.append(
+                ResourceAlert(
+                    container_id=self.container_id,
+                    resource_type="memory",
+                    current_value=float(usage.oom_kills),
+                    threshold=float(self._last_oom_kills),
+                    timestamp=usage.timestamp,
+                    severity="critical",
+                    message=f"OOM killer terminated {usage.oom_kills - self._last_oom_kills} process(es)",
+                )
+            )
+        self._last_oom_kills = usage.oom_kills
+
         # Store alerts and notify callback
         for alert in alerts:
             self.alerts.append(alert)
@@ -248,15 +476,20 @@ class ResourceMonitor:
         """Get current resource usage snapshot."""
         return self._collect_usage()
 
+    def get_latest_usage(self) -> Optional[ResourceUsage]:
+        """Get the most recent sampled usage without querying Docker."""
+        latest = self.history.latest()
+        return _sample_to_usage(latest) if latest else None
+
     def get_usage_history(
         self, duration: Optional[timedelta] = None
     ) -> List[ResourceUsage]:
         """Get resource usage history."""
         if not duration:
-            return self.usage_history.copy()
+            return self.usage_history
 
-        cutoff = datetime.now() - duration
-        return [u for u in self.usage_history if u.timestamp >= cutoff]
+        cutoff = (datetime.now() - duration).timestamp()
+        return [_sample_to_usage(row) for row in self.history.rows(since=cutoff)]
 
     def get_alerts(self, severity: Optional[str] = None) -> List[ResourceAlert]:
         """Get resource alerts, optionally filtered by severity."""
@@ -274,9 +507,16 @@ class ResourceManager:
     and alerting for resource usage violations.
     """
 
-    def __init__(self):
-        """Initialize resource manager."""
+    def __init__(self, sample_interval: float = 5.0):
+        """
+        Initialize resource manager.
+
+        Args:
+            sample_interval: Seconds between container sampling rounds
+        """
         self.monitors: Dict[str, ResourceMonitor] = {}
+        self.sampler = StatsSampler(interval=sample_interval)
+        self.cgroup_reader = CgroupV2Reader()
         self.global_alerts: List[ResourceAlert] = []
         self.alert_handlers: List[Callable[[ResourceAlert], None]] = []
 
@@ -311,6 +551,8 @@ class ResourceManager:
             container_id=container_id,
             container=container,
             alert_callback=self._handle_container_alert,
+            sampler=self.sampler,
+            cgroup_reader=self.cgroup_reader,
         )
 
         self.monitors[container_id] = monitor
@@ -329,6 +571,7 @@ class ResourceManager:
         if container_id in self.monitors:
             monitor = self.monitors[container_id]
             monitor.stop_monitoring()
+            self.cgroup_reader.forget(getattr(monitor.container, "id", None))
             del self.monitors[container_id]
             logger.info(f"Unregistered container {container_id[:8]} from monitoring")
 
@@ -420,10 +663,10 @@ class ResourceManager:
         return None
 
     def get_all_container_usage(self) -> Dict[str, ResourceUsage]:
-        """Get current usage for all monitored containers."""
+        """Get latest sampled usage for all monitored containers."""
         usage = {}
         for container_id, monitor in self.monitors.items():
-            current = monitor.get_current_usage()
+            current = monitor.get_latest_usage() or monitor.get_current_usage()
             if current:
                 usage[container_id] = current
         return usage
@@ -439,7 +682,7 @@ class ResourceManager:
         total_network_tx = 0
 
         for monitor in self.monitors.values():
-            usage = monitor.get_current_usage()
+            usage = monitor.get_latest_usage() or monitor.get_current_usage()
             if usage:
                 total_cpu += usage.cpu_percent
                 total_memory += usage.memory_bytes
@@ -453,6 +696,8 @@ class ResourceManager:
             "total_memory_mb": total_memory / (1024 * 1024),
             "total_network_rx_bytes": total_network_rx,
             "total_network_tx_bytes": total_network_tx,
+            "sampler": self.sampler.get_status(),
+            "cgroup_reader": self.cgroup_reader.get_status(),
             "system_usage": self.get_system_usage(),
         }
 
@@ -531,4 +776,6 @@ class ResourceManager:
         for container_id in container_ids:
             self.unregister_container(container_id)
 
+        self.sampler.stop()
+
         logger.info("Resource manager cleanup completed")
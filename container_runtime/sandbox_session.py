@@ -0,0 +1,1101 @@
+"""
+Session-Scoped Sandbox for Agent Command Execution.
+
+Runs one long-lived hardened container per agent session and executes each
+command inside it with ``docker exec``, so a short command costs an exec
+round trip instead of a full container lifecycle. The policy's execution
+time limit applies to each command rather than to the container, which
+idles until the session closes, or until ``idle_timeout`` passes without
+commands; the next command then starts a fresh container. Processes are exposed
+through a ``subprocess.Popen``-compatible handle with streamed stdout and
+stderr, and the container is torn down when the session closes.
+
+Standard input given as ``PIPE``, a file descriptor or a file object (and
+``input=`` of ``run``/``communicate``) is sent over the exec's attach
+socket. With ``stdin=None`` the command reads end of file, as with
+``DEVNULL``: the host's standard input is never forwarded into the sandbox.
+"""
+
+import atexit
+import io
+import itertools
+import logging
+import os
+import select
+import selectors
+import shlex
+import signal
+import socket
+import struct
+import subprocess
+import threading
+import time
+import uuid
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    TYPE_CHECKING,
+)
+
+from .execution_engine import ContainerExecutionEngine, ExecutionRequest
+
+if TYPE_CHECKING:
+    from .container_manager import ContainerConfig
+    from .resource_manager import ResourceMonitor
+    from .security_policy import CompiledPolicy
+
+# Import Enhanced Separation shared modules
+import sys
+
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "..", ".claude", "shared", "utils")
+)
+try:
+    from error_handling import GadugiError  # type: ignore[import-not-found]
+except ImportError:
+
+    class GadugiError(Exception):  # type: ignore[import-not-found]
+        pass
+
+
+logger = logging.getLogger(__name__)
+
+# Records the command's in-container PID so it can be signalled, removes
+# PID files of finished commands, then replaces itself with the command
+EXEC_WRAPPER = 'rm -f $1; echo $$ >"$0" 2>/dev/null; shift; exec "$@"'
+
+# Signals the PID recorded by EXEC_WRAPPER, waiting briefly for it to appear
+SIGNAL_SCRIPT = (
+    'for _ in 1 2 3 4 5; do [ -s "$0" ] && break; sleep 0.1; done; '
+    'kill -$1 "$(cat "$0")" 2>/dev/null'
+)
+
+PID_DIR = "/tmp"
+READ_CHUNK = 32768
+
+# Largest pipe write that never blocks once the pipe is writable
+PIPE_BUF = getattr(select, "PIPE_BUF", 512)
+
+# Stream id of stderr in the multiplexed attach stream of non-TTY execs
+STDERR_STREAM = 2
+
+OutputChunk = Tuple[Optional[bytes], Optional[bytes]]
+
+CommandArgs = Union[str, bytes, "os.PathLike[str]", Sequence[Any]]
+
+
+def command_argv(args: CommandArgs, shell: bool = False) -> List[str]:
+    """
+    Convert ``subprocess``-style arguments to an argv list.
+
+    Args:
+        args: Command string or sequence
+        shell: Run through ``/bin/sh -c`` like ``subprocess`` does
+
+    Returns:
+        Command argv
+    """
+    if isinstance(args, (str, bytes, os.PathLike)):
+        argv = [os.fsdecode(args)]
+    else:
+        argv = [os.fsdecode(arg) for arg in args]
+
+    if shell:
+        return ["/bin/sh", "-c", *argv]
+    return argv
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    """Receive ``size`` bytes, fewer only at end of stream."""
+    chunks = []
+    while size:
+        data = sock.recv(min(size, READ_CHUNK))
+        if not data:
+            break
+        chunks.append(data)
+        size -= len(data)
+    return b"".join(chunks)
+
+
+def _socket_frames(sock: socket.socket) -> Iterator[OutputChunk]:
+    """Demultiplex an exec attach socket into (stdout, stderr) chunks."""
+    while True:
+        header = _recv_exact(sock, 8)
+        if len(header) < 8:
+            return
+        stream_id, length = struct.unpack(">BxxxI", header)
+        data = _recv_exact(sock, length)
+        if stream_id == STDERR_STREAM:
+            yield None, data
+        else:
+            yield data, None
+
+
+def _decode(data: bytes, encoding: Optional[str], errors: Optional[str]) -> str:
+    """Decode captured output with universal newlines, like ``subprocess``."""
+    return io.TextIOWrapper(
+        io.BytesIO(data), encoding=encoding or "utf-8", errors=errors
+    ).read()
+
+
+class SandboxProcess:
+    """
+    ``subprocess.Popen``-compatible handle for a command in a sandbox.
+
+    ``stdout`` and ``stderr`` accept ``PIPE``, ``DEVNULL``, ``None``
+    (inherit), a file descriptor or file object, and ``stderr`` also
+    ``STDOUT``. Output is streamed from the exec as it is produced.
+    ``stdin`` accepts ``PIPE``, a file descriptor or file object for execs
+    started with an ``attach`` socket, and its data is sent over that
+    socket. A missing program exits with 127 instead of raising
+    ``FileNotFoundError``.
+    """
+
+    def __init__(
+        self,
+        session: "SandboxSession",
+        args: CommandArgs,
+        exec_id: str,
+        pid_file: str,
+        stream: Optional[Iterator[OutputChunk]] = None,
+        attach: Any = None,
+        stdin: Any = None,
+        stdout: Any = None,
+        stderr: Any = None,
+        text: bool = False,
+        encoding: Optional[str] = None,
+        errors: Optional[str] = None,
+        time_limit: Optional[float] = None,
+    ):
+        self.session = session
+        self.args = args
+        self.exec_id = exec_id
+        self.returncode: Optional[int] = None
+        self.stdin: Any = None
+        self.text_mode = text
+        self._encoding = encoding
+        self._errors = errors
+        self._pid_file = pid_file
+        self._pid: Optional[int] = None
+        self._signal_sent: Optional[int] = None
+        self._done = threading.Event()
+        self._pipe_fds: List[int] = []
+        self._captured: Dict[Any, List[bytes]] = {}
+        self._communication_started = False
+        self._input: Optional[memoryview] = None
+        self._input_offset = 0
+
+        # The attach socket is closed once both its readers and writers end
+        self._attach: Any = attach
+        self._attach_users = 0
+        self._attach_lock = threading.Lock()
+        if attach is not None:
+            # docker-py wraps the connection in a SocketIO
+            raw = getattr(attach, "_sock", attach)
+            stream = _socket_frames(raw)
+            self._attach_users = 2
+            self.stdin, source_fd, own_fd = self._open_source(stdin)
+            threading.Thread(
+                target=self._feed,
+                args=(source_fd, own_fd, raw),
+                daemon=True,
+                name=f"sandbox-stdin-{exec_id[:8]}",
+            ).start()
+        assert stream is not None
+
+        self.stdout, write_out = self._open_sink(stdout, 1)
+        if stderr == subprocess.STDOUT:
+            self.stderr, write_err = None, write_out
+        else:
+            self.stderr, write_err = self._open_sink(stderr, 2)
+
+        # Kills the command once it outlives the policy's execution time
+        self.time_limit = time_limit
+        self.timed_out = False
+        self._watchdog: Optional[threading.Timer] = None
+        if time_limit:
+            self._watchdog = threading.Timer(time_limit, self._time_limit_exceeded)
+            self._watchdog.daemon = True
+            self._watchdog.start()
+
+        self._pump_thread = threading.Thread(
+            target=self._pump,
+            args=(stream, write_out, write_err),
+            daemon=True,
+            name=f"sandbox-exec-{exec_id[:8]}",
+        )
+        self._pump_thread.start()
+
+    def _open_sink(
+        self, target: Any, default_fd: int
+    ) -> Tuple[Any, Optional[Callable[[bytes], None]]]:
+        """Map a ``subprocess`` stream argument to a reader and a writer."""
+        if target == subprocess.DEVNULL:
+            return None, None
+        if target == subprocess.PIPE:
+            read_fd, write_fd = os.pipe()
+            self._pipe_fds.append(write_fd)
+            reader: Any = os.fdopen(read_fd, "rb")
+            if self.text_mode:
+                reader = io.TextIOWrapper(
+                    reader, encoding=self._encoding or "utf-8", errors=self._errors
+                )
+            return reader, self._fd_writer(write_fd)
+        if target is None:
+            return None, self._fd_writer(default_fd)
+        if isinstance(target, int):
+            return None, self._fd_writer(target)
+        return None, self._fd_writer(target.fileno())
+
+    def _open_source(self, source: Any) -> Tuple[Any, int, bool]:
+        """
+        Map a ``subprocess`` stdin argument to a writer and a source fd.
+
+        Returns:
+            Writer exposed as ``stdin``, fd fed to the command, and whether
+            the fd is ours to close
+        """
+        if source == subprocess.PIPE:
+            read_fd, write_fd = os.pipe()
+            writer: Any = os.fdopen(write_fd, "wb")
+            if self.text_mode:
+                writer = io.TextIOWrapper(
+                    writer,
+                    encoding=self._encoding or "utf-8",
+                    errors=self._errors,
+                    write_through=True,
+                )
+            return writer, read_fd, True
+        if isinstance(source, int):
+            return None, source, False
+        return None, source.fileno(), False
+
+    def _feed(self, fd: int, own_fd: bool, sock: socket.socket) -> None:
+        """Copy standard input to the attach socket, then signal its end."""
+        try:
+            while True:
+                data = os.read(fd, READ_CHUNK)
+                if not data:
+                    break
+                sock.sendall(data)
+        except OSError as e:
+            logger.debug(f"Sandbox exec {self.exec_id[:8]} stdin closed: {e}")
+        finally:
+            if own_fd:
+                os.close(fd)
+            try:
+                sock.shutdown(socket.SHUT_WR)
+            except OSError:
+                pass
+            self._release_attach()
+
+    def _release_attach(self) -> None:
+        with self._attach_lock:
+            self._attach_users -= 1
+            if self._attach_users:
+                return
+        raw = getattr(self._attach, "_sock", self._attach)
+        for sock in (self._attach, raw):
+            try:
+                sock.close()
+            except OSError:
+                pass
+
+    @staticmethod
+    def _fd_writer(fd: int) -> Callable[[bytes], None]:
+        def write(data: bytes) -> None:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view) :]
+
+        return write
+
+    def _pump(
+        self,
+        stream: Iterator[OutputChunk],
+        write_out: Optional[Callable[[bytes], None]],
+        write_err: Optional[Callable[[bytes], None]],
+    ) -> None:
+        """Copy exec output to its destinations until the command exits."""
+        try:
+            for out, err in stream:
+                if out and write_out is not None:
+                    try:
+                        write_out(out)
+                    except BrokenPipeError:
+                        write_out = None  # Reader went away; drop the rest
+                if err and write_err is not None:
+                    try:
+                        write_err(err)
+                    except BrokenPipeError:
+                        write_err = None
+        except Exception as e:
+            logger.warning(f"Sandbox exec {self.exec_id[:8]} stream failed: {e}")
+        finally:
+            if self._watchdog is not None:
+                self._watchdog.cancel()
+            for fd in self._pipe_fds:
+                os.close(fd)
+            if self._attach is not None:
+                self._release_attach()
+            self.returncode = self._exit_code(self.session.exit_code(self.exec_id))
+            self.session._process_finished(self)
+            self._done.set()
+
+    def _time_limit_exceeded(self) -> None:
+        logger.warning(
+            f"Sandbox command exceeded the execution time limit, killing: {self.args!r}"
+        )
+        self.timed_out = True
+        self.kill()
+
+    def _exit_code(self, exit_code: Optional[int]) -> int:
+        """Report signal deaths as negative signal numbers, like ``Popen``."""
+        if exit_code is None:
+            return -signal.SIGKILL  # Session container went away
+        if self._signal_sent is not None and exit_code == 128 + self._signal_sent:
+            return -self._signal_sent
+        return exit_code
+
+    @property
+    def pid(self) -> Optional[int]:
+        """Host PID of the exec'd process, as reported by Docker."""
+        if self._pid is None:
+            self._pid = self.session.exec_pid(self.exec_id)
+        return self._pid
+
+    def poll(self) -> Optional[int]:
+        return self.returncode if self._done.is_set() else None
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        """
+        Wait for the command to exit.
+
+        Raises:
+            subprocess.TimeoutExpired: If it is still running after timeout
+        """
+        if not self._done.wait(timeout):
+            raise subprocess.TimeoutExpired(self.args, timeout)  # type: ignore[arg-type]
+        assert self.returncode is not None
+        return self.returncode
+
+    def communicate(
+        self, input: Optional[Any] = None, timeout: Optional[float] = None
+    ) -> Tuple[Any, Any]:
+        """
+        Read all output and wait for the command to exit.
+
+        Input is written to ``stdin``, which is then closed; it is ignored
+        unless ``stdin`` is a pipe. Output read before a ``TimeoutExpired``
+        is kept, so calling again after a timeout returns everything.
+
+        Raises:
+            ValueError: If input is given after communication started
+            subprocess.TimeoutExpired: If the command outlives the timeout
+        """
+        if self._communication_started and input:
+            raise ValueError("Cannot send input after starting communication")
+
+        if self.stdin is not None and not self._communication_started:
+            try:
+                self.stdin.flush()
+            except BrokenPipeError:
+                pass
+            if input:
+                if self.text_mode:
+                    input = input.encode(self.stdin.encoding, self.stdin.errors)
+                self._input = memoryview(input)
+            else:
+                self._close_stdin()
+        self._communication_started = True
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        streams = [s for s in (self.stdout, self.stderr) if s is not None]
+        with selectors.DefaultSelector() as selector:
+            if self._input is not None and self.stdin is not None:
+                selector.register(self.stdin, selectors.EVENT_WRITE, data=self.stdin)
+            for s in streams:
+                if not s.closed:
+                    selector.register(s, selectors.EVENT_READ, data=s)
+            while selector.get_map():
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise subprocess.TimeoutExpired(self.args, timeout)  # type: ignore[arg-type]
+                for key, _ in selector.select(remaining):
+                    stream = key.data  # The pipe object, not just its fd
+                    if stream is self.stdin:
+                        if self._write_input(key.fd):
+                            selector.unregister(stream)
+                            self._close_stdin()
+                        continue
+                    data = os.read(key.fd, READ_CHUNK)
+                    if data:
+                        self._captured.setdefault(stream, []).append(data)
+                    else:
+                        selector.unregister(stream)
+                        stream.close()
+
+        self.wait(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        return self._collected(self.stdout), self._collected(self.stderr)
+
+    def _write_input(self, fd: int) -> bool:
+        """Write the next chunk of input; True once all of it is written."""
+        assert self._input is not None
+        chunk = self._input[self._input_offset : self._input_offset + PIPE_BUF]
+        try:
+            self._input_offset += os.write(fd, chunk)
+        except BrokenPipeError:
+            return True  # The command stopped reading
+        return self._input_offset >= len(self._input)
+
+    def _close_stdin(self) -> None:
+        try:
+            self.stdin.close()
+        except BrokenPipeError:
+            pass
+
+    def _collected(self, stream: Any) -> Any:
+        if stream is None:
+            return None
+        data = b"".join(self._captured.get(stream, []))
+        return _decode(data, self._encoding, self._errors) if self.text_mode else data
+
+    def send_signal(self, sig: int) -> None:
+        """Send a signal to the command inside the sandbox."""
+        if self._done.is_set():
+            return
+        self._signal_sent = int(sig)
+        self.session.signal_exec(self._pid_file, int(sig))
+
+    def terminate(self) -> None:
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self) -> None:
+        self.send_signal(signal.SIGKILL)
+
+    def __enter__(self) -> "SandboxProcess":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        for stream in (self.stdout, self.stderr):
+            if stream is not None:
+                stream.close()
+        if self.stdin is not None:
+            self._close_stdin()
+        self.wait()
+
+    def __repr__(self) -> str:
+        return f"<SandboxProcess: returncode: {self.returncode} args: {self.args!r}>"
+
+
+class SandboxSession:
+    """
+    One long-lived hardened container shared by an agent session.
+
+    The container is created under a security policy exactly like a
+    one-off execution, then idles until the session closes. Every command
+    is checked against the same policy before it is exec'd, denied commands
+    are audited, and a command outliving the policy's execution time is
+    killed. A container that went away, or was stopped after
+    ``idle_timeout``, is replaced by a fresh one on the next command. Use
+    as a context manager, or call :meth:`close`; sessions left open are
+    closed at interpreter exit.
+    """
+
+    def __init__(
+        self,
+        engine: ContainerExecutionEngine,
+        runtime: str = "shell",
+        security_policy: Optional[str] = None,
+        environment: Optional[Dict[str, str]] = None,
+        user_id: Optional[str] = None,
+        tenant_id: Optional[str] = None,
+        working_directory: str = "/workspace",
+        idle_timeout: Optional[float] = None,
+    ):
+        """
+        Initialize sandbox session.
+
+        Args:
+            engine: Execution engine providing policy, images and audit
+            runtime: Runtime image to run commands in
+            security_policy: Security policy for the session
+            environment: Environment for every command
+            user_id: User ID for audit logging
+            tenant_id: Tenant whose policy overrides apply
+            working_directory: Default working directory for commands
+            idle_timeout: Seconds without running commands after which the
+                container is stopped until the next command, None to keep
+                it until the session closes
+        """
+        self.engine = engine
+        self.idle_timeout = idle_timeout
+        self.session_id = f"session-{uuid.uuid4().hex[:12]}"
+        self.request = ExecutionRequest(
+            runtime=runtime,
+            command=["sleep"],
+            environment=environment,
+            security_policy=security_policy,
+            user_id=user_id,
+            working_directory=working_directory,
+            tenant_id=tenant_id,
+        )
+
+        self.container_id: Optional[str] = None
+        self.config: Optional["ContainerConfig"] = None
+        self.compiled: Optional["CompiledPolicy"] = None
+        self.started_at: Optional[float] = None
+        self._container: Any = None
+        self._monitor: Optional["ResourceMonitor"] = None
+        self._closed = False
+        self._lock = threading.Lock()
+        # Serializes starting, replacing and stopping the container
+        self._lifecycle_lock = threading.RLock()
+        self._last_used = time.monotonic()
+        self._idle_timer: Optional[threading.Timer] = None
+        self._processes: Dict[str, SandboxProcess] = {}
+        self._finished_pid_files: List[str] = []
+        self._exec_counter = itertools.count(1)
+
+        # Session statistics
+        self.commands_run = 0
+        self.commands_denied = 0
+        self.batches_run = 0
+        self.containers_started = 0
+
+    @property
+    def active(self) -> bool:
+        return self.started_at is not None and not self._closed
+
+    def start(self) -> "SandboxSession":
+        """
+        Create and start the session container.
+
+        Returns:
+            This session
+
+        Raises:
+            GadugiError: If the policy rejects the session or Docker fails
+        """
+        with self._lifecycle_lock:
+            if self._closed:
+                raise GadugiError(f"Sandbox session {self.session_id} is closed")
+            if self._container is None:
+                self._start_container()
+        return self
+
+    def _start_container(self) -> None:
+        """Create and start a container for the session."""
+        engine = self.engine
+        request = self.request
+        if not engine.resource_manager.check_system_capacity():
+            raise GadugiError(
+                "System at capacity - cannot start another sandbox session"
+            )
+
+        policy_set, compiled = engine._resolve_policy(request)
+        image_name = engine._admit_image(request, compiled)
+        config = engine._start_execution(
+            request, self.session_id, policy_set, compiled, image_name, []
+        )
+        # Idle until stopped; the time limit applies to each command
+        config.command = ["tail", "-f", "/dev/null"]
+
+        container_id = None
+        try:
+            engine._log_container_created(self.session_id, config, request.user_id)
+            container_id = engine.container_manager.create_container(config)
+            engine.container_manager.start_container(container_id)
+        except Exception as e:
+            engine.active_executions.pop(self.session_id, None)
+            engine.audit_logger.log_container_failed(
+                container_id=self.session_id, error=str(e), user_id=request.user_id
+            )
+            if container_id:
+                engine.container_manager.cleanup_container(container_id)
+            raise
+
+        self._container = engine.container_manager.active_containers[container_id]
+        self.container_id = container_id
+        self.config = config
+        self.compiled = compiled
+        self.started_at = time.time()
+        self._monitor = engine.resource_manager.register_container(
+            container_id, self._container
+        )
+        engine._mark_started(self.session_id, container_id, request.user_id)
+        if not self.containers_started:
+            atexit.register(self.close)
+        self.containers_started += 1
+        self._touch()
+
+        logger.info(f"Sandbox session started: {self.session_id} ({image_name})")
+
+    def _ensure_container(self) -> None:
+        """Start a fresh container if the previous one was stopped."""
+        with self._lifecycle_lock:
+            if self._closed or self.started_at is None:
+                raise GadugiError(f"Sandbox session {self.session_id} is not active")
+            if self._container is None:
+                logger.info(f"Restarting sandbox session {self.session_id}")
+                self._start_container()
+            self._last_used = time.monotonic()
+
+    def _container_gone(self) -> bool:
+        """Whether the session container was removed or has exited."""
+        from docker.errors import NotFound
+
+        if self._container is None:
+            return True
+        try:
+            self._container.reload()
+        except NotFound:
+            return True
+        except Exception:
+            return False
+        return self._container.status in ("exited", "dead")
+
+    def _touch(self) -> None:
+        """Record activity and schedule the idle check."""
+        self._last_used = time.monotonic()
+        if not self.idle_timeout:
+            return
+        with self._lock:
+            if self._idle_timer is not None:
+                self._idle_timer.cancel()
+            self._idle_timer = threading.Timer(self.idle_timeout, self._stop_if_idle)
+            self._idle_timer.daemon = True
+            self._idle_timer.start()
+
+    def _stop_if_idle(self) -> None:
+        assert self.idle_timeout is not None
+        with self._lifecycle_lock:
+            with self._lock:
+                busy = bool(self._processes)
+            idle_for = time.monotonic() - self._last_used
+            if self._closed or self._container is None or busy:
+                return
+            if idle_for < self.idle_timeout:
+                self._touch()
+                return
+            logger.info(
+                f"Stopping idle sandbox session container {self.session_id} "
+                f"after {idle_for:.0f}s"
+            )
+            self._stop_container()
+
+    def _check_command(self, argv: List[str]) -> None:
+        """Apply the session policy to one command, auditing denials."""
+        self._ensure_container()
+        assert self.compiled is not None and self.config is not None
+
+        try:
+            self.compiled.validate(self.config.image, argv)
+        except Exception as e:
+            self.commands_denied += 1
+            self.engine.audit_logger.log_access_denied(
+                container_id=self.session_id,
+                requested_action=shlex.join(argv),
+                reason=str(e),
+                user_id=self.request.user_id,
+            )
+            raise
+
+    def _exec_environment(self, env: Optional[Dict[str, str]]) -> Dict[str, str]:
+        """Session environment plus per-command overrides the policy allows."""
+        assert self.compiled is not None and self.config is not None
+        environment = {**(self.config.environment or {}), **(env or {})}
+        whitelist = self.compiled.environment_whitelist
+        if whitelist:
+            environment = {k: v for k, v in environment.items() if k in whitelist}
+        return environment
+
+    def _spawn(
+        self,
+        args: CommandArgs,
+        argv: List[str],
+        cwd: Optional[str],
+        env: Optional[Dict[str, str]],
+        stdin: Any = None,
+        **process_kwargs: Any,
+    ) -> SandboxProcess:
+        """Exec an already-checked command in the session container."""
+        assert self.config is not None
+        with self._lock:
+            pid_file = (
+                f"{PID_DIR}/.gadugi-{self.session_id}-{next(self._exec_counter)}.pid"
+            )
+
+        try:
+            exec_id, stream, attach = self._exec_start(argv, cwd, env, pid_file, stdin)
+        except Exception as e:
+            if not self._container_gone():
+                raise GadugiError(f"Failed to exec in sandbox {self.session_id}: {e}")
+            # The container went away; replace it and try once more
+            logger.warning(f"Sandbox session {self.session_id} container is gone")
+            with self._lifecycle_lock:
+                self._stop_container()
+            self._ensure_container()
+            try:
+                exec_id, stream, attach = self._exec_start(
+                    argv, cwd, env, pid_file, stdin
+                )
+            except Exception as e:
+                raise GadugiError(f"Failed to exec in sandbox {self.session_id}: {e}")
+
+        process = SandboxProcess(
+            self,
+            args,
+            exec_id,
+            pid_file,
+            stream=stream,
+            attach=attach,
+            stdin=stdin if attach is not None else None,
+            time_limit=self.config.timeout,
+            **process_kwargs,
+        )
+        with self._lock:
+            self._processes[exec_id] = process
+            self.commands_run += 1
+        return process
+
+    def _exec_start(
+        self,
+        argv: List[str],
+        cwd: Optional[str],
+        env: Optional[Dict[str, str]],
+        pid_file: str,
+        stdin: Any,
+    ) -> Tuple[str, Any, Any]:
+        """
+        Create and start an exec of the wrapped command.
+
+        Returns:
+            Exec ID, and its output stream or its attach socket
+        """
+        assert self.config is not None
+        attach_stdin = stdin not in (None, subprocess.DEVNULL)
+        with self._lock:
+            stale = " ".join(self._finished_pid_files)
+            self._finished_pid_files.clear()
+
+        api = self.engine.container_manager.client.api
+        exec_id = api.exec_create(
+            self._container.id,
+            ["/bin/sh", "-c", EXEC_WRAPPER, pid_file, stale, *argv],
+            stdout=True,
+            stderr=True,
+            stdin=attach_stdin,
+            user=self.config.user,
+            workdir=cwd or self.config.working_dir,
+            environment=self._exec_environment(env),
+        )["Id"]
+        if attach_stdin:
+            return exec_id, None, api.exec_start(exec_id, socket=True)
+        return exec_id, api.exec_start(exec_id, stream=True, demux=True), None
+
+    def _process_finished(self, process: SandboxProcess) -> None:
+        with self._lock:
+            self._processes.pop(process.exec_id, None)
+            self._finished_pid_files.append(process._pid_file)
+        self._touch()
+
+    def exit_code(self, exec_id: str) -> Optional[int]:
+        """Exit code of a finished exec, or None if it cannot be inspected."""
+        api = self.engine.container_manager.client.api
+        for delay in (0.0, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5):
+            time.sleep(delay)
+            try:
+                info = api.exec_inspect(exec_id)
+            except Exception as e:
+                logger.debug(f"Cannot inspect sandbox exec {exec_id[:8]}: {e}")
+                return None
+            # The output stream can close just before Docker records the exit
+            if not info.get("Running"):
+                return info.get("ExitCode")
+        return None
+
+    def exec_pid(self, exec_id: str) -> Optional[int]:
+        try:
+            return self.engine.container_manager.client.api.exec_inspect(exec_id).get(
+                "Pid"
+            )
+        except Exception:
+            return None
+
+    def signal_exec(self, pid_file: str, sig: int) -> None:
+        """Signal the command whose PID was recorded in ``pid_file``."""
+        if not self.active:
+            return
+        try:
+            self._container.exec_run(
+                ["/bin/sh", "-c", SIGNAL_SCRIPT, pid_file, str(sig)],
+                user=self.config.user if self.config else "",
+            )
+        except Exception as e:
+            logger.warning(f"Failed to signal sandbox process: {e}")
+
+    def popen(
+        self,
+        args: CommandArgs,
+        stdin: Any = None,
+        stdout: Any = None,
+        stderr: Any = None,
+        shell: bool = False,
+        cwd: Optional[str] = None,
+        env: Optional[Dict[str, str]] = None,
+        text: Optional[bool] = None,
+        encoding: Optional[str] = None,
+        errors: Optional[str] = None,
+        universal_newlines: Optional[bool] = None,
+        **kwargs: Any,
+    ) -> SandboxProcess:
+        """
+        Start a command in the sandbox, like ``subprocess.Popen``.
+
+        ``env`` is layered over the session environment rather than
+        replacing it. ``stdin=None`` leaves standard input unconnected
+        instead of inheriting the host's. Other ``Popen`` keyword arguments
+        are accepted and ignored.
+
+        Returns:
+            Handle for the running command
+
+        Raises:
+            GadugiError: If the policy denies the command or the exec fails
+        """
+        argv = command_argv(args, shell)
+        self._check_command(argv)
+        return self._spawn(
+            args,
+            argv,
+            cwd,
+            env,
+            stdin=stdin,
+            stdout=stdout,
+            stderr=stderr,
+            text=bool(text or universal_newlines or encoding or errors),
+            encoding=encoding,
+            errors=errors,
+        )
+
+    def run(
+        self,
+        args: CommandArgs,
+        input: Optional[Any] = None,
+        capture_output: bool = False,
+        timeout: Optional[float] = None,
+        check: bool = False,
+        **kwargs: Any,
+    ) -> subprocess.CompletedProcess:
+        """
+        Run a command in the sandbox, like ``subprocess.run``.
+
+        Returns:
+            Completed process
+
+        Raises:
+            subprocess.TimeoutExpired: If the command outlives the timeout
+                or the policy's execution time; it is killed first
+            subprocess.CalledProcessError: If check is set and it fails
+            GadugiError: If the policy denies the command
+        """
+        if input is not None:
+            if kwargs.get("stdin") is not None:
+                raise ValueError("stdin and input arguments may not both be used.")
+            kwargs["stdin"] = subprocess.PIPE
+
+        if capture_output:
+            if kwargs.get("stdout") is not None or kwargs.get("stderr") is not None:
+                raise ValueError(
+                    "stdout and stderr arguments may not be used with capture_output."
+                )
+            kwargs["stdout"] = kwargs["stderr"] = subprocess.PIPE
+
+        with self.popen(args, **kwargs) as process:
+            try:
+                stdout, stderr = process.communicate(input, timeout=timeout)
+            except subprocess.TimeoutExpired as e:
+                process.kill()
+                process.wait()
+                e.output = process._collected(process.stdout)
+                e.stderr = process._collected(process.stderr)
+                raise
+            except BaseException:
+                process.kill()
+                raise
+            returncode = process.wait()
+
+        if process.timed_out:
+            raise subprocess.TimeoutExpired(
+                process.args,
+                process.time_limit,  # type: ignore[arg-type]
+                output=stdout,
+                stderr=stderr,
+            )
+        if check and returncode:
+            raise subprocess.CalledProcessError(
+                returncode, process.args, output=stdout, stderr=stderr
+            )
+        return subprocess.CompletedProcess(process.args, returncode, stdout, stderr)
+
+    def run_batch(
+        self,
+        commands: Sequence[CommandArgs],
+        stop_on_error: bool = False,
+        timeout: Optional[float] = None,
+        text: bool = True,
+    ) -> List[subprocess.CompletedProcess]:
+        """
+        Run several commands in one exec round trip.
+
+        Commands run one after another; strings go through ``/bin/sh -c``.
+        Each command's output is buffered inside the sandbox and framed with
+        its exit code, so results are returned per command.
+
+        Args:
+            commands: Commands to run
+            stop_on_error: Stop after the first command that fails
+            timeout: Timeout for the whole batch
+            text: Decode output as text
+
+        Returns:
+            Completed processes for the commands that ran
+
+        Raises:
+            subprocess.TimeoutExpired: If the batch outlives the timeout or
+                the policy's execution time
+            GadugiError: If the policy denies any command; none are run
+        """
+        argvs = []
+        for command in commands:
+            argv = command_argv(command, shell=isinstance(command, (str, bytes)))
+            self._check_command(argv)
+            argvs.append(argv)
+
+        lines = ["d=$(mktemp -d) || exit 125; trap 'rm -rf \"$d\"' EXIT"]
+        for argv in argvs:
+            lines.append(
+                f'{shlex.join(argv)} </dev/null >"$d/o" 2>"$d/e"; rc=$?; '
+                'echo "$rc $(wc -c <"$d/o") $(wc -c <"$d/e")"; cat "$d/o" "$d/e"'
+            )
+            if stop_on_error:
+                lines.append('[ "$rc" -eq 0 ] || exit 0')
+
+        script = ["/bin/sh", "-c", "\n".join(lines)]
+        with self._spawn(
+            commands, script, None, None, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        ) as process:
+            try:
+                data, errors = process.communicate(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                raise
+        if process.timed_out:
+            raise subprocess.TimeoutExpired(commands, process.time_limit)  # type: ignore[arg-type]
+        self.batches_run += 1
+
+        results = []
+        position = 0
+        for command in commands:
+            newline = data.find(b"\n", position)
+            if newline < 0:
+                break
+            header = data[position:newline].split()
+            if len(header) != 3:
+                raise GadugiError(f"Malformed sandbox batch output: {errors!r}")
+            returncode, out_size, err_size = map(int, header)
+            position = newline + 1
+            out = data[position : position + out_size]
+            position += out_size
+            err = data[position : position + err_size]
+            position += err_size
+            if text:
+                results.append(
+                    subprocess.CompletedProcess(
+                        command,
+                        returncode,
+                        _decode(out, None, None),
+                        _decode(err, None, None),
+                    )
+                )
+            else:
+                results.append(
+                    subprocess.CompletedProcess(command, returncode, out, err)
+                )
+        return results
+
+    def close(self) -> None:
+        """Stop running commands, remove the container and audit the session."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._idle_timer is not None:
+                self._idle_timer.cancel()
+        atexit.unregister(self.close)
+
+        with self._lifecycle_lock:
+            self._stop_container()
+        logger.info(
+            f"Sandbox session closed: {self.session_id} ({self.commands_run} commands)"
+        )
+
+    def _stop_container(self) -> None:
+        """Remove the session container, ending every exec still running in it."""
+        if self.container_id is None:
+            return
+
+        engine = self.engine
+        usage = self._monitor.get_usage_summary() if self._monitor else {}
+        try:
+            engine.resource_manager.unregister_container(self.container_id)
+        except Exception:
+            pass  # Not critical if unregistration fails
+
+        # Removing the container ends every exec still running in it
+        engine.container_manager.cleanup_container(self.container_id)
+        engine.audit_logger.log_container_stopped(
+            container_id=self.session_id,
+            exit_code=0,
+            execution_time=time.time() - (self.started_at or time.time()),
+            resource_usage=usage,
+            user_id=self.request.user_id,
+        )
+        engine.active_executions.pop(self.session_id, None)
+        self._container = None
+        self._monitor = None
+        self.container_id = None
+        with self._lock:
+            self._finished_pid_files.clear()
+
+    def __enter__(self) -> "SandboxSession":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get session status and statistics."""
+        with self._lock:
+            running = len(self._processes)
+        return {
+            "session_id": self.session_id,
+            "container_id": self.container_id,
+            "active": self.active,
+            "image": self.config.image if self.config else None,
+            "policy": self.compiled.policy.name if self.compiled else None,
+            "uptime": time.time() - self.started_at if self.started_at else 0.0,
+            "running_commands": running,
+            "commands_run": self.commands_run,
+            "commands_denied": self.commands_denied,
+            "batches_run": self.batches_run,
+            "containers_started": self.containers_started,
+        }
@@ -3,11 +3,32 @@ Security Policy Engine for Container Execution.
 
 Implements comprehensive security policies for container execution,
 including resource limits, capability restrictions, and access controls.
+
+Policies are published as immutable, versioned :class:`PolicySet` objects.
+The policy file and an optional directory of per-tenant policy files are
+watched for changes; a reload validates and compiles everything before the
+new set replaces the old one, so a broken edit never takes effect.
 """
 
 import logging
+import re
+import threading
 import yaml
-from typing import Dict, List, Optional, Any, Set
+from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
+from typing import (
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Any,
+    Set,
+    FrozenSet,
+    Pattern,
+    Tuple,
+)
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
@@ -29,6 +50,14 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+IMAGE_SCAN_MODES = {"async", "block"}
+
+# Per-tenant policy files in the tenant policy directory, named <tenant>.yaml
+TENANT_POLICY_PATTERNS = ("*.yaml", "*.yml")
+
+# (path, mtime_ns, size) of every watched policy source
+SourceSignature = Tuple[Tuple[str, Optional[int], Optional[int]], ...]
+
 
 class SecurityLevel(Enum):
     """Security levels for different execution contexts."""
@@ -88,6 +117,254 @@ class ExecutionPolicy:
     environment_whitelist: Set[str] = field(default_factory=set)
     mount_restrictions: Dict[str, Any] = field(default_factory=dict)
     audit_required: bool = True
+    # "async": scan in background and quarantine on findings,
+    # "block": wait for a clean scan before the image may run
+    image_scan_mode: str = "async"
+
+
+@lru_cache(maxsize=1024)
+def normalize_image_reference(image: str) -> str:
+    """Normalize Docker image reference for comparison."""
+    # Handle special case for empty or None
+    if not image:
+        return ""
+
+    # Strip whitespace
+    image = image.strip()
+
+    # Add default tag if missing
+    if ":" not in image:
+        image = f"{image}:latest"
+
+    # Handle registry prefix normalization
+    # docker.io/library/image:tag -> library/image:tag
+    if image.startswith("docker.io/"):
+        image = image.removeprefix("docker.io/")
+
+    # Official images on Docker Hub are in the library namespace
+    if "/" not in image.split(":")[0]:
+        image = f"library/{image}"
+
+    return image
+
+
+@dataclass(frozen=True)
+class CompiledPolicy:
+    """
+    Immutable evaluator for an :class:`ExecutionPolicy`.
+
+    Everything that does not depend on the request is computed once when
+    the policy is registered: the normalized image allow-list, a single
+    regex over all blocked commands and the container settings the policy
+    imposes. Per request only the image lookup, one regex search per
+    command part and a merge into the base config remain.
+    """
+
+    policy: ExecutionPolicy
+    allowed_images: FrozenSet[str]
+    blocked_pattern: Optional[Pattern[str]]
+    config_template: Dict[str, Any]  # Never mutated, only merged
+    cap_drop: Tuple[str, ...]
+    cap_add: Tuple[str, ...]
+    security_opt: Tuple[str, ...]
+    ulimits: Tuple[Dict[str, Any], ...]
+    environment_whitelist: FrozenSet[str]
+    tmpfs: Dict[str, str]
+
+    @classmethod
+    def compile(cls, policy: ExecutionPolicy) -> "CompiledPolicy":
+        """Precompute the request-independent parts of a policy."""
+        constraints = policy.security_constraints
+        limits = policy.resource_limits
+
+        # Longest first so the reported element is the most specific match
+        blocked_pattern = None
+        if policy.blocked_commands:
+            blocked_pattern = re.compile(
+                "|".join(
+                    re.escape(blocked)
+                    for blocked in sorted(
+                        policy.blocked_commands, key=lambda b: (-len(b), b)
+                    )
+                )
+            )
+
+        template: Dict[str, Any] = {
+            "mem_limit": limits.memory,
+            "cpu_count": float(limits.cpu),
+            "read_only": constraints.read_only_root,
+            "user": f"{constraints.user_id}:{constraints.group_id}",
+        }
+        if policy.network_policy == NetworkPolicy.NONE:
+            template["network_mode"] = "none"
+        elif policy.network_policy == NetworkPolicy.INTERNAL:
+            template["network_mode"] = "bridge"
+
+        security_opt = []
+        if constraints.no_new_privileges:
+            security_opt.append("no-new-privileges:true")
+        if constraints.seccomp_profile:
+            security_opt.append(f"seccomp={constraints.seccomp_profile}")
+        if constraints.apparmor_profile:
+            security_opt.append(f"apparmor={constraints.apparmor_profile}")
+
+        ulimits = (
+            {"Name": "nproc", "Soft": limits.processes, "Hard": limits.processes},
+            {"Name": "nofile", "Soft": limits.open_files, "Hard": limits.open_files},
+        )
+
+        tmpfs: Dict[str, str] = {}
+        restrictions = policy.mount_restrictions
+        if restrictions.get("tmpfs_only"):
+            tmpfs_config = "rw"
+            if restrictions.get("no_exec"):
+                tmpfs_config += ",noexec"
+            if restrictions.get("no_suid"):
+                tmpfs_config += ",nosuid"
+            if restrictions.get("no_dev"):
+                tmpfs_config += ",nodev"
+            tmpfs_config += f",size={restrictions.get('max_size', '100m')}"
+            tmpfs["/tmp"] = tmpfs_config
+
+        return cls(
+            policy=policy,
+            allowed_images=frozenset(
+                normalize_image_reference(image) for image in policy.allowed_images
+            ),
+            blocked_pattern=blocked_pattern,
+            config_template=template,
+            cap_drop=tuple(constraints.drop_capabilities),
+            cap_add=tuple(constraints.add_capabilities),
+            security_opt=tuple(security_opt),
+            ulimits=ulimits,
+            environment_whitelist=frozenset(policy.environment_whitelist),
+            tmpfs=tmpfs,
+        )
+
+    def image_allowed(self, image: str) -> bool:
+        """Whether an image passes the allow-list (empty allows all)."""
+        if not self.allowed_images:
+            return True
+        return normalize_image_reference(image) in self.allowed_images
+
+    def validate(self, image: str, command: List[str]) -> None:
+        """
+        Check an execution request against the policy.
+
+        Raises:
+            GadugiError: If request violates policy
+        """
+        # Check image whitelist with normalization
+        if not self.image_allowed(image):
+            raise GadugiError(
+                f"Image '{image}' not allowed by policy '{self.policy.name}'"
+            )
+
+        # Check command blacklist
+        blocked = self.find_blocked_command(command)
+        if blocked is not None:
+            raise GadugiError(f"Command contains blocked element '{blocked}'")
+
+    def find_blocked_command(self, command: List[str]) -> Optional[str]:
+        """Return the first blocked element contained in a command, if any."""
+        if self.blocked_pattern is None or not command:
+            return None
+
+        for cmd_part in command:
+            if isinstance(cmd_part, str):
+                match = self.blocked_pattern.search(cmd_part)
+                if match:
+                    return match.group(0)
+        return None
+
+    def apply(self, base_config: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge the policy's container settings into a request's config."""
+        config = {**base_config, **self.config_template}
+
+        # Fresh containers per request so callers cannot alter the policy
+        config["security_opt"] = [
+            *base_config.get("security_opt", ()),
+            *self.security_opt,
+        ]
+        config["cap_drop"] = list(self.cap_drop)
+        if self.cap_add:
+            config["cap_add"] = list(self.cap_add)
+        config["ulimits"] = [
+            *base_config.get("ulimits", ()),
+            *[ulimit.copy() for ulimit in self.ulimits],
+        ]
+
+        # Environment variable filtering
+        if self.environment_whitelist:
+            env = config.get("environment", {})
+            config["environment"] = {
+                k: v for k, v in env.items() if k in self.environment_whitelist
+            }
+
+        if self.tmpfs:
+            config["tmpfs"] = self.tmpfs.copy()
+
+        return config
+
+    def summary(self) -> Dict[str, Any]:
+        """Get summary information about the policy."""
+        policy = self.policy
+        return {
+            "name": policy.name,
+            "security_level": policy.security_level.value,
+            "network_policy": policy.network_policy.value,
+            "memory_limit": policy.resource_limits.memory,
+            "cpu_limit": policy.resource_limits.cpu,
+            "execution_timeout": policy.resource_limits.execution_time,
+            "read_only_root": policy.security_constraints.read_only_root,
+            "allowed_images": len(policy.allowed_images),
+            "blocked_commands": len(policy.blocked_commands),
+            "audit_required": policy.audit_required,
+            "image_scan_mode": policy.image_scan_mode,
+        }
+
+
+@dataclass(frozen=True)
+class PolicySet:
+    """
+    One published version of every compiled policy.
+
+    A set is never modified after publication. Executions resolve their
+    policy from the set current when they start and keep using it, so a
+    reload mid-execution cannot change rules already applied to them.
+    """
+
+    version: int
+    policies: Mapping[str, CompiledPolicy]
+    # Tenant policies override or extend the shared policies for one tenant
+    tenants: Mapping[str, Mapping[str, CompiledPolicy]]
+    loaded_at: datetime = field(default_factory=datetime.now)
+
+    def get(self, policy_name: str, tenant: Optional[str] = None) -> CompiledPolicy:
+        """
+        Resolve a policy, preferring the tenant's own definition.
+
+        Raises:
+            GadugiError: If policy not found
+        """
+        if tenant is not None:
+            compiled = self.tenants.get(tenant, {}).get(policy_name)
+            if compiled is not None:
+                return compiled
+
+        compiled = self.policies.get(policy_name)
+        if compiled is None:
+            raise GadugiError(f"Security policy '{policy_name}' not found")
+        return compiled
+
+    def names(self, tenant: Optional[str] = None) -> List[str]:
+        """Policy names visible to a tenant (or shared policies only)."""
+        names = list(self.policies)
+        if tenant is not None:
+            names.extend(
+                name for name in self.tenants.get(tenant, {}) if name not in names
+            )
+        return names
 
 
 class SecurityPolicyEngine:
@@ -99,17 +376,75 @@ class SecurityPolicyEngine:
     resource management.
     """
 
-    def __init__(self, policy_file: Optional[Path] = None):
-        """Initialize security policy engine."""
-        self.policies: Dict[str, ExecutionPolicy] = {}
+    def __init__(
+        self,
+        policy_file: Optional[Path] = None,
+        tenant_policy_dir: Optional[Path] = None,
+        reload_interval: Optional[float] = None,
+    ):
+        """
+        Initialize security policy engine.
+
+        Args:
+            policy_file: YAML file of shared custom policies
+            tenant_policy_dir: Directory of ``<tenant>.yaml`` policy files
+            reload_interval: Seconds between checks of the policy sources
+                for changes, None to only reload on request
+
+        Raises:
+            GadugiError: If a policy source is invalid
+        """
+        self.policy_file = policy_file
+        self.tenant_policy_dir = tenant_policy_dir
         self.default_policy_name = "standard"
 
+        # Compiled policies by source; merged into each published PolicySet
+        self._builtin: Dict[str, CompiledPolicy] = {}
+        self._file_policies: Dict[str, CompiledPolicy] = {}
+        self._tenant_policies: Dict[str, Dict[str, CompiledPolicy]] = {}
+        self._registered: Dict[str, CompiledPolicy] = {}
+
+        self._lock = threading.RLock()
+        self._policy_set = PolicySet(
+            version=0, policies=MappingProxyType({}), tenants=MappingProxyType({})
+        )
+        self._source_signature: Optional[SourceSignature] = None
+        self._reload_handlers: List[Callable[[PolicySet], None]] = []
+
+        # Reload statistics
+        self.reloads = 0
+        self.failed_reloads = 0
+        self.last_reload_error: Optional[str] = None
+
+        self._stop_event = threading.Event()
+        self._watch_thread: Optional[threading.Thread] = None
+
         # Load built-in policies
         self._load_builtin_policies()
 
-        # Load custom policies if provided
-        if policy_file and policy_file.exists():
-            self._load_policies_from_file(policy_file)
+        # Load custom and tenant policies; an invalid source fails startup
+        self._source_signature = self._read_source_signature()
+        self._file_policies, self._tenant_policies = self._compile_sources()
+        self._publish()
+
+        if reload_interval:
+            self.start_watching(reload_interval)
+
+    @property
+    def policy_set(self) -> PolicySet:
+        """The current policy version; pin it for the length of an execution."""
+        return self._policy_set
+
+    @property
+    def policy_version(self) -> int:
+        return self._policy_set.version
+
+    @property
+    def policies(self) -> Mapping[str, ExecutionPolicy]:
+        """Read-only view of the current shared policies."""
+        return MappingProxyType(
+            {name: c.policy for name, c in self._policy_set.policies.items()}
+        )
 
     def _load_builtin_policies(self) -> None:
         """Load built-in security policies."""
@@ -254,32 +589,222 @@ class SecurityPolicyEngine:
             },
         )
 
-        # Register all policies
+        # Compile all policies
         for policy in [
             minimal_policy,
             standard_policy,
             hardened_policy,
             paranoid_policy,
         ]:
-            self.policies[policy.name] = policy
+            self._builtin[policy.name] = CompiledPolicy.compile(policy)
 
-        logger.info(f"Loaded {len(self.policies)} built-in security policies")
+        logger.info(f"Loaded {len(self._builtin)} built-in security policies")
 
-    def _load_policies_from_file(self, policy_file: Path) -> None:
+    def _load_policies_from_file(self, policy_file: Path) -> List[ExecutionPolicy]:
         """Load custom policies from YAML file."""
         try:
             with open(policy_file, "r") as f:
-                policy_data = yaml.safe_load(f)
+                policy_data = yaml.safe_load(f) or {}
 
-            for policy_name, policy_config in policy_data.get("policies", {}).items():
-                policy = self._parse_policy_config(policy_name, policy_config)
-                self.policies[policy_name] = policy
+            policies = [
+                self._parse_policy_config(policy_name, policy_config)
+                for policy_name, policy_config in policy_data.get(
+                    "policies", {}
+                ).items()
+            ]
 
             logger.info(f"Loaded custom policies from {policy_file}")
+            return policies
 
         except Exception as e:
             raise GadugiError(f"Failed to load policies from {policy_file}: {e}")
 
+    def _tenant_policy_files(self) -> List[Path]:
+        """Per-tenant policy files, one per tenant."""
+        if not self.tenant_policy_dir or not self.tenant_policy_dir.is_dir():
+            return []
+
+        files: Dict[str, Path] = {}
+        for pattern in TENANT_POLICY_PATTERNS:
+            for path in sorted(self.tenant_policy_dir.glob(pattern)):
+                files.setdefault(path.stem, path)
+        return [files[tenant] for tenant in sorted(files)]
+
+    def _read_source_signature(self) -> SourceSignature:
+        """Modification times and sizes of every watched policy source."""
+        paths = [self.policy_file] if self.policy_file else []
+        paths.extend(self._tenant_policy_files())
+
+        signature = []
+        for path in paths:
+            try:
+                stat = path.stat()
+                signature.append((str(path), stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append((str(path), None, None))
+        return tuple(signature)
+
+    def _compile_policies(
+        self,
+        policies: List[ExecutionPolicy],
+        previous: Dict[str, CompiledPolicy],
+        source: Path,
+    ) -> Dict[str, CompiledPolicy]:
+        """Compile parsed policies, reusing evaluators of unchanged ones."""
+        compiled: Dict[str, CompiledPolicy] = {}
+        for policy in policies:
+            existing = previous.get(policy.name)
+            if existing is not None and existing.policy == policy:
+                compiled[policy.name] = existing
+                continue
+            try:
+                compiled[policy.name] = CompiledPolicy.compile(policy)
+            except Exception as e:
+                raise GadugiError(
+                    f"Failed to compile policy '{policy.name}' from {source}: {e}"
+                )
+        return compiled
+
+    def _compile_sources(
+        self,
+    ) -> Tuple[Dict[str, CompiledPolicy], Dict[str, Dict[str, CompiledPolicy]]]:
+        """
+        Load and compile the policy file and tenant policy files.
+
+        Nothing is published here, so a failure leaves the current version
+        untouched.
+
+        Raises:
+            GadugiError: If any source fails to parse or compile
+        """
+        file_policies: Dict[str, CompiledPolicy] = {}
+        if self.policy_file and self.policy_file.exists():
+            file_policies = self._compile_policies(
+                self._load_policies_from_file(self.policy_file),
+                self._file_policies,
+                self.policy_file,
+            )
+
+        tenant_policies: Dict[str, Dict[str, CompiledPolicy]] = {}
+        for path in self._tenant_policy_files():
+            tenant_policies[path.stem] = self._compile_policies(
+                self._load_policies_from_file(path),
+                self._tenant_policies.get(path.stem, {}),
+                path,
+            )
+
+        return file_policies, tenant_policies
+
+    def _publish(self) -> PolicySet:
+        """Swap in a new policy version built from the current sources."""
+        with self._lock:
+            policy_set = PolicySet(
+                version=self._policy_set.version + 1,
+                policies=MappingProxyType(
+                    {**self._builtin, **self._file_policies, **self._registered}
+                ),
+                tenants=MappingProxyType(
+                    {
+                        tenant: MappingProxyType(dict(policies))
+                        for tenant, policies in self._tenant_policies.items()
+                    }
+                ),
+            )
+            self._policy_set = policy_set
+        return policy_set
+
+    def _notify_reload(self, policy_set: PolicySet) -> None:
+        for handler in list(self._reload_handlers):
+            try:
+                handler(policy_set)
+            except Exception as e:
+                logger.error(f"Error in policy reload handler: {e}")
+
+    def add_reload_handler(self, handler: Callable[[PolicySet], None]) -> None:
+        """Register a callback for every newly published policy version."""
+        self._reload_handlers.append(handler)
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Reload policy sources if they changed since the last load.
+
+        Every source is parsed and compiled before anything is swapped in.
+        If any of them is invalid the current version stays active and the
+        error is kept in ``last_reload_error``.
+
+        Args:
+            force: Reload even if no source appears to have changed
+
+        Returns:
+            True if a new policy version was published
+        """
+        with self._lock:
+            signature = self._read_source_signature()
+            if not force and signature == self._source_signature:
+                return False
+
+            # Remember broken sources too, so they are retried only once edited
+            self._source_signature = signature
+            try:
+                file_policies, tenant_policies = self._compile_sources()
+            except GadugiError as e:
+                self.failed_reloads += 1
+                self.last_reload_error = str(e)
+                logger.error(
+                    f"Policy reload failed, keeping version "
+                    f"{self._policy_set.version}: {e}"
+                )
+                return False
+
+            self._file_policies = file_policies
+            self._tenant_policies = tenant_policies
+            self.last_reload_error = None
+            self.reloads += 1
+            policy_set = self._publish()
+
+        logger.info(
+            f"Published security policy version {policy_set.version} "
+            f"({len(policy_set.policies)} policies, "
+            f"{len(policy_set.tenants)} tenants)"
+        )
+        self._notify_reload(policy_set)
+        return True
+
+    @property
+    def watching(self) -> bool:
+        """Whether the policy watcher thread is alive."""
+        return self._watch_thread is not None and self._watch_thread.is_alive()
+
+    def start_watching(self, interval: float = 5.0) -> None:
+        """Start polling the policy sources for changes."""
+        if self.watching:
+            return
+
+        self._stop_event.clear()
+        self._watch_thread = threading.Thread(
+            target=self._watch_loop,
+            args=(interval,),
+            name="gadugi-policy-watcher",
+            daemon=True,
+        )
+        self._watch_thread.start()
+        logger.info(f"Watching security policy sources (interval={interval}s)")
+
+    def stop_watching(self, timeout: float = 1.0) -> None:
+        """Stop the policy watcher thread."""
+        self._stop_event.set()
+        if self._watch_thread and self._watch_thread.is_alive():
+            self._watch_thread.join(timeout=timeout)
+        self._watch_thread = None
+
+    def _watch_loop(self, interval: float) -> None:
+        """Main watch loop."""
+        while not self._stop_event.wait(interval):
+            try:
+                self.reload()
+            except Exception as e:
+                logger.error(f"Error checking security policy sources: {e}")
+
     def _parse_policy_config(
         self, name: str, config: Dict[str, Any]
     ) -> ExecutionPolicy:
@@ -321,19 +846,61 @@ class SecurityPolicyEngine:
                 environment_whitelist=set(config.get("environment_whitelist", [])),
                 mount_restrictions=config.get("mount_restrictions", {}),
                 audit_required=config.get("audit_required", True),
+                image_scan_mode=config.get("image_scan_mode", "async"),
             )
 
+            if policy.image_scan_mode not in IMAGE_SCAN_MODES:
+                raise ValueError(
+                    f"image_scan_mode must be one of {sorted(IMAGE_SCAN_MODES)}"
+                )
+
             return policy
 
         except Exception as e:
             raise GadugiError(f"Failed to parse policy configuration for {name}: {e}")
 
-    def get_policy(self, policy_name: Optional[str] = None) -> ExecutionPolicy:
+    def register_policy(self, policy: ExecutionPolicy) -> None:
+        """
+        Add or replace a shared policy and publish a new policy version.
+
+        Registered policies take precedence over the policy file and survive
+        reloads. Re-register a policy after modifying it in place so its
+        compiled evaluator is rebuilt.
+        """
+        with self._lock:
+            self._registered[policy.name] = CompiledPolicy.compile(policy)
+            policy_set = self._publish()
+        self._notify_reload(policy_set)
+
+    def get_compiled_policy(
+        self,
+        policy_name: Optional[str] = None,
+        tenant: Optional[str] = None,
+        policy_set: Optional[PolicySet] = None,
+    ) -> CompiledPolicy:
+        """
+        Get the compiled evaluator for a policy.
+
+        Args:
+            policy_name: Name of policy to retrieve, defaults to default policy
+            tenant: Tenant whose policy overrides apply
+            policy_set: Pinned policy version, defaults to the current one
+
+        Raises:
+            GadugiError: If policy not found
+        """
+        policy_set = policy_set or self._policy_set
+        return policy_set.get(policy_name or self.default_policy_name, tenant)
+
+    def get_policy(
+        self, policy_name: Optional[str] = None, tenant: Optional[str] = None
+    ) -> ExecutionPolicy:
         """
         Get security policy by name.
 
         Args:
             policy_name: Name of policy to retrieve, defaults to default policy
+            tenant: Tenant whose policy overrides apply
 
         Returns:
             ExecutionPolicy object
@@ -341,15 +908,14 @@ class SecurityPolicyEngine:
         Raises:
             GadugiError: If policy not found
         """
-        name = policy_name or self.default_policy_name
-
-        if name not in self.policies:
-            raise GadugiError(f"Security policy '{name}' not found")
-
-        return self.policies[name]
+        return self.get_compiled_policy(policy_name, tenant).policy
 
     def validate_execution_request(
-        self, image: str, command: List[str], policy_name: Optional[str] = None
+        self,
+        image: str,
+        command: List[str],
+        policy_name: Optional[str] = None,
+        tenant: Optional[str] = None,
     ) -> bool:
         """
         Validate if an execution request meets policy requirements.
@@ -358,6 +924,7 @@ class SecurityPolicyEngine:
             image: Container image name
             command: Command to execute
             policy_name: Security policy to use
+            tenant: Tenant whose policy overrides apply
 
         Returns:
             True if request is valid
@@ -365,58 +932,18 @@ class SecurityPolicyEngine:
         Raises:
             GadugiError: If request violates policy
         """
-        policy = self.get_policy(policy_name)
-
-        # Check image whitelist with normalization
-        if policy.allowed_images:
-            normalized_image = self._normalize_image_reference(image)
-            normalized_allowed = set(
-                self._normalize_image_reference(img) for img in policy.allowed_images
-            )
-            if normalized_image not in normalized_allowed:
-                raise GadugiError(
-                    f"Image '{image}' not allowed by policy '{policy.name}'"
-                )
-
-        # Check command blacklist
-        if command and policy.blocked_commands:
-            for cmd_part in command:
-                if isinstance(cmd_part, str):
-                    # Check if any part of the command is blocked
-                    for blocked in policy.blocked_commands:
-                        if blocked in cmd_part:
-                            raise GadugiError(
-                                f"Command contains blocked element '{blocked}'"
-                            )
-
+        self.get_compiled_policy(policy_name, tenant).validate(image, command)
         return True
 
     def _normalize_image_reference(self, image: str) -> str:
         """Normalize Docker image reference for comparison."""
-        # Handle special case for empty or None
-        if not image:
-            return ""
-
-        # Strip whitespace
-        image = image.strip()
-
-        # Add default tag if missing
-        if ":" not in image:
-            image = f"{image}:latest"
-
-        # Handle registry prefix normalization
-        # docker.io/library/image:tag -> library/image:tag
-        if image.startswith("docker.io/"):
-            image = image.removeprefix("docker.io/")
-
-        # Official images on Docker Hub are in the library namespace
-        if "/" not in image.split(":")[0]:
-            image = f"library/{image}"
-
-        return image
+        return normalize_image_reference(image)
 
     def apply_policy_to_container_config(
-        self, base_config: Dict[str, Any], policy_name: Optional[str] = None
+        self,
+        base_config: Dict[str, Any],
+        policy_name: Optional[str] = None,
+        tenant: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Apply security policy to container configuration.
@@ -424,114 +951,46 @@ class SecurityPolicyEngine:
         Args:
             base_config: Base container configuration
             policy_name: Security policy to apply
+            tenant: Tenant whose policy overrides apply
 
         Returns:
             Modified container configuration with policy applied
         """
-        policy = self.get_policy(policy_name)
-        config = base_config.copy()
-
-        # Apply resource limits
-        config["mem_limit"] = policy.resource_limits.memory
-        config["cpu_count"] = float(policy.resource_limits.cpu)
+        return self.get_compiled_policy(policy_name, tenant).apply(base_config)
 
-        # Apply security constraints
-        config["read_only"] = policy.security_constraints.read_only_root
-        config["user"] = (
-            f"{policy.security_constraints.user_id}:{policy.security_constraints.group_id}"
-        )
-
-        # Security options
-        security_opt = config.get("security_opt", [])
-        if policy.security_constraints.no_new_privileges:
-            security_opt.append("no-new-privileges:true")
-        if policy.security_constraints.seccomp_profile:
-            security_opt.append(
-                f"seccomp={policy.security_constraints.seccomp_profile}"
-            )
-        if policy.security_constraints.apparmor_profile:
-            security_opt.append(
-                f"apparmor={policy.security_constraints.apparmor_profile}"
-            )
-        config["security_opt"] = security_opt
-
-        # Capabilities
-        config["cap_drop"] = policy.security_constraints.drop_capabilities
-        if policy.security_constraints.add_capabilities:
-            config["cap_add"] = policy.security_constraints.add_capabilities
-
-        # Network policy
-        if policy.network_policy == NetworkPolicy.NONE:
-            config["network_mode"] = "none"
-        elif policy.network_policy == NetworkPolicy.INTERNAL:
-            config["network_mode"] = "bridge"
-
-        # Process limits
-        ulimits = config.get("ulimits", [])
-        ulimits.extend(
-            [
-                {
-                    "Name": "nproc",
-                    "Soft": policy.resource_limits.processes,
-                    "Hard": policy.resource_limits.processes,
-                },
-                {
-                    "Name": "nofile",
-                    "Soft": policy.resource_limits.open_files,
-                    "Hard": policy.resource_limits.open_files,
-                },
-            ]
-        )
-        config["ulimits"] = ulimits
-
-        # Environment variable filtering
-        if policy.environment_whitelist:
-            env = config.get("environment", {})
-            config["environment"] = {
-                k: v for k, v in env.items() if k in policy.environment_whitelist
-            }
-
-        # Mount restrictions
-        if policy.mount_restrictions.get("tmpfs_only"):
-            tmpfs_config = "rw"
-            if policy.mount_restrictions.get("no_exec"):
-                tmpfs_config += ",noexec"
-            if policy.mount_restrictions.get("no_suid"):
-                tmpfs_config += ",nosuid"
-            if policy.mount_restrictions.get("no_dev"):
-                tmpfs_config += ",nodev"
-
-            max_size = policy.mount_restrictions.get("max_size", "100m")
-            tmpfs_config += f",size={max_size}"
-
-            config["tmpfs"] = {"/tmp": tmpfs_config}
-
-        return config
-
-    def list_policies(self) -> List[str]:
+    def list_policies(self, tenant: Optional[str] = None) -> List[str]:
         """List all available policy names."""
-        return list(self.policies.keys())
+        return self._policy_set.names(tenant)
+
+    def list_tenants(self) -> List[str]:
+        """List tenants with their own policy file."""
+        return sorted(self._policy_set.tenants)
 
-    def get_policy_summary(self, policy_name: str) -> Dict[str, Any]:
+    def get_policy_summary(
+        self, policy_name: str, tenant: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Get summary information about a policy."""
-        policy = self.get_policy(policy_name)
+        return self.get_compiled_policy(policy_name, tenant).summary()
 
+    def get_status(self) -> Dict[str, Any]:
+        """Get policy cache status information."""
+        policy_set = self._policy_set
         return {
-            "name": policy.name,
-            "security_level": policy.security_level.value,
-            "network_policy": policy.network_policy.value,
-            "memory_limit": policy.resource_limits.memory,
-            "cpu_limit": policy.resource_limits.cpu,
-            "execution_timeout": policy.resource_limits.execution_time,
-            "read_only_root": policy.security_constraints.read_only_root,
-            "allowed_images": len(policy.allowed_images),
-            "blocked_commands": len(policy.blocked_commands),
-            "audit_required": policy.audit_required,
+            "policy_version": policy_set.version,
+            "loaded_at": policy_set.loaded_at.isoformat(),
+            "policies": len(policy_set.policies),
+            "tenants": sorted(policy_set.tenants),
+            "watching": self.watching,
+            "reloads": self.reloads,
+            "failed_reloads": self.failed_reloads,
+            "last_reload_error": self.last_reload_error,
         }
 
-    def export_policy(self, policy_name: str) -> Dict[str, Any]:
+    def export_policy(
+        self, policy_name: str, tenant: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Export policy configuration as dictionary."""
-        policy = self.get_policy(policy_name)
+        policy = self.get_policy(policy_name, tenant)
 
         return {
             "name": policy.name,
@@ -560,4 +1019,5 @@ class SecurityPolicyEngine:
             "environment_whitelist": list(policy.environment_whitelist),
             "mount_restrictions": policy.mount_restrictions,
             "audit_required": policy.audit_required,
+            "image_scan_mode": policy.image_scan_mode,
         }
@@ -0,0 +1,269 @@
+"""
+Shared Stats Sampler for Container Resource Monitoring.
+
+Multiplexes resource sampling for all monitored containers onto a single
+background thread and stores samples in fixed-size, array-backed ring
+buffers instead of per-sample Python objects.
+"""
+
+import logging
+import threading
+import time
+from array import array
+from typing import Dict, List, Optional, Any, Iterator, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .resource_manager import ResourceMonitor
+
+logger = logging.getLogger(__name__)
+
+
+# Metric name -> array typecode. Timestamps and ratios are doubles,
+# byte and count metrics are signed 64-bit integers.
+METRIC_TYPECODES: Dict[str, str] = {
+    "timestamp": "d",
+    "cpu_percent": "d",
+    "memory_bytes": "q",
+    "memory_percent": "d",
+    "disk_bytes": "q",
+    "network_rx_bytes": "q",
+    "network_tx_bytes": "q",
+    "processes": "q",
+    "open_files": "q",
+    "oom_kills": "q",
+}
+
+
+class MetricRingBuffer:
+    """Fixed-capacity ring buffer of numeric samples backed by ``array.array``."""
+
+    __slots__ = ("capacity", "_data", "_head", "_count")
+
+    def __init__(self, capacity: int, typecode: str = "d"):
+        """
+        Initialize ring buffer.
+
+        Args:
+            capacity: Maximum number of samples retained
+            typecode: ``array`` typecode used for storage
+        """
+        if capacity <= 0:
+            raise ValueError("Ring buffer capacity must be positive")
+
+        self.capacity = capacity
+        self._data: "array[float]" = array(typecode, [0] * capacity)
+        self._head = 0  # Next write position
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, value: float) -> None:
+        """Append a sample, overwriting the oldest one when full."""
+        self._data[self._head] = value
+        self._head = (self._head + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def __iter__(self) -> Iterator[float]:
+        """Iterate samples from oldest to newest."""
+        start = (self._head - self._count) % self.capacity
+        for offset in range(self._count):
+            yield self._data[(start + offset) % self.capacity]
+
+    def latest(self) -> Optional[float]:
+        """Return the most recent sample, if any."""
+        if self._count == 0:
+            return None
+        return self._data[(self._head - 1) % self.capacity]
+
+    def to_list(self) -> List[float]:
+        """Return samples from oldest to newest."""
+        return list(self)
+
+    def max(self) -> Optional[float]:
+        """Return the maximum retained sample."""
+        return max(self) if self._count else None
+
+    def mean(self) -> Optional[float]:
+        """Return the mean of retained samples."""
+        return sum(self) / self._count if self._count else None
+
+    def clear(self) -> None:
+        """Drop all samples without releasing storage."""
+        self._head = 0
+        self._count = 0
+
+
+class UsageRingBuffer:
+    """
+    Column-oriented resource usage history.
+
+    Holds one :class:`MetricRingBuffer` per metric so a sample costs a
+    handful of array stores rather than a dataclass allocation.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        """Initialize one ring buffer per metric."""
+        self.capacity = capacity
+        self.metrics: Dict[str, MetricRingBuffer] = {
+            name: MetricRingBuffer(capacity, typecode)
+            for name, typecode in METRIC_TYPECODES.items()
+        }
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.metrics["timestamp"])
+
+    def append(self, sample: Dict[str, float]) -> None:
+        """Record a sample; missing metrics are stored as zero."""
+        with self._lock:
+            for name, buffer in self.metrics.items():
+                buffer.append(sample.get(name, 0))
+
+    def rows(self, since: Optional[float] = None) -> List[Dict[str, float]]:
+        """
+        Return samples as dictionaries from oldest to newest.
+
+        Args:
+            since: Only include samples with a timestamp at or after this
+                epoch time
+        """
+        with self._lock:
+            columns: List[Tuple[str, List[float]]] = [
+                (name, buffer.to_list()) for name, buffer in self.metrics.items()
+            ]
+
+        rows = []
+        for index in range(len(columns[0][1])):
+            row = {name: values[index] for name, values in columns}
+            if since is not None and row["timestamp"] < since:
+                continue
+            rows.append(row)
+        return rows
+
+    def latest(self) -> Optional[Dict[str, float]]:
+        """Return the most recent sample, if any."""
+        with self._lock:
+            if not len(self.metrics["timestamp"]):
+                return None
+            return {name: buffer.latest() for name, buffer in self.metrics.items()}  # type: ignore[misc]
+
+    def series(self, metric: str) -> List[float]:
+        """Return the retained samples of a single metric."""
+        with self._lock:
+            return self.metrics[metric].to_list()
+
+    def clear(self) -> None:
+        """Drop all samples."""
+        with self._lock:
+            for buffer in self.metrics.values():
+                buffer.clear()
+
+
+class StatsSampler:
+    """
+    Single background sampler shared by all container resource monitors.
+
+    Replaces one polling thread per container with one thread that walks
+    every registered monitor per interval.
+    """
+
+    def __init__(self, interval: float = 5.0):
+        """
+        Initialize stats sampler.
+
+        Args:
+            interval: Seconds between sampling rounds
+        """
+        self.interval = interval
+        self.monitors: Dict[str, "ResourceMonitor"] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # Sampling statistics
+        self.rounds_completed = 0
+        self.last_round_duration = 0.0
+
+    @property
+    def running(self) -> bool:
+        """Whether the sampler thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def add(self, monitor: "ResourceMonitor") -> None:
+        """Add a monitor to the sampling set, starting the thread if needed."""
+        with self._lock:
+            self.monitors[monitor.container_id] = monitor
+        self.start()
+
+    def remove(self, container_id: str) -> None:
+        """Remove a monitor from the sampling set."""
+        with self._lock:
+            self.monitors.pop(container_id, None)
+
+    def start(self) -> None:
+        """Start the sampler thread if it is not already running."""
+        if self.running:
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._sample_loop, name="gadugi-stats-sampler", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Started shared stats sampler (interval={self.interval}s)")
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """Stop the sampler thread."""
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+        self._thread = None
+        logger.info("Stopped shared stats sampler")
+
+    def sample_once(self) -> int:
+        """
+        Run a single sampling round over all registered monitors.
+
+        Returns:
+            Number of monitors that produced a sample
+        """
+        with self._lock:
+            monitors = list(self.monitors.values())
+
+        started = time.monotonic()
+        sampled = 0
+        for monitor in monitors:
+            if self._stop_event.is_set():
+                break
+            try:
+                if monitor.sample():
+                    sampled += 1
+            except Exception as e:
+                logger.warning(
+                    f"Error sampling container {monitor.container_id[:8]}: {e}"
+                )
+
+        self.last_round_duration = time.monotonic() - started
+        self.rounds_completed += 1
+        return sampled
+
+    def _sample_loop(self) -> None:
+        """Main sampling loop."""
+        while not self._stop_event.is_set():
+            self.sample_once()
+
+            # Keep a steady cadence regardless of how long the round took
+            delay = max(0.0, self.interval - self.last_round_duration)
+            self._stop_event.wait(delay)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get sampler status information."""
+        return {
+            "running": self.running,
+            "interval": self.interval,
+            "monitored_containers": len(self.monitors),
+            "rounds_completed": self.rounds_completed,
+            "last_round_duration": self.last_round_duration,
+        }
@@ -0,0 +1,385 @@
+"""
+Tests for the async Docker client, run against a local fake Docker API.
+"""
+
+import asyncio
+import struct
+import tempfile
+import uuid
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from container_runtime.async_docker import (
+    AsyncContainerManager,
+    AsyncDockerClient,
+    DockerAPIError,
+    container_config_to_api,
+    demultiplex_logs,
+    parse_memory_limit,
+)
+from container_runtime.container_manager import ContainerConfig, ContainerStatus
+
+
+def log_frame(stream: int, data: bytes) -> bytes:
+    """One frame of Docker's multiplexed log format."""
+    return struct.pack(">BxxxI", stream, len(data)) + data
+
+
+class FakeDockerAPI:
+    """
+    In-process Docker Engine API over a Unix socket.
+
+    Containers "run" for ``run_seconds`` and exit with the code in the
+    ``EXIT`` environment variable. Images named ``missing`` fail to create.
+    """
+
+    def __init__(self, socket_path: str, run_seconds: float = 0.05):
+        self.socket_path = socket_path
+        self.run_seconds = run_seconds
+        self.containers = {}
+        self.running = 0
+        self.peak_running = 0
+        self.create_bodies = []
+        self.connections = set()
+        self._runner = None
+
+    async def start(self) -> None:
+        app = web.Application()
+        prefix = "/v{version}"
+        app.router.add_get(prefix + "/_ping", self.ping)
+        app.router.add_post(prefix + "/containers/create", self.create)
+        app.router.add_post(prefix + "/containers/{id}/start", self.start_container)
+        app.router.add_post(prefix + "/containers/{id}/wait", self.wait)
+        app.router.add_post(prefix + "/containers/{id}/kill", self.kill)
+        app.router.add_get(prefix + "/containers/{id}/logs", self.logs)
+        app.router.add_get(prefix + "/containers/{id}/stats", self.stats)
+        app.router.add_delete(prefix + "/containers/{id}", self.remove)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.UnixSite(self._runner, self.socket_path).start()
+
+    async def stop(self) -> None:
+        assert self._runner is not None
+        await self._runner.cleanup()
+
+    def _container(self, request: web.Request):
+        self.connections.add(request.transport)
+        container = self.containers.get(request.match_info["id"])
+        if container is None:
+            raise web.HTTPNotFound(
+                text='{"message": "No such container"}',
+                content_type="application/json",
+            )
+        return container
+
+    async def ping(self, request: web.Request) -> web.Response:
+        return web.Response(text="OK")
+
+    async def create(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        self.create_bodies.append(body)
+        if body["Image"] == "missing":
+            return web.json_response({"message": "No such image: missing"}, status=404)
+
+        docker_id = uuid.uuid4().hex
+        env = dict(item.split("=", 1) for item in body["Env"])
+        self.containers[docker_id] = {
+            "name": request.query.get("name"),
+            "exit_code": int(env.get("EXIT", 0)),
+            "done": asyncio.Event(),
+            "started": False,
+            "killed": False,
+        }
+        return web.json_response({"Id": docker_id}, status=201)
+
+    async def start_container(self, request: web.Request) -> web.Response:
+        container = self._container(request)
+        container["started"] = True
+        self.running += 1
+        self.peak_running = max(self.peak_running, self.running)
+
+        async def run() -> None:
+            await asyncio.sleep(self.run_seconds)
+            container["done"].set()
+
+        if self.run_seconds >= 0:
+            asyncio.ensure_future(run())
+        return web.Response(status=204)
+
+    async def wait(self, request: web.Request) -> web.Response:
+        container = self._container(request)
+        await container["done"].wait()
+        return web.json_response({"StatusCode": container["exit_code"]})
+
+    async def kill(self, request: web.Request) -> web.Response:
+        container = self._container(request)
+        container["killed"] = True
+        container["exit_code"] = 137
+        container["done"].set()
+        return web.Response(status=204)
+
+    async def logs(self, request: web.Request) -> web.Response:
+        container = self._container(request)
+        body = log_frame(1, f"hello from {container['name']}\n".encode()) + log_frame(
+            2, b"warning\n"
+        )
+        return web.Response(body=body)
+
+    async def stats(self, request: web.Request) -> web.Response:
+        self._container(request)
+        return web.json_response(
+            {
+                "cpu_stats": {},
+                "precpu_stats": {},
+                "memory_stats": {"usage": 1024, "limit": 4096},
+                "pids_stats": {"current": 2},
+            }
+        )
+
+    async def remove(self, request: web.Request) -> web.Response:
+        container = self._container(request)
+        if container["started"]:
+            self.running -= 1
+        del self.containers[request.match_info["id"]]
+        return web.Response(status=204)
+
+
+@pytest_asyncio.fixture
+async def fake_docker():
+    """Fake Docker API listening on a short Unix socket path."""
+    with tempfile.TemporaryDirectory(prefix="gadugi-") as directory:
+        server = FakeDockerAPI(str(Path(directory) / "docker.sock"))
+        await server.start()
+        try:
+            yield server
+        finally:
+            await server.stop()
+
+
+@pytest_asyncio.fixture
+async def async_manager(fake_docker):
+    """Async container manager connected to the fake API."""
+    client = AsyncDockerClient(f"unix://{fake_docker.socket_path}", max_connections=64)
+    manager = AsyncContainerManager(client=client, max_concurrent=32)
+    manager.cgroup_reader = Mock(read=Mock(return_value=None), forget=Mock())
+    try:
+        yield manager
+    finally:
+        await manager.close()
+
+
+def make_config(exit_code: int = 0, **kwargs) -> ContainerConfig:
+    return ContainerConfig(
+        image=kwargs.pop("image", "python:3.11-slim"),
+        command=["python", "-c", "print('hello')"],
+        environment={"EXIT": str(exit_code)},
+        **kwargs,
+    )
+
+
+def test_demultiplex_logs():
+    """Multiplexed frames are split by stream; raw output is stdout."""
+    data = log_frame(1, b"out1\n") + log_frame(2, b"err\n") + log_frame(1, b"out2\n")
+    assert demultiplex_logs(data) == (b"out1\nout2\n", b"err\n")
+    assert demultiplex_logs(b"plain tty output\n") == (b"plain tty output\n", b"")
+    assert demultiplex_logs(b"") == (b"", b"")
+
+
+def test_container_config_to_api():
+    """The create body carries the same hardening as the sync manager."""
+    body = container_config_to_api(
+        ContainerConfig(
+            image="alpine",
+            command=["ls"],
+            memory_limit="256m",
+            cpu_limit="0.5",
+            volumes={"/data": {"bind": "/workspace", "mode": "ro"}},
+        )
+    )
+    host = body["HostConfig"]
+    assert host["Memory"] == 256 * 1024 * 1024
+    assert host["NanoCpus"] == 500_000_000
+    assert host["CapDrop"] == ["ALL"]
+    assert host["SecurityOpt"] == ["no-new-privileges:true"]
+    assert host["ReadonlyRootfs"] is True
+    assert host["NetworkMode"] == "none"
+    assert host["Binds"] == ["/data:/workspace:ro"]
+    assert parse_memory_limit("1g") == 1024**3
+    assert parse_memory_limit("512") == 512
+
+
+def test_unsupported_docker_host():
+    with pytest.raises(Exception, match="Unsupported Docker host"):
+        AsyncDockerClient("ssh://remote")
+
+
+@pytest.mark.asyncio
+async def test_ping_and_errors(fake_docker):
+    """Error responses surface the daemon's message and status."""
+    async with AsyncDockerClient(f"unix://{fake_docker.socket_path}") as client:
+        assert await client.ping()
+
+        with pytest.raises(DockerAPIError) as excinfo:
+            await client.start_container("unknown")
+        assert excinfo.value.status == 404
+        assert "No such container" in str(excinfo.value)
+        assert client.get_status()["request_errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_execute_container(async_manager, fake_docker):
+    """A full lifecycle yields separated output and removes the container."""
+    started = []
+    result = await async_manager.execute_container(
+        make_config(exit_code=3), on_started=lambda cid, did: started.append(cid)
+    )
+
+    assert result.exit_code == 3
+    assert result.status == ContainerStatus.FAILED
+    assert result.stdout.startswith("hello from gadugi-")
+    assert result.stderr == "warning\n"
+    assert result.resource_usage["memory_percent"] == 25.0
+    assert started == [result.container_id]
+    assert fake_docker.containers == {}
+    assert async_manager.active_containers == {}
+    assert len(async_manager.execution_history) == 1
+
+
+@pytest.mark.asyncio
+async def test_timeout_kills_container(async_manager, fake_docker):
+    """Containers outliving their timeout are killed and exit 124."""
+    fake_docker.run_seconds = -1  # Never exits by itself
+
+    result = await async_manager.execute_container(make_config(timeout=0.2))
+
+    assert result.exit_code == 124
+    assert fake_docker.containers == {}
+
+
+@pytest.mark.asyncio
+async def test_create_failure(async_manager):
+    """Daemon errors during creation raise and leave nothing behind."""
+    with pytest.raises(Exception, match="No such image"):
+        await async_manager.execute_container(make_config(image="missing"))
+    assert async_manager.active_containers == {}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lifecycles_share_pool(async_manager, fake_docker):
+    """Hundreds of executions run on one loop over a bounded pool."""
+    results = await asyncio.gather(
+        *(
+            async_manager.execute_container(make_config(exit_code=i % 2))
+            for i in range(200)
+        )
+    )
+
+    assert [r.exit_code for r in results] == [i % 2 for i in range(200)]
+    assert 1 < fake_docker.peak_running <= async_manager.max_concurrent
+    assert len(fake_docker.connections) <= async_manager.client.max_connections
+    assert fake_docker.containers == {}
+
+
+@pytest.mark.asyncio
+async def test_engine_execute_async(fake_docker, tmp_path):
+    """The engine's async path applies policy and audits like execute()."""
+    from container_runtime.audit_logger import AuditEventType
+    from container_runtime.execution_engine import ContainerExecutionEngine
+
+    with (
+        patch("docker.from_env") as mock_docker,
+        patch(
+            "container_runtime.image_manager.ImageManager.get_or_create_runtime_image",
+            return_value="gadugi/python:test",
+        ),
+        patch(
+            "container_runtime.resource_manager.ResourceManager.check_system_capacity",
+            return_value=True,
+        ),
+    ):
+        mock_docker.return_value.ping.return_value = True
+        engine = ContainerExecutionEngine(
+            audit_log_dir=tmp_path / "audit",
+            image_cache_dir=tmp_path / "images",
+            prebuild_images=False,
+            docker_host=f"unix://{fake_docker.socket_path}",
+        )
+        engine.get_async_container_manager().cgroup_reader = Mock(
+            read=Mock(return_value=None), forget=Mock()
+        )
+
+        response = await engine.execute_async(
+            engine_request("print('hi')", security_policy="standard")
+        )
+        blocked = await engine.execute_async(
+            engine_request("x", command=["sudo", "ls"], security_policy="standard")
+        )
+        stopped = engine.audit_logger.search_events(
+            event_type=AuditEventType.CONTAINER_STOPPED
+        )
+        await engine.shutdown_async()
+
+    assert response.success, response.error_message
+    assert response.stderr == "warning\n"
+    assert fake_docker.create_bodies[0]["HostConfig"]["CapDrop"] == ["ALL"]
+    assert not blocked.success
+    assert blocked.error_message is not None
+    assert "blocked element" in blocked.error_message
+    assert len(fake_docker.create_bodies) == 1
+    assert len(stopped) == 1
+
+
+@pytest.mark.asyncio
+async def test_engine_managers_share_output_store(fake_docker, tmp_path):
+    """Output spilled by the sync and async paths reads back in full."""
+    from container_runtime.execution_engine import ContainerExecutionEngine
+
+    container = Mock()
+    container.wait.return_value = {"StatusCode": 0}
+    container.logs.return_value = b"sync output body\n"
+
+    with patch("docker.from_env") as mock_docker:
+        mock_docker.return_value.ping.return_value = True
+        mock_docker.return_value.containers.create.return_value = container
+        engine = ContainerExecutionEngine(
+            audit_log_dir=tmp_path / "audit",
+            image_cache_dir=tmp_path / "images",
+            prebuild_images=False,
+            execution_output_dir=tmp_path / "output",
+            docker_host=f"unix://{fake_docker.socket_path}",
+        )
+    sync_manager = engine.container_manager
+    async_manager = engine.get_async_container_manager()
+    async_manager.cgroup_reader = Mock(read=Mock(return_value=None), forget=Mock())
+    sync_manager.execution_history.inline_limit = 4
+    async_manager.execution_history.inline_limit = 4
+
+    with patch.object(sync_manager, "_get_resource_usage", return_value={}):
+        sync_manager.execute_container(make_config())
+    await async_manager.execute_container(make_config())
+
+    (sync_record,) = sync_manager.execution_history.query()
+    (async_record,) = async_manager.execution_history.query()
+    assert sync_record.stdout.segment is not None
+    assert async_record.stdout.segment is not None
+    assert (
+        sync_manager.execution_history.read_output(sync_record.stdout)
+        == "sync output body\n"
+    )
+    async_output = async_manager.execution_history.read_output(async_record.stdout)
+    assert async_output is not None
+    assert async_output.startswith("hello from gadugi-")
+
+    await engine.shutdown_async()
+
+
+def engine_request(code, command=None, **kwargs):
+    from container_runtime.execution_engine import ExecutionRequest
+
+    return ExecutionRequest(
+        runtime="python", command=command or ["python", "-c", code], **kwargs
+    )
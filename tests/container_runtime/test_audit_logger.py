@@ -0,0 +1,524 @@
+"""
+Tests for Audit Logger and its segment index.
+"""
+
+import json
+import time
+
+import pytest
+from datetime import datetime, timedelta
+
+from container_runtime.audit_archive import (
+    SegmentReader,
+    is_compressed,
+    load_frame_index,
+)
+from container_runtime.audit_index import ROLLUP_BUCKET_SECONDS
+from container_runtime.audit_logger import AuditEventType, AuditLogger, AuditSeverity
+from container_runtime.audit_verifier import (
+    list_segments,
+    main as verifier_main,
+    segment_end_hash,
+    verify_segment,
+    verify_segments,
+)
+
+
+@pytest.fixture
+def audit_logger(tmp_path):
+    """Audit logger writing to a temporary directory."""
+    audit = AuditLogger(log_directory=tmp_path / "audit")
+    yield audit
+    audit.close()
+
+
+def log_started(audit, container_id):
+    return audit.log_container_started(container_id)
+
+
+class TestAuditIndex:
+    """Test indexed search and statistics."""
+
+    def test_search_by_container(self, audit_logger):
+        """Container queries return only that container's events."""
+        for i in range(5):
+            log_started(audit_logger, f"container-{i % 2}")
+
+        events = audit_logger.search_events(container_id="container-1")
+
+        assert len(events) == 2
+        assert {e["container_id"] for e in events} == {"container-1"}
+
+    def test_search_filters_and_limit(self, audit_logger):
+        """Type, severity and limit filters are applied by the index."""
+        for i in range(4):
+            log_started(audit_logger, f"c{i}")
+        audit_logger.log_container_failed("c9", "boom")
+
+        failed = audit_logger.search_events(severity=AuditSeverity.ERROR)
+        started = audit_logger.search_events(
+            event_type=AuditEventType.CONTAINER_STARTED, limit=3
+        )
+
+        assert [e["container_id"] for e in failed] == ["c9"]
+        assert [e["container_id"] for e in started] == ["c0", "c1", "c2"]
+
+    def test_search_time_range(self, audit_logger):
+        """Time range queries use indexed timestamps."""
+        log_started(audit_logger, "old")
+        midpoint = datetime.now()
+        log_started(audit_logger, "new")
+
+        events = audit_logger.search_events(start_time=midpoint)
+
+        assert [e["container_id"] for e in events] == ["new"]
+
+    def test_search_across_rotated_segments(self, tmp_path):
+        """Events are found in every segment after rotation."""
+        audit = AuditLogger(log_directory=tmp_path / "audit", max_log_size=500)
+        for i in range(6):
+            log_started(audit, f"c{i}")
+
+        assert len(list((tmp_path / "audit").glob("audit_*.jsonl"))) > 1
+        events = audit.search_events()
+        assert [e["container_id"] for e in events] == [f"c{i}" for i in range(6)]
+        audit.close()
+
+    def test_unindexed_tail_is_caught_up(self, audit_logger):
+        """Lines appended outside the logger are indexed on the next query."""
+        log_started(audit_logger, "indexed")
+        audit_logger.flush()
+
+        external = {
+            "event_id": "external",
+            "timestamp": datetime.now().isoformat(),
+            "event_type": "container_stopped",
+            "severity": "warning",
+            "container_id": "external",
+            "message": "written by another process",
+        }
+        with open(audit_logger.current_log_file, "a") as f:
+            f.write(json.dumps(external) + "\n")
+
+        events = audit_logger.search_events(container_id="external")
+
+        assert [e["event_id"] for e in events] == ["external"]
+
+    def test_rebuild_index(self, audit_logger):
+        """Index can be rebuilt from segments alone."""
+        for i in range(3):
+            log_started(audit_logger, f"c{i}")
+
+        assert audit_logger.rebuild_index() == 3
+        assert len(audit_logger.search_events()) == 3
+
+    def test_statistics_from_rollups(self, audit_logger):
+        """Statistics count all events, not just the first search page."""
+        for i in range(3):
+            log_started(audit_logger, f"c{i}")
+        audit_logger.log_container_failed("c0", "boom")
+
+        stats = audit_logger.get_statistics()
+
+        assert stats["total_events"] == 4
+        assert stats["events_by_type"] == {
+            "container_started": 3,
+            "container_failed": 1,
+        }
+        assert stats["events_by_severity"] == {"info": 3, "error": 1}
+        assert stats["unique_containers"] == 3
+
+    def test_statistics_time_range_edges(self, audit_logger):
+        """Partial rollup buckets at range edges are counted exactly."""
+        log_started(audit_logger, "c0")
+        now = datetime.now()
+
+        in_range = audit_logger.get_statistics(
+            start_time=now - timedelta(seconds=ROLLUP_BUCKET_SECONDS * 3),
+            end_time=now + timedelta(seconds=ROLLUP_BUCKET_SECONDS * 3),
+        )
+        narrow = audit_logger.get_statistics(
+            start_time=now + timedelta(seconds=1),
+            end_time=now + timedelta(seconds=2),
+        )
+
+        assert in_range["total_events"] == 1
+        assert narrow["total_events"] == 0
+
+    def test_cleanup_removes_segments_from_index(self, tmp_path):
+        """Deleted segments disappear from search results and statistics."""
+        previous = AuditLogger(log_directory=tmp_path / "audit")
+        log_started(previous, "c0")
+        previous.close()
+
+        audit = AuditLogger(log_directory=tmp_path / "audit", retention_days=-1)
+
+        # The active segment is never removed
+        assert audit.cleanup_old_logs() == 1
+        assert audit.current_log_file is not None
+        assert audit.current_log_file.exists()
+        assert audit.search_events() == []
+        assert audit.get_statistics()["total_events"] == 0
+        audit.close()
+
+
+class TestAuditWriter:
+    """Test the group-commit writer."""
+
+    def test_events_written_in_batches(self, tmp_path):
+        """Events logged together share a group commit."""
+        audit = AuditLogger(log_directory=tmp_path / "audit", flush_interval=0.5)
+        for i in range(50):
+            log_started(audit, f"c{i}")
+        audit.flush()
+
+        status = audit.get_writer_status()
+        assert status["records_written"] == 51  # Including the segment header
+        assert status["batches_committed"] < 51
+        assert status["pending_records"] == 0
+        audit.close()
+
+    def test_hash_chain_intact(self, audit_logger):
+        """Single-pass serialisation produces verifiable checksums."""
+        for i in range(10):
+            audit_logger.log_event(
+                AuditEventType.CONFIGURATION_CHANGED,
+                AuditSeverity.INFO,
+                f"change {i}",
+                user_id="user",
+                details={"index": i, "nested": {"b": 1, "a": [1, 2]}},
+                resource_usage={"started": datetime.now()},
+            )
+
+        result = audit_logger.verify_log_integrity()
+
+        assert result["status"] == "verified"
+        assert result["events_verified"] == 10
+
+        event = audit_logger.search_events()[0]
+        assert event["user_id"] == "user"
+        assert event["details"]["nested"] == {"b": 1, "a": [1, 2]}
+
+    def test_chain_spans_rotated_segments_in_order(self, tmp_path):
+        """Records land in their segments in submission order."""
+        audit = AuditLogger(log_directory=tmp_path / "audit", max_log_size=800)
+        for i in range(10):
+            log_started(audit, f"c{i}")
+        audit.flush()
+
+        previous_hash = ""
+        for segment in sorted((tmp_path / "audit").glob("audit_*.jsonl")):
+            for line in segment.read_text().splitlines():
+                event = json.loads(line)
+                if "log_initialized" in event:
+                    continue
+                assert event["previous_hash"] == previous_hash
+                previous_hash = event["checksum"]
+        audit.close()
+
+    def test_invalid_fsync_policy(self, tmp_path):
+        """Unknown fsync policies are rejected."""
+        with pytest.raises(Exception, match="fsync policy"):
+            AuditLogger(log_directory=tmp_path / "audit", fsync_policy="sometimes")
+
+    def test_idle_tail_synced_within_interval(self, tmp_path):
+        """Records written after the last interval fsync are synced while idle."""
+        from container_runtime.audit_writer import AuditWriter
+
+        segment = tmp_path / "audit_test.jsonl"
+        writer = AuditWriter(flush_interval=0.01, fsync_interval=0.2)
+        writer.submit(segment, b"first\n")
+        writer.flush(timeout=5)
+        assert writer.fsyncs == 0  # Written before the first interval elapsed
+
+        deadline = time.monotonic() + 5
+        while writer.fsyncs == 0 and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        assert writer.fsyncs == 1
+        time.sleep(0.5)
+        assert writer.fsyncs == 1  # Nothing new to sync
+        writer.close()
+
+    def test_failed_write_is_retried(self, tmp_path):
+        """Records survive a failed write and are retried in order."""
+        from container_runtime.audit_writer import AuditWriter
+
+        segment = tmp_path / "missing" / "audit_test.jsonl"
+        writer = AuditWriter(flush_interval=0.01)
+        writer.submit(segment, b"first\n")
+        writer.submit(segment, b"second\n")
+
+        with pytest.raises(Exception, match="Audit logging failed"):
+            writer.flush(timeout=5)
+
+        segment.parent.mkdir()
+        deadline = time.monotonic() + 5
+        while writer.pending and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        writer.close()
+        assert segment.read_bytes() == b"first\nsecond\n"
+
+
+@pytest.fixture
+def rotated_logs(tmp_path):
+    """Audit directory with several rotated segments."""
+    audit = AuditLogger(log_directory=tmp_path / "audit", max_log_size=800)
+    for i in range(12):
+        log_started(audit, f"c{i}")
+    audit.close()
+    return tmp_path / "audit"
+
+
+class TestIntegrityVerification:
+    """Test segment checkpoints and chain verification."""
+
+    def test_rotated_segments_verify_on_their_own(self, rotated_logs):
+        """Each segment verifies from its header checkpoint."""
+        audit = AuditLogger(log_directory=rotated_logs)
+        segments = list_segments(rotated_logs)
+
+        assert len(segments) > 2
+        for segment in segments:
+            assert audit.verify_log_integrity(segment)["status"] == "verified"
+        audit.close()
+
+    def test_chain_continues_across_restarts(self, rotated_logs):
+        """A new logger links its first segment to the previous one."""
+        last_hash = segment_end_hash(list_segments(rotated_logs)[-1])
+
+        audit = AuditLogger(log_directory=rotated_logs)
+        log_started(audit, "after-restart")
+        audit.flush()
+
+        assert audit.current_log_file is not None
+        header = json.loads(audit.current_log_file.read_text().splitlines()[0])
+        assert header["previous_hash"] == last_hash
+        assert audit.verify_all_segments(workers=1)["status"] == "verified"
+        audit.close()
+
+    def test_parallel_verification(self, rotated_logs):
+        """All segments verify in a process pool."""
+        summary = verify_segments(rotated_logs, workers=2)
+
+        assert summary["status"] == "verified"
+        assert summary["events_verified"] == 12
+        assert summary["segments_verified"] == len(list_segments(rotated_logs))
+        assert summary["broken_links"] == []
+
+    def test_tampered_record_reports_offset(self, rotated_logs):
+        """The first broken record is reported with its byte offset."""
+        segment = list_segments(rotated_logs)[1]
+        lines = segment.read_bytes().splitlines(keepends=True)
+        lines[1] = lines[1].replace(b"Container started", b"Container STARTED")
+        segment.write_bytes(b"".join(lines))
+
+        summary = verify_segments(rotated_logs, workers=1)
+
+        assert summary["status"] == "failed"
+        assert summary["events_failed"] == 1
+        assert summary["first_failure"]["segment"] == segment.name
+        assert summary["first_failure"]["offset"] == len(lines[0])
+        assert summary["first_failure"]["reason"] == "checksum mismatch"
+
+    def test_removed_segment_breaks_chain(self, rotated_logs):
+        """Deleting a segment is detected through the checkpoints."""
+        removed = list_segments(rotated_logs)[1]
+        removed.unlink()
+
+        summary = verify_segments(rotated_logs, workers=1)
+
+        assert summary["status"] == "failed"
+        assert summary["events_failed"] == 0
+        assert summary["broken_links"][0]["segment"] > removed.name
+
+    def test_torn_tail_is_not_a_failure(self, rotated_logs):
+        """A partial final write from a crash is reported as truncated."""
+        segment = list_segments(rotated_logs)[-1]
+        with open(segment, "ab") as f:
+            f.write(b'{"event_id": "torn"')
+
+        result = verify_segment(str(segment))
+
+        assert result["status"] == "verified"
+        assert result["truncated"] is True
+
+    def test_verify_since_last(self, rotated_logs):
+        """Only segments after the last sealed, verified segment are checked."""
+        first = verify_segments(rotated_logs, workers=1)
+        audit = AuditLogger(log_directory=rotated_logs, max_log_size=800)
+        for i in range(6):
+            log_started(audit, f"new{i}")
+        audit.flush()
+
+        summary = audit.verify_all_segments(since="last", workers=1)
+
+        assert summary["status"] == "verified"
+        assert summary["since"] == first["segments"][-2]["segment"]
+        assert summary["segments_verified"] < len(list_segments(rotated_logs))
+        assert summary["events_verified"] >= 6
+        audit.close()
+
+    def test_cli(self, rotated_logs, capsys):
+        """The command line verifier exits non-zero on failure."""
+        assert verifier_main([str(rotated_logs), "--workers", "1"]) == 0
+        assert "verified" in capsys.readouterr().out
+
+        list_segments(rotated_logs)[1].unlink()
+        assert verifier_main([str(rotated_logs), "--workers", "1"]) == 1
+
+
+class TestCompressedStorage:
+    """Test compressed cold storage of rotated segments."""
+
+    @pytest.fixture
+    def compressed_logs(self, tmp_path):
+        audit = AuditLogger(
+            log_directory=tmp_path / "audit", max_log_size=4000, frame_size=600
+        )
+        for i in range(40):
+            log_started(audit, f"c{i}")
+        result = audit.compress_rotated_logs()
+        yield audit, result
+        audit.close()
+
+    def test_rotated_segments_compressed(self, compressed_logs):
+        """Sealed segments move to gzip storage, the active one stays plain."""
+        audit, result = compressed_logs
+        segments = list_segments(audit.log_directory)
+
+        assert result["segments_compressed"] == len(segments) - 1
+        assert all(is_compressed(path) for path in segments[:-1])
+        assert segments[-1] == audit.current_log_file
+        assert result["bytes_saved"] > 0
+
+        stats = audit.get_storage_stats()
+        assert stats["compressed_segments"] == len(segments) - 1
+        assert stats["savings_percent"] > 0
+
+    def test_search_reads_only_relevant_frames(self, compressed_logs, monkeypatch):
+        """Searches decompress only the frames holding matching records."""
+        audit, _ = compressed_logs
+        readers = []
+        original_init = SegmentReader.__init__
+
+        def tracking_init(reader, path):
+            original_init(reader, path)
+            readers.append(reader)
+
+        monkeypatch.setattr(SegmentReader, "__init__", tracking_init)
+
+        events = audit.search_events(container_id="c3")
+
+        assert [e["container_id"] for e in events] == ["c3"]
+        assert [r.frames_read for r in readers] == [1]
+        index = load_frame_index(readers[0].path)
+        assert index is not None
+        assert len(index.frames) > 1
+
+    def test_search_spans_tiers(self, compressed_logs):
+        """Results are identical across plain and compressed segments."""
+        audit, _ = compressed_logs
+
+        events = audit.search_events()
+
+        assert [e["container_id"] for e in events] == [f"c{i}" for i in range(40)]
+
+    def test_compressed_segments_verify_and_reindex(self, compressed_logs):
+        """Verification and index rebuilds read compressed segments."""
+        audit, _ = compressed_logs
+
+        assert audit.verify_all_segments(workers=1)["status"] == "verified"
+        assert audit.rebuild_index() == 40
+
+    def test_interrupted_compression_keeps_plain_segment(self, tmp_path):
+        """A leftover compressed copy never shadows the plain segment."""
+        audit = AuditLogger(log_directory=tmp_path / "audit", max_log_size=800)
+        for i in range(6):
+            log_started(audit, f"c{i}")
+        audit.flush()
+        sealed = list_segments(audit.log_directory)[0]
+        (sealed.parent / f"{sealed.name}.gz").write_bytes(b"partial")
+
+        assert list_segments(audit.log_directory)[0] == sealed
+        assert len(audit.search_events()) == 6
+        audit.close()
+
+    def test_shared_directory_keeps_other_active_segment(self, tmp_path):
+        """Cleanup by one logger never compresses another's active segment."""
+        first = AuditLogger(log_directory=tmp_path / "audit", max_log_size=800)
+        second = AuditLogger(log_directory=tmp_path / "audit")
+        for i in range(3):
+            log_started(second, f"b{i}")
+        for i in range(6):
+            log_started(first, f"a{i}")
+        second.flush()
+
+        first.cleanup_old_logs()
+        for i in range(3, 6):
+            log_started(second, f"b{i}")
+
+        assert second.current_log_file is not None
+        assert second.current_log_file.exists()
+        assert any(is_compressed(path) for path in list_segments(tmp_path / "audit"))
+        events = second.search_events()
+        assert [e["container_id"] for e in events if e["container_id"][0] == "b"] == [
+            f"b{i}" for i in range(6)
+        ]
+        first.close()
+        second.close()
+
+        # Each logger keeps its own chain, so only the records are checked
+        result = second.verify_all_segments(workers=1)
+        assert result["events_verified"] == 12
+        assert result["events_failed"] == 0
+
+    def test_quiet_segments_are_sealed(self, tmp_path):
+        """A segment left by a closed logger is compressed once quiet."""
+        previous = AuditLogger(log_directory=tmp_path / "audit")
+        log_started(previous, "c0")
+        previous.close()
+
+        audit = AuditLogger(log_directory=tmp_path / "audit")
+        assert audit.compress_rotated_logs()["segments_compressed"] == 0
+        audit.seal_after = -1
+        assert audit.compress_rotated_logs()["segments_compressed"] == 1
+        assert [e["container_id"] for e in audit.search_events()] == ["c0"]
+        audit.close()
+
+    def test_new_segment_never_hides_compressed_one(self, tmp_path, monkeypatch):
+        """A logger started in the same second skips compressed segment names."""
+
+        class FrozenDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return cls(2025, 1, 1, 12, 0, 0)
+
+        monkeypatch.setattr("container_runtime.audit_logger.datetime", FrozenDatetime)
+        previous = AuditLogger(log_directory=tmp_path / "audit")
+        log_started(previous, "c0")
+        previous.close()
+        compressor = AuditLogger(log_directory=tmp_path / "audit", seal_after=-1)
+        assert compressor.compress_rotated_logs()["segments_compressed"] == 1
+        compressor.close()
+
+        audit = AuditLogger(log_directory=tmp_path / "audit")
+        log_started(audit, "c1")
+        audit.flush()
+
+        names = [path.name for path in list_segments(tmp_path / "audit")]
+        assert len(names) == len(set(names)) == 3
+        assert len(audit.search_events(container_id="c0")) == 1
+        audit.close()
+        assert audit.verify_all_segments(workers=1)["events_failed"] == 0
+
+    def test_retention_removes_compressed_segments(self, compressed_logs):
+        """Expired compressed segments and their frame index are deleted."""
+        audit, result = compressed_logs
+        audit.retention_days = -1
+
+        assert audit.cleanup_old_logs() == result["segments_compressed"]
+        assert list(audit.log_directory.glob("*.frames")) == []
+        assert list_segments(audit.log_directory) == [audit.current_log_file]
+        assert audit.get_statistics()["total_events"] < 40
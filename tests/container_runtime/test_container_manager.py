@@ -2,6 +2,9 @@
 Tests for Container Manager.
 """
 
+import hashlib
+import time
+
 import pytest
 import docker
 from unittest.mock import Mock, patch
@@ -11,7 +14,11 @@ from container_runtime.container_manager import (
     ContainerConfig,
     ContainerResult,
     ContainerStatus,
+    usage_from_cgroup,
+    usage_from_docker_stats,
 )
+from container_runtime.cgroup_reader import CgroupStats
+from container_runtime.execution_history import ExecutionHistory, OutputStore
 
 
 @pytest.fixture
@@ -187,6 +194,28 @@ def test_execute_container_timeout(container_manager, sample_config):
     mock_stop.assert_called_once()
 
 
+def test_execute_container_on_started_callback(container_manager, sample_config):
+    """Test the start callback runs while the container is active."""
+    mock_container = Mock()
+    mock_container.wait.return_value = 0
+    mock_container.logs.return_value = b"ok\n"
+    container_manager.client.containers.create.return_value = mock_container
+
+    seen = []
+
+    def on_started(container_id, container):
+        seen.append((container_id, container))
+        assert container_id in container_manager.active_containers
+        mock_container.wait.assert_not_called()
+
+    with patch.object(container_manager, "_get_resource_usage", return_value={}):
+        result = container_manager.execute_container(
+            sample_config, on_started=on_started
+        )
+
+    assert seen == [(result.container_id, mock_container)]
+
+
 def test_stop_container_graceful(container_manager, sample_config):
     """Test graceful container stop."""
     # Create container
@@ -346,3 +375,153 @@ def test_get_execution_history(container_manager, sample_config):
     # Test with limit
     limited_history = container_manager.get_execution_history(limit=1)
     assert len(limited_history) == 1
+
+
+def make_result(container_id, exit_code=0, stdout="", stderr=""):
+    """Build a finished container result."""
+    return ContainerResult(
+        container_id=container_id,
+        exit_code=exit_code,
+        stdout=stdout,
+        stderr=stderr,
+        execution_time=0.1,
+        resource_usage={},
+        status=ContainerStatus.STOPPED if exit_code == 0 else ContainerStatus.FAILED,
+    )
+
+
+class TestExecutionHistory:
+    """Test the bounded execution history."""
+
+    def test_history_is_bounded(self):
+        """Only the newest records are kept."""
+        history = ExecutionHistory(max_records=3)
+        for i in range(5):
+            history.add(make_result(f"c{i}"))
+
+        assert len(history) == 3
+        assert [r.container_id for r in history.query()] == ["c2", "c3", "c4"]
+        assert history.get_stats()["records_added"] == 5
+
+    def test_query_filters_and_pages(self):
+        """Filters apply before paging backwards from the newest match."""
+        history = ExecutionHistory()
+        for i in range(6):
+            history.add(make_result(f"c{i}", exit_code=i % 2), image=f"img{i % 3}")
+
+        failed = history.query(status=ContainerStatus.FAILED)
+        assert [r.container_id for r in failed] == ["c1", "c3", "c5"]
+        assert [r.container_id for r in history.query(limit=2)] == ["c4", "c5"]
+        assert len(history.query(limit=0)) == 6  # No limit, as before
+        assert [r.container_id for r in history.query(limit=2, offset=2)] == [
+            "c2",
+            "c3",
+        ]
+        assert [r.container_id for r in history.query(exit_code=0, image="img0")] == [
+            "c0"
+        ]
+        assert history.query(container_id="c3")[0].exit_code == 1
+        assert history.query(since=time.time() + 60) == []
+
+    def test_large_output_truncated_with_hash(self):
+        """Without a store, large output keeps its tail and content hash."""
+        history = ExecutionHistory(inline_limit=10)
+        output = "x" * 100 + "error: boom"
+        record = history.add(make_result("c0", stdout=output, stderr="short"))
+
+        assert record.stdout.truncated
+        assert record.stdout.preview == output[-10:]
+        assert record.stdout.size == len(output)
+        assert record.stdout.sha256 == hashlib.sha256(output.encode()).hexdigest()
+        assert history.read_output(record.stdout) is None
+        assert history.read_output(record.stderr) == "short"
+
+    def test_large_output_spilled_to_store(self, tmp_path):
+        """Spilled output reads back in full until its segment expires."""
+        store = OutputStore(tmp_path, segment_size=150, max_segments=2)
+        history = ExecutionHistory(output_store=store, inline_limit=10)
+
+        records = [
+            history.add(make_result(f"c{i}", stdout=f"{i}" * 100)) for i in range(4)
+        ]
+
+        assert history.read_output(records[3].stdout) == "3" * 100
+        assert history.read_output(records[2].stdout) == "2" * 100
+        assert history.read_output(records[0].stdout) is None  # Rotated away
+        assert store.get_stats()["segments"] == 2
+        history.close()
+
+        # A new store never appends to segments of an earlier one
+        reopened = OutputStore(tmp_path, segment_size=150, max_segments=2)
+        assert records[3].stdout.segment is not None
+        assert reopened.append(b"new")[0] > records[3].stdout.segment
+        reopened.close()
+
+    def test_manager_history_query(self, mock_docker_client, sample_config, tmp_path):
+        """The manager records executions and serves their output."""
+        manager = ContainerManager(
+            docker_client=mock_docker_client,
+            output_store_dir=tmp_path,
+            inline_output_limit=8,
+        )
+        mock_container = Mock()
+        mock_container.wait.return_value = 1
+        mock_container.logs.return_value = b"Traceback: failure in step 3\n"
+        mock_docker_client.containers.create.return_value = mock_container
+
+        with patch.object(manager, "_get_resource_usage", return_value={}):
+            manager.execute_container(sample_config)
+
+        (record,) = manager.get_execution_history(exit_code=1, image="python:3.11-slim")
+        assert record.status == "failed"
+        assert record.stdout.truncated
+        output = manager.get_execution_output(record)
+        assert output["complete"]
+        assert output["stdout"] == "Traceback: failure in step 3\n"
+
+
+def test_final_usage_has_one_shape():
+    """Test cgroup and Docker usage report the same keys."""
+    cgroup = CgroupStats(
+        timestamp=12.0,
+        cpu_usage_usec=1_000_000,
+        memory_current=1024,
+        memory_max=None,
+        oom_events=0,
+        oom_kill_events=0,
+        io_read_bytes=10,
+        io_write_bytes=20,
+        pids_current=2,
+        open_files=3,
+        network_rx_bytes=100,
+        network_tx_bytes=200,
+    )
+    docker_stats = {
+        "cpu_stats": {"cpu_usage": {"total_usage": 300}, "system_cpu_usage": 1000},
+        "precpu_stats": {"cpu_usage": {"total_usage": 100}, "system_cpu_usage": 0},
+        "memory_stats": {"usage": 1024, "limit": 4096},
+        "networks": {"eth0": {"rx_bytes": 100, "tx_bytes": 200}},
+        "blkio_stats": {
+            "io_service_bytes_recursive": [
+                {"op": "Read", "value": 10},
+                {"op": "Write", "value": 20},
+            ]
+        },
+    }
+
+    with (
+        patch("os.cpu_count", return_value=2),
+        patch("psutil.virtual_memory", return_value=Mock(total=8192)),
+    ):
+        from_cgroup = usage_from_cgroup(cgroup, started=10.0)
+    from_docker = usage_from_docker_stats(docker_stats)
+
+    assert from_cgroup.keys() == from_docker.keys()
+    # One CPU second over two seconds on a two-CPU host
+    assert from_cgroup["cpu_percent"] == 25.0
+    # Unlimited memory is measured against the host, like Docker does
+    assert from_cgroup["memory_limit_bytes"] == 8192
+    assert from_cgroup["memory_percent"] == 12.5
+    assert from_docker["cpu_percent"] == 20.0
+    assert (from_docker["io_read_bytes"], from_docker["io_write_bytes"]) == (10, 20)
+    assert from_docker["network_rx_bytes"] == from_cgroup["network_rx_bytes"]
@@ -0,0 +1,366 @@
+"""
+Tests for Image Manager.
+"""
+
+import pytest
+import docker
+from docker.errors import ImageNotFound
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+from container_runtime.image_manager import ImageManager
+
+
+@pytest.fixture
+def mock_docker_client():
+    """Mock Docker client with an in-memory image store."""
+    client = Mock(spec=docker.DockerClient)
+    client.images = Mock()
+    client.containers = Mock()
+    client.containers.list.return_value = []
+
+    store = {}
+
+    def make_image(tag, size):
+        image = Mock()
+        image.id = f"sha256:{abs(hash(tag)):x}"
+        image.tags = [tag]
+        image.attrs = {"Size": size, "Created": datetime.now().isoformat()}
+        image.history.return_value = []
+        return image
+
+    def build(path, tag, **kwargs):
+        size = 300 if "-deps:" in tag else 100
+        store[tag] = make_image(tag, size)
+        return store[tag], [{"stream": "built"}]
+
+    def get(name):
+        if name not in store:
+            raise ImageNotFound("not found")
+        return store[name]
+
+    def remove(image_id, force=False):
+        for tag, image in list(store.items()):
+            if image.id == image_id:
+                del store[tag]
+
+    client.images.build.side_effect = build
+    client.images.get.side_effect = get
+    client.images.remove.side_effect = remove
+    client.store = store
+    return client
+
+
+@pytest.fixture
+def image_manager(mock_docker_client, tmp_path):
+    """Image manager fixture."""
+    with patch.object(ImageManager, "_check_security_scanner", return_value=False):
+        yield ImageManager(
+            docker_client=mock_docker_client,
+            image_cache_dir=tmp_path / "images",
+            max_dependency_cache_bytes=500,
+        )
+
+
+def test_dependency_image_reused_for_same_package_set(image_manager):
+    """Test equivalent package sets map to one cached image."""
+    first = image_manager.get_or_create_dependency_image(
+        "python", ["requests", "numpy==1.26.0"]
+    )
+    second = image_manager.get_or_create_dependency_image(
+        "python", [" numpy==1.26.0", "requests", "Requests"]
+    )
+
+    assert first == second
+    assert first.startswith("gadugi/python-deps:")
+    stats = image_manager.get_dependency_cache_stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+    assert stats["total_bytes"] == 200  # Only the layers above the runtime image
+
+
+def test_dependency_image_without_packages_uses_runtime_image(image_manager):
+    """Test an empty package set falls back to the runtime image."""
+    image = image_manager.get_or_create_dependency_image("python", ["  "])
+
+    assert image.startswith("gadugi/python:")
+    assert image_manager.dependency_cache == {}
+
+
+def test_dependency_cache_persisted(image_manager, mock_docker_client, tmp_path):
+    """Test the dependency cache index survives a restart."""
+    image = image_manager.get_or_create_dependency_image("node", ["lodash"])
+
+    with patch.object(ImageManager, "_check_security_scanner", return_value=False):
+        reloaded = ImageManager(
+            docker_client=mock_docker_client, image_cache_dir=tmp_path / "images"
+        )
+
+    assert reloaded.get_or_create_dependency_image("node", ["lodash"]) == image
+    assert reloaded.dependency_cache_hits == 1
+    assert mock_docker_client.images.build.call_count == 2  # runtime + deps
+
+
+def test_dependency_cache_hits_persisted_on_shutdown(
+    image_manager, mock_docker_client, tmp_path
+):
+    """Test cache hits skip the index write until shutdown saves them."""
+    image_manager.get_or_create_dependency_image("node", ["lodash"])
+
+    with patch.object(image_manager, "_save_dependency_cache") as save:
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(
+                pool.map(
+                    lambda _: image_manager.get_or_create_dependency_image(
+                        "node", ["lodash"]
+                    ),
+                    range(20),
+                )
+            )
+    save.assert_not_called()
+    assert image_manager.dependency_cache_hits == 20
+
+    image_manager.shutdown()
+
+    assert not list((tmp_path / "images").glob("*.tmp"))
+    with patch.object(ImageManager, "_check_security_scanner", return_value=False):
+        reloaded = ImageManager(
+            docker_client=mock_docker_client, image_cache_dir=tmp_path / "images"
+        )
+    (entry,) = reloaded.dependency_cache.values()
+    assert entry.use_count == 21
+
+
+def test_dependency_cache_lru_eviction(image_manager, mock_docker_client):
+    """Test least recently used images are evicted over the disk budget."""
+    first = image_manager.get_or_create_dependency_image("python", ["a"])
+    second = image_manager.get_or_create_dependency_image("python", ["b"])
+
+    # Touch the first image so the second becomes least recently used
+    entry = next(
+        e for e in image_manager.dependency_cache.values() if e.image_name == second
+    )
+    entry.last_used -= timedelta(hours=1)
+    image_manager.get_or_create_dependency_image("python", ["a"])
+
+    third = image_manager.get_or_create_dependency_image("python", ["c"])
+
+    cached = {e.image_name for e in image_manager.dependency_cache.values()}
+    assert cached == {first, third}
+    assert second not in mock_docker_client.store
+
+
+def test_dependency_dockerfile_offline_cache(image_manager):
+    """Test offline caches switch installers to offline mode."""
+    python_file = image_manager._generate_dependency_dockerfile(
+        "python", "gadugi/python:abc", ["requests", "x; rm -rf /"], offline=True
+    )
+    node_file = image_manager._generate_dependency_dockerfile(
+        "node", "gadugi/node:abc", ["lodash"], offline=False
+    )
+
+    assert "--no-index --find-links=/opt/gadugi/offline-cache" in python_file
+    assert "'x; rm -rf /'" in python_file
+    assert python_file.rstrip().endswith("USER gadugi:gadugi")
+    assert "--offline" not in node_file
+    assert "ENV NODE_PATH=/opt/gadugi/node_modules" in node_file
+
+
+def test_dependency_image_unsupported_runtime(image_manager):
+    """Test package installs are rejected for runtimes without installers."""
+    with pytest.raises(Exception, match="not supported"):
+        image_manager.get_or_create_dependency_image("shell", ["curl"])
+
+
+def test_concurrent_builds_share_one_build(image_manager, mock_docker_client):
+    """Test concurrent first requests for a runtime build the image once."""
+    build_started = threading.Event()
+    release_build = threading.Event()
+    original_build = mock_docker_client.images.build.side_effect
+
+    def slow_build(path, tag, **kwargs):
+        build_started.set()
+        release_build.wait(timeout=5)
+        return original_build(path, tag, **kwargs)
+
+    mock_docker_client.images.build.side_effect = slow_build
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [
+            executor.submit(image_manager.get_or_create_runtime_image, "python")
+            for _ in range(4)
+        ]
+        assert build_started.wait(timeout=5)
+        time.sleep(0.05)  # Let the other callers join the in-flight build
+        release_build.set()
+        results = {future.result(timeout=5) for future in futures}
+
+    assert len(results) == 1
+    assert mock_docker_client.images.build.call_count == 1
+
+
+def test_single_flight_propagates_failure(image_manager):
+    """Test a failing build is reported and not cached."""
+    with pytest.raises(RuntimeError):
+        image_manager._single_flight("gadugi/x:1", Mock(side_effect=RuntimeError))
+
+    assert image_manager._inflight_builds == {}
+    assert image_manager._single_flight("gadugi/x:1", lambda: "ok") == "ok"
+
+
+def test_image_exists_positive_cache(image_manager, mock_docker_client):
+    """Test known tags are not re-queried from the daemon."""
+    image = image_manager.get_or_create_runtime_image("shell")
+    mock_docker_client.images.get.reset_mock()
+
+    for _ in range(3):
+        assert image_manager.get_or_create_runtime_image("shell") == image
+
+    mock_docker_client.images.get.assert_not_called()
+
+    image_manager.forget_image(image)
+    assert image_manager._image_exists(image) is True
+    mock_docker_client.images.get.assert_called_once_with(image)
+
+
+def test_prebuild_runtime_images(image_manager, mock_docker_client):
+    """Test default runtimes are built in the background."""
+    futures = image_manager.prebuild_runtime_images()
+
+    images = {runtime: future.result(timeout=5) for runtime, future in futures.items()}
+
+    assert set(images) == {"python", "node", "shell", "multi"}
+    assert all(image in mock_docker_client.store for image in images.values())
+    image_manager.shutdown()
+
+
+def scan_summary(critical=0, status="clean"):
+    """Build a scan summary as returned by the scanner."""
+    return {
+        "total_vulnerabilities": critical,
+        "critical_count": critical,
+        "high_count": 0,
+        "security_score": 100 - critical * 10,
+        "scan_date": datetime.now().isoformat(),
+        "status": status,
+    }
+
+
+@pytest.fixture
+def scanning_image_manager(image_manager):
+    """Image manager with a (mocked) scanner available."""
+    image_manager.security_scanner_available = True
+    yield image_manager
+    image_manager.shutdown()
+
+
+def test_scans_run_in_background(scanning_image_manager):
+    """Test image creation does not wait for the vulnerability scan."""
+    release_scan = threading.Event()
+
+    def slow_scan(image_name):
+        release_scan.wait(timeout=5)
+        return scan_summary()
+
+    with patch.object(
+        scanning_image_manager, "_scan_image_security", side_effect=slow_scan
+    ):
+        image = scanning_image_manager.get_or_create_runtime_image("python")
+        assert scanning_image_manager.get_scan_result(image) is None
+        assert scanning_image_manager.image_registry[image].scan_status == "pending"
+
+        release_scan.set()
+        future = scanning_image_manager.request_scan(image)
+        assert future.result(timeout=5)["status"] == "clean"
+
+    assert scanning_image_manager.image_registry[image].scan_status == "clean"
+
+
+def test_scan_results_reused_for_same_layer_set(
+    scanning_image_manager, mock_docker_client
+):
+    """Test images with identical layers are scanned once."""
+    for tag in ("gadugi/a:1", "gadugi/b:1"):
+        image = Mock(id=f"sha256:{tag}", tags=[tag])
+        image.attrs = {"RootFS": {"Layers": ["sha256:l1", "sha256:l2"]}}
+        mock_docker_client.store[tag] = image
+
+    with patch.object(
+        scanning_image_manager, "_scan_image_security", return_value=scan_summary()
+    ) as mock_scan:
+        scanning_image_manager.request_scan("gadugi/a:1").result(timeout=5)
+        scanning_image_manager.request_scan("gadugi/b:1").result(timeout=5)
+
+    mock_scan.assert_called_once_with("gadugi/a:1")
+    assert scanning_image_manager.get_scan_result("gadugi/b:1")["status"] == "clean"
+
+
+def test_quarantined_image_rejected(
+    scanning_image_manager, mock_docker_client, tmp_path
+):
+    """Test findings quarantine an image, persisted across restarts."""
+    with patch.object(
+        scanning_image_manager,
+        "_scan_image_security",
+        return_value=scan_summary(critical=2, status="quarantined"),
+    ):
+        image = scanning_image_manager.get_or_create_runtime_image("node")
+        scanning_image_manager.request_scan(image).result(timeout=5)
+
+    with pytest.raises(Exception, match="quarantined"):
+        scanning_image_manager.ensure_image_scanned(image)
+
+    with patch.object(ImageManager, "_check_security_scanner", return_value=False):
+        reloaded = ImageManager(
+            docker_client=mock_docker_client, image_cache_dir=tmp_path / "images"
+        )
+    assert reloaded.is_quarantined(image)
+    assert reloaded.image_registry[image].scan_status == "quarantined"
+
+
+def test_block_mode_waits_for_scan(scanning_image_manager, mock_docker_client):
+    """Test blocking policies wait for, and enforce, the scan result."""
+    mock_docker_client.store["gadugi/x:1"] = Mock(id="sha256:x", attrs={})
+
+    with patch.object(
+        scanning_image_manager, "_scan_image_security", return_value=None
+    ):
+        with pytest.raises(Exception, match="scan of gadugi/x:1 failed"):
+            scanning_image_manager.ensure_image_scanned("gadugi/x:1", block=True)
+
+    # The scan is retried once the remembered failure expires
+    scanning_image_manager.scan_retry_after = 0
+    with patch.object(
+        scanning_image_manager, "_scan_image_security", return_value=scan_summary()
+    ):
+        summary = scanning_image_manager.ensure_image_scanned("gadugi/x:1", block=True)
+    assert summary["status"] == "clean"
+
+
+def test_failed_scan_fails_fast_until_retry(scanning_image_manager, mock_docker_client):
+    """Test a failed scan is not rerun for every execution."""
+    mock_docker_client.store["gadugi/x:1"] = Mock(id="sha256:x", attrs={})
+
+    with patch.object(
+        scanning_image_manager, "_scan_image_security", return_value=None
+    ) as mock_scan:
+        for _ in range(3):
+            with pytest.raises(Exception, match="scan of gadugi/x:1 failed"):
+                scanning_image_manager.ensure_image_scanned("gadugi/x:1", block=True)
+        mock_scan.assert_called_once()
+
+        scanning_image_manager.scan_retry_after = 0
+        with pytest.raises(Exception, match="failed"):
+            scanning_image_manager.ensure_image_scanned("gadugi/x:1", block=True)
+        assert mock_scan.call_count == 2
+
+
+def test_block_mode_without_scanner(image_manager):
+    """Test blocking policies fail closed without a scanner."""
+    assert image_manager.ensure_image_scanned("gadugi/x:1") is None
+
+    with pytest.raises(Exception, match="no scanner"):
+        image_manager.ensure_image_scanned("gadugi/x:1", block=True)
@@ -8,6 +8,7 @@ from pathlib import Path
 from unittest.mock import patch, Mock
 
 from container_runtime import ContainerExecutionEngine
+from container_runtime.audit_logger import AuditEventType
 from container_runtime.agent_integration import AgentContainerExecutor
 
 
@@ -18,6 +19,21 @@ def temp_dir():
         yield Path(tmp_dir)
 
 
+@pytest.fixture
+def make_engine():
+    """Create execution engines, shut down after the test."""
+    engines = []
+
+    def make(**kwargs):
+        engine = ContainerExecutionEngine(**kwargs)
+        engines.append(engine)
+        return engine
+
+    yield make
+    for engine in engines:
+        engine.shutdown()
+
+
 @pytest.fixture
 def mock_execution_engine():
     """Mock execution engine for testing."""
@@ -32,7 +48,7 @@ def mock_execution_engine():
 class TestContainerExecutionEngine:
     """Test container execution engine integration."""
 
-    def test_engine_initialization(self, temp_dir):
+    def test_engine_initialization(self, temp_dir, make_engine):
         """Test execution engine initialization."""
         # Mock Docker client to avoid requiring actual Docker
         with patch("docker.from_env") as mock_docker:
@@ -40,7 +56,7 @@ class TestContainerExecutionEngine:
             mock_client.ping.return_value = True
             mock_docker.return_value = mock_client
 
-            engine = ContainerExecutionEngine(
+            engine = make_engine(
                 audit_log_dir=temp_dir / "audit", image_cache_dir=temp_dir / "images"
             )
 
@@ -50,7 +66,7 @@ class TestContainerExecutionEngine:
             assert engine.audit_logger is not None
             assert engine.image_manager is not None
 
-    def test_python_code_execution_mock(self, temp_dir):
+    def test_python_code_execution_mock(self, temp_dir, make_engine):
         """Test Python code execution with mocked components."""
         with patch("docker.from_env") as mock_docker:
             # Mock Docker client
@@ -93,7 +109,7 @@ class TestContainerExecutionEngine:
                     ) as mock_capacity:
                         mock_capacity.return_value = True
 
-                        engine = ContainerExecutionEngine(
+                        engine = make_engine(
                             audit_log_dir=temp_dir / "audit",
                             image_cache_dir=temp_dir / "images",
                         )
@@ -107,14 +123,106 @@ class TestContainerExecutionEngine:
                         assert "Hello from Python!" in response.stdout
                         assert response.execution_time == 1.5
 
-    def test_security_policy_enforcement(self, temp_dir):
+    def test_execution_monitored_for_container_lifetime(self, temp_dir, make_engine):
+        """Test resource monitoring starts with the container."""
+        with patch("docker.from_env") as mock_docker:
+            mock_client = Mock()
+            mock_client.ping.return_value = True
+            mock_docker.return_value = mock_client
+
+            mock_container = Mock()
+            mock_container.wait.return_value = 0
+            mock_container.logs.return_value = b"done\n"
+            mock_container.stats.return_value = {
+                "cpu_stats": {},
+                "precpu_stats": {},
+                "memory_stats": {"usage": 1024, "limit": 4096},
+                "pids_stats": {"current": 3},
+            }
+            mock_client.containers.create.return_value = mock_container
+
+            with (
+                patch(
+                    "container_runtime.image_manager.ImageManager.get_or_create_runtime_image",
+                    return_value="gadugi/python:test",
+                ),
+                patch(
+                    "container_runtime.resource_manager.ResourceManager.check_system_capacity",
+                    return_value=True,
+                ),
+            ):
+                engine = make_engine(
+                    audit_log_dir=temp_dir / "audit",
+                    image_cache_dir=temp_dir / "images",
+                    sample_interval=60.0,
+                )
+                response = engine.execute_python_code("print('done')")
+
+            assert response.success is True
+            assert response.resource_usage["samples"] >= 1
+            assert response.resource_usage["peak"]["memory_percent"] == 25.0
+            assert response.resource_usage["peak"]["processes"] == 3
+            assert "time_series" in response.resource_usage
+            assert engine.resource_manager.monitors == {}
+
+            started = engine.audit_logger.search_events(
+                event_type=AuditEventType.CONTAINER_STARTED
+            )
+            assert len(started) == 1
+
+    def test_execution_records_policy_version(self, temp_dir, make_engine):
+        """Test policy versions are audited per execution and per reload."""
+        with patch("docker.from_env") as mock_docker:
+            mock_client = Mock()
+            mock_client.ping.return_value = True
+            mock_docker.return_value = mock_client
+
+            mock_container = Mock()
+            mock_container.wait.return_value = 0
+            mock_container.logs.return_value = b""
+            mock_container.stats.return_value = {}
+            mock_client.containers.create.return_value = mock_container
+
+            with (
+                patch(
+                    "container_runtime.image_manager.ImageManager.get_or_create_runtime_image",
+                    return_value="gadugi/python:test",
+                ),
+                patch(
+                    "container_runtime.resource_manager.ResourceManager.check_system_capacity",
+                    return_value=True,
+                ),
+            ):
+                engine = make_engine(
+                    audit_log_dir=temp_dir / "audit",
+                    image_cache_dir=temp_dir / "images",
+                    sample_interval=60.0,
+                )
+                engine.security_policy.reload(force=True)
+                response = engine.execute_python_code("print('done')")
+
+            assert response.success is True
+            engine.audit_logger.flush()
+
+            reloaded = engine.audit_logger.search_events(
+                event_type=AuditEventType.CONFIGURATION_CHANGED
+            )
+            assert reloaded[0]["details"]["policy_version"] == 2
+
+            applied = engine.audit_logger.search_events(
+                event_type=AuditEventType.POLICY_APPLIED
+            )
+            assert applied[0]["details"]["policy_version"] == 2
+            assert applied[0]["security_context"]["policy_version"] == 2
+
+    def test_security_policy_enforcement(self, temp_dir, make_engine):
         """Test security policy enforcement."""
         with patch("docker.from_env") as mock_docker:
             mock_client = Mock()
             mock_client.ping.return_value = True
             mock_docker.return_value = mock_client
 
-            engine = ContainerExecutionEngine(
+            engine = make_engine(
                 audit_log_dir=temp_dir / "audit", image_cache_dir=temp_dir / "images"
             )
 
@@ -126,14 +234,14 @@ class TestContainerExecutionEngine:
                     policy_name="standard",
                 )
 
-    def test_audit_logging(self, temp_dir):
+    def test_audit_logging(self, temp_dir, make_engine):
         """Test audit logging functionality."""
         with patch("docker.from_env") as mock_docker:
             mock_client = Mock()
             mock_client.ping.return_value = True
             mock_docker.return_value = mock_client
 
-            engine = ContainerExecutionEngine(
+            engine = make_engine(
                 audit_log_dir=temp_dir / "audit", image_cache_dir=temp_dir / "images"
             )
 
@@ -155,14 +263,14 @@ class TestContainerExecutionEngine:
             audit_files = list((temp_dir / "audit").glob("audit_*.jsonl"))
             assert len(audit_files) > 0
 
-    def test_resource_monitoring(self, temp_dir):
+    def test_resource_monitoring(self, temp_dir, make_engine):
         """Test resource monitoring functionality."""
         with patch("docker.from_env") as mock_docker:
             mock_client = Mock()
             mock_client.ping.return_value = True
             mock_docker.return_value = mock_client
 
-            engine = ContainerExecutionEngine(
+            engine = make_engine(
                 audit_log_dir=temp_dir / "audit", image_cache_dir=temp_dir / "images"
             )
 
@@ -174,14 +282,14 @@ class TestContainerExecutionEngine:
                     capacity = engine.resource_manager.check_system_capacity()
                     assert capacity is True  # Should have capacity
 
-    def test_execution_statistics(self, temp_dir):
+    def test_execution_statistics(self, temp_dir, make_engine):
         """Test execution statistics collection."""
         with patch("docker.from_env") as mock_docker:
             mock_client = Mock()
             mock_client.ping.return_value = True
             mock_docker.return_value = mock_client
 
-            engine = ContainerExecutionEngine(
+            engine = make_engine(
                 audit_log_dir=temp_dir / "audit", image_cache_dir=temp_dir / "images"
             )
 
@@ -376,14 +484,14 @@ class TestSecurityPolicyIntegration:
 class TestCleanupAndShutdown:
     """Test cleanup and shutdown functionality."""
 
-    def test_cleanup_resources(self, temp_dir):
+    def test_cleanup_resources(self, temp_dir, make_engine):
         """Test resource cleanup."""
         with patch("docker.from_env") as mock_docker:
             mock_client = Mock()
             mock_client.ping.return_value = True
             mock_docker.return_value = mock_client
 
-            engine = ContainerExecutionEngine(
+            engine = make_engine(
                 audit_log_dir=temp_dir / "audit", image_cache_dir=temp_dir / "images"
             )
 
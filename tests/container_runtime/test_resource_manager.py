@@ -0,0 +1,329 @@
+"""
+Tests for Resource Manager and the shared stats sampler.
+"""
+
+import pytest
+from datetime import timedelta
+from unittest.mock import Mock
+
+from container_runtime.cgroup_reader import CgroupV2Reader
+from container_runtime.resource_manager import ResourceManager, ResourceMonitor
+from container_runtime.stats_sampler import (
+    MetricRingBuffer,
+    StatsSampler,
+    UsageRingBuffer,
+)
+
+
+def make_stats(cpu_total, system_total, memory=64 * 1024 * 1024, online_cpus=2):
+    """Build a one-shot Docker stats payload."""
+    return {
+        "cpu_stats": {
+            "cpu_usage": {"total_usage": cpu_total},
+            "system_cpu_usage": system_total,
+            "online_cpus": online_cpus,
+        },
+        "precpu_stats": {},
+        "memory_stats": {"usage": memory, "limit": 256 * 1024 * 1024},
+        "networks": {"eth0": {"rx_bytes": 100, "tx_bytes": 200}},
+    }
+
+
+DOCKER_ID = "a" * 64
+
+
+@pytest.fixture
+def fake_cgroup(tmp_path):
+    """Fake cgroup v2 hierarchy and procfs for one container."""
+    cgroup_root = tmp_path / "cgroup"
+    container_dir = cgroup_root / "system.slice" / f"docker-{DOCKER_ID}.scope"
+    container_dir.mkdir(parents=True)
+    (cgroup_root / "cgroup.controllers").write_text("cpu io memory pids\n")
+
+    files = {
+        "cgroup.procs": "101\n102\n",
+        "cpu.stat": "usage_usec 500000\nuser_usec 400000\nsystem_usec 100000\n",
+        "memory.current": "67108864\n",
+        "memory.max": "268435456\n",
+        "memory.events": "low 0\nhigh 0\nmax 3\noom 2\noom_kill 1\n",
+        "io.stat": "8:0 rbytes=1000 wbytes=2000 rios=1 wios=2\n"
+        "8:16 rbytes=10 wbytes=20 rios=1 wios=1\n",
+        "pids.current": "2\n",
+    }
+    for name, content in files.items():
+        (container_dir / name).write_text(content)
+
+    proc_root = tmp_path / "proc"
+    for pid, fds in (("101", 3), ("102", 2)):
+        fd_dir = proc_root / pid / "fd"
+        fd_dir.mkdir(parents=True)
+        for fd in range(fds):
+            (fd_dir / str(fd)).write_text("")
+    (proc_root / "101" / "net").mkdir()
+    (proc_root / "101" / "net" / "dev").write_text(
+        "Inter-|   Receive                            |  Transmit\n"
+        " face |bytes    packets errs drop fifo frame compressed multicast|bytes\n"
+        "    lo:     999       1    0    0    0     0          0         0      999\n"
+        "  eth0:    1500      10    0    0    0     0          0         0     2500\n"
+    )
+
+    return CgroupV2Reader(cgroup_root=cgroup_root, proc_root=proc_root), container_dir
+
+
+@pytest.fixture
+def resource_manager(monkeypatch):
+    """Resource manager fixture without the system monitoring thread."""
+    monkeypatch.setattr(ResourceManager, "_start_system_monitoring", Mock())
+    manager = ResourceManager(sample_interval=60.0)
+    yield manager
+    manager.cleanup()
+
+
+def test_metric_ring_buffer_wraps():
+    """Test ring buffer keeps only the newest samples."""
+    buffer = MetricRingBuffer(3, "q")
+    for value in range(5):
+        buffer.append(value)
+
+    assert len(buffer) == 3
+    assert buffer.to_list() == [2, 3, 4]
+    assert buffer.latest() == 4
+    assert buffer.max() == 4
+    assert buffer.mean() == 3
+
+
+def test_metric_ring_buffer_rejects_zero_capacity():
+    """Test ring buffer capacity validation."""
+    with pytest.raises(ValueError):
+        MetricRingBuffer(0)
+
+
+def test_usage_ring_buffer_rows_since():
+    """Test usage history filtering by timestamp."""
+    history = UsageRingBuffer(capacity=2)
+    history.append({"timestamp": 1.0, "cpu_percent": 10.0})
+    history.append({"timestamp": 2.0, "cpu_percent": 20.0})
+    history.append({"timestamp": 3.0, "cpu_percent": 30.0})
+
+    assert [row["cpu_percent"] for row in history.rows()] == [20.0, 30.0]
+    assert [row["timestamp"] for row in history.rows(since=2.5)] == [3.0]
+    latest = history.latest()
+    assert latest is not None
+    assert latest["cpu_percent"] == 30.0
+
+
+def test_monitor_computes_cpu_from_previous_one_shot_sample():
+    """Test CPU percentage derived from consecutive one-shot samples."""
+    container = Mock()
+    container.stats.side_effect = [
+        make_stats(cpu_total=1_000, system_total=10_000),
+        make_stats(cpu_total=2_000, system_total=20_000),
+    ]
+    monitor = ResourceMonitor("container-1", container)
+
+    assert monitor.sample() is True
+    assert monitor.sample() is True
+
+    history = monitor.get_usage_history()
+    assert len(history) == 2
+    assert history[0].cpu_percent == 0.0
+    assert history[1].cpu_percent == pytest.approx(20.0)
+    assert history[1].memory_percent == pytest.approx(25.0)
+    container.stats.assert_called_with(stream=False, one_shot=True)
+
+
+def test_monitor_falls_back_without_one_shot():
+    """Test fallback to regular stats when one-shot is unsupported."""
+    container = Mock()
+    container.stats.side_effect = [TypeError("one_shot"), make_stats(1, 1)]
+    monitor = ResourceMonitor("container-1", container)
+
+    assert monitor.sample() is True
+    container.stats.assert_called_with(stream=False)
+    assert monitor._one_shot_supported is False
+
+
+def test_monitor_threshold_alerts():
+    """Test alerts raised from sampled usage."""
+    container = Mock()
+    container.stats.return_value = make_stats(1, 1, memory=250 * 1024 * 1024)
+    callback = Mock()
+    monitor = ResourceMonitor("container-1", container, alert_callback=callback)
+
+    monitor.sample()
+
+    assert monitor.get_alerts("critical")[0].resource_type == "memory"
+    callback.assert_called_once()
+
+
+def test_monitor_history_duration_filter():
+    """Test history filtering by duration."""
+    container = Mock()
+    container.stats.return_value = make_stats(1, 1)
+    monitor = ResourceMonitor("container-1", container)
+    monitor.sample()
+
+    assert len(monitor.get_usage_history(timedelta(minutes=1))) == 1
+    assert monitor.get_latest_usage() is not None
+
+
+def test_sampler_multiplexes_monitors():
+    """Test a single sampling round covers every registered monitor."""
+    sampler = StatsSampler(interval=60.0)
+    monitors = [Mock(container_id=f"container-{i}") for i in range(3)]
+    monitors[1].sample.side_effect = Exception("daemon error")
+    for monitor in monitors:
+        monitor.sample.return_value = True
+        with sampler._lock:
+            sampler.monitors[monitor.container_id] = monitor
+
+    assert sampler.sample_once() == 2
+    assert all(monitor.sample.called for monitor in monitors)
+    assert sampler.rounds_completed == 1
+
+
+def test_manager_shares_one_sampler(resource_manager):
+    """Test all registered containers share the manager's sampler."""
+    for index in range(3):
+        container = Mock()
+        container.stats.return_value = make_stats(1, 1)
+        resource_manager.register_container(f"container-{index}", container)
+
+    assert resource_manager.sampler.running
+    assert len(resource_manager.sampler.monitors) == 3
+    assert all(
+        monitor.sampler is resource_manager.sampler
+        for monitor in resource_manager.monitors.values()
+    )
+
+    resource_manager.unregister_container("container-0")
+    assert "container-0" not in resource_manager.sampler.monitors
+
+    resource_manager.cleanup()
+    assert not resource_manager.sampler.running
+
+
+def test_cgroup_reader_reads_counters(fake_cgroup):
+    """Test cgroup v2 counters are parsed from the container's cgroup."""
+    reader, _ = fake_cgroup
+
+    stats = reader.read(DOCKER_ID)
+
+    assert stats is not None
+    assert stats.cpu_usage_usec == 500000
+    assert stats.memory_current == 64 * 1024 * 1024
+    assert stats.memory_max == 256 * 1024 * 1024
+    assert stats.oom_events == 2
+    assert stats.oom_kill_events == 1
+    assert stats.io_bytes == 3030
+    assert stats.pids_current == 2
+    assert stats.open_files == 5
+    assert (stats.network_rx_bytes, stats.network_tx_bytes) == (1500, 2500)
+
+
+def test_cgroup_reader_unavailable(tmp_path):
+    """Test reader reports unavailable cgroup paths."""
+    reader = CgroupV2Reader(cgroup_root=tmp_path)
+
+    assert reader.available is False
+    assert reader.read(DOCKER_ID) is None
+
+
+def test_cgroup_reader_container_removed(fake_cgroup):
+    """Test reader returns None once the container cgroup disappears."""
+    reader, container_dir = fake_cgroup
+    (container_dir / "memory.current").unlink()
+
+    assert reader.read(DOCKER_ID) is None
+    assert reader.read("b" * 64) is None
+
+
+def test_cgroup_reader_retries_missing_cgroup(fake_cgroup):
+    """Test a cgroup created after the first lookup is found later."""
+    reader, container_dir = fake_cgroup
+    late_dir = container_dir.parent / f"docker-{'b' * 64}.scope"
+
+    assert reader.find_cgroup_path("b" * 64) is None
+
+    late_dir.mkdir()
+    (late_dir / "cgroup.procs").write_text("103\n")
+    assert reader.find_cgroup_path("b" * 64) is None  # miss still fresh
+
+    reader.miss_retry_after = 0
+    assert reader.find_cgroup_path("b" * 64) == late_dir
+
+
+def test_monitor_prefers_cgroup(fake_cgroup):
+    """Test monitors use cgroup counters and skip the Docker API."""
+    reader, container_dir = fake_cgroup
+    container = Mock()
+    container.id = DOCKER_ID
+    callback = Mock()
+    monitor = ResourceMonitor(
+        "container-1", container, alert_callback=callback, cgroup_reader=reader
+    )
+
+    assert monitor.sample() is True
+    (container_dir / "cpu.stat").write_text("usage_usec 900000\n")
+    assert monitor.sample() is True
+
+    latest = monitor.get_latest_usage()
+    assert latest is not None
+    container.stats.assert_not_called()
+    assert latest.processes == 2
+    assert latest.disk_bytes == 3030
+    assert latest.oom_kills == 1
+    assert latest.memory_percent == pytest.approx(25.0)
+    assert monitor.usage_history[1].cpu_percent > 0
+
+    # The OOM kill is only alerted once
+    oom_alerts = [
+        call.args[0]
+        for call in callback.call_args_list
+        if "OOM" in call.args[0].message
+    ]
+    assert len(oom_alerts) == 1
+
+
+def test_monitor_falls_back_to_docker_without_cgroup(tmp_path):
+    """Test Docker stats are used when the cgroup is not accessible."""
+    container = Mock()
+    container.id = DOCKER_ID
+    stats = make_stats(1, 1)
+    stats["pids_stats"] = {"current": 4}
+    container.stats.return_value = stats
+    monitor = ResourceMonitor(
+        "container-1", container, cgroup_reader=CgroupV2Reader(cgroup_root=tmp_path)
+    )
+
+    monitor.sample()
+
+    latest = monitor.get_latest_usage()
+    assert latest is not None
+    assert latest.processes == 4
+    container.stats.assert_called_once()
+
+
+def test_monitor_usage_summary_tracks_peaks():
+    """Test lifetime peak/average tracking and compact time series."""
+    container = Mock()
+    container.stats.side_effect = [
+        make_stats(0, 0, memory=32 * 1024 * 1024),
+        make_stats(1_000, 10_000, memory=128 * 1024 * 1024),
+        make_stats(1_500, 20_000, memory=64 * 1024 * 1024),
+    ]
+    monitor = ResourceMonitor("container-1", container, history_size=2)
+    for _ in range(3):
+        monitor.sample()
+
+    summary = monitor.get_usage_summary(max_points=10)
+
+    assert summary["samples"] == 3
+    assert summary["peak"]["memory_bytes"] == 128 * 1024 * 1024
+    assert summary["peak"]["cpu_percent"] == pytest.approx(20.0)
+    assert summary["average"]["memory_bytes"] == pytest.approx(
+        (32 + 128 + 64) / 3 * 1024 * 1024
+    )
+    # Peaks survive the bounded history; the series only holds retained samples
+    assert len(summary["time_series"]["memory_bytes"]) == 2
+    assert len(summary["time_series"]["offset_seconds"]) == 2
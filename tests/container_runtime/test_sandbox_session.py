@@ -0,0 +1,502 @@
+"""
+Tests for session-scoped sandbox execution.
+
+Docker exec requests are served by running the commands as local
+processes, so streaming, exit codes and signals behave for real.
+"""
+
+import os
+import selectors
+import signal
+import socket as socket_module
+import struct
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+from docker.errors import APIError, ImageNotFound, NotFound
+
+from container_runtime import sandbox_session
+from container_runtime.agent_integration import (
+    AgentContainerExecutor,
+    replace_shell_execution,
+)
+from container_runtime.audit_logger import AuditEventType
+from container_runtime.execution_engine import ContainerExecutionEngine
+from container_runtime.host_process import run_on_host
+from container_runtime.image_manager import BuildContext
+
+# Captured before any test patches subprocess.Popen
+HOST_POPEN = subprocess.Popen
+
+
+class LocalExecAPI:
+    """Low-level Docker exec API that runs commands on the host."""
+
+    def __init__(self, workdir: Path):
+        self.workdir = workdir
+        self.execs = {}
+
+    def exec_create(
+        self, container, cmd, stdout, stderr, stdin, user, workdir, environment
+    ):
+        exec_id = uuid.uuid4().hex
+        self.execs[exec_id] = {
+            "cmd": cmd,
+            "environment": environment,
+            "stdin": stdin,
+            "proc": None,
+        }
+        return {"Id": exec_id}
+
+    def exec_start(self, exec_id, stream=False, demux=False, socket=False):
+        info = self.execs[exec_id]
+        proc = HOST_POPEN(
+            info["cmd"],
+            stdin=subprocess.PIPE if info["stdin"] else subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=self.workdir,
+            env={**os.environ, **info["environment"]},
+        )
+        info["proc"] = proc
+        if socket:
+            return self._attach(proc)
+        return self._demux(proc)
+
+    def _attach(self, proc):
+        """Serve the exec over a socket in Docker's multiplexed format."""
+        client, server = socket_module.socketpair()
+
+        def copy_stdin():
+            while data := server.recv(4096):
+                try:
+                    proc.stdin.write(data)
+                    proc.stdin.flush()
+                except BrokenPipeError:
+                    break
+            proc.stdin.close()
+
+        def copy_output():
+            for out, err in self._demux(proc):
+                stream_id, data = (1, out) if out else (2, err or b"")
+                server.sendall(struct.pack(">BxxxI", stream_id, len(data)) + data)
+            server.shutdown(socket_module.SHUT_WR)
+            stdin_thread.join()
+            server.close()
+
+        stdin_thread = threading.Thread(target=copy_stdin, daemon=True)
+        stdin_thread.start()
+        threading.Thread(target=copy_output, daemon=True).start()
+        return client
+
+    @staticmethod
+    def _demux(proc):
+        with selectors.DefaultSelector() as selector:
+            selector.register(proc.stdout, selectors.EVENT_READ, 0)
+            selector.register(proc.stderr, selectors.EVENT_READ, 1)
+            while selector.get_map():
+                for key, _ in selector.select():
+                    data = os.read(key.fd, 4096)
+                    if not data:
+                        selector.unregister(key.fileobj)
+                    elif key.data == 0:
+                        yield data, None
+                    else:
+                        yield None, data
+        proc.wait()
+
+    def exec_inspect(self, exec_id):
+        proc = self.execs[exec_id]["proc"]
+        returncode = proc.poll()
+        if returncode is not None and returncode < 0:
+            returncode = 128 - returncode  # Docker reports 128 + signal
+        return {"Running": returncode is None, "ExitCode": returncode, "Pid": proc.pid}
+
+
+@pytest.fixture
+def sandbox_engine(tmp_path, monkeypatch):
+    """Execution engine whose Docker client runs execs locally."""
+    monkeypatch.setattr(sandbox_session, "PID_DIR", str(tmp_path))
+    workdir = tmp_path / "workspace"
+    workdir.mkdir()
+
+    container = Mock(id="docker-session", status="created")
+    container.stats.return_value = {}
+    container.exec_run.side_effect = lambda cmd, user: HOST_POPEN(cmd).wait()
+
+    with (
+        patch("docker.from_env") as mock_docker,
+        patch(
+            "container_runtime.image_manager.ImageManager.get_or_create_runtime_image",
+            return_value="alpine:latest",
+        ),
+        patch(
+            "container_runtime.resource_manager.ResourceManager.check_system_capacity",
+            return_value=True,
+        ),
+    ):
+        client = mock_docker.return_value
+        client.ping.return_value = True
+        client.api = LocalExecAPI(workdir)
+        client.containers.create.return_value = container
+
+        engine = ContainerExecutionEngine(
+            audit_log_dir=tmp_path / "audit",
+            image_cache_dir=tmp_path / "images",
+            prebuild_images=False,
+        )
+        engine.resource_manager.cgroup_reader = Mock(
+            read=Mock(return_value=None), forget=Mock()
+        )
+        yield engine
+        engine.shutdown()
+
+
+@pytest.fixture
+def session(sandbox_engine):
+    with sandbox_session.SandboxSession(
+        sandbox_engine, security_policy="standard", environment={"GREETING": "hi"}
+    ) as session:
+        yield session
+
+
+class TestSandboxSession:
+    """Test commands run through one session container."""
+
+    def test_run_captures_streams(self, session):
+        """Output is captured per stream with the command's exit code."""
+        result = session.run(
+            'echo "$GREETING"; echo oops >&2; exit 3',
+            shell=True,
+            capture_output=True,
+            text=True,
+        )
+
+        assert result.returncode == 3
+        assert result.stdout == "hi\n"
+        assert result.stderr == "oops\n"
+
+        with pytest.raises(subprocess.CalledProcessError):
+            session.run(["false"], check=True)
+
+    def test_popen_streams_output(self, session):
+        """Output is readable while the command is still running."""
+        with session.popen(
+            ["sh", "-c", "echo one; sleep 0.5; echo two"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+        ) as process:
+            assert process.stdout.readline() == "one\n"
+            assert process.poll() is None
+            assert process.stdout.read() == "two\n"
+            assert process.wait(timeout=5) == 0
+
+    def test_stdin_is_connected(self, session, tmp_path):
+        """Standard input reaches the command through the attach socket."""
+        result = session.run(["tee"], input="hello", capture_output=True, text=True)
+        assert result.stdout == "hello"
+
+        # Large input and output are exchanged without deadlocking
+        data = os.urandom(1 << 20)
+        result = session.run(["tee"], input=data, capture_output=True, timeout=30)
+        assert result.stdout == data
+
+        with session.popen(
+            ["sh", "-c", "read line; echo got $line"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+        ) as process:
+            process.stdin.write("x\n")
+            process.stdin.close()
+            assert process.stdout.read() == "got x\n"
+
+        source = tmp_path / "input.txt"
+        source.write_text("from file\n")
+        with open(source) as f:
+            result = session.run(["tee"], stdin=f, capture_output=True, text=True)
+        assert result.stdout == "from file\n"
+
+        # Unconnected standard input reads end of file
+        result = session.run(["tee"], capture_output=True, text=True, timeout=10)
+        assert (result.returncode, result.stdout) == (0, "")
+
+    def test_timeout_kills_command(self, session):
+        """Commands outliving a timeout are killed inside the sandbox."""
+        start = time.time()
+        with pytest.raises(subprocess.TimeoutExpired):
+            session.run(["sleep", "30"], timeout=0.3)
+        assert time.time() - start < 10
+
+        process = session.popen(["sleep", "30"])
+        time.sleep(0.1)
+        process.terminate()
+        assert process.wait(timeout=10) == -signal.SIGTERM
+
+    def test_denied_command(self, session, sandbox_engine):
+        """Commands the session policy blocks are refused and audited."""
+        with pytest.raises(Exception, match="blocked element 'sudo'"):
+            session.run(["sudo", "ls"])
+
+        assert session.commands_denied == 1
+        denied = sandbox_engine.audit_logger.search_events(
+            event_type=AuditEventType.ACCESS_DENIED
+        )
+        assert denied[0]["container_id"] == session.session_id
+
+    def test_run_batch(self, session):
+        """A batch returns one result per command from a single exec."""
+        api = session.engine.container_manager.client.api
+        results = session.run_batch(
+            [
+                "echo a; echo b",
+                ["sh", "-c", "printf 'no newline'; echo err >&2; exit 4"],
+                ["echo", "it's quoted"],
+            ]
+        )
+
+        assert [r.returncode for r in results] == [0, 4, 0]
+        assert results[0].stdout == "a\nb\n"
+        assert results[1].stdout == "no newline"
+        assert results[1].stderr == "err\n"
+        assert results[2].stdout == "it's quoted\n"
+        assert len(api.execs) == 1
+
+        stopped = session.run_batch(["exit 2", "echo never"], stop_on_error=True)
+        assert [r.returncode for r in stopped] == [2]
+
+    def test_one_container_per_session(self, sandbox_engine):
+        """Commands share one container, removed and audited on close."""
+        client = sandbox_engine.container_manager.client
+        with sandbox_session.SandboxSession(sandbox_engine) as session:
+            for i in range(5):
+                assert session.run(["echo", str(i)]).returncode == 0
+            assert session.get_status()["commands_run"] == 5
+            assert sandbox_engine.list_active_executions()[0]["request_id"] == (
+                session.session_id
+            )
+
+        assert client.containers.create.call_count == 1
+        client.containers.create.return_value.remove.assert_called_once_with(force=True)
+        assert sandbox_engine.active_executions == {}
+        assert not session.active
+        with pytest.raises(Exception, match="not active"):
+            session.run(["true"])
+
+        stopped = sandbox_engine.audit_logger.search_events(
+            event_type=AuditEventType.CONTAINER_STOPPED
+        )
+        assert [e["container_id"] for e in stopped] == [session.session_id]
+
+    def test_execution_time_limits_each_command(self, session):
+        """The policy's execution time kills commands, not the container."""
+        client = session.engine.container_manager.client
+        create_args = client.containers.create.call_args.kwargs
+        assert create_args["command"] == ["tail", "-f", "/dev/null"]
+
+        session.config.timeout = 0.3
+        start = time.time()
+        with pytest.raises(subprocess.TimeoutExpired):
+            session.run(["sleep", "30"])
+        assert time.time() - start < 10
+
+        process = session.popen(["sleep", "30"])
+        assert process.wait(timeout=10) == -signal.SIGKILL
+        assert process.timed_out
+
+        assert session.run(["true"]).returncode == 0
+        assert client.containers.create.call_count == 1
+
+    def test_idle_container_is_restarted(self, sandbox_engine):
+        """An idle session stops its container and starts one when needed."""
+        client = sandbox_engine.container_manager.client
+        with sandbox_session.SandboxSession(
+            sandbox_engine, idle_timeout=0.2
+        ) as session:
+            assert session.run(["echo", "one"], capture_output=True).stdout == b"one\n"
+            deadline = time.time() + 10
+            while session.container_id is not None and time.time() < deadline:
+                time.sleep(0.05)
+
+            assert session.container_id is None
+            assert session.active
+            client.containers.create.return_value.remove.assert_called_once_with(
+                force=True
+            )
+            assert sandbox_engine.active_executions == {}
+
+            assert session.run(["echo", "two"], capture_output=True).stdout == b"two\n"
+            assert client.containers.create.call_count == 2
+            assert session.get_status()["containers_started"] == 2
+
+        assert not session.active
+
+    def test_gone_container_is_replaced(self, session):
+        """A command run after the container went away gets a fresh one."""
+        client = session.engine.container_manager.client
+        container = client.containers.create.return_value
+        container.reload.side_effect = NotFound("container is gone")
+        exec_create = client.api.exec_create
+        failures = [APIError("container is not running")]
+
+        def failing_exec_create(*args, **kwargs):
+            if failures:
+                raise failures.pop()
+            return exec_create(*args, **kwargs)
+
+        client.api.exec_create = failing_exec_create
+
+        result = session.run(["echo", "back"], capture_output=True, text=True)
+        assert result.stdout == "back\n"
+        assert client.containers.create.call_count == 2
+        container.remove.assert_called_once_with(force=True)
+
+
+def test_replace_shell_execution(sandbox_engine):
+    """Patched subprocess calls run in one sandbox session."""
+    executor = AgentContainerExecutor.__new__(AgentContainerExecutor)
+    executor.default_policy = "standard"
+    executor.audit_enabled = True
+    executor.execution_engine = sandbox_engine
+    executor.shutdown = Mock()
+    api = sandbox_engine.container_manager.client.api
+
+    with patch(
+        "container_runtime.agent_integration.create_agent_executor",
+        return_value=executor,
+    ):
+        restore = replace_shell_execution()
+    try:
+        assert subprocess.check_output(["echo", "hello"], text=True) == "hello\n"
+
+        result = subprocess.run(
+            'echo "$EXTRA"',
+            shell=True,
+            capture_output=True,
+            text=True,
+            env={**os.environ, "EXTRA": "forwarded"},
+            cwd=tempfile.gettempdir(),
+        )
+        assert result.stdout == "forwarded\n"
+        environment = list(api.execs.values())[-1]["environment"]
+        assert "EXTRA" in environment
+        assert "PATH" not in environment
+
+        piped = subprocess.run(["tee"], input=b"piped", capture_output=True)
+        assert piped.stdout == b"piped"
+
+        with pytest.raises(subprocess.TimeoutExpired):
+            subprocess.run(["sleep", "30"], timeout=0.3)
+    finally:
+        restore()
+
+    assert subprocess.Popen is HOST_POPEN
+    assert sandbox_engine.container_manager.client.containers.create.call_count == 1
+    executor.shutdown.assert_called_once()
+
+
+def test_replace_shell_execution_spares_runtime(sandbox_engine):
+    """Agent threads are sandboxed; only runtime commands stay on the host."""
+    executor = AgentContainerExecutor.__new__(AgentContainerExecutor)
+    executor.default_policy = "standard"
+    executor.audit_enabled = True
+    executor.execution_engine = sandbox_engine
+    executor.shutdown = Mock()
+    api = sandbox_engine.container_manager.client.api
+
+    with patch(
+        "container_runtime.agent_integration.create_agent_executor",
+        return_value=executor,
+    ):
+        restore = replace_shell_execution()
+    try:
+        subprocess.run(["true"], check=True)
+        assert len(api.execs) == 1
+
+        # Runtime tools such as trivy scans run on the host
+        result = run_on_host(["echo", "host"], capture_output=True, text=True)
+        assert result.stdout == "host\n"
+
+        # Worker threads are sandboxed too
+        outputs = []
+        thread = threading.Thread(
+            target=lambda: outputs.append(subprocess.run(["echo", "bg"]).returncode)
+        )
+        thread.start()
+        thread.join()
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pool.submit(subprocess.run, ["echo", "pool"], check=True).result()
+        assert outputs == [0]
+        assert [e["cmd"][-2:] for e in list(api.execs.values())[1:]] == [
+            ["echo", "bg"],
+            ["echo", "pool"],
+        ]
+
+        # run_on_host from a worker thread stays on the host
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pool.submit(run_on_host, ["true"], check=True).result()
+        assert len(api.execs) == 3
+
+        # subprocess.Popen stays usable as a type
+        with subprocess.Popen(["true"]) as process:
+            assert isinstance(process, subprocess.Popen)
+        assert subprocess.Popen[bytes] is not None
+        assert len(api.execs) == 4
+    finally:
+        restore()
+
+    assert subprocess.Popen is HOST_POPEN
+    assert sandbox_engine.container_manager.client.containers.create.call_count == 1
+    executor.shutdown.assert_called_once()
+
+
+def test_replace_shell_execution_spares_image_builds(sandbox_engine):
+    """Credential helpers run by Docker SDK builds stay on the host."""
+    executor = AgentContainerExecutor.__new__(AgentContainerExecutor)
+    executor.default_policy = "standard"
+    executor.audit_enabled = True
+    executor.execution_engine = sandbox_engine
+    executor.shutdown = Mock()
+    api = sandbox_engine.container_manager.client.api
+    images = sandbox_engine.image_manager.client.images
+    helper_output = []
+
+    def build(path, tag, **kwargs):
+        # docker-py runs docker-credential-* helpers for credsStore setups
+        helper = subprocess.run(["echo", "creds"], capture_output=True, text=True)
+        helper_output.append(helper.stdout)
+        image = Mock(id=f"sha256:{tag}", tags=[tag])
+        image.attrs = {"Size": 100, "Created": "2025-01-01T00:00:00"}
+        return image, []
+
+    images.build.side_effect = build
+    images.get.side_effect = ImageNotFound("not found")
+
+    with patch(
+        "container_runtime.agent_integration.create_agent_executor",
+        return_value=executor,
+    ):
+        restore = replace_shell_execution()
+    try:
+        execs = len(api.execs)
+        sandbox_engine.image_manager.get_or_create_dependency_image(
+            "python", ["requests"]
+        )
+        sandbox_engine.image_manager.create_runtime_image(
+            BuildContext(base_image="python:3.11-slim", runtime="python", packages=[])
+        )
+
+        assert helper_output == ["creds\n", "creds\n"]
+        assert len(api.execs) == execs
+        subprocess.run(["true"], check=True)
+        assert len(api.execs) == execs + 1  # Agent commands are still sandboxed
+    finally:
+        restore()
@@ -2,7 +2,11 @@
 Tests for Security Policy Engine.
 """
 
+import os
+import time
+
 import pytest
+import yaml
 from pathlib import Path
 from unittest.mock import patch, mock_open
 
@@ -258,6 +262,230 @@ def test_parse_policy_config_invalid():
         engine._parse_policy_config("invalid", invalid_config)
 
 
+def test_parse_policy_image_scan_mode():
+    """Test image scan mode parsing and validation."""
+    engine = SecurityPolicyEngine()
+
+    policy = engine._parse_policy_config("scanned", {"image_scan_mode": "block"})
+    assert policy.image_scan_mode == "block"
+    assert engine.policies["standard"].image_scan_mode == "async"
+
+    with pytest.raises(Exception, match="image_scan_mode"):
+        engine._parse_policy_config("invalid", {"image_scan_mode": "sometimes"})
+
+
+def test_compiled_policy_reused(policy_engine):
+    """Policies are compiled once at registration and reused."""
+    compiled = policy_engine.get_compiled_policy("standard")
+
+    assert policy_engine.get_compiled_policy("standard") is compiled
+    assert "library/python:3.11-slim" in compiled.allowed_images
+    assert compiled.image_allowed("docker.io/library/python:3.11-slim")
+    assert not compiled.image_allowed("python:3.12")
+
+
+def test_compiled_policy_blocked_commands(policy_engine):
+    """The combined matcher keeps substring semantics."""
+    compiled = policy_engine.get_compiled_policy("hardened")
+
+    assert compiled.find_blocked_command(["python", "main.py"]) is None
+    assert compiled.find_blocked_command(["sh", "-c", "netcat -l 80"]) == "netcat"
+    assert compiled.find_blocked_command(["/usr/bin/curl", "x"]) == "curl"
+    assert compiled.find_blocked_command([None, 3]) is None
+
+
+def test_register_policy_recompiles(policy_engine):
+    """Replacing or re-registering a policy rebuilds its evaluator."""
+    policy = ExecutionPolicy(
+        name="custom",
+        security_level=SecurityLevel.STANDARD,
+        network_policy=NetworkPolicy.NONE,
+        resource_limits=ResourceLimits(),
+        security_constraints=SecurityConstraints(),
+        blocked_commands={"rm"},
+    )
+    policy_engine.register_policy(policy)
+    with pytest.raises(Exception, match="blocked element 'rm'"):
+        policy_engine.validate_execution_request("alpine", ["rm", "-rf"], "custom")
+
+    policy.blocked_commands = {"dd"}
+    policy_engine.register_policy(policy)
+    assert policy_engine.validate_execution_request("alpine", ["rm"], "custom")
+
+    # Policies are only changed through new versions, never in place
+    with pytest.raises(TypeError):
+        policy_engine.policies["custom"] = policy
+
+
+def test_apply_policy_does_not_share_state(policy_engine):
+    """Applying a policy never mutates the base config or the template."""
+    base_config = {"image": "alpine", "security_opt": ["label=disable"]}
+
+    first = policy_engine.apply_policy_to_container_config(base_config, "paranoid")
+    first["cap_drop"].append("CHOWN")
+    first["ulimits"][0]["Soft"] = 1
+    first["tmpfs"]["/tmp"] = "rw"
+    second = policy_engine.apply_policy_to_container_config(base_config, "paranoid")
+
+    assert base_config["security_opt"] == ["label=disable"]
+    assert second["security_opt"][0] == "label=disable"
+    assert "apparmor=docker-default" in second["security_opt"]
+    assert second["cap_drop"] == ["ALL"]
+    assert second["ulimits"][0] == {"Name": "nproc", "Soft": 64, "Hard": 64}
+    assert second["tmpfs"]["/tmp"] == "rw,noexec,nosuid,nodev,size=50m"
+
+
+def test_policy_benchmark_runs():
+    """The benchmark reports per-request timings for every policy."""
+    from container_runtime.policy_benchmark import benchmark_policies
+
+    results = benchmark_policies(iterations=10, repeat=1)
+
+    assert set(results) == {"minimal", "standard", "hardened", "paranoid"}
+    assert all(t["validate_us"] > 0 and t["apply_us"] > 0 for t in results.values())
+
+
+def write_policies(path, policies):
+    """Write a policy file and give it a fresh modification time."""
+    path.write_text(yaml.safe_dump({"policies": policies}))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestPolicyReload:
+    """Test versioned hot reload of policy sources."""
+
+    @pytest.fixture
+    def policy_file(self, tmp_path):
+        path = tmp_path / "policies.yaml"
+        write_policies(path, {"team": {"allowed_images": ["alpine:latest"]}})
+        return path
+
+    def test_reload_publishes_new_version(self, policy_file):
+        """Edits to the policy file take effect as a new version."""
+        engine = SecurityPolicyEngine(policy_file=policy_file)
+        assert engine.policy_version == 1
+        assert not engine.reload()  # Unchanged
+
+        write_policies(policy_file, {"team": {"allowed_images": ["ubuntu:22.04"]}})
+        published = []
+        engine.add_reload_handler(published.append)
+
+        assert engine.reload()
+        assert engine.policy_version == 2
+        assert [s.version for s in published] == [2]
+        assert engine.validate_execution_request("ubuntu:22.04", ["ls"], "team")
+        with pytest.raises(Exception, match="not allowed"):
+            engine.validate_execution_request("alpine", ["ls"], "team")
+
+        # Unchanged policies keep their compiled evaluator
+        assert published[0].policies["standard"] is engine.get_compiled_policy()
+
+    def test_invalid_reload_keeps_current_version(self, policy_file):
+        """A broken edit is rejected as a whole and retried once fixed."""
+        engine = SecurityPolicyEngine(policy_file=policy_file)
+
+        write_policies(
+            policy_file,
+            {
+                "team": {"allowed_images": ["ubuntu:22.04"]},
+                "broken": {"network_policy": "everywhere"},
+            },
+        )
+        assert not engine.reload()
+        assert engine.policy_version == 1
+        assert engine.get_status()["failed_reloads"] == 1
+        assert engine.last_reload_error is not None
+        assert "broken" in engine.last_reload_error
+        assert engine.validate_execution_request("alpine", ["ls"], "team")
+        assert not engine.reload()  # Not retried until edited again
+
+        write_policies(policy_file, {"team": {"allowed_images": ["ubuntu:22.04"]}})
+        assert engine.reload()
+        assert engine.last_reload_error is None
+
+    def test_invalid_file_fails_startup(self, tmp_path):
+        """An engine never starts without its configured policies."""
+        policy_file = tmp_path / "policies.yaml"
+        write_policies(policy_file, {"broken": {"resources": {"cpu": "lots"}}})
+
+        with pytest.raises(Exception, match="broken"):
+            SecurityPolicyEngine(policy_file=policy_file)
+
+    def test_pinned_policy_set_is_unaffected(self, policy_file):
+        """Executions keep the policy version they started with."""
+        engine = SecurityPolicyEngine(policy_file=policy_file)
+        pinned = engine.policy_set
+
+        write_policies(policy_file, {"team": {"allowed_images": ["ubuntu:22.04"]}})
+        engine.reload()
+
+        compiled = engine.get_compiled_policy("team", policy_set=pinned)
+        assert compiled.image_allowed("alpine")
+        assert not engine.get_compiled_policy("team").image_allowed("alpine")
+        with pytest.raises(TypeError):
+            pinned.policies["team"] = compiled  # type: ignore[index]
+
+    def test_registered_policies_survive_reload(self, policy_file):
+        """Programmatic registrations outrank the file across reloads."""
+        engine = SecurityPolicyEngine(policy_file=policy_file)
+        engine.register_policy(
+            ExecutionPolicy(
+                name="team",
+                security_level=SecurityLevel.STANDARD,
+                network_policy=NetworkPolicy.NONE,
+                resource_limits=ResourceLimits(),
+                security_constraints=SecurityConstraints(),
+            )
+        )
+
+        assert engine.reload(force=True)
+        assert engine.validate_execution_request("ubuntu", ["ls"], "team")
+
+    def test_tenant_policies(self, tmp_path, policy_file):
+        """Tenant files override shared policies for that tenant only."""
+        tenant_dir = tmp_path / "tenants"
+        tenant_dir.mkdir()
+        write_policies(
+            tenant_dir / "acme.yaml",
+            {
+                "standard": {"allowed_images": ["acme/runner:1"]},
+                "acme-only": {"blocked_commands": ["curl"]},
+            },
+        )
+        engine = SecurityPolicyEngine(
+            policy_file=policy_file, tenant_policy_dir=tenant_dir
+        )
+
+        assert engine.list_tenants() == ["acme"]
+        assert engine.validate_execution_request("acme/runner:1", ["ls"], tenant="acme")
+        with pytest.raises(Exception, match="not allowed"):
+            engine.validate_execution_request("acme/runner:1", ["ls"])
+        assert "acme-only" in engine.list_policies("acme")
+        assert "acme-only" not in engine.list_policies()
+        assert engine.get_policy("team", tenant="acme").name == "team"
+
+        # New tenant files are picked up by a reload
+        write_policies(tenant_dir / "globex.yml", {"team": {}})
+        assert engine.reload()
+        assert engine.list_tenants() == ["acme", "globex"]
+
+    def test_watcher_reloads_changes(self, policy_file):
+        """The watcher thread publishes edits without an explicit reload."""
+        engine = SecurityPolicyEngine(policy_file=policy_file, reload_interval=0.01)
+        try:
+            assert engine.watching
+            write_policies(policy_file, {"team": {"allowed_images": ["ubuntu"]}})
+
+            deadline = time.monotonic() + 5
+            while engine.policy_version == 1 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert engine.policy_version == 2
+        finally:
+            engine.stop_watching()
+        assert not engine.watching
+
+
 def test_resource_limits_dataclass():
     """Test ResourceLimits dataclass."""
     limits = ResourceLimits(
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Tests for the GraphQL batch transport used by memory issue sync
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+import unittest
+from unittest.mock import patch
+
+# Add the memory-manager directory to the path
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "../../.github/memory-manager")
+)
+
+from github_batch import (
+    GitHubRateLimitError,
+    GitHubTransportError,
+    GitHubTransportUnavailableError,
+    GraphQLBatchTransport,
+    IssueOperation,
+    OperationResult,
+)
+from github_integration import GitHubIntegration, GitHubIssue
+
+LABELS = ["memory-sync", "enhancement", "priority:high", "completed"]
+
+
+class FakeGh:
+    """Answers gh subprocess calls from an in-memory repository"""
+
+    def __init__(self):
+        self.issues = {}
+        self.requests = []
+        self.responses = []  # queued (status, headers, body), None to answer
+
+    def issue_node(self, number):
+        issue = self.issues[number]
+        return {
+            "id": f"I_{number}",
+            "number": number,
+            "title": issue["title"],
+            "body": issue["body"],
+            "state": issue["state"],
+            "createdAt": "2025-01-01T00:00:00Z",
+            "updatedAt": "2025-01-01T00:00:00Z",
+            "url": f"https://github.com/o/r/issues/{number}",
+            "labels": {"nodes": []},
+            "assignees": {"nodes": []},
+        }
+
+    def __call__(self, cmd, input=None, **kwargs):
+        if cmd[:3] == ["gh", "repo", "view"]:
+            stdout = json.dumps({"owner": {"login": "o"}, "name": "r"})
+            return subprocess.CompletedProcess(cmd, 0, stdout, "")
+
+        payload = json.loads(input)
+        self.requests.append(payload)
+        response = self.responses.pop(0) if self.responses else None
+        if response is None:
+            response = 200, {}, json.dumps(self.answer(payload))
+        status, headers, body = response
+
+        head = [f"HTTP/2.0 {status} OK"]
+        head += [f"{name}: {value}" for name, value in headers.items()]
+        stdout = "\r\n".join(head) + "\r\n\r\n" + body
+        return subprocess.CompletedProcess(cmd, 0 if status == 200 else 1, stdout, "")
+
+    def answer(self, payload):
+        query, variables = payload["query"], payload["variables"]
+        if "labels(first: 100)" in query:
+            labels = [{"id": f"L_{name}", "name": name} for name in LABELS]
+            return {"data": {"repository": {"id": "R_1", "labels": {"nodes": labels}}}}
+
+        if query.startswith("query"):
+            numbers = [int(n) for n in re.findall(r"issue\(number: (\d+)\)", query)]
+            return {
+                "data": {
+                    "repository": {
+                        f"i{n}": {"id": f"I_{n}"} if n in self.issues else None
+                        for n in numbers
+                    }
+                }
+            }
+
+        data, errors = {}, []
+        for alias, mutation, var in re.findall(
+            r"(op\d+): (\w+)\(input: \$(in\d+)\)", query
+        ):
+            value = variables[var]
+            if mutation == "createIssue":
+                number = len(self.issues) + 1
+                self.issues[number] = {
+                    "title": value["title"],
+                    "body": value["body"],
+                    "state": "OPEN",
+                }
+            else:
+                number = int((value.get("id") or value.get("issueId"))[2:])
+                if number not in self.issues:
+                    data[alias] = None
+                    errors.append({"path": [alias], "message": "Could not resolve"})
+                    continue
+                issue = self.issues[number]
+                issue["title"] = value.get("title", issue["title"])
+                issue["state"] = value.get("state", issue["state"])
+                if mutation == "closeIssue":
+                    issue["state"] = "CLOSED"
+            data[alias] = {"issue": self.issue_node(number)}
+
+        response = {"data": data}
+        if errors:
+            response["errors"] = errors
+        return response
+
+
+def create_op(index, labels=("memory-sync",)):
+    return IssueOperation(
+        task_id=f"task-{index:03d}",
+        kind="create",
+        title=f"Task {index}",
+        body="body",
+        labels=list(labels),
+    )
+
+
+class TestGraphQLBatchTransport(unittest.TestCase):
+    """Test batching, error attribution and rate limiting"""
+
+    def setUp(self):
+        self.gh = FakeGh()
+        patcher = patch("github_batch.subprocess.run", side_effect=self.gh)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.transport = GraphQLBatchTransport("/repo", batch_size=20, min_interval=0)
+
+    def mutations(self):
+        return [r for r in self.gh.requests if r["query"].startswith("mutation")]
+
+    def test_operations_are_batched(self):
+        """Many creates cost one request per batch, results in order"""
+        results = self.transport.execute([create_op(i) for i in range(45)])
+
+        self.assertEqual(len(self.mutations()), 3)
+        self.assertEqual(len(results), 45)
+        self.assertTrue(all(r.success for r in results))
+        self.assertEqual(results[44].operation.task_id, "task-044")
+
+        issue = GitHubIssue.from_gh_json(results[44].issue_data)
+        self.assertEqual(issue.number, 45)
+        self.assertEqual(issue.state, "open")
+        self.assertEqual(issue.node_id, "I_45")
+        self.assertEqual(self.transport.get_stats()["operations_sent"], 45)
+
+    def test_errors_are_attributed_to_tasks(self):
+        """A failing mutation only fails its own operation"""
+        self.gh.issues[1] = {"title": "old", "body": "", "state": "OPEN"}
+        operations = [
+            IssueOperation(
+                task_id="task-001",
+                kind="update",
+                title="new",
+                issue_number=1,
+                state="closed",
+            ),
+            IssueOperation(task_id="task-002", kind="close", issue_number=7),
+            create_op(3, labels=["memory-sync", "no-such-label"]),
+            create_op(4),
+        ]
+
+        results = self.transport.execute(operations, node_ids={7: "I_7"})
+
+        self.assertEqual([r.success for r in results], [True, False, False, True])
+        self.assertEqual(results[0].issue_data["state"], "CLOSED")
+        self.assertEqual(results[1].error, "Could not resolve")
+        self.assertIn("no-such-label", results[2].error)
+        self.assertEqual(len(self.mutations()), 1)
+
+    def test_issue_ids_are_resolved_in_one_query(self):
+        """Updates without known node IDs are looked up together"""
+        for number in (1, 2):
+            self.gh.issues[number] = {"title": "t", "body": "", "state": "OPEN"}
+        operations = [
+            IssueOperation(task_id=f"task-{n}", kind="close", issue_number=n)
+            for n in (1, 2, 3)
+        ]
+
+        results = self.transport.execute(operations)
+
+        lookups = [r for r in self.gh.requests if "issue(number:" in r["query"]]
+        self.assertEqual(len(lookups), 1)
+        self.assertEqual([r.success for r in results], [True, True, False])
+        self.assertIn("#3 not found", results[2].error)
+
+    def test_rate_limited_request_is_retried(self):
+        """A secondary rate limit response is waited out and retried"""
+        self.transport.execute([create_op(0)])
+        self.gh.responses.append(
+            (403, {"Retry-After": "0"}, '{"message": "secondary rate limit"}')
+        )
+
+        with patch("github_batch.time.sleep") as sleep:
+            results = self.transport.execute([create_op(1)])
+
+        self.assertTrue(results[0].success)
+        sleep.assert_called_with(0.0)
+        self.assertEqual(self.transport.rate_limit_waits, 1)
+
+    def test_long_rate_limit_reset_raises(self):
+        """Exhausted quota resetting beyond the allowed wait is an error"""
+        self.gh.responses.append(
+            (
+                200,
+                {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "4102444800"},
+                "{}",
+            )
+        )
+        self.transport.graphql("query { viewer { login } }")
+
+        with self.assertRaises(GitHubRateLimitError):
+            self.transport.graphql("query { viewer { login } }")
+
+    def test_transport_failure_keeps_completed_batches(self):
+        """Results of batches sent before a failure are reported"""
+        self.transport.batch_size = 2
+        self.transport.execute([create_op(0)])
+        self.gh.responses = [None, (502, {}, "Bad gateway")]
+
+        with self.assertRaises(GitHubTransportError) as context:
+            self.transport.execute([create_op(i) for i in range(1, 5)])
+
+        completed = context.exception.completed
+        self.assertEqual(
+            [r.operation.task_id for r in completed], ["task-001", "task-002"]
+        )
+        self.assertEqual(
+            [op.task_id for op in context.exception.in_flight],
+            ["task-003", "task-004"],
+        )
+
+    def test_unusable_graphql_is_unavailable(self):
+        """A missing gh or refused repository lookup rules out batching"""
+        self.gh.responses.append((404, {}, '{"message": "Not Found"}'))
+        with self.assertRaises(GitHubTransportUnavailableError):
+            self.transport.execute([create_op(0)])
+
+        with patch("github_batch.subprocess.run", side_effect=FileNotFoundError):
+            transport = GraphQLBatchTransport("/repo")
+            with self.assertRaises(GitHubTransportUnavailableError):
+                transport.execute([create_op(0)])
+
+
+class TestApplyOperations(unittest.TestCase):
+    """Test GitHubIntegration batching with the gh fallback"""
+
+    def make_github(self, transport):
+        github = GitHubIntegration.__new__(GitHubIntegration)
+        github.repo_path = "/repo"
+        github.batch_transport = transport
+        return github
+
+    def failing_transport(self, error):
+        class FailingTransport:
+            def execute(self, operations, node_ids=None):
+                raise error
+
+        return FailingTransport()
+
+    def test_falls_back_to_gh_for_unsent_operations(self):
+        """Without usable GraphQL, unsent operations go through gh commands"""
+        operations = [create_op(i) for i in range(3)]
+        sent = [OperationResult(operations[0], issue_data={"number": 1})]
+        error = GitHubTransportUnavailableError("GitHub CLI not found", completed=sent)
+
+        github = self.make_github(self.failing_transport(error))
+        with (
+            patch.object(
+                github,
+                "_apply_with_gh",
+                side_effect=lambda op: OperationResult(op, issue_data={}),
+            ) as apply_with_gh,
+            patch("github_integration.time.sleep") as sleep,
+        ):
+            results = github.apply_operations(operations)
+
+        self.assertEqual(len(results), 3)
+        self.assertIs(results[0], sent[0])
+        self.assertEqual(
+            [call.args[0] for call in apply_with_gh.call_args_list], operations[1:]
+        )
+        self.assertIsNone(github.batch_transport)
+        sleep.assert_called_once_with(GitHubIntegration.GH_FALLBACK_INTERVAL)
+
+    def test_rate_limit_stops_without_gh(self):
+        """Operations stopped by the rate limit fail instead of bursting via gh"""
+        operations = [create_op(i) for i in range(3)]
+        transport = self.failing_transport(GitHubRateLimitError("resets in 900s"))
+        github = self.make_github(transport)
+
+        with patch.object(github, "_apply_with_gh") as apply_with_gh:
+            results = github.apply_operations(operations)
+
+        apply_with_gh.assert_not_called()
+        self.assertIs(github.batch_transport, transport)
+        self.assertTrue(all("Not applied" in r.error for r in results))
+
+    def test_failed_batch_is_not_replayed(self):
+        """Creates GitHub applied before a failure are found, not recreated"""
+        operations = [
+            create_op(0),
+            create_op(1),
+            create_op(2),
+            IssueOperation("task-003", "update", "t", "b", issue_number=3),
+            create_op(4),
+        ]
+        error = GitHubTransportError(
+            "HTTP 502",
+            completed=[OperationResult(operations[0], issue_data={"number": 1})],
+            status=502,
+        )
+        error.in_flight = operations[1:4]
+        github = self.make_github(self.failing_transport(error))
+
+        with (
+            patch.object(github, "_apply_with_gh") as apply_with_gh,
+            patch.object(
+                github,
+                "_find_recent_memory_issues",
+                return_value={"task-001": {"number": 2}},
+            ),
+        ):
+            results = github.apply_operations(operations)
+
+        apply_with_gh.assert_not_called()
+        self.assertEqual(results[1].issue_data, {"number": 2})
+        self.assertIn("Not applied", results[2].error)
+        self.assertIn("Outcome unknown", results[3].error)
+        self.assertIn("Not applied", results[4].error)
+
+    def test_gh_path_matches_issue_state(self):
+        """The gh path closes or reopens only when the state changes"""
+        github = self.make_github(None)
+        with (
+            patch.object(github, "_close_issue") as close,
+            patch.object(github, "_reopen_issue") as reopen,
+            patch.object(github, "_update_gh_issue", return_value={}),
+        ):
+            github.apply_operations(
+                [
+                    IssueOperation("task-001", "update", "t", "b", issue_number=1),
+                    IssueOperation(
+                        "task-002", "update", "t", "b", issue_number=2, state="open"
+                    ),
+                    IssueOperation("task-003", "close", issue_number=3),
+                ]
+            )
+
+        reopen.assert_called_once_with(2)
+        close.assert_called_once_with(3)
+
+
+if __name__ == "__main__":
+    unittest.main()
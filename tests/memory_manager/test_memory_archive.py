@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Tests for the append-only, indexed archive of compacted memory items
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add the memory-manager directory to the path
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "../../.github/memory-manager")
+)
+
+from memory_archive import MemoryArchive, extract_keywords, source_hash
+
+
+class TestKeywords(unittest.TestCase):
+    """Test index keyword and hash extraction"""
+
+    def test_keywords_skip_stopwords_and_keep_references(self):
+        """Issue references come first, then the most frequent words"""
+        keywords = extract_keywords(
+            "- Fixed the parser cache for #42; parser cache was stale"
+        )
+
+        self.assertEqual(keywords[:3], ["#42", "cache", "parser"])
+        self.assertNotIn("the", keywords)
+        self.assertNotIn("fixed", keywords)
+
+    def test_hash_ignores_whitespace(self):
+        """Reflowed copies of an item share one ID"""
+        self.assertEqual(source_hash("- a  b\n  c"), source_hash("- a b c "))
+
+
+class TestMemoryArchive(unittest.TestCase):
+    """Test appending, querying and importing archived items"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.archive_dir = Path(self.temp_dir) / "LongTermMemoryDetails"
+        self.archive = MemoryArchive(str(self.archive_dir))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_append_is_deduplicated_and_append_only(self):
+        """Known items are skipped and earlier bytes are never rewritten"""
+        self.assertFalse(self.archive_dir.exists())
+        self.archive.append([("Completed Tasks", "- Task one", "2025-07-01")])
+        segment = self.archive_dir / "segment-000001.jsonl"
+        before = segment.read_bytes()
+
+        appended = self.archive.append(
+            [
+                ("Completed Tasks", "- Task one", "2025-07-01"),
+                ("Completed Tasks", "- Task two", None),
+                ("Reflections", "- Task two", None),
+            ]
+        )
+
+        self.assertEqual(appended, [source_hash("- Task two")])
+        self.assertTrue(segment.read_bytes().startswith(before))
+        self.assertEqual(self.archive.get_stats()["items"], 2)
+
+    def test_query_ranks_and_filters(self):
+        """More matching words rank first; section and dates filter"""
+        self.archive.append(
+            [
+                ("Completed Tasks", "- Parser cache fix", "2025-07-01"),
+                ("Completed Tasks", "- Parser speedup", "2025-07-10"),
+                ("Reflections", "- Notes on cache sizing", "2025-06-01"),
+            ],
+            archived_at="2025-08-01T00:00:00",
+        )
+
+        texts = [item.text for item in self.archive.query("parser cache")]
+        self.assertEqual(
+            texts,
+            ["- Parser cache fix", "- Parser speedup", "- Notes on cache sizing"],
+        )
+        self.assertEqual(len(self.archive.query("cach", section="reflections")), 1)
+        self.assertEqual(
+            [i.text for i in self.archive.query(since="2025-07-05")],
+            ["- Parser speedup"],
+        )
+        self.assertEqual(self.archive.query("deployment"), [])
+
+    def test_segments_roll_over(self):
+        """A full segment is closed and items stay readable"""
+        archive = MemoryArchive(str(self.archive_dir), max_segment_bytes=200)
+        for n in range(5):
+            archive.append([("Reflections", f"- Reflection {n} " + "x" * 100, None)])
+
+        self.assertGreater(archive.get_stats()["segments"], 1)
+        self.assertEqual(len(archive.query("reflection", limit=10)), 5)
+
+    def test_torn_index_line_is_ignored(self):
+        """A partly written index line does not hide later items"""
+        self.archive.append([("Reflections", "- First", None)])
+        with open(self.archive.index_path, "a", encoding="utf-8") as f:
+            f.write('{"id": "torn')
+
+        self.archive.append([("Reflections", "- Second", None)])
+
+        reopened = MemoryArchive(str(self.archive_dir))
+        self.assertEqual(reopened.get_stats()["items"], 2)
+
+    def test_recall_fits_budget(self):
+        """Recall returns a Markdown excerpt within max_chars"""
+        self.archive.append(
+            [("Reflections", f"- Caching lesson {n}", "2025-07-01") for n in range(3)]
+        )
+
+        excerpt = self.archive.recall("caching", max_chars=80)
+
+        self.assertTrue(excerpt.startswith("- [Reflections, 2025-07-01] Caching"))
+        self.assertLessEqual(len(excerpt), 80)
+        self.assertEqual(self.archive.recall("unrelated"), "")
+
+    def test_import_legacy_markdown(self):
+        """Items under compaction archive headers are indexed once"""
+        details = Path(self.temp_dir) / "LongTermMemoryDetails.md"
+        details.write_text(
+            "# AI Assistant Long-Term Memory Details\n\n"
+            "## Automatic Compaction System\n\n"
+            "- Not an archived item\n\n"
+            "## Memory Compaction Archive - 2025-08-05T22:38:00\n\n"
+            "The following items were archived during automatic compaction:\n\n"
+            "- ✅ Old task (2025-07-01)\n\n"
+            "  - with detail\n\n"
+            "- Old reflection\n",
+            encoding="utf-8",
+        )
+
+        self.assertEqual(self.archive.import_markdown(str(details)), 2)
+        self.assertEqual(self.archive.import_markdown(str(details)), 0)
+
+        item = self.archive.query("task")[0]
+        self.assertEqual(item.text, "- ✅ Old task (2025-07-01)\n  - with detail")
+        self.assertEqual(item.archived_at, "2025-08-05T22:38:00")
+
+
+if __name__ == "__main__":
+    unittest.main()
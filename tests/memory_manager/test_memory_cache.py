@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite cache of Project Memory comments
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add the memory-manager directory to the path
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "../../.github/memory-manager")
+)
+
+from memory_cache import MemoryCommentCache
+
+
+def comment(n, section="current-goals", updated=None, body=None):
+    return {
+        "id": f"IC_{n}",
+        "body": body if body is not None else f"{section}|update {n}",
+        "createdAt": f"2025-01-01T00:00:{n:02d}Z",
+        "updatedAt": updated or f"2025-01-01T00:00:{n:02d}Z",
+        "author": {"login": "agent"},
+    }
+
+
+class CountingParser:
+    """Parses 'section|content' bodies, counting calls"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, body):
+        self.calls += 1
+        if "|" not in body:
+            return None
+        section, content = body.split("|", 1)
+        return {"section": section, "content": content}
+
+
+class TestMemoryCommentCache(unittest.TestCase):
+    """Test incremental storage and local reads of memory comments"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = str(Path(self.temp_dir) / "state" / "memory_comments.db")
+        self.cache = MemoryCommentCache(self.db_path, issue_number=7)
+        self.parse = CountingParser()
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_only_new_or_edited_comments_are_parsed(self):
+        """Re-storing unchanged comments costs no parsing"""
+        comments = [comment(n) for n in range(1, 6)]
+        self.assertEqual(self.cache.upsert(comments, self.parse), 5)
+
+        comments[2] = comment(
+            3, updated="2025-01-02T00:00:00Z", body="next-steps|edited"
+        )
+        parsed = self.cache.upsert(comments + [comment(6)], self.parse)
+
+        self.assertEqual(parsed, 2)
+        self.assertEqual(self.parse.calls, 7)
+        self.assertEqual(self.cache.watermark(), "2025-01-02T00:00:00Z")
+        self.assertEqual(
+            self.cache.section_counts(), {"current-goals": 5, "next-steps": 1}
+        )
+
+    def test_updates_are_filtered_locally(self):
+        """Section filters and limits keep comment order"""
+        self.cache.upsert(
+            [
+                comment(1),
+                comment(2, section="next-steps"),
+                comment(3),
+                comment(4, body="not a memory update"),
+                comment(5),
+            ],
+            self.parse,
+        )
+
+        updates = self.cache.updates()
+        self.assertEqual([p["content"] for p, _ in updates][0], "update 1")
+        self.assertEqual(len(updates), 4)
+        self.assertEqual(self.cache.count(), 5)
+
+        recent = self.cache.updates(section="current-goals", limit=2)
+        self.assertEqual([p["content"] for p, _ in recent], ["update 3", "update 5"])
+        self.assertEqual(
+            recent[1][1],
+            {
+                "comment_id": "IC_5",
+                "created_at": "2025-01-01T00:00:05Z",
+                "author": "agent",
+            },
+        )
+
+    def test_replace_all_drops_deleted_comments(self):
+        """A full refresh removes comments deleted on GitHub"""
+        self.cache.upsert([comment(n) for n in range(1, 4)], self.parse)
+
+        parsed = self.cache.replace_all([comment(1), comment(3)], self.parse)
+
+        self.assertEqual(parsed, 0)
+        self.assertEqual(
+            [d["comment_id"] for _, d in self.cache.updates()], ["IC_1", "IC_3"]
+        )
+        self.assertEqual(self.cache.get_stats()["full_refreshes"], 1)
+
+    def test_cache_persists_per_issue(self):
+        """A reopened cache keeps its comments, separately for each issue"""
+        self.cache.upsert([comment(1)], self.parse)
+        self.cache.set_meta("issue_updated_at", "2025-01-01T00:00:01Z")
+        self.cache.close()
+
+        self.cache = MemoryCommentCache(self.db_path, issue_number=7)
+        self.assertEqual(self.cache.count(), 1)
+        self.assertEqual(
+            self.cache.get_meta("issue_updated_at"), "2025-01-01T00:00:01Z"
+        )
+
+        other = MemoryCommentCache(self.db_path, issue_number=8)
+        self.assertEqual(other.count(), 0)
+        self.assertIsNone(other.watermark())
+        other.close()
+
+
+class TestMemorySearch(unittest.TestCase):
+    """Test the local full-text index over memory updates"""
+
+    UPDATES = [
+        ("current-goals", "WorkflowManager", "Improve parser performance", [12]),
+        ("important-context", "OrchestratorAgent", "Parser uses one regex", []),
+        ("completed-tasks", "WorkflowManager", "Shipped performance dashboard", []),
+        ("current-goals", "CodeReviewer", "Review the sync engine", [12, 40]),
+    ]
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = str(Path(self.temp_dir) / "memory_comments.db")
+        self.cache = MemoryCommentCache(self.db_path, issue_number=7)
+        self.updates = list(self.UPDATES)
+        self.comments = [
+            comment(n, body=str(n)) for n in range(1, len(self.updates) + 1)
+        ]
+        self.cache.upsert(self.comments, self.parse)
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def parse(self, body):
+        section, agent, content, related = self.updates[int(body) - 1]
+        return {
+            "section": section,
+            "agent": agent,
+            "content": content,
+            "related_issues": related,
+            "related_prs": [],
+        }
+
+    def search(self, query, **filters):
+        return [p["content"] for p, _, _ in self.cache.search(query, **filters)]
+
+    def test_words_match_prefixes_in_any_order(self):
+        """Every query word must start a word of the update"""
+        self.assertEqual(
+            sorted(self.search("perf parser")), ["Improve parser performance"]
+        )
+        self.assertEqual(len(self.search("PERFORMANCE")), 2)
+        self.assertEqual(self.search("missing"), [])
+        self.assertEqual(self.search("!!"), [])
+
+    def test_related_references_are_searchable(self):
+        """Issue references can be searched for"""
+        self.assertEqual(len(self.search("#12")), 2)
+        self.assertEqual(self.search("40"), ["Review the sync engine"])
+
+    def test_section_and_agent_filters(self):
+        """Filters narrow results without another query"""
+        self.assertEqual(
+            self.search("performance", section="completed-tasks"),
+            ["Shipped performance dashboard"],
+        )
+        self.assertEqual(
+            self.search("parser", agent="OrchestratorAgent"),
+            ["Parser uses one regex"],
+        )
+
+    def test_results_are_ranked(self):
+        """Updates matching more often rank first"""
+        self.cache.upsert(
+            [comment(9, body="1")],
+            lambda body: {
+                "section": "reflections",
+                "agent": "Reviewer",
+                "content": "parser parser parser",
+            },
+        )
+
+        results = self.cache.search("parser")
+        self.assertEqual(results[0][0]["content"], "parser parser parser")
+        self.assertGreater(results[0][2], results[-1][2])
+
+    def test_index_follows_edits_and_deletions(self):
+        """Edited and deleted comments are reindexed incrementally"""
+        self.updates.append(("next-steps", "Agent", "Profile sync", []))
+        edited = comment(4, updated="2025-01-02T00:00:00Z", body="5")
+        self.cache.upsert([edited], self.parse)
+        self.assertEqual(self.search("review"), [])
+        self.assertEqual(self.search("profile"), ["Profile sync"])
+
+        self.cache.replace_all(self.comments[:1], self.parse)
+        self.assertEqual(self.search("parser"), ["Improve parser performance"])
+        self.assertEqual(self.search("profile"), [])
+
+    def test_existing_cache_is_indexed(self):
+        """Comments cached before the index existed are indexed on open"""
+        self.cache.conn.execute("DELETE FROM comment_search")
+        self.cache.conn.commit()
+        self.cache.close()
+
+        self.cache = MemoryCommentCache(self.db_path, issue_number=7)
+        self.assertEqual(len(self.search("performance")), 2)
+
+    def test_scan_fallback_matches_index(self):
+        """Without FTS5 the same queries are answered by scanning"""
+        indexed = sorted(self.search("perf"))
+        self.cache.search_enabled = False
+
+        self.assertEqual(sorted(self.search("perf")), indexed)
+        self.assertEqual(
+            self.search("parser", agent="OrchestratorAgent"), ["Parser uses one regex"]
+        )
+
+
+class TestArchiveManifest(unittest.TestCase):
+    """Test archived comments leaving the cache but staying resolvable"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = MemoryCommentCache(
+            str(Path(self.temp_dir) / "memory_comments.db"), issue_number=7
+        )
+        self.parse = CountingParser()
+        self.comments = [comment(n) for n in range(1, 4)]
+        self.cache.upsert(self.comments, self.parse)
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def archive_first(self):
+        entry = (self.comments[0], self.parse(self.comments[0]["body"]))
+        self.cache.archive([entry], "2025-01", 43, "https://example/43#c1")
+
+    def test_archived_comments_leave_reads(self):
+        """Archived updates are no longer read but still counted until deleted"""
+        self.archive_first()
+
+        self.assertEqual(
+            [d["comment_id"] for _, d in self.cache.updates()], ["IC_2", "IC_3"]
+        )
+        self.assertEqual(self.cache.count(), 3)
+        self.assertEqual(self.cache.pending_deletions(), ["IC_1"])
+
+        self.cache.mark_deleted(["IC_1"])
+        self.assertEqual(self.cache.count(), 2)
+        self.assertEqual(self.cache.pending_deletions(), [])
+        self.assertEqual(self.cache.get_stats()["archived_comments"], 1)
+
+    def test_archived_comments_resolve_to_digest(self):
+        """The manifest points at the digest holding an archived update"""
+        self.archive_first()
+
+        archived = self.cache.resolve("IC_1")
+        self.assertEqual(archived["period"], "2025-01")
+        self.assertEqual(archived["archive_issue"], 43)
+        self.assertEqual(archived["update"]["content"], "update 1")
+        self.assertFalse(archived["deleted"])
+        self.assertIsNone(self.cache.resolve("IC_2"))
+
+    def test_archived_comments_stay_searchable(self):
+        """Search results carry the archive location"""
+        self.archive_first()
+
+        for search_enabled in (True, False):
+            self.cache.search_enabled = search_enabled
+            results = self.cache.search("update")
+            details = {d["comment_id"]: d for _, d, _ in results}
+            self.assertEqual(len(details), 3)
+            self.assertEqual(details["IC_1"]["archived"]["archive_issue"], 43)
+            self.assertNotIn("archived", details["IC_2"])
+
+    def test_refreshes_skip_archived_comments(self):
+        """Comments awaiting deletion are not cached again"""
+        self.archive_first()
+
+        self.cache.replace_all(self.comments, self.parse)
+        self.assertEqual(len(self.cache.updates()), 2)
+        self.assertEqual(self.cache.pending_deletions(), ["IC_1"])
+
+        self.cache.replace_all(self.comments[1:], self.parse)
+        self.assertEqual(self.cache.pending_deletions(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -242,6 +242,27 @@ Last Updated: 2025-08-05T10:00:00-08:00
         age = compactor._estimate_item_age(item_no_date, current_date)
         self.assertEqual(age, 0)
 
+    def test_estimate_item_age_heuristics(self):
+        """Test date formats and relative markers found in one scan"""
+        compactor = MemoryCompactor(self.memory_path, self.details_path)
+        current_date = datetime(2025, 8, 5)
+
+        cases = {
+            "Shipped 07/26/2025": 10,
+            "Shipped 7/26/25": 10,
+            "Bad date 2025-13-40, fixed 2025-08-01": 4,
+            "Noted weeks ago, dated 2025-08-04": 1,
+            "Old note from days ago": 7,
+            "Raised months ago, revisited weeks ago": 90,
+            "OLD workaround": 60,
+            "Unfolded the boldest plan": 0,
+        }
+        for item, expected in cases.items():
+            with self.subTest(item=item):
+                self.assertEqual(
+                    compactor._estimate_item_age(item, current_date), expected
+                )
+
     def test_compact_memory_not_needed(self):
         """Test compact_memory when compaction is not needed"""
         # Create small file
@@ -348,10 +369,57 @@ Last Updated: 2025-08-05T10:00:00-08:00
         with open(self.details_path, "r", encoding="utf-8") as f:
             content = f.read()
 
-        self.assertIn("Existing Details", content)
-        self.assertIn("Some existing content", content)
+        self.assertTrue(content.startswith(existing_content))
         self.assertIn("New archived item", content)
 
+        # Archiving the same item again, as a retried compaction does,
+        # changes neither the index nor the readable log
+        compactor._archive_items(items_to_archive)
+        self.assertEqual(compactor.archive.get_stats()["items"], 1)
+        with open(self.details_path, "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), content)
+
+    def test_archive_items_updates_header_timestamp(self):
+        """Test appending to LongTermMemoryDetails.md updates Last Updated"""
+        with open(self.details_path, "w", encoding="utf-8") as f:
+            f.write(
+                "# AI Assistant Long-Term Memory Details\n"
+                "Last Updated: 2025-08-04T08:50:00-08:00\n\n"
+                "## Automatic Compaction System\n\nLast Updated: item text\n"
+            )
+        compactor = MemoryCompactor(self.memory_path, self.details_path)
+
+        compactor._archive_items(["- First item"])
+        compactor._archive_items(["- Second item"])
+
+        with open(self.details_path, "r", encoding="utf-8") as f:
+            lines = f.read().split("\n")
+        self.assertNotIn("2025-08-04", lines[1])
+        archived_at = compactor.archive.query("second")[0].archived_at
+        self.assertEqual(lines[1].rstrip(), f"Last Updated: {archived_at}")
+        self.assertIn("Last Updated: item text", lines)
+
+    def test_archive_items_are_indexed_by_section(self):
+        """Archived items can be queried by section, date and keywords"""
+        compactor = MemoryCompactor(self.memory_path, self.details_path)
+
+        compactor._archive_items(
+            ["- Fixed parser cache (2025-07-01)", "- Reviewed old docs"],
+            {
+                "Completed Tasks": ["- Fixed parser cache (2025-07-01)"],
+                "Reflections": ["- Reviewed old docs"],
+            },
+        )
+
+        items = compactor.archive.query("parser")
+        self.assertEqual(len(items), 1)
+        self.assertEqual(items[0].section, "Completed Tasks")
+        self.assertEqual(items[0].date, "2025-07-01")
+        self.assertEqual(
+            [i.text for i in compactor.archive.query(section="Reflections")],
+            ["- Reviewed old docs"],
+        )
+
     def test_create_compacted_memory(self):
         """Test creating compacted memory content"""
         compactor = MemoryCompactor(self.memory_path, self.details_path)
@@ -500,6 +568,11 @@ Last Updated: 2025-08-05T10:00:00-08:00
         self.assertIn("Long-Term Memory Details", archive_content)
         self.assertIn("Memory Compaction Archive", archive_content)
 
+        # Verify every archived item is indexed under its section
+        stats = compactor.archive.get_stats()
+        self.assertEqual(stats["items"], result["result"]["archived_items"])
+        self.assertNotIn("Archived", stats["sections"])
+
     def test_compaction_preserves_essential_content(self):
         """Test that compaction preserves essential current content"""
         essential_content = (
@@ -561,6 +634,54 @@ Last Updated: 2025-08-05T10:00:00-08:00
         # Verify reference to archive
         self.assertIn("LongTermMemoryDetails.md", compacted_content)
 
+    def test_compaction_reads_memory_once(self):
+        """Analysis, plan, backup and output all come from a single read"""
+        with open(self.memory_path, "w", encoding="utf-8") as f:
+            f.write(
+                "# AI Assistant Memory\n\n## Completed Tasks\n"
+                + "\n".join(
+                    f"- ✅ Task {i} done on 2025-01-{i:02d}" for i in range(1, 29)
+                )
+                + "\n"
+            )
+        os.chmod(self.memory_path, 0o640)
+        compactor = MemoryCompactor(
+            self.memory_path,
+            self.details_path,
+            size_thresholds={"max_lines": 20, "target_lines": 15},
+        )
+
+        real_open = open
+        reads = []
+
+        def counting_open(file, mode="r", *args, **kwargs):
+            if str(file) == str(self.memory_path) and "r" in mode:
+                reads.append(file)
+            return real_open(file, mode, *args, **kwargs)
+
+        with (
+            patch("builtins.open", side_effect=counting_open),
+            patch.object(compactor.parser, "parse_file") as parse_file,
+        ):
+            result = compactor.compact_memory(dry_run=False)
+
+        self.assertTrue(result["success"])
+        self.assertEqual(len(reads), 1)
+        parse_file.assert_not_called()
+
+        # Atomic writes leave no temporary files and keep permissions
+        self.assertEqual(
+            sorted(os.listdir(self.temp_dir)),
+            [
+                "LongTermMemoryDetails",
+                "LongTermMemoryDetails.md",
+                "Memory.md",
+                "Memory.md.backup",
+            ],
+        )
+        self.assertEqual(os.stat(self.memory_path).st_mode & 0o777, 0o640)
+        self.assertEqual(os.stat(self.memory_path + ".backup").st_mode & 0o777, 0o600)
+
 
 if __name__ == "__main__":
     unittest.main()
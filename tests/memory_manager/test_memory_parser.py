@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Tests for stable task identities in MemoryParser
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add the memory-manager directory to the path
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "../../.github/memory-manager")
+)
+
+from memory_parser import (
+    MemoryParser,
+    TaskIdentityMap,
+    TaskPriority,
+    TaskStatus,
+    task_key,
+)
+from parser_benchmark import benchmark_parser
+
+MEMORY_CONTENT = """# AI Assistant Memory
+
+## Current Goals
+- [ ] Write the parser
+- [ ] Ship the sync engine
+- [ ] Review open pull requests
+
+## Completed Tasks
+- ✅ Set up the repository
+"""
+
+
+class TestStableTaskIds(unittest.TestCase):
+    """Test that task IDs follow task content rather than position"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.id_file = Path(self.temp_dir) / "task_ids.json"
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def parse(self, content, parser=None):
+        parser = parser or MemoryParser(TaskIdentityMap(str(self.id_file)))
+        return {task.content: task.id for task in parser.parse_content(content).tasks}
+
+    def test_ids_survive_insertions(self):
+        """Inserting a task does not renumber the tasks after it"""
+        parser = MemoryParser()
+        before = self.parse(MEMORY_CONTENT, parser)
+        after = self.parse(
+            MEMORY_CONTENT.replace(
+                "## Current Goals\n", "## Current Goals\n- [ ] Plan the release\n"
+            ),
+            parser,
+        )
+
+        self.assertEqual(len(set(before.values())), 4)
+        for content, task_id in before.items():
+            self.assertEqual(after[content], task_id)
+        self.assertEqual(
+            before["Write the parser"], task_key("Current Goals", "Write the parser")
+        )
+
+    def test_formatting_and_status_do_not_change_ids(self):
+        """Checking a task off or reformatting it keeps its ID"""
+        before = self.parse(MEMORY_CONTENT, MemoryParser())
+        after = self.parse(
+            MEMORY_CONTENT.replace(
+                "- [ ] Write the parser", "- [x] **Write** the parser."
+            ),
+            MemoryParser(),
+        )
+
+        self.assertEqual(after["**Write** the parser."], before["Write the parser"])
+
+    def test_duplicate_tasks_get_distinct_ids(self):
+        """Repeated text in a section is disambiguated in document order"""
+        tasks = (
+            MemoryParser()
+            .parse_content("## Current Goals\n- [ ] Update docs\n- [ ] Update docs\n")
+            .tasks
+        )
+
+        self.assertEqual(tasks[1].id, f"{tasks[0].id}-2")
+
+    def test_edited_task_keeps_id_across_runs(self):
+        """An edited task keeps its ID, also for a freshly loaded map"""
+        before = self.parse(MEMORY_CONTENT)
+        edited = MEMORY_CONTENT.replace(
+            "Ship the sync engine", "Ship the sync engine v2"
+        )
+
+        after = self.parse(edited)
+        self.assertEqual(
+            after["Ship the sync engine v2"], before["Ship the sync engine"]
+        )
+        self.assertEqual(len(TaskIdentityMap(str(self.id_file)).renames), 1)
+
+        # The rename map resolves the edited text directly from now on
+        again = self.parse(edited)
+        self.assertEqual(again, after)
+
+    def test_moved_task_keeps_id(self):
+        """Moving a task to another section keeps its ID"""
+        before = self.parse(MEMORY_CONTENT)
+        moved = MEMORY_CONTENT.replace("- [ ] Write the parser\n", "") + (
+            "- ✅ Write the parser\n"
+        )
+
+        after = self.parse(moved)
+        self.assertEqual(after["Write the parser"], before["Write the parser"])
+
+    def test_unrelated_replacement_gets_new_id(self):
+        """A deleted task's ID is not handed to unrelated new text"""
+        before = self.parse(MEMORY_CONTENT)
+        after = self.parse(
+            MEMORY_CONTENT.replace("Review open pull requests", "Benchmark cold starts")
+        )
+
+        self.assertNotIn(after["Benchmark cold starts"], before.values())
+
+    def test_deleted_and_added_similar_task_gets_new_id(self):
+        """A similar task added where another was deleted is a new task"""
+        content = MEMORY_CONTENT.replace(
+            "- [ ] Review open pull requests\n",
+            "- [ ] Fix login timeout on staging #12\n- [ ] Review open pull requests\n",
+        )
+        before = self.parse(content)
+        after = self.parse(
+            content.replace("- [ ] Fix login timeout on staging #12\n", "").replace(
+                "- [ ] Review open pull requests\n",
+                "- [ ] Review open pull requests\n- [ ] Fix logout timeout on production\n",
+            )
+        )
+
+        self.assertNotIn(after["Fix logout timeout on production"], before.values())
+        self.assertEqual(
+            after["Review open pull requests"], before["Review open pull requests"]
+        )
+
+        # An edit in place that drops the issue reference is not a rename
+        self.id_file.unlink()
+        before = self.parse(content)
+        again = self.parse(
+            content.replace("Fix login timeout on staging #12", "Fix login timeout")
+        )
+        self.assertNotIn(again["Fix login timeout"], before.values())
+
+
+class TestIncrementalParsing(unittest.TestCase):
+    """Test that re-parses only rescan what changed"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @staticmethod
+    def snapshot(doc):
+        return [
+            (t.id, t.content, t.status, t.priority, t.section, t.line_number)
+            for t in doc.tasks
+        ]
+
+    def test_task_formats(self):
+        """Each task format maps to its status and priority"""
+        tasks = (
+            MemoryParser()
+            .parse_content(
+                "## Goals\n- ✅ Done\n- [X] Also done\n- [ ] Open\n"
+                "- **low**: Later\n- Plain **URGENT** note\nNot a task\n"
+            )
+            .tasks
+        )
+
+        self.assertEqual(
+            [(t.content, t.status, t.priority) for t in tasks],
+            [
+                ("Done", TaskStatus.COMPLETED, TaskPriority.MEDIUM),
+                ("Also done", TaskStatus.COMPLETED, TaskPriority.MEDIUM),
+                ("Open", TaskStatus.PENDING, TaskPriority.MEDIUM),
+                ("Later", TaskStatus.PENDING, TaskPriority.LOW),
+                ("Plain **URGENT** note", TaskStatus.PENDING, TaskPriority.HIGH),
+            ],
+        )
+
+    def test_only_changed_sections_are_rescanned(self):
+        """Editing one section reuses the others and matches a cold parse"""
+        parser = MemoryParser()
+        parser.parse_content(MEMORY_CONTENT)
+        edited = MEMORY_CONTENT.replace(
+            "## Current Goals\n", "## Current Goals\n- [ ] Plan the release\n"
+        )
+
+        doc = parser.parse_content(edited)
+
+        stats = parser.get_stats()
+        self.assertEqual(stats["sections_parsed"], 4)
+        self.assertEqual(stats["sections_reused"], 2)
+        self.assertEqual(
+            self.snapshot(doc), self.snapshot(MemoryParser().parse_content(edited))
+        )
+        self.assertEqual(doc.tasks[-1].line_number, 10)
+
+    def test_unchanged_file_is_not_reread(self):
+        """parse_file reuses content until the file changes"""
+        path = Path(self.temp_dir) / "Memory.md"
+        path.write_text(MEMORY_CONTENT)
+        os.utime(path, (1_700_000_000, 1_700_000_000))
+        parser = MemoryParser()
+
+        first = parser.parse_file(str(path))
+        second = parser.parse_file(str(path))
+        self.assertEqual(parser.get_stats()["file_reads_skipped"], 1)
+        self.assertIsNot(first.tasks[0], second.tasks[0])
+
+        path.write_text(MEMORY_CONTENT + "- [ ] One more\n")
+        self.assertEqual(len(parser.parse_file(str(path)).tasks), 5)
+
+    def test_same_size_rewrite_in_one_mtime_tick_is_reread(self):
+        """A recently modified file is re-read even if mtime and size match"""
+        path = Path(self.temp_dir) / "Memory.md"
+        path.write_text(MEMORY_CONTENT)
+        parser = MemoryParser()
+        parser.parse_file(str(path))
+        mtime_ns = path.stat().st_mtime_ns
+
+        path.write_text(MEMORY_CONTENT.replace("[ ]", "[x]", 1))
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+        doc = parser.parse_file(str(path))
+        self.assertEqual(parser.get_stats()["file_reads_skipped"], 0)
+        task = next(t for t in doc.tasks if t.content == "Write the parser")
+        self.assertEqual(task.status, TaskStatus.COMPLETED)
+
+    def test_benchmark_runs(self):
+        """The benchmark reports timings for each case"""
+        result = benchmark_parser(lines=200, repeat=1)
+
+        self.assertGreater(result["tasks"], 0)
+        self.assertGreaterEqual(result["cold_parse_ms"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Tests for the write-behind queue of Project Memory updates
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+# Add the memory-manager directory to the path
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "../../.github/memory-manager")
+)
+
+from memory_write_buffer import (
+    MAX_COMMENT_CONTENT,
+    MemoryWriteBuffer,
+    coalesce_updates,
+    split_content,
+)
+
+
+def update(content, section="current-goals", agent="WorkflowManager", **fields):
+    return {
+        "content": content,
+        "section": section,
+        "agent": agent,
+        "priority": fields.get("priority", "medium"),
+        "related_issues": fields.get("related_issues", []),
+        "related_prs": [],
+        "related_commits": [],
+        "related_files": fields.get("related_files", []),
+        "timestamp": fields.get("timestamp", "2025-01-01T00:00:00"),
+    }
+
+
+class RecordingPoster:
+    """Records posted updates, failing while ``fail`` is set"""
+
+    def __init__(self):
+        self.posted = []
+        self.fail = False
+        self.rejected = set()  # Contents that always fail
+        self.posted_event = threading.Event()
+
+    def __call__(self, fields):
+        if self.fail or fields["content"] in self.rejected:
+            return False
+        self.posted.append(fields)
+        self.posted_event.set()
+        return True
+
+
+class TestCoalesceUpdates(unittest.TestCase):
+    """Test merging queued updates into comments"""
+
+    def test_updates_merge_per_section_and_agent(self):
+        """One comment per section and agent, in order of first update"""
+        entries = [
+            (1, update("Goal A", related_issues=[1])),
+            (2, update("Done", section="completed-tasks")),
+            (3, update("Goal B", priority="high", related_issues=[1, 2])),
+            (4, update("Other agent", agent="OrchestratorAgent")),
+        ]
+
+        groups = coalesce_updates(entries)
+
+        self.assertEqual([ids for ids, _ in groups], [[1, 3], [2], [4]])
+        merged = groups[0][1]
+        self.assertEqual(merged["content"], "Goal A\n\nGoal B")
+        self.assertEqual(merged["priority"], "high")
+        self.assertEqual(merged["related_issues"], [1, 2])
+        self.assertEqual(entries[0][1]["content"], "Goal A")
+
+    def test_long_groups_are_split(self):
+        """Merged content stays under the comment size limit"""
+        entries = [(n, update("x" * 40)) for n in range(1, 6)]
+
+        groups = coalesce_updates(entries, max_content=100)
+
+        self.assertEqual([ids for ids, _ in groups], [[1, 2], [3, 4], [5]])
+
+    def test_split_content_at_line_breaks(self):
+        """Long content is split at line breaks, or hard when there are none"""
+        self.assertEqual(split_content("aaaa\nbbbb\ncc", 9), ["aaaa\nbbbb", "cc"])
+        self.assertEqual(split_content("x" * 10, 4), ["xxxx", "xxxx", "xx"])
+        self.assertEqual(split_content("short", 9), ["short"])
+
+
+class TestMemoryWriteBuffer(unittest.TestCase):
+    """Test durable queuing, flush triggers and failure handling"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = str(Path(self.temp_dir) / "state" / "memory_pending.db")
+        self.poster = RecordingPoster()
+        self.buffers = []
+
+    def tearDown(self):
+        for buffer in self.buffers:
+            buffer.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def open_buffer(self, **options):
+        options.setdefault("flush_interval", 60)
+        buffer = MemoryWriteBuffer(self.db_path, 7, self.poster, **options)
+        self.buffers.append(buffer)
+        return buffer
+
+    def test_updates_wait_for_flush(self):
+        """Enqueueing does not post; a flush posts coalesced comments"""
+        buffer = self.open_buffer()
+        for content in ("Goal A", "Goal B"):
+            buffer.enqueue(update(content))
+        buffer.enqueue(update("Done", section="completed-tasks"))
+        self.assertEqual(self.poster.posted, [])
+
+        result = buffer.flush()
+
+        self.assertEqual(
+            result, {"updates_posted": 3, "comments_posted": 2, "pending": 0}
+        )
+        self.assertEqual(
+            [p["content"] for p in self.poster.posted], ["Goal A\n\nGoal B", "Done"]
+        )
+
+    def test_full_queue_flushes_in_background(self):
+        """Reaching max_pending posts without waiting for the interval"""
+        buffer = self.open_buffer(max_pending=3)
+        for n in range(3):
+            buffer.enqueue(update(f"Goal {n}"))
+
+        self.assertTrue(self.poster.posted_event.wait(5))
+        buffer.close()
+        self.assertEqual(len(self.poster.posted), 1)
+        self.assertEqual(buffer.get_stats()["updates_posted"], 3)
+
+    def test_interval_flushes_in_background(self):
+        """An update is posted once it has waited flush_interval seconds"""
+        buffer = self.open_buffer(flush_interval=0.05)
+        buffer.enqueue(update("Goal"))
+
+        self.assertTrue(self.poster.posted_event.wait(5))
+        self.assertEqual(self.poster.posted[0]["content"], "Goal")
+
+    def test_failed_updates_stay_queued(self):
+        """A failed post keeps its updates for the next flush"""
+        buffer = self.open_buffer()
+        buffer.enqueue(update("Goal"))
+        self.poster.fail = True
+
+        self.assertEqual(buffer.flush()["pending"], 1)
+        self.assertEqual(buffer.get_stats()["flush_failures"], 1)
+
+        self.poster.fail = False
+        self.assertEqual(buffer.flush()["updates_posted"], 1)
+        self.assertEqual(buffer.pending_count(), 0)
+
+    def test_oversized_update_is_split(self):
+        """An update over the comment limit does not block later ones"""
+        buffer = self.open_buffer()
+        long_content = "\n".join(["x" * 99] * 700)  # 70k characters
+        buffer.enqueue(update(long_content))
+        buffer.enqueue(update("Goal"))
+
+        result = buffer.flush()
+
+        self.assertEqual(result["pending"], 0)
+        self.assertGreater(result["comments_posted"], 1)
+        posted = [p["content"] for p in self.poster.posted]
+        self.assertTrue(all(len(c) <= MAX_COMMENT_CONTENT for c in posted))
+        self.assertEqual("\n".join(posted), f"{long_content}\n\nGoal")
+
+    def test_failing_update_is_dead_lettered(self):
+        """An update that keeps failing is set aside after max_attempts"""
+        buffer = self.open_buffer(max_attempts=2)
+        self.poster.rejected.add("Rejected")
+        buffer.enqueue(update("Rejected"))
+        buffer.enqueue(update("Done", section="completed-tasks"))
+
+        self.assertEqual(buffer.flush()["pending"], 2)
+        self.assertEqual(
+            buffer.flush(), {"updates_posted": 1, "comments_posted": 1, "pending": 0}
+        )
+        self.assertEqual([p["content"] for p in self.poster.posted], ["Done"])
+        self.assertEqual(buffer.get_stats()["updates_dead_lettered"], 1)
+        dead = buffer.conn.execute("SELECT fields FROM dead_updates").fetchall()
+        self.assertEqual([json.loads(row[0])["content"] for row in dead], ["Rejected"])
+
+    def test_queue_survives_restart(self):
+        """Updates left by a process that could not post are posted later"""
+        buffer = self.open_buffer()
+        buffer.enqueue(update("Goal"))
+        self.poster.fail = True
+        self.assertEqual(buffer.close()["pending"], 1)
+
+        self.poster.fail = False
+        reopened = self.open_buffer()
+        self.assertEqual(reopened.pending_count(), 1)
+        reopened.close()
+        self.assertEqual([p["content"] for p in self.poster.posted], ["Goal"])
+
+    def test_claimed_updates_are_not_posted_twice(self):
+        """Another process skips updates claimed until the claim expires"""
+        first = self.open_buffer()
+        first.enqueue(update("Goal"))
+        first._claim()
+
+        second = self.open_buffer()
+        self.assertEqual(second.flush()["updates_posted"], 0)
+
+        second.claim_timeout = -1
+        self.assertEqual(second.flush()["updates_posted"], 1)
+        self.assertEqual(len(self.poster.posted), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
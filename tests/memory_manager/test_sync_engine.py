@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Tests for SyncEngine change detection
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+# Add the memory-manager directory to the path
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "../../.github/memory-manager")
+)
+
+from enums import SyncDirection
+from github_batch import OperationResult
+from github_integration import GitHubIntegration, GitHubIssue
+from sync_engine import SyncConfig, SyncEngine, task_fingerprint
+
+MEMORY_CONTENT = """# AI Assistant Memory
+
+## Current Goals
+- [ ] Write the parser
+- [ ] Ship the sync engine
+- ✅ Set up the repository
+"""
+
+
+class FakeGitHub(GitHubIntegration):
+    """In-memory stand-in for GitHubIntegration that counts API calls"""
+
+    def __init__(self):
+        self.repo_path = ""
+        self.batch_transport = None
+        self.issues = {}
+        self.calls = []
+        self.clock = datetime(2025, 1, 1)
+
+    def get_all_memory_issues(self):
+        self.calls.append("list")
+        return [GitHubIssue(**vars(issue)) for issue in self.issues.values()]
+
+    def _apply_with_gh(self, operation):
+        self.calls.append((operation.kind, operation.task_id))
+        if operation.kind == "create":
+            number = len(self.issues) + 1
+            issue = GitHubIssue(
+                number=number,
+                title=operation.title,
+                body=operation.body,
+                state="closed" if "completed" in operation.labels else "open",
+                labels=[],
+                assignees=[],
+                created_at=self.clock,
+                updated_at=self.clock,
+                html_url=f"https://example.com/{number}",
+                memory_task_id=operation.task_id,
+            )
+            self.issues[number] = issue
+        else:
+            issue = self.issues[operation.issue_number]
+            issue.title = operation.title
+            issue.state = operation.state or issue.state
+
+        self.clock += timedelta(seconds=1)
+        issue.updated_at = self.clock
+        return OperationResult(
+            operation,
+            issue_data={
+                "number": issue.number,
+                "title": issue.title,
+                "body": issue.body,
+                "state": issue.state,
+                "labels": [],
+                "assignees": [],
+                "createdAt": issue.created_at.isoformat(),
+                "updatedAt": issue.updated_at.isoformat(),
+                "htmlUrl": issue.html_url,
+            },
+        )
+
+
+class TestSyncChangeDetection(unittest.TestCase):
+    """Test that only changed tasks generate API calls"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.memory_file = Path(self.temp_dir) / "Memory.md"
+        self.memory_file.write_text(MEMORY_CONTENT)
+        self.github = FakeGitHub()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def make_engine(self):
+        with patch("sync_engine.GitHubIntegration", return_value=self.github):
+            return SyncEngine(
+                str(self.memory_file),
+                self.temp_dir,
+                SyncConfig(backup_before_sync=False),
+            )
+
+    def test_unchanged_tasks_are_skipped(self):
+        """A second sync with nothing changed makes no write calls"""
+        first = self.make_engine().sync(SyncDirection.MEMORY_TO_GITHUB)
+        self.assertEqual(first.created_issues, 3)
+
+        # A fresh engine proves the fingerprints were persisted
+        self.github.calls.clear()
+        second = self.make_engine().sync(SyncDirection.MEMORY_TO_GITHUB)
+
+        self.assertTrue(second.success)
+        self.assertEqual(second.skipped_unchanged, 3)
+        self.assertEqual(second.updated_issues, 0)
+        self.assertEqual(self.github.calls, ["list"])
+        self.assertEqual(second.to_dict()["skipped_unchanged"], 3)
+
+    def test_changed_task_is_updated(self):
+        """Editing one task updates only its issue"""
+        self.make_engine().sync(SyncDirection.MEMORY_TO_GITHUB)
+        self.memory_file.write_text(
+            MEMORY_CONTENT.replace("Write the parser", "Write the parser and tests")
+        )
+
+        self.github.calls.clear()
+        result = self.make_engine().sync(SyncDirection.MEMORY_TO_GITHUB)
+
+        # The edited task keeps the ID its issue was created with
+        task_id = self.github.issues[1].memory_task_id
+        self.assertEqual(self.github.calls, ["list", ("update", task_id)])
+        self.assertEqual(result.updated_issues, 1)
+        self.assertEqual(result.skipped_unchanged, 2)
+
+    def test_issue_edited_on_github_is_resynced(self):
+        """A newer issue updatedAt forces the task to be synced again"""
+        self.make_engine().sync(SyncDirection.MEMORY_TO_GITHUB)
+        self.github.issues[2].updated_at += timedelta(hours=1)
+
+        self.github.calls.clear()
+        result = self.make_engine().sync(SyncDirection.MEMORY_TO_GITHUB)
+
+        task_id = self.github.issues[2].memory_task_id
+        self.assertEqual(self.github.calls, ["list", ("update", task_id)])
+        self.assertEqual(result.skipped_unchanged, 2)
+
+    def test_inserted_task_does_not_disturb_others(self):
+        """Adding a task at the top creates one issue and touches nothing else"""
+        self.make_engine().sync(SyncDirection.MEMORY_TO_GITHUB)
+        self.memory_file.write_text(
+            MEMORY_CONTENT.replace(
+                "## Current Goals\n", "## Current Goals\n- [ ] Plan the release\n"
+            )
+        )
+
+        self.github.calls.clear()
+        result = self.make_engine().sync(SyncDirection.MEMORY_TO_GITHUB)
+
+        self.assertEqual(result.created_issues, 1)
+        self.assertEqual(result.skipped_unchanged, 3)
+        self.assertEqual(len(self.github.calls), 2)
+
+    def test_legacy_issue_ids_are_adopted(self):
+        """Issues created with sequential IDs keep their task"""
+        self.github.issues[1] = GitHubIssue(
+            number=1,
+            title="Ship the sync engine",
+            body="# Memory.md Task\n\nShip the sync engine\n\n## Task Details\n",
+            state="open",
+            labels=[],
+            assignees=[],
+            created_at=self.github.clock,
+            updated_at=self.github.clock,
+            html_url="https://example.com/1",
+            memory_task_id="task-002",
+        )
+
+        result = self.make_engine().sync(SyncDirection.MEMORY_TO_GITHUB)
+
+        self.assertEqual(result.created_issues, 2)
+        self.assertIn(("update", "task-002"), self.github.calls)
+        self.assertEqual(
+            self.make_engine().parser.parse_file(str(self.memory_file)).tasks[1].id,
+            "task-002",
+        )
+
+    def test_bidirectional_sync_does_not_refetch(self):
+        """Bidirectional sync reuses the issues returned by writes"""
+        engine = self.make_engine()
+        result = engine.sync(SyncDirection.BIDIRECTIONAL)
+
+        self.assertTrue(result.success)
+        self.assertEqual(self.github.calls.count("list"), 1)
+        self.assertEqual(result.updated_tasks, 0)
+
+    def test_dry_run_records_nothing(self):
+        """Dry runs leave the fingerprint state untouched"""
+        engine = self.make_engine()
+        engine.config.dry_run = True
+        engine.sync(SyncDirection.MEMORY_TO_GITHUB)
+
+        self.assertEqual(engine.task_state, {})
+        self.assertEqual(engine.get_sync_status()["tracked_tasks"], 0)
+
+    def test_fingerprint_ignores_line_number(self):
+        """Moving a task without editing it keeps its fingerprint"""
+        engine = self.make_engine()
+        task = engine.parser.parse_content(MEMORY_CONTENT).tasks[0]
+        fingerprint = task_fingerprint(task)
+
+        task.line_number += 10
+        self.assertEqual(task_fingerprint(task), fingerprint)
+
+        task.content += " quickly"
+        self.assertNotEqual(task_fingerprint(task), fingerprint)
+
+
+if __name__ == "__main__":
+    unittest.main()